@@ -2,59 +2,50 @@ import os
 import sys
 from annogesiclib.gff3 import Gff3Parser
 from annogesiclib.helper import Helper
+from annogesiclib.genome_store import GenomeStore
 from annogesiclib.parser_wig import WigParser
 from annogesiclib.gen_TSS_type import compare_tss_cds, fix_primary_type
 from annogesiclib.lib_reader import read_libs, read_wig
 
 
-def get_upstream(seq, tss, out, name, nt_before):
+def get_upstream(seq, tss, nt_before):
+    '''the region of the upstream sequence of TSS'''
     if tss.strand == "+":
         if (tss.start - nt_before + 1) <= 0:
             start = 1
         else:
             start = tss.start - nt_before + 1
-        fasta = Helper().extract_gene(seq, start,
-                                      tss.start, tss.strand)
+        return (tss.seq_id, start, tss.start, tss.strand)
     else:
         if (tss.start + nt_before - 1) > len(seq):
             end = len(seq)
         else:
             end = tss.start + nt_before - 1
-        fasta = Helper().extract_gene(seq, tss.start,
-                                      end, tss.strand)
-    if len(fasta) >= nt_before:
-        out.write("{0}\n{1}\n".format(name, fasta))
+        return (tss.seq_id, tss.start, end, tss.strand)
 
 
-def print_fasta(seq, tss, files, name, nt_before):
-    for key in seq.keys():
-        if tss.seq_id == key:
-            if "Primary" in tss.attributes["type"]:
-                get_upstream(seq[key], tss, files["pri"], name, nt_before)
-            if "Secondary" in tss.attributes["type"]:
-                get_upstream(seq[key], tss, files["sec"], name, nt_before)
-            if "Internal" in tss.attributes["type"]:
-                get_upstream(seq[key], tss, files["inter"], name, nt_before)
-            if "Antisense" in tss.attributes["type"]:
-                get_upstream(seq[key], tss, files["anti"], name, nt_before)
-            if "Orphan" in tss.attributes["type"]:
-                get_upstream(seq[key], tss, files["orph"], name, nt_before)
+def print_fasta(seq, tsss, files, nt_before):
+    '''print the upstream sequences of the TSSs to the files of their
+    types. The sequences are extracted in one batch'''
+    tsss = [tss for tss in tsss if tss.seq_id in seq.keys()]
+    fastas = Helper().extract_genes(seq, [
+        get_upstream(seq[tss.seq_id], tss, nt_before) for tss in tsss])
+    for tss, fasta in zip(tsss, fastas):
+        if len(fasta) >= nt_before:
+            name = ">" + "_".join([str(tss.start), tss.strand, tss.seq_id])
+            for type_, key in (("Primary", "pri"), ("Secondary", "sec"),
+                               ("Internal", "inter"), ("Antisense", "anti"),
+                               ("Orphan", "orph")):
+                if type_ in tss.attributes["type"]:
+                    files[key].write("{0}\n{1}\n".format(name, fasta))
 
 
 def read_data(tss_file, fasta_file):
-    seq = {}
     tsss = []
     t_f = open(tss_file, "r")
     for entry in Gff3Parser().entries(t_f):
         tsss.append(entry)
-    with open(fasta_file, "r") as f_h:
-        for line in f_h:
-            line = line.strip()
-            if line[0] == ">":
-                seq[line[1:]] = ""
-                seq_id = line[1:]
-            else:
-                seq[seq_id] = seq[seq_id] + line
+    seq = GenomeStore(fasta_file)
     tsss = sorted(tsss, key=lambda k: (k.seq_id, k.start, k.end, k.strand))
     return tsss, seq
 
@@ -91,17 +82,16 @@ def upstream(tss_file, fasta_file, gff_file, out_class, args_pro, prefix):
             print("Error: The TSS gff file may not generated from ANNOgesic."
                   "Please run with --tss_source!")
             sys.exit()
-        if args_pro.source:
-            name = ">" + "_".join([str(tss.start), tss.strand, tss.seq_id])
-            print_fasta(seq, tss, files, name, args_pro.nt_before)
-        else:
+        if not args_pro.source:
             tss_type = compare_tss_cds(tss, cdss, genes)
             tss.attributes = tss_type[1]
             tss.attributes["ID"] = tss.seq_id + "_tss" + str(num_tss)
             tss.attribute_string = "".join([
                 tss_type[0], ";ID=", tss.seq_id, "_tss", str(num_tss)])
             num_tss += 1
-    if not args_pro.source:
+    if args_pro.source:
+        print_fasta(seq, tsss, files, args_pro.nt_before)
+    else:
         libs, texs = read_libs(args_pro.input_libs, args_pro.tex_wigs)
         wigs_f = read_wig(os.path.join(
             args_pro.wig_path, prefix + "_forward.wig"), "+", libs)
@@ -111,14 +101,13 @@ def upstream(tss_file, fasta_file, gff_file, out_class, args_pro, prefix):
                                                 k.end, k.strand))
         final_tsss = fix_primary_type(sort_tsss, wigs_f, wigs_r)
         for tss in final_tsss:
-            name = ">" + "_".join([str(tss.start), tss.strand, tss.seq_id])
             tss.attribute_string = ";".join(
                 ["=".join(items) for items in tss.attributes.items()])
             out.write("\t".join([str(field) for field in [
                             tss.seq_id, tss.source, tss.feature, tss.start,
                             tss.end, tss.score, tss.strand, tss.phase,
                             tss.attribute_string]]) + "\n")
-            print_fasta(seq, tss, files, name, args_pro.nt_before)
+        print_fasta(seq, final_tsss, files, args_pro.nt_before)
 
 
 def del_repeat_fasta(input_file, out_file):
@@ -135,18 +124,18 @@ def del_repeat_fasta(input_file, out_file):
                 if first_file:
                     seq_id = line[1:]
                     first_file = False
-                    data[seq_id] = ""
+                    data[seq_id] = []
                 else:
                     if line[1:] in data.keys():
                         check_same = True
                     else:
                         seq_id = line[1:]
-                        data[seq_id] = ""
+                        data[seq_id] = []
             else:
                 if check_same:
                     pass
                 else:
-                    data[seq_id] = data[seq_id] + line
+                    data[seq_id].append(line)
     for strain, fasta in data.items():
         out.write(">" + strain + "\n")
-        out.write(fasta + "\n")
+        out.write("".join(fasta) + "\n")
@@ -472,7 +472,8 @@ class ArgsContainer(object):
                            max_factor_reduction, max_base_height,
                            max_enrichment_factor, max_processing_factor,
                            utr_length, lib, output_prefix, cluster, strain_lengths,
-                           core, program, replicate_match, steps):
+                           core, program, replicate_match, steps,
+                           asynchronous):
         self.tsspredator_path = TSSpredator_path
         if strain_lengths is not None:
             nt_lengths = self._check_strain_length(
@@ -513,6 +514,7 @@ class ArgsContainer(object):
         self.program = program
         self.replicate = replicate_match
         self.steps = steps
+        self.asynchronous = asynchronous
         return self
 
     def _create_wig_folder(self, folder, libs):
@@ -531,7 +533,7 @@ class ArgsContainer(object):
             tex_notex_libs, frag_libs, tex_notex, replicates_tex,
             replicates_frag, min_loop_length, max_loop_length,
             min_stem_length, max_stem_length, min_AT_tail, miss_rate,
-            mut_u, keep_multi, window, shift):
+            mut_u, keep_multi, window, shift, threads):
         self.TransTermHP_path = TransTermHP_path
         self.expterm_path = expterm_path
         self.RNAfold_path = RNAfold_path
@@ -582,6 +584,7 @@ class ArgsContainer(object):
         self.keep_multi = keep_multi
         self.window = window
         self.shift = shift
+        self.threads = threads
         self = self._parser_combine_wigs("terminator")
         return self
 
@@ -590,7 +593,8 @@ class ArgsContainer(object):
                              replicates_tex, replicates_frag, out_folder,
                              tss_files, TSS_fuzzy, tex_treated_libs,
                              fragmented_libs, compare_feature_genome,
-                             terminator_files, fuzzy_term, max_dist):
+                             terminator_files, fuzzy_term, max_dist,
+                             threads):
         if (compare_feature_genome is not None) and (annotation_files is None):
             print("Error: --annotation_files needs to be assigned if "
                   "--compare_feature_genome is assigned.")
@@ -643,13 +647,14 @@ class ArgsContainer(object):
                 ["--terminator_files"])
         self.fuzzy_term = fuzzy_term
         self.max_dist = max_dist
+        self.threads = threads
         self = self._parser_combine_wigs("transcript")
         return self
 
     def container_utr(self, tss_files, annotation_files,
                       transcript_assembly_files, terminator_files,
                       terminator_fuzzy, utr_folder, tss_source, base_5utr,
-                      length, base_3utr, fuzzy_3utr, fuzzy_5utr):
+                      length, base_3utr, fuzzy_3utr, fuzzy_5utr, threads):
         self.tsss = self._gen_copy_new_folder(
                 [".gff"], utr_folder, "tmp_tss", tss_files, ["--tss_files"])
         self.gffs = self._gen_copy_new_folder(
@@ -669,6 +674,7 @@ class ArgsContainer(object):
         self.length = length
         self.fuzzy_3utr = fuzzy_3utr
         self.fuzzy_5utr = fuzzy_5utr
+        self.threads = threads
         return self
 
     def container_srna(self, rnafold, relplot_pl, mountain_pl, blastn, blastx,
@@ -695,11 +701,13 @@ class ArgsContainer(object):
                        terminator_fuzzy_out_sRNA, ignore_hypothetical_protein,
                        TSS_source, min_utr_coverage, promoter_tables,
                        ranking_promoter, promoter_name, compute_sec_str,
-                       len_u, num_u, mut_u, ex_srna):
+                       len_u, num_u, mut_u, ex_srna, threads,
+                       blast_tabular):
         self.rnafold = rnafold
         self.ex_srna = ex_srna
         self.compute_sec_str = compute_sec_str
         self.para_blast = para_blast
+        self.blast_tabular = blast_tabular
         self.relplot_pl = relplot_pl
         self.mountain_pl = mountain_pl
         self.blastx = blastx
@@ -817,6 +825,7 @@ class ArgsContainer(object):
             sys.exit()
         self.rank_promoter = ranking_promoter
         self.promoter_name = promoter_name
+        self.threads = threads
         self = self._parser_combine_wigs("srna")
         return self
 
@@ -940,7 +949,7 @@ class ArgsContainer(object):
                        fuzzy_rbs, rbs_not_after_TSS, print_all_combination,
                        best_no_sRNA, best_no_TSS, ignore_hypothetical_protein,
                        min_rbs_distance, max_rbs_distance, extend_3, extend_5,
-                       multi_stop):
+                       multi_stop, threads):
         self.multi_stop = multi_stop
         self.out_folder = sorf_folder
         self.rbs_seq = rbs_seq
@@ -997,6 +1006,7 @@ class ArgsContainer(object):
         self.hypo = ignore_hypothetical_protein
         self.min_rbs = min_rbs_distance
         self.max_rbs = max_rbs_distance
+        self.threads = threads
         self = self._parser_combine_wigs("sorf")
         return self
 
@@ -1155,7 +1165,8 @@ class ArgsContainer(object):
     def container_operon(self, TSS_files, annotation_files,
                          transcript_files,
                          term_files, TSS_fuzzy, term_fuzzy, min_length,
-                         operon_output_folder, operon_statistics_folder):
+                         operon_output_folder, operon_statistics_folder,
+                         threads):
         self.tsss = self._gen_copy_new_folder(
                 [".gff"], operon_output_folder, "tmp_tss",
                 TSS_files, ["--tss_files"])
@@ -1173,12 +1184,14 @@ class ArgsContainer(object):
         self.length = min_length
         self.output_folder = operon_output_folder
         self.stat_folder = operon_statistics_folder
+        self.threads = threads
         return self
 
     def container_snp(self, samtools_path, bcftools_path, bam_type,
                       program, fasta_files, bam_files,
                       quality, read_depth_range, snp_output_folder,
-                      indel_fraction, chrom, rg, caller, filters, DP4_cutoff):
+                      indel_fraction, chrom, rg, caller, filters, DP4_cutoff,
+                      threads, region_size, max_combination):
         self.samtools_path = samtools_path
         self.bcftools_path = bcftools_path
         self.types = bam_type
@@ -1203,6 +1216,9 @@ class ArgsContainer(object):
         self.filters = filters
         self.dp4_sum = DP4_cutoff.split(",")[0]
         self.dp4_frac = DP4_cutoff.split(",")[-1]
+        self.threads = threads
+        self.region_size = region_size
+        self.max_combination = max_combination
         return self
 
     def container_circrna(self, process, fasta_files, annotation_files,
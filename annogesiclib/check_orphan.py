@@ -1,7 +1,7 @@
 import os
 from annogesiclib.helper import Helper
 from annogesiclib.gff3 import Gff3Parser
-from annogesiclib.parser_wig import WigParser
+from annogesiclib.coverage_store import load_coverage
 
 
 def read_gff(gff_file, features):
@@ -83,15 +83,11 @@ def detect_coverage(wigs, tss, ref):
                 if ((tss.start + 1) <= len(wig)) and (
                         (ref.start + 1) <= len(wig)):
                     if tss.strand == "+":
-                        diff_t = (wig[tss.start - 1]["coverage"] -
-                                  wig[tss.start - 2]["coverage"])
-                        diff_r = (wig[ref.start - 1]["coverage"] -
-                                  wig[ref.start - 2]["coverage"])
+                        diff_t = (wig[tss.start - 1] - wig[tss.start - 2])
+                        diff_r = (wig[ref.start - 1] - wig[ref.start - 2])
                     else:
-                        diff_t = (wig[tss.start - 1]["coverage"] -
-                                  wig[tss.start]["coverage"])
-                        diff_r = (wig[ref.start - 1]["coverage"] -
-                                  wig[ref.start]["coverage"])
+                        diff_t = (wig[tss.start - 1] - wig[tss.start])
+                        diff_r = (wig[ref.start - 1] - wig[ref.start])
                     tss_cover = tss_cover + diff_t
                     ref_cover = ref_cover + diff_r
     return tss_cover, ref_cover
@@ -221,19 +217,8 @@ def fix_primary_type(tsss, wigs_f, wigs_r):
 
 def read_wig(filename, strand):
     wigs = {}
-    wig_parser = WigParser()
     if filename:
-        wig_fh = open(filename)
-        for entry in wig_parser.parser(wig_fh, strand):
-            if entry.strain not in wigs.keys():
-                strain = entry.strain
-                wigs[strain] = {}
-            if entry.track not in wigs[strain].keys():
-                wigs[strain][entry.track] = []
-            wigs[strain][entry.track].append({
-                 "pos": entry.pos, "coverage": entry.coverage,
-                 "strand": entry.strand})
-        wig_fh.close()
+        wigs = load_coverage(filename, strand)
     return wigs
 
 
@@ -1,14 +1,14 @@
 import os
 import sys
-import time
 import shutil
 import copy
 from glob import glob
-from subprocess import call, Popen
+from subprocess import call
 from annogesiclib.multiparser import Multiparser
 from annogesiclib.helper import Helper
 from annogesiclib.converter import Converter
 from annogesiclib.circRNA import detect_circrna
+from annogesiclib.parallel import CommandPool
 
 
 class CircRNADetection(object):
@@ -32,22 +32,6 @@ class CircRNADetection(object):
                       "trans": "transrealigned"}
         self.fasta_path = os.path.join(args_circ.fastas, "tmp")
 
-    def _wait_process(self, processes):
-        '''wait for the parallels to finish the process'''
-        for p in processes:
-            p.wait()
-            if p.stdout:
-                p.stdout.close()
-            if p.stdin:
-                p.stdin.close()
-            if p.stderr:
-                p.stderr.close()
-            try:
-                p.kill()
-            except OSError:
-                pass
-            time.sleep(5)
-
     def _deal_zip_file(self, read_files, log):
         tmp_datas = []
         tmp_reads = []
@@ -100,22 +84,18 @@ class CircRNADetection(object):
               "-x", os.path.join(fasta_path, index),
               "-d", os.path.join(fasta_path, fasta)])
 
-    def _run_segemehl_align(self, args_circ, index, fasta, read,
+    def _run_segemehl_align(self, pool, args_circ, index, fasta, read,
                             sam_file, log_file, fasta_prefix, log):
-        out = open(os.path.join(self.alignment_path,
-                   fasta_prefix, sam_file), "w")
-        log = open(os.path.join(self.alignment_path,
-                   fasta_prefix, log_file), "w")
-        log.write(" ".join([args_circ.segemehl_path,
-                   "-i", os.path.join(self.fasta_path, index),
-                   "-d", os.path.join(self.fasta_path, fasta),
-                   "-q", read, "-S"]) + "\n")
-        p = Popen([args_circ.segemehl_path,
+        command = [args_circ.segemehl_path,
                    "-i", os.path.join(self.fasta_path, index),
                    "-d", os.path.join(self.fasta_path, fasta),
-                   "-q", read, "-S"],
-                  stdout=out, stderr=log)
-        return p
+                   "-q", read, "-S"]
+        log.write(" ".join(command) + "\n")
+        pool.submit(command, stdout=os.path.join(
+                        self.alignment_path, fasta_prefix, sam_file),
+                    stderr=os.path.join(
+                        self.alignment_path, fasta_prefix, log_file),
+                    name=sam_file)
 
     def _align(self, args_circ, read_datas, log):
         '''align the read. if the bam files are provided, it can be skipped.'''
@@ -123,12 +103,11 @@ class CircRNADetection(object):
         align_files = []
         log.write("Using segemehl to align the read.\n")
         log.write("Please make sure the version of segemehl is at least 0.1.9.\n")
+        pool = CommandPool(args_circ.cores, log)
         for fasta in os.listdir(self.fasta_path):
             index = fasta.replace(".fa", ".idx")
             self._run_segemehl_fasta_index(args_circ.segemehl_path,
                                            self.fasta_path, index, fasta, log)
-            processes = []
-            num_process = 0
             fasta_prefix = fasta.replace(".fa", "")
             prefixs.append(fasta_prefix)
             self.helper.check_make_folder(os.path.join(
@@ -136,7 +115,6 @@ class CircRNADetection(object):
             log.write("Running for {0}.\n".format(fasta_prefix))
             for reads in read_datas:
                 for read in reads["files"]:
-                    num_process += 1
                     read_name = read.split("/")[-1]
                     if read_name.endswith(".fa") or \
                        read_name.endswith(".fna") or \
@@ -149,15 +127,12 @@ class CircRNADetection(object):
                         log_file = "_".join([read_prefix, fasta_prefix + ".log"])
                         align_files.append("_".join([read_prefix, fasta_prefix]))
                         print("Mapping {0}".format(sam_file))
-                        p = self._run_segemehl_align(
-                                args_circ, index, fasta, read,
+                        self._run_segemehl_align(
+                                pool, args_circ, index, fasta, read,
                                 sam_file, log_file, fasta_prefix, log)
-                        processes.append(p)
-                        if num_process == args_circ.cores:
-                            self._wait_process(processes)
-                            num_process = 0
-                self._wait_process(processes)
-            log.write("Done!\n")
+        pool.join()
+        log.write("Done!\n")
+        for fasta_prefix in prefixs:
             log.write("The following files are generated in {0}:\n".format(
                   os.path.join(self.alignment_path, fasta_prefix)))
             for file_ in os.listdir(os.path.join(
@@ -2,31 +2,6 @@ import os
 import sys
 from annogesiclib.projectcreator import ProjectCreator
 from annogesiclib.paths import Paths
-from annogesiclib.get_input import get_file
-from annogesiclib.converter import Converter
-from annogesiclib.get_target_fasta import TargetFasta
-from annogesiclib.ratt import RATT
-from annogesiclib.tsspredator import TSSpredator
-from annogesiclib.optimize import optimize_tss
-from annogesiclib.color_png import ColorPNG
-from annogesiclib.terminator import Terminator
-from annogesiclib.transcript import TranscriptDetection
-from annogesiclib.utr import UTRDetection
-from annogesiclib.srna import sRNADetection
-from annogesiclib.sorf import sORFDetection
-from annogesiclib.meme import MEME
-from annogesiclib.operon import OperonDetection
-from annogesiclib.circrna import CircRNADetection
-from annogesiclib.goterm import GoTermFinding
-from annogesiclib.srna_target import sRNATargetPrediction
-from annogesiclib.snp import SNPCalling
-from annogesiclib.ppi import PPINetwork
-from annogesiclib.sublocal import SubLocal
-from annogesiclib.ribos import Ribos
-from annogesiclib.crispr import Crispr
-from annogesiclib.merge_feature import run_merge
-from annogesiclib.overlap import deal_overlap
-from annogesiclib.screen import Screen
 from annogesiclib.args_container import ArgsContainer
 from annogesiclib.helper import Helper
 project_creator = ProjectCreator()
@@ -164,6 +139,8 @@ class Controller(object):
 
     def get_input(self):
         """Download required files from website."""
+        from annogesiclib.get_input import get_file
+        from annogesiclib.converter import Converter
         print("Running get input files")
         log = open(os.path.join(self._paths.reference_input_folder, "log.txt"), "w")
         if self._args.ftp_path is None:
@@ -213,6 +190,7 @@ class Controller(object):
 
     def get_target_fasta(self):
         """Get target fasta"""
+        from annogesiclib.get_target_fasta import TargetFasta
         print("Running update genome fasta")
         project_creator.create_subfolders(
             self._paths.required_folders("get_target_fasta"))
@@ -230,6 +208,7 @@ class Controller(object):
 
     def ratt(self):
         """Run RATT to transfer annotation file from reference to target."""
+        from annogesiclib.ratt import RATT
         print("Running annotation transfer")
         project_creator.create_subfolders(
             self._paths.required_folders("get_target_fasta"))
@@ -278,6 +257,7 @@ class Controller(object):
 
     def tsspredator(self):
         """Run TSSpredator for predicting TSS candidates."""
+        from annogesiclib.tsspredator import TSSpredator
         if self._args.program.lower() == "tss":
             print("Running TSS prediction")
             project_creator.create_subfolders(
@@ -328,6 +308,7 @@ class Controller(object):
 
     def optimize(self):
         """opimize TSSpredator"""
+        from annogesiclib.optimize import optimize_tss
         if self._args.program.lower() == "tss":
             print("Running optimization of TSS prediction")
             project_creator.create_subfolders(
@@ -372,12 +353,13 @@ class Controller(object):
             self._args.condition_names, self._args.cluster,
             self._args.curated_sequence_length, self._args.parallels,
             self._args.program, self._args.replicate_tex,
-            self._args.steps)
+            self._args.steps, self._args.asynchronous)
         optimize_tss(args_ops, log)
         log.close()
 
     def color(self):
         """color the screenshots"""
+        from annogesiclib.color_png import ColorPNG
         print("Running png files coloring")
         if not os.path.exists(os.path.join(self._args.screenshot_folder,
                                            "screenshots")):
@@ -398,6 +380,7 @@ class Controller(object):
 
     def terminator(self):
         """Run TransTermHP and Gene converaged for detecting terminators"""
+        from annogesiclib.terminator import Terminator
         print("Running terminator prediction")
         project_creator.create_subfolders(
             self._paths.required_folders("terminator"))
@@ -430,13 +413,15 @@ class Controller(object):
             self._args.min_stem_length, self._args.max_stem_length,
             self._args.min_u_tail, self._args.miss_rate,
             self._args.mutation_u_tail, self._args.keep_multi_term,
-            self._args.window_size, self._args.window_shift)
+            self._args.window_size, self._args.window_shift,
+            self._args.threads)
         terminator = Terminator(args_term)
         terminator.run_terminator(args_term, log)
         log.close()
 
     def transcript(self):
         """Run Transcript detection"""
+        from annogesiclib.transcript import TranscriptDetection
         project_creator.create_subfolders(
             self._paths.required_folders("transcript"))
         log = open(os.path.join(self._paths.transcript_output_folder, "log.txt"), "w")
@@ -456,12 +441,13 @@ class Controller(object):
             self._args.tex_notex_libs, self._args.frag_libs,
             self._args.compare_feature_genome,
             self._args.terminator_files, self._args.terminator_tolerance,
-            self._args.max_length_distribution)
+            self._args.max_length_distribution, self._args.threads)
         transcript = TranscriptDetection(args_tran)
         transcript.run_transcript(args_tran, log)
 
     def utr_detection(self):
         """Run UTR detection."""
+        from annogesiclib.utr import UTRDetection
         print("Running UTR detection")
         project_creator.create_subfolders(self._paths.required_folders("utr"))
         log = open(os.path.join(self._paths.utr_folder, "log.txt"), "w")
@@ -476,7 +462,8 @@ class Controller(object):
                 self._args.terminator_tolerance, self._paths.utr_folder,
                 self._args.tss_source, self._args.base_5utr,
                 self._args.utr_length, self._args.base_3utr,
-                self._args.tolerance_3utr, self._args.tolerance_5utr)
+                self._args.tolerance_3utr, self._args.tolerance_5utr,
+                self._args.threads)
         utr = UTRDetection(args_utr)
         utr.run_utr_detection(args_utr, log)
 
@@ -512,6 +499,7 @@ class Controller(object):
 
     def srna_detection(self):
         """sRNA_detection."""
+        from annogesiclib.srna import sRNADetection
         print("Running sRNA prediction")
         project_creator.create_subfolders(self._paths.required_folders("srna"))
         log = open(os.path.join(self._paths.srna_folder, "log.txt"), "w")
@@ -627,12 +615,14 @@ class Controller(object):
                 self._args.ranking_time_promoter, self._args.promoter_names,
                 self._args.compute_sec_structures, self._args.search_poly_u,
                 self._args.min_u_poly_u, self._args.mutation_poly_u,
-                self._args.exclude_srna_in_annotation_file)
+                self._args.exclude_srna_in_annotation_file,
+                self._args.threads, self._args.blast_tabular)
         srna = sRNADetection(args_srna)
         srna.run_srna_detection(args_srna, log)
 
     def sorf_detection(self):
         """sORF_detection."""
+        from annogesiclib.sorf import sORFDetection
         print("Running sORF prediction")
         project_creator.create_subfolders(
             self._paths.required_folders("sorf"))
@@ -666,12 +656,13 @@ class Controller(object):
             self._args.ignore_hypothetical_protein,
             self._args.min_rbs_distance, self._args.max_rbs_distance,
             self._args.tolerance_3end, self._args.tolerance_5end,
-            self._args.contain_multi_stop)
+            self._args.contain_multi_stop, self._args.threads)
         sorf = sORFDetection(args_sorf)
         sorf.run_sorf_detection(args_sorf, log)
 
     def meme(self):
         """promoter detectopn"""
+        from annogesiclib.meme import MEME
         print("Running promoter detection")
         project_creator.create_subfolders(
             self._paths.required_folders("promoter"))
@@ -702,6 +693,7 @@ class Controller(object):
 
     def operon(self):
         """operon detection"""
+        from annogesiclib.operon import OperonDetection
         print("Running operon detection")
         project_creator.create_subfolders(
             self._paths.required_folders("operon"))
@@ -716,12 +708,13 @@ class Controller(object):
             self._args.transcript_files, self._args.terminator_files,
             self._args.tss_tolerance, self._args.terminator_tolerance,
             self._args.min_length, self._paths.operon_output_folder,
-            self._paths.operon_statistics_folder)
+            self._paths.operon_statistics_folder, self._args.threads)
         operon = OperonDetection(args_op)
         operon.run_operon(args_op, log)
 
     def circrna(self):
         """circRNA detection"""
+        from annogesiclib.circrna import CircRNADetection
         print("Running circular RNA prediction")
         project_creator.create_subfolders(
             self._paths.required_folders("circrna"))
@@ -750,6 +743,7 @@ class Controller(object):
 
     def goterm(self):
         """Go term discovery"""
+        from annogesiclib.goterm import GoTermFinding
         print("Running GO term mapping")
         project_creator.create_subfolders(
             self._paths.required_folders("go_term"))
@@ -770,6 +764,7 @@ class Controller(object):
 
     def srna_target(self):
         """sRNA target prediction"""
+        from annogesiclib.srna_target import sRNATargetPrediction
         print("Running sRNA target prediction")
         project_creator.create_subfolders(
             self._paths.required_folders("srna_target"))
@@ -823,6 +818,7 @@ class Controller(object):
 
     def snp(self):
         """SNP transcript detection"""
+        from annogesiclib.snp import SNPCalling
         print("Running SNP/mutations calling")
         project_creator.create_subfolders(self._paths.required_folders("snp"))
         log = open(os.path.join(self._paths.snp_output_folder,
@@ -854,12 +850,15 @@ class Controller(object):
             self._args.quality, self._args.read_depth_range,
             self._paths.snp_output_folder, self._args.indel_fraction,
             self._args.ploidy, self._args.rg_tag, self._args.caller,
-            self._args.filter_tag_info, self._args.dp4_cutoff)
+            self._args.filter_tag_info, self._args.dp4_cutoff,
+            self._args.threads, self._args.region_size,
+            self._args.max_combination)
         snp = SNPCalling(args_snp)
         snp.run_snp_calling(args_snp, log)
 
     def ppi(self):
         """PPI network retrieve"""
+        from annogesiclib.ppi import PPINetwork
         project_creator.create_subfolders(
             self._paths.required_folders("ppi_network"))
         log = open(os.path.join(self._paths.ppi_output_folder,
@@ -880,6 +879,7 @@ class Controller(object):
 
     def sublocal(self):
         """Subcellular Localization prediction"""
+        from annogesiclib.sublocal import SubLocal
         print("Running subcellular localization prediction")
         project_creator.create_subfolders(
             self._paths.required_folders("subcellular_localization"))
@@ -906,6 +906,7 @@ class Controller(object):
 
     def ribos(self):
         """riboswitch and RNA thermometer prediction"""
+        from annogesiclib.ribos import Ribos
         print("Running riboswitch and RNA thermometer prediction")
         log_t = None
         log_r = None
@@ -976,6 +977,7 @@ class Controller(object):
 
     def crispr(self):
         """CRISPR prediction"""
+        from annogesiclib.crispr import Crispr
         print("Running CRISPR prediction")
         project_creator.create_subfolders(
             self._paths.required_folders("crispr"))
@@ -997,6 +999,8 @@ class Controller(object):
 
     def merge(self):
         """Merge all features"""
+        from annogesiclib.merge_feature import run_merge
+        from annogesiclib.overlap import deal_overlap
         print("Merging all features to one gff file")
         merge_folder = os.path.join(self._paths.output_folder,
                                     "merge_all_features")
@@ -1015,6 +1019,7 @@ class Controller(object):
 
     def screen(self):
         """generate screenshot"""
+        from annogesiclib.screen import Screen
         print("Running screenshot generation")
         out_folder = os.path.join(self._args.output_folder, "screenshots")
         if os.path.exists(out_folder):
@@ -5,6 +5,7 @@ from collections import defaultdict
 from annogesiclib.gff3 import Gff3Parser, Gff3Entry
 from annogesiclib.TSSpredator import TSSPredatorReader
 from annogesiclib.helper import Helper
+from annogesiclib.genome_store import read_seq
 
 
 class Converter(object):
@@ -73,7 +74,6 @@ class Converter(object):
     def _read_file(self, gff_file, fasta_file, rnas, cdss, genes):
         num_cds = 0
         num_rna = 0
-        seq = ""
         g_f = open(gff_file, "r")
         for entry in self.gff3parser.entries(g_f):
             if (entry.feature == "rRNA") or (entry.feature == "tRNA"):
@@ -88,12 +88,7 @@ class Converter(object):
         if fasta_file == "0":
             seq = "-1"
         else:
-            with open(fasta_file, "r") as f_f:
-                for line in f_f:
-                    line = line.strip()
-                    if len(line) != 0:
-                        if line[0] != ">":
-                            seq = seq + line
+            seq = read_seq(fasta_file)
         return (num_cds, num_rna, seq)
 
     def _srna2rntptt(self, srna_input_file, srna_output_file, srnas, length):
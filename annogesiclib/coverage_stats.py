@@ -0,0 +1,196 @@
+import weakref
+import numpy as np
+
+
+_CHUNK = 256
+
+
+class CoverageStats(object):
+    '''Range statistics (total, highest and lowest coverage) of one
+    coverage array. The array is split to blocks; the sums of the blocks
+    are accumulated and the highest/lowest coverages of the blocks are
+    stored in sparse tables, so a query only needs to look at two partial
+    blocks at most. Ranges are half-open indices of the array [start, end).
+    The tables have about log2(n / block_size) levels of n / block_size
+    values, in the precision of the coverage array (float32 for the
+    coverage stores). With the default block size, the tables of a 5 Mb
+    float32 track take about 1 MB, 5% of the 20 MB track. tables can be
+    assigned to reuse the tables of the same array.'''
+
+    def __init__(self, covers, block_size=512, tables=None):
+        self.covers = np.asarray(covers)
+        if tables is None:
+            tables = self._build_tables(block_size)
+        self.block_size, self.sums, self.highs, self.lows = tables
+
+    def tables(self):
+        return self.block_size, self.sums, self.highs, self.lows
+
+    def _build_tables(self, block_size):
+        num_block = len(self.covers) // block_size
+        blocks = self.covers[:num_block * block_size].reshape(
+            num_block, block_size)
+        dtype = np.result_type(self.covers.dtype, np.float32)
+        sums = np.concatenate([[0.0], np.cumsum(
+            blocks.sum(axis=1, dtype=np.float64))])
+        highs = [blocks.max(axis=1).astype(dtype)] if num_block != 0 else []
+        lows = [blocks.min(axis=1).astype(dtype)] if num_block != 0 else []
+        level = 1
+        while (2 ** level) <= num_block:
+            half = 2 ** (level - 1)
+            highs.append(np.maximum(highs[-1][:-half], highs[-1][half:]))
+            lows.append(np.minimum(lows[-1][:-half], lows[-1][half:]))
+            level += 1
+        return block_size, sums, highs, lows
+
+    def _clip(self, start, end):
+        start = min(max(start, 0), len(self.covers))
+        end = min(max(end, start), len(self.covers))
+        return start, end
+
+    def query(self, start, end):
+        '''return the total, highest and lowest coverage of the range.
+        The highest and lowest coverage are None if the range is empty'''
+        start, end = self._clip(start, end)
+        if start == end:
+            return 0.0, None, None
+        first = -(-start // self.block_size)
+        last = end // self.block_size
+        if last - first < 1:
+            covers = self.covers[start: end]
+            return covers.sum(dtype=np.float64), covers.max(), covers.min()
+        level = int(np.log2(last - first))
+        total = self.sums[last] - self.sums[first]
+        high = max(self.highs[level][first],
+                   self.highs[level][last - 2 ** level])
+        low = min(self.lows[level][first],
+                  self.lows[level][last - 2 ** level])
+        for covers in (self.covers[start: first * self.block_size],
+                       self.covers[last * self.block_size: end]):
+            if len(covers) != 0:
+                total += covers.sum(dtype=np.float64)
+                high = max(high, covers.max())
+                low = min(low, covers.min())
+        return total, high, low
+
+    def _partial(self, starts, ends, width, totals, highs, lows):
+        '''add the coverages of the short ranges (shorter than width) to
+        the statistics. The ranges are gathered in chunks, so only the
+        gathered coverages are converted to float64'''
+        for index in range(0, len(starts), _CHUNK):
+            part = slice(index, index + _CHUNK)
+            indices = starts[part, None] + np.arange(width)[None, :]
+            masks = indices < ends[part, None]
+            covers = self.covers[np.minimum(
+                indices, len(self.covers) - 1)].astype(np.float64)
+            totals[part] += np.where(masks, covers, 0).sum(axis=1)
+            highs[part] = np.maximum(highs[part], np.where(
+                masks, covers, -np.inf).max(axis=1))
+            lows[part] = np.minimum(lows[part], np.where(
+                masks, covers, np.inf).min(axis=1))
+
+    def batch(self, starts, ends):
+        '''the total, highest and lowest coverage of many ranges in one
+        vectorized call. The highest and lowest coverage of the empty
+        ranges are nan'''
+        starts = np.clip(np.asarray(starts, dtype=np.int64), 0,
+                         len(self.covers))
+        ends = np.clip(np.asarray(ends, dtype=np.int64), starts,
+                       len(self.covers))
+        totals = np.zeros(len(starts))
+        highs = np.full(len(starts), -np.inf)
+        lows = np.full(len(starts), np.inf)
+        if len(self.covers) == 0:
+            return totals, np.full(len(starts), np.nan), \
+                np.full(len(starts), np.nan)
+        firsts = -(-starts // self.block_size)
+        lasts = ends // self.block_size
+        fulls = lasts > firsts
+        lefts = np.where(fulls, firsts * self.block_size, ends)
+        rights = np.where(fulls, lasts * self.block_size, ends)
+        self._partial(starts, lefts, 2 * self.block_size, totals, highs, lows)
+        self._partial(rights, ends, self.block_size, totals, highs, lows)
+        if fulls.any():
+            lens = np.where(fulls, lasts - firsts, 1)
+            levels = np.floor(np.log2(lens)).astype(np.int64)
+            for level in np.unique(levels[fulls]):
+                targets = fulls & (levels == level)
+                first = firsts[targets]
+                last = lasts[targets] - 2 ** level
+                totals[targets] += (self.sums[lasts[targets]] -
+                                    self.sums[first])
+                highs[targets] = np.maximum(highs[targets], np.maximum(
+                    self.highs[level][first], self.highs[level][last]))
+                lows[targets] = np.minimum(lows[targets], np.minimum(
+                    self.lows[level][first], self.lows[level][last]))
+        empties = ends <= starts
+        highs[empties] = np.nan
+        lows[empties] = np.nan
+        return totals, highs, lows
+
+
+_TABLES = {}
+
+
+def get_stats(covers):
+    '''the CoverageStats of the coverage array. The tables are computed
+    once for every array and reused by the later queries. The cache does
+    not keep the array alive; the tables are removed when the array (for
+    example, the tracks of a wig dict) is released'''
+    key = id(covers)
+    if key in _TABLES.keys():
+        return CoverageStats(covers, tables=_TABLES[key])
+    stats = CoverageStats(covers)
+    try:
+        weakref.finalize(covers, _TABLES.pop, key, None)
+    except TypeError:
+        return stats
+    _TABLES[key] = stats.tables()
+    return stats
+
+
+def feature_range(start, end, strand, length):
+    '''the index range [start, end) of the coverage array which is
+    compared with the feature in the coverage detection of sRNA and sORF'''
+    if strand == "+":
+        return max(start, 0), max(min(end + 1, length), max(start, 0))
+    return max(start - 1, 0), max(min(end, length), max(start - 1, 0))
+
+
+def high_low(covers, start, end, strand):
+    '''the highest coverage and the lowest coverage after the highest one
+    in the direction of the strand, in the range [start, end) of the
+    array (as coverage_detection.coverage_comparison). The indices of the
+    highest and lowest coverage are returned as well'''
+    covers = np.asarray(covers[start: end])
+    if len(covers) == 0:
+        return None, None, None, None
+    if strand == "-":
+        covers = covers[::-1]
+    high_index = int(np.argmax(covers))
+    low_index = high_index + int(np.argmin(covers[high_index:]))
+    high = covers[high_index]
+    low = covers[low_index]
+    if strand == "-":
+        return high, end - 1 - high_index, low, end - 1 - low_index
+    return high, start + high_index, low, start + low_index
+
+
+def coverage_matrix(libs, starts, ends, type_):
+    '''the coverage of the ranges in every library as a (range x library)
+    matrix. libs is the list of the coverage arrays and type_ is one of
+    "total", "average", "high" or "low"'''
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    matrix = np.zeros((len(starts), len(libs)))
+    for index, covers in enumerate(libs):
+        totals, highs, lows = get_stats(covers).batch(starts, ends)
+        if type_ == "total":
+            matrix[:, index] = totals
+        elif type_ == "average":
+            matrix[:, index] = totals / np.maximum(ends - starts, 1)
+        elif type_ == "high":
+            matrix[:, index] = highs
+        elif type_ == "low":
+            matrix[:, index] = lows
+    return matrix
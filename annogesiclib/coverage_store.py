@@ -0,0 +1,160 @@
+import os
+import json
+import shutil
+import struct
+import hashlib
+import tempfile
+from multiprocessing import util
+import numpy as np
+from annogesiclib.parser_wig import WigParser
+
+
+MAGIC = b"ANNOCOV1"
+DTYPE = np.float32
+_RUN_STORE = {"folder": None}
+
+
+def store_folder():
+    '''the folder of the binary stores. The stores are not put into the
+    wig folders, because the wig folders are scanned by other steps.
+    If ANNOGESIC_COVERAGE_STORE is not assigned, the stores are only
+    kept during the run: a temporary folder is created and it is
+    removed when the process which created it exits'''
+    if "ANNOGESIC_COVERAGE_STORE" in os.environ.keys():
+        return os.environ["ANNOGESIC_COVERAGE_STORE"]
+    folder = _RUN_STORE["folder"]
+    if (folder is None) or (not os.path.isdir(folder)):
+        folder = tempfile.mkdtemp(prefix="annogesic_coverage_store_")
+        util.Finalize(None, shutil.rmtree, args=(folder, True),
+                      exitpriority=0)
+        _RUN_STORE["folder"] = folder
+    return folder
+
+
+def store_name(wig_file, strand):
+    '''the path of the binary coverage store which belongs to the wig'''
+    if strand == "+":
+        strand_name = "forward"
+    else:
+        strand_name = "reverse"
+    key = hashlib.sha1(os.path.abspath(wig_file).encode("utf-8")).hexdigest()
+    return os.path.join(store_folder(), "_".join([key, strand_name]) + ".cov")
+
+
+def _source_stamp(wig_file):
+    stat = os.stat(wig_file)
+    return {"path": os.path.abspath(wig_file),
+            "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def _read_header(store_file):
+    with open(store_file, "rb") as s_h:
+        if s_h.read(len(MAGIC)) != MAGIC:
+            return None, 0
+        head_len = struct.unpack("<Q", s_h.read(8))[0]
+        header = json.loads(s_h.read(head_len).decode("utf-8"))
+    data_start = len(MAGIC) + 8 + head_len
+    data_start += (-data_start) % np.dtype(DTYPE).itemsize
+    return header, data_start
+
+
+def _is_fresh(wig_file, strand, store_file):
+    if not os.path.exists(store_file):
+        return False
+    try:
+        header, data_start = _read_header(store_file)
+    except (OSError, ValueError, struct.error):
+        return False
+    return ((header is not None) and (header["strand"] == strand) and (
+        header["source"] == _source_stamp(wig_file)))
+
+
+def _parse_wig(wig_file, strand):
+    '''parse the wig once and keep the coverage of
+    every strain and track as compact float array'''
+    covers = {}
+    wig_parser = WigParser()
+    with open(wig_file, "r") as wig_fh:
+        for strain, track, cover in wig_parser.parser_array(wig_fh, strand):
+            cover = cover.astype(DTYPE)
+            if strain not in covers.keys():
+                covers[strain] = {}
+            if track not in covers[strain].keys():
+                covers[strain][track] = cover
+            else:
+                pre_cover = covers[strain][track]
+                if len(pre_cover) < len(cover):
+                    pre_cover, cover = cover, pre_cover
+                pre_cover[:len(cover)] += cover
+                covers[strain][track] = pre_cover
+    return covers
+
+
+def write_store(wig_file, strand, covers, store_file):
+    '''write the binary store. The store is composed of a small
+    JSON index header and one float32 array per strain/track'''
+    index = []
+    offset = 0
+    for strain, tracks in covers.items():
+        for track, cover in tracks.items():
+            index.append({"strain": strain, "track": track,
+                          "offset": offset, "length": len(cover)})
+            offset += len(cover)
+    header = json.dumps({"strand": strand,
+                         "source": _source_stamp(wig_file),
+                         "tracks": index}).encode("utf-8")
+    if not os.path.exists(os.path.dirname(store_file)):
+        os.makedirs(os.path.dirname(store_file), exist_ok=True)
+    tmp_file = "".join([store_file, ".", str(os.getpid()), ".tmp"])
+    with open(tmp_file, "wb") as s_h:
+        s_h.write(MAGIC)
+        s_h.write(struct.pack("<Q", len(header)))
+        s_h.write(header)
+        s_h.write(b"\0" * ((-s_h.tell()) % np.dtype(DTYPE).itemsize))
+        for tracks in covers.values():
+            for cover in tracks.values():
+                cover.tofile(s_h)
+    os.replace(tmp_file, store_file)
+
+
+def convert_wig(wig_file, strand, store_file=None):
+    '''convert the wig file to binary store'''
+    if store_file is None:
+        store_file = store_name(wig_file, strand)
+    covers = _parse_wig(wig_file, strand)
+    write_store(wig_file, strand, covers, store_file)
+    return store_file
+
+
+def open_store(store_file):
+    '''open the binary store by numpy.memmap. The arrays are
+    copy-on-write, modification will not touch the file'''
+    header, data_start = _read_header(store_file)
+    wigs = {}
+    total = sum([track["length"] for track in header["tracks"]])
+    if total == 0:
+        datas = np.zeros(0, dtype=DTYPE)
+    else:
+        datas = np.memmap(store_file, dtype=DTYPE, mode="c",
+                          offset=data_start, shape=(total,))
+    for track in header["tracks"]:
+        if track["strain"] not in wigs.keys():
+            wigs[track["strain"]] = {}
+        wigs[track["strain"]][track["track"]] = datas[
+            track["offset"]: track["offset"] + track["length"]]
+    return wigs
+
+
+def load_coverage(wig_file, strand):
+    '''get the coverage of the wig file as {strain: {track: array}}.
+    The wig file is only parsed if its binary store is missing
+    or outdated, otherwise the store is mapped directly'''
+    store_file = store_name(wig_file, strand)
+    if _is_fresh(wig_file, strand, store_file):
+        return open_store(store_file)
+    covers = _parse_wig(wig_file, strand)
+    try:
+        write_store(wig_file, strand, covers, store_file)
+    except OSError:
+        return covers
+    return open_store(store_file)
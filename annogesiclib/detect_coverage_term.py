@@ -4,6 +4,7 @@ import os
 from annogesiclib.gff3 import Gff3Parser
 from annogesiclib.coverage_detection import coverage_comparison, check_tex, get_repmatch
 from annogesiclib.lib_reader import read_libs, read_wig
+from annogesiclib.genome_store import GenomeStore
 
 
 def import_data(row):
@@ -478,7 +479,6 @@ def read_data(gff_file, tran_file, tranterm_file, seq_file, term_table):
     tas = []
     hps = []
     fr_terms = []
-    seq = {}
     new_terms = []
     for entry in gff_parser.entries(open(gff_file)):
         if (entry.feature == "gene"):
@@ -489,14 +489,7 @@ def read_data(gff_file, tran_file, tranterm_file, seq_file, term_table):
     if os.path.exists(tranterm_file):
         for entry in gff_parser.entries(open(tranterm_file)):
             hps.append(entry)
-    with open(seq_file, "r") as s_f:
-        for line in s_f:
-            line = line.strip()
-            if line.startswith(">"):
-                strain = line[1:]
-                seq[strain] = ""
-            else:
-                seq[strain] = seq[strain] + line
+    seq = GenomeStore(seq_file)
     if os.path.exists(term_table):
         term_f = open(term_table, "r")
         for row in csv.reader(term_f, delimiter="\t"):
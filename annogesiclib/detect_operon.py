@@ -1,6 +1,7 @@
 import math
 from annogesiclib.gff3 import Gff3Parser
 from annogesiclib.helper import Helper
+from annogesiclib.interval_index import IntervalIndex
 
 
 def import_to_operon(start, end, strand):
@@ -68,6 +69,8 @@ def detect_features(ta, inputs, feature, term_fuzzy, tss_fuzzy):
     '''Detect the feature which should group as a operon'''
     features = {"num": 0, "detect": False}
     datas = []
+    if feature == "gene":
+        inputs = inputs.overlap(ta.seq_id, ta.strand, ta.start, ta.end)
     for data in inputs:
         if (feature == "term"):
             if ta.strand == "+":
@@ -307,13 +310,15 @@ def operon(ta_file, tss_file, gff_file, terminator_file, tss_fuzzy,
     num_operon = 0
     tas, gffs, tss_gffs, term_gffs = read_gff(ta_file, gff_file, tss_file,
                                               terminator_file)
+    gene_index = IntervalIndex([gff for gff in gffs if gff.feature == "gene"])
     for ta in tas:
         whole_gene = []
         check_operon = False
         if (math.fabs(ta.start - ta.end) >= min_length):
             whole_operon = ta
             check_operon = True
-        genes = detect_features(ta, gffs, "gene", term_fuzzy, tss_fuzzy)
+        genes = detect_features(ta, gene_index, "gene",
+                                term_fuzzy, tss_fuzzy)
         if len(tss_gffs) != 0:
             tsss = detect_features(ta, tss_gffs, "tss", term_fuzzy, tss_fuzzy)
         else:
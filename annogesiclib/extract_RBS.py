@@ -1,5 +1,6 @@
 from annogesiclib.gff3 import Gff3Parser
 from annogesiclib.helper import Helper
+from annogesiclib.genome_store import GenomeStore
 
 
 def get_feature(cds):
@@ -49,15 +50,7 @@ def read_file(seq_file, gff_file, tss_file, tran_file):
     cdss = []
     tsss = []
     trans = []
-    seq = {}
-    with open(seq_file, "r") as f_h:
-        for line in f_h:
-            line = line.strip()
-            if line.startswith(">"):
-                strain = line[1:]
-                seq[strain] = ""
-            else:
-                seq[strain] = seq[strain] + line
+    seq = GenomeStore(seq_file)
     g_h = open(gff_file)
     for entry in Gff3Parser().entries(g_h):
         if (entry.feature == "CDS"):
@@ -1,3 +1,5 @@
+import os
+import json
 from annogesiclib.gff3 import Gff3Parser
 
 
@@ -190,72 +192,240 @@ def get_whole_query(line, blast_f):
         return whole_line
 
 
+def _query_key(query):
+    '''the name of the query as get_whole_query and extract_blast'''
+    return query.split("=")[1].strip()
+
+
+def index_blast(blast_result):
+    '''read the blast report once and index the blocks of every query.
+    The key is the query name and the values are the byte ranges of the
+    blocks (from "Query=" to the next "Query=") of the query'''
+    index = {}
+    block = {"key": None, "query": None, "start": None}
+    offset = 0
+    with open(blast_result, "rb") as blast_f:
+        for line in blast_f:
+            text = line.decode("utf-8", "replace").strip()
+            if text.startswith("Query= "):
+                if block["key"] is not None:
+                    index.setdefault(block["key"], []).append(
+                        [block["start"], offset])
+                block = {"key": None, "query": text, "start": offset}
+            elif (block["query"] is not None) and (block["key"] is None):
+                block["query"] = block["query"] + text
+            if (block["key"] is None) and (block["query"] is not None) and (
+                    block["query"].endswith("+") or (
+                    block["query"].endswith("-"))):
+                block["key"] = _query_key(block["query"])
+            offset += len(line)
+    if block["key"] is not None:
+        index.setdefault(block["key"], []).append([block["start"], offset])
+    return index
+
+
+def _source_stamp(blast_result):
+    stat = os.stat(blast_result)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def load_blast_index(blast_result, index_file=None):
+    '''get the query index of the blast report. If index_file is
+    assigned, the index is stored in it and reused when the report is
+    not changed'''
+    if (index_file is not None) and os.path.exists(index_file):
+        try:
+            with open(index_file) as i_f:
+                datas = json.load(i_f)
+            if datas["source"] == _source_stamp(blast_result):
+                return datas["index"]
+        except (ValueError, KeyError):
+            pass
+    index = index_blast(blast_result)
+    if index_file is not None:
+        with open(index_file, "w") as i_f:
+            json.dump({"source": _source_stamp(blast_result),
+                       "index": index}, i_f)
+    return index
+
+
+def read_query_blocks(blast_f, ranges):
+    '''read the blocks of one query from the opened blast report'''
+    lines = []
+    for start, end in ranges:
+        blast_f.seek(start)
+        text = blast_f.read(end - start).decode("utf-8", "replace")
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        lines.extend(text.splitlines(True))
+    return iter(lines)
+
+
+def extract_query(blast_f, srna, database, out_f, out_t, score_s, score_n):
+    '''extract the hits of the sRNA from the lines of blast report'''
+    blasts = {"hit_num": 0, "blast": False, "name": ""}
+    names = []
+    prefix = "\t".join([srna.seq_id, srna.attributes["ID"],
+                        srna.strand, str(srna.start), str(srna.end)])
+    print_ = 0
+    for line in blast_f:
+        line = line.strip()
+        if line.startswith("Query= "):
+            if print_ == 2:
+                print_ = 0
+            elif print_ == 1:
+                print_ = 0
+                out_t.write("{0}\tNA\n".format(prefix))
+            line = get_whole_query(line, blast_f)
+            go_out = False
+            query = line.split("=")[1].strip()
+            if (query == ("|".join([
+                    srna.attributes["ID"], srna.seq_id,
+                    str(srna.start), str(srna.end), srna.strand]))):
+                for line in blast_f:
+                    line = line.strip()
+                    if line.find("No hits found") != -1:
+                        print_file(database, out_f,
+                                   srna.info, "NA", "NA")
+                        out_t.write("{0}\tNA\n".format(prefix))
+                        break
+                    elif line.find("Sequences producing "
+                                   "significant alignments:") != -1:
+                        for line in blast_f:
+                            line = line.strip()
+                            if len(line) != 0:
+                                if line.startswith(
+                                        "Effective search space"):
+                                    go_out = True
+                                    break
+                                if database == "sRNA":
+                                    p = detect_srna(
+                                        line, blast_f, out_t,
+                                        blasts, prefix, score_s)
+                                    if p:
+                                        print_ = p
+                                    if (len(blasts["name"]) > 0):
+                                        if blasts["name"] not in names:
+                                            names.append(
+                                                blasts["name"])
+                                elif database == "nr":
+                                    p = detect_nr(
+                                        line, blast_f, out_t, blasts,
+                                        prefix, score_n)
+                                    if p:
+                                        print_ = p
+                        gen_out_flie(blasts, out_t, prefix, out_f,
+                                     database, srna, names)
+                        blasts["hit_num"] = 0
+                        break
+                if go_out:
+                    break
+
+
 def extract_blast(blast_result, srna_file, output_file,
-                  output_table, database, score_s, score_n):
-    '''extract the result of blast'''
+                  output_table, database, score_s, score_n, index_file=None):
+    '''extract the result of blast. The report is indexed by query in
+    one pass, then only the blocks of each sRNA are read'''
     out_f = open(output_file, "w")
     out_t = open(output_table, "w")
     out_f.write("##gff-version 3\n")
     srnas = read_gff(srna_file, database)
+    index = load_blast_index(blast_result, index_file)
+    with open(blast_result, "rb") as blast_f:
+        for srna in srnas:
+            query = "|".join([srna.attributes["ID"], srna.seq_id,
+                              str(srna.start), str(srna.end), srna.strand])
+            if query in index.keys():
+                extract_query(read_query_blocks(blast_f, index[query]),
+                              srna, database, out_f, out_t, score_s, score_n)
+    out_f.close()
+    out_t.close()
+
+
+BLAST_TABLE_FORMAT = "6 qseqid sseqid evalue bitscore stitle"
+
+
+def is_hypothetical(name):
+    return ("hypothetical" in name) or ("Hypothetical" in name) or (
+            "unknown" in name) or ("Unknown" in name) or (
+            "predicted coding region" in name) or (
+            "Predicted coding region" in name) or (
+            "PREDICTED:" in name) or ("putative" in name) or (
+            "Putative" in name)
+
+
+def read_blast_table(blast_table):
+    '''read the tabular blast output (-outfmt BLAST_TABLE_FORMAT) and
+    store the hits by query. Only the best alignment of each subject is
+    kept and the hits of a query are sorted by e-value (the table of
+    the plus and minus strand may be merged)'''
+    hits = {}
+    with open(blast_table) as b_f:
+        for line in b_f:
+            line = line.rstrip("\n")
+            if (len(line) == 0) or line.startswith("#"):
+                continue
+            row = line.split("\t")
+            if len(row) < 5:
+                continue
+            query = row[0][4:] if row[0].startswith("lcl|") else row[0]
+            subjects = hits.setdefault(query, {})
+            if row[1] not in subjects.keys():
+                subjects[row[1]] = {"id": row[1], "e": row[2],
+                                    "score": row[3],
+                                    "title": "\t".join(row[4:]).strip()}
+    for query, subjects in hits.items():
+        hits[query] = sorted(subjects.values(),
+                             key=lambda k: (float(k["e"]), -float(k["score"])))
+    return hits
+
+
+def get_protein_info(hit):
+    '''the protein name (without the strain) and the tag of the hit
+    in nr database'''
+    title = hit["title"]
+    if title.startswith(hit["id"]):
+        title = title[len(hit["id"]):].strip()
+    name = title.split("[")[0].strip()
+    tags = [tag for tag in hit["id"].split("|") if len(tag) != 0]
+    return name, tags[-1]
+
+
+def extract_blast_table(blast_table, srna_file, output_file,
+                        output_table, database, score_s, score_n):
+    '''extract the result of the tabular blast output. The gff file and
+    the table are the same as extract_blast'''
+    out_f = open(output_file, "w")
+    out_t = open(output_table, "w")
+    out_f.write("##gff-version 3\n")
+    srnas = read_gff(srna_file, database)
+    hits = read_blast_table(blast_table)
+    score_cut = score_s if database == "sRNA" else score_n
     for srna in srnas:
-        blasts = {"hit_num": 0, "blast": False, "name": ""}
-        names = []
         prefix = "\t".join([srna.seq_id, srna.attributes["ID"],
-                           srna.strand, str(srna.start), str(srna.end)])
-        print_ = 0
-        with open(blast_result, "r") as blast_f:
-            for line in blast_f:
-                line = line.strip()
-                if line.startswith("Query= "):
-                    if print_ == 2:
-                        print_ = 0
-                    elif print_ == 1:
-                        print_ = 0
-                        out_t.write("{0}\tNA\n".format(prefix))
-                    line = get_whole_query(line, blast_f)
-                    go_out = False
-                    query = line.split("=")[1].strip()
-                    if (query == ("|".join([
-                            srna.attributes["ID"], srna.seq_id,
-                            str(srna.start), str(srna.end), srna.strand]))):
-                        for line in blast_f:
-                            line = line.strip()
-                            if line.find("No hits found") != -1:
-                                print_file(database, out_f,
-                                           srna.info, "NA", "NA")
-                                out_t.write("{0}\tNA\n".format(prefix))
-                                break
-                            elif line.find("Sequences producing "
-                                           "significant alignments:") != -1:
-                                for line in blast_f:
-                                    line = line.strip()
-                                    if len(line) != 0:
-                                        if line.startswith(
-                                                "Effective search space"):
-                                            go_out = True
-                                            break
-                                        if database == "sRNA":
-                                            p = detect_srna(
-                                                line, blast_f, out_t,
-                                                blasts, prefix, score_s)
-                                            if p:
-                                            	print_ = p
-                                            if (len(blasts["name"]) > 0):
-                                                if blasts["name"] not in names:
-                                                    names.append(
-                                                        blasts["name"])
-                                        elif database == "nr":
-                                            p = detect_nr(
-                                                line, blast_f, out_t, blasts,
-                                                prefix, score_n)
-                                            if p:
-                                                print_ = p
-                                gen_out_flie(blasts, out_t, prefix, out_f,
-                                             database, srna, names)
-                                blasts["hit_num"] = 0
-                                break
-                        if go_out:
-                            break
+                            srna.strand, str(srna.start), str(srna.end)])
+        query = "|".join([srna.attributes["ID"], srna.seq_id,
+                          str(srna.start), str(srna.end), srna.strand])
+        names = []
+        hit_num = 0
+        for hit in hits.get(query, []):
+            if (score_cut is not None) and (float(hit["score"]) < score_cut):
+                continue
+            if database == "sRNA":
+                out_t.write("{0}\t{1}\t{2}\t{3}\n".format(
+                    prefix, hit["title"], hit["e"], hit["score"]))
+                if hit["title"] not in names:
+                    names.append(hit["title"])
+            elif (database == "nr") and (hit_num < 3):
+                name, tag = get_protein_info(hit)
+                if not is_hypothetical(name):
+                    out_t.write("{0}\t{1}\t{2}\t{3}\t{4}\n".format(
+                        prefix, name, tag, hit["e"], hit["score"]))
+                    hit_num += 1
+        if (len(names) != 0) or (hit_num != 0):
+            print_file(database, out_f, srna.info, len(names), hit_num)
+        else:
+            out_t.write("{0}\tNA\n".format(prefix))
+            print_file(database, out_f, srna.info, "NA", "NA")
     out_f.close()
     out_t.close()
 
@@ -1,6 +1,7 @@
 import os
 import shutil
 import math
+import numpy as np
 from annogesiclib.gff3 import Gff3Parser
 
 
@@ -27,17 +28,49 @@ def compare_tss_pro(tars, refs, out, cluster):
                     break
 
 
+def read_table(input_file):
+    with open(input_file, "r") as f_h:
+        return Gff3Parser().table(f_h)
+
+
+def compare_tss_pro_table(tars, refs, out, cluster):
+    '''compare between TSS and processing site (as compare_tss_pro) by
+    the columnar tables. For each target, only the first reference
+    (sorted by start) which starts at least at start - cluster of the
+    same genome and strand is checked by binary search'''
+    ref_starts = {}
+    for index in refs.order():
+        key = (refs.seq_ids[refs.seq_id[index]],
+               refs.strands[refs.strand[index]])
+        ref_starts.setdefault(key, []).append(refs.start[index])
+    orders = tars.order()
+    keep = np.zeros(len(tars), dtype=bool)
+    for key, starts in ref_starts.items():
+        starts = np.array(starts, dtype=np.int64)
+        indices = orders[tars.mask(seq_id=key[0], strand=key[1])[orders]]
+        tar_starts = tars.start[indices]
+        points = np.searchsorted(starts, tar_starts - cluster, side="left")
+        founds = points < len(starts)
+        keep[indices[founds]] = (starts[points[founds]] - tar_starts[
+            founds]) > cluster
+    for index in orders:
+        if keep[index]:
+            out.write(tars.line(index) + "\n")
+
+
 def filter_tss_pro(tss_file, pro_file, feature, cluster):
     '''deal with the overlap of TSS and processing site'''
-    tsss = read_gff(tss_file)
-    pros = read_gff(pro_file)
+    tsss = read_table(tss_file)
+    pros = read_table(pro_file)
     out = open("tmp_filter", "w")
     out.write("##gff-version 3\n")
     if feature.lower() == "tss":
-        compare_tss_pro(pros, tsss, out, cluster)
+        compare_tss_pro_table(pros, tsss, out, cluster)
+        out.close()
         os.remove(pro_file)
         shutil.move("tmp_filter", pro_file)
     elif feature.lower() == "processing":
-        compare_tss_pro(tsss, pros, out, cluster)
+        compare_tss_pro_table(tsss, pros, out, cluster)
+        out.close()
         os.remove(tss_file)
         shutil.move("tmp_filter", tss_file)
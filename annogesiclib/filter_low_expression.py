@@ -1,5 +1,5 @@
-import math
 from annogesiclib.gff3 import Gff3Parser
+from annogesiclib.interval_index import IntervalIndex
 from annogesiclib.lib_reader import read_libs, read_wig
 
 
@@ -21,8 +21,8 @@ def get_coverage(tar, wigs):
         if tar.seq_id == strain:
             for tracks in conds.values():
                 for wigs in tracks.values():
-                    if coverage < wigs[tar.start - 1]["coverage"]:
-                        coverage = wigs[tar.start - 1]["coverage"]
+                    if coverage < wigs[tar.start - 1]:
+                        coverage = wigs[tar.start - 1]
     return coverage
 
 
@@ -40,18 +40,19 @@ def stat(tars, refs, cutoff, gene_length, cluster):
     stats = {"tp": 0, "fp": 0, "miss": 0, "fp_rate": 0,
              "tp_rate": 0, "miss_rate": 0}
     num_ref = 0
+    tar_index = IntervalIndex([
+        tar for tar in tars if (
+            float(tar.attributes["coverage"]) >= cutoff) and (
+            tar.start <= int(gene_length))])
     for ref in refs:
         num_ref += 1
         detect = False
-        for tar in tars:
-            if (ref.seq_id == tar.seq_id) and (
-                    ref.strand == tar.strand) and (
-                    float(tar.attributes["coverage"]) >= cutoff) and (
-                    tar.start <= int(gene_length)):
-                if math.fabs(ref.start - tar.start) <= cluster:
-                    stats["tp"] += 1
-                    tar.attributes["print"] = True
-                    detect = True
+        for tar in tar_index.start_within(ref.seq_id, ref.strand,
+                                          ref.start - cluster,
+                                          ref.start + cluster):
+            stats["tp"] += 1
+            tar.attributes["print"] = True
+            detect = True
         if not detect:
             stats["miss"] += 1
     for tar in tars:
@@ -1,8 +1,10 @@
 import os
 import sys
+import numpy as np
 from glob import glob
 from annogesiclib.gff3 import Gff3Parser
-from annogesiclib.parser_wig import WigParser
+from annogesiclib.coverage_store import load_coverage
+from annogesiclib.genome_store import GenomeStore
 
 
 def load_wigs(out, lib_t, lib_n, lib_f):
@@ -29,9 +31,9 @@ def set_data_range(out, gff, wigs, strand):
     for strains in wigs.values():
         for strain, wig_datas in strains.items():
             if strain == gff.seq_id:
-                for wig in wig_datas[(gff.start - 1): gff.end]:
-                    if max_range < wig.coverage:
-                        max_range = wig.coverage
+                covers = wig_datas[(gff.start - 1): gff.end]
+                if (len(covers) != 0) and (max_range < np.max(covers)):
+                    max_range = np.max(covers)
     max_range = int(max_range / 1) + 10
     if strand == "+":
         out.write("setDataRange 0,{0}\n".format(max_range))
@@ -66,17 +68,11 @@ def print_batch(args_sc, out, strand, lib_t, lib_n, lib_f, strain):
 
 
 def import_wig(lib, wigs, strand):
-    wig_parser = WigParser()
     for wig in lib:
         wigs[wig] = {}
-        strain = ""
-        wig_fh = open(wig)
-        for entry in wig_parser.parser(wig_fh, strand):
-            if strain != entry.strain:
-                wigs[wig][entry.strain] = []
-                strain = entry.strain
-            wigs[wig][strain].append(entry)
-        wig_fh.close()
+        for strain, tracks in load_coverage(wig, strand).items():
+            for cover in tracks.values():
+                wigs[wig][strain] = cover
 
 
 def gen_batch(lib_t, lib_n, lib_f, strand, gffs, out, seq):
@@ -117,16 +113,7 @@ def gen_batch(lib_t, lib_n, lib_f, strand, gffs, out, seq):
 
 def get_length(fasta_file):
     '''get sequence information and we can know the length of seq'''
-    seq = {}
-    with open(fasta_file) as fh:
-        for line in fh:
-            line = line.strip()
-            if line.startswith(">"):
-                strain = line[1:]
-                seq[strain] = ""
-            else:
-                seq[strain] = seq[strain] + line
-    return seq
+    return GenomeStore(fasta_file)
 
 
 def gen_screenshot(args_sc, libs, forward_file, reverse_file, strain):
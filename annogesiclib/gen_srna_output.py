@@ -72,55 +72,69 @@ def merge_info(blasts):
     return finals
 
 
+def position_key(strain, strand, start, end):
+    return (strain, strand, start, end)
+
+
+def index_by_position(datas):
+    '''index the rows of the tables (sRNA table or blast hits) by
+    genome, strand, start and end. The rows of the same position are
+    kept in the original order'''
+    index = {}
+    for data in datas:
+        key = position_key(data["strain"], data["strand"],
+                           data["start"], data["end"])
+        if key not in index.keys():
+            index[key] = []
+        index[key].append(data)
+    return index
+
+
 def compare_srna_table(srna_tables, srna, final, args_srna):
-    '''Get the information from sRNA table which has more details'''
-    for table in srna_tables:
+    '''Get the information from sRNA table which has more details.
+    srna_tables is the table indexed by index_by_position'''
+    key = position_key(srna.seq_id, srna.strand, srna.start, srna.end)
+    for table in srna_tables.get(key, []):
         tsss = []
         pros = []
         cands = []
-        if (table["strain"] == srna.seq_id) and (
-                table["strand"] == srna.strand) and (
-                table["start"] == srna.start) and (
-                table["end"] == srna.end):
-            final = dict(final, **table)
-            start_datas = table["tss_pro"].split(";")
-            end_datas = table["end_pro"].split(";")
-            tsss.append(table["start"])
-            pros.append(table["end"])
-            for data in start_datas:
-                if "TSS" in data:
-                    if table["start"] != int(data.split(":")[1][:-2]):
-                        tsss.append(int(data.split(":")[1][:-2]))
-                elif "Cleavage" in data:
-                    if table["end"] != int(data.split(":")[1][:-2]):
-                        pros.append(int(data.split(":")[1][:-2]))
-            for data in end_datas:
-                if "Cleavage" in data:
-                    if table["end"] != int(data.split(":")[1][:-2]):
-                        pros.append(int(data.split(":")[1][:-2]))
-            for tss in tsss:
-                for pro in pros:
-                    if ((pro - tss) >= args_srna.min_len) and (
-                            (pro - tss) <= args_srna.max_len):
-                        cands.append("-".join([str(tss), str(pro)]))
-            final["candidates"] = ";".join(cands)
-            if ("tex" in table["conds"]) and (
-                    "frag" in table["conds"]):
-                final["type"] = "TEX+/-;Fragmented"
-            elif ("tex" in table["conds"]):
-                final["type"] = "TEX+/-"
-            elif ("frag" in table["conds"]):
-                final["type"] = "Fragmented"
+        final = dict(final, **table)
+        start_datas = table["tss_pro"].split(";")
+        end_datas = table["end_pro"].split(";")
+        tsss.append(table["start"])
+        pros.append(table["end"])
+        for data in start_datas:
+            if "TSS" in data:
+                if table["start"] != int(data.split(":")[1][:-2]):
+                    tsss.append(int(data.split(":")[1][:-2]))
+            elif "Cleavage" in data:
+                if table["end"] != int(data.split(":")[1][:-2]):
+                    pros.append(int(data.split(":")[1][:-2]))
+        for data in end_datas:
+            if "Cleavage" in data:
+                if table["end"] != int(data.split(":")[1][:-2]):
+                    pros.append(int(data.split(":")[1][:-2]))
+        for tss in tsss:
+            for pro in pros:
+                if ((pro - tss) >= args_srna.min_len) and (
+                        (pro - tss) <= args_srna.max_len):
+                    cands.append("-".join([str(tss), str(pro)]))
+        final["candidates"] = ";".join(cands)
+        if ("tex" in table["conds"]) and (
+                "frag" in table["conds"]):
+            final["type"] = "TEX+/-;Fragmented"
+        elif ("tex" in table["conds"]):
+            final["type"] = "TEX+/-"
+        elif ("frag" in table["conds"]):
+            final["type"] = "Fragmented"
     return final
 
 
 def compare_blast(blasts, srna, final, hit):
-    for blast in blasts:
-        if (srna.seq_id == blast["strain"]) and (
-                srna.strand == blast["strand"]) and (
-                srna.start == blast["start"]) and (
-                srna.end == blast["end"]):
-            final[hit] = blast["hits"]
+    '''blasts is the merged hits indexed by index_by_position'''
+    key = position_key(srna.seq_id, srna.strand, srna.start, srna.end)
+    if key in blasts.keys():
+        final[hit] = blasts[key][-1]["hits"]
     return final
 
 
@@ -146,6 +160,9 @@ def check_keys(ref_key, final_key, srna, final):
 def compare(srnas, srna_tables, nr_blasts, srna_blasts, args_srna):
     '''Check sRNA candidate pass the filters or not'''
     finals = []
+    srna_tables = index_by_position(srna_tables)
+    nr_blasts = index_by_position(nr_blasts)
+    srna_blasts = index_by_position(srna_blasts)
     for srna in srnas:
         final = {}
         check_keys("2d_energy", "energy", srna, final)
@@ -224,17 +241,15 @@ def print_file(finals, out, srnas, out_gff):
                   str(final["overlap_percent"]), final["with_term"],
                   final["promoter"], str(length)]) + "\n")
         rank += 1
+    final_index = index_by_position(finals)
     for srna in srnas:
-        for final in finals:
-            if (srna.seq_id == final["strain"]) and (
-                    srna.start == final["start"]) and (
-                    srna.end == final["end"]) and (
-                    srna.strand == final["strand"]):
-                if ("sRNA_hit" in final.keys()):
-                    if final["sRNA_hit"] != "NA":
-                        names = change_srna_name(final)
-                        srna.attributes["Name"] = "/".join(names)
-                        srna.attributes["gene"] = "/".join(names)
+        key = position_key(srna.seq_id, srna.strand, srna.start, srna.end)
+        for final in final_index.get(key, []):
+            if ("sRNA_hit" in final.keys()):
+                if final["sRNA_hit"] != "NA":
+                    names = change_srna_name(final)
+                    srna.attributes["Name"] = "/".join(names)
+                    srna.attributes["gene"] = "/".join(names)
         attribute_string = ";".join(
             ["=".join(items) for items in srna.attributes.items()])
         out_gff.write("\t".join([srna.info_without_attributes,
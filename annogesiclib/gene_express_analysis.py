@@ -1,8 +1,10 @@
 import os
 import sys
 import copy
+import numpy as np
 from annogesiclib.gff3 import Gff3Parser
 from annogesiclib.lib_reader import read_wig, read_libs
+from annogesiclib.coverage_stats import get_stats
 from annogesiclib.plot_coverage_table import plot_table
 
 
@@ -46,14 +48,11 @@ def set_cutoff(cond, percent_tex, percent_frag, detects, gff):
 def detect_express(wigs, gff, cutoff_coverage, detects, percent_tex,
                    percent_frag, texs, cond, tex_notex, track, plots,
                    cover_type, name):
-    total = 0
-    high = 0
-    for wig in wigs[(gff.start - 1): gff.end]:
-        total = wig["coverage"] + total
-        if wig["coverage"] > high:
-            high = wig["coverage"]
-        if wig["coverage"] >= cutoff_coverage:
-            detects["express"] += 1
+    total, high, _ = get_stats(wigs).query(gff.start - 1, gff.end)
+    if (high is None) or (high < 0):
+        high = 0
+    detects["express"] += int(np.count_nonzero(
+        wigs[(gff.start - 1): gff.end] >= cutoff_coverage))
     if cover_type == "average":
         plots[cond][name] = float(total) / float(gff.end - gff.start + 1)
     elif cover_type == "high":
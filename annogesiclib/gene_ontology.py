@@ -9,11 +9,20 @@ import matplotlib.pyplot as plt
 plt.style.use('ggplot')
 
 
-def import_uniprot_data(entry, name_list, feature):
-    '''import uniprot to dict'''
-    ref_name = entry.attributes[feature]
-    if ref_name not in name_list:
-        name_list.add(ref_name)
+def index_cds(gffs):
+    '''index the CDSs by Name and protein_id'''
+    cds_index = {}
+    for gff in gffs:
+        ids = []
+        for feature in ("Name", "protein_id"):
+            if (feature in gff.attributes.keys()) and (
+                    gff.attributes[feature] not in ids):
+                ids.append(gff.attributes[feature])
+        for id_ in ids:
+            if id_ not in cds_index.keys():
+                cds_index[id_] = []
+            cds_index[id_].append(gff)
+    return cds_index
 
 
 def compare_cds_tran(gffs, trans):
@@ -38,22 +47,13 @@ def compare_cds_tran(gffs, trans):
     return new_gffs
 
 
-def get_go_id(gffs, id_, uni_lines, gos):
+def get_go_id(cds_index, id_, go, gos):
     '''get the GO id of CDS'''
-    detect = False
-    for gff in gffs:
-        if ("Name" in gff.attributes.keys()):
-            if (id_ == gff.attributes["Name"]):
-                detect = True
-        if ("protein_id" in gff.attributes.keys()):
-            if (id_ == gff.attributes["protein_id"]):
-                detect = True
-        if detect:
-            detect = False
-            gos.append({"strain": gff.seq_id, "strand": gff.strand,
-                        "start": gff.start, "end": gff.end,
-                        "protein_id": id_, "go": uni_lines[6]})
-            gff.attributes["print"] = True
+    for gff in cds_index.get(id_, []):
+        gos.append({"strain": gff.seq_id, "strand": gff.strand,
+                    "start": gff.start, "end": gff.end,
+                    "protein_id": id_, "go": go})
+        gff.attributes["print"] = True
 
 
 def print_go(gos, out):
@@ -92,26 +92,14 @@ def print_go(gos, out):
                   str(pre_go["start"]), str(pre_go["end"]),
                   pre_go["protein_id"], pre_go["go"]]) + "\n")
 
-def retrieve_uniprot(database_file, gff_file, out_file, tran_file, type_):
-    '''Retrieve the GO term from Uniprot'''
-    name_list = set()
+def retrieve_uniprot(uni_index, gff_file, out_file, tran_file, type_):
+    '''Retrieve the GO term from the index of Uniprot'''
     gffs = []
     out = open(out_file, "w")
     out.write("\t".join(["Genome", "Strand", "Start", "End",
                          "Protein_id", "Go_term"]) + "\n")
     for entry in Gff3Parser().entries(open(gff_file)):
         if entry.feature == "CDS":
-            if ("Name" in entry.attributes.keys()) and (
-                    "protein_id" in entry.attributes.keys()):
-                if entry.attributes["Name"] == entry.attributes["protein_id"]:
-                    import_uniprot_data(entry, name_list, "Name")
-                else:
-                    import_uniprot_data(entry, name_list, "Name")
-                    import_uniprot_data(entry, name_list, "protein_id")
-            elif ("Name" in entry.attributes.keys()):
-                import_uniprot_data(entry, name_list, "Name")
-            elif ("protein_id" in entry.attributes.keys()):
-                import_uniprot_data(entry, name_list, "protein_id")
             gffs.append(entry)
     if (type_ == "express") and (tran_file is not None):
         trans = []
@@ -119,24 +107,19 @@ def retrieve_uniprot(database_file, gff_file, out_file, tran_file, type_):
             trans.append(entry)
         new_gffs = compare_cds_tran(gffs, trans)
         gffs = new_gffs
-    idmapping = open(database_file, "r")
+    cds_index = index_cds(gffs)
     gos = []
-    for uni_id in idmapping:
-        uni_line = uni_id.rstrip("\n")
-        uni_lines = uni_line.split("\t")
-        uni_ids = uni_lines[3].split(";")
-        for id_ in uni_ids:
-            id_ = id_.strip()
-            if id_ in name_list:
-                get_go_id(gffs, id_, uni_lines, gos)
+    for id_, go in uni_index.lookup(cds_index.keys()):
+        get_go_id(cds_index, id_, go, gos)
     for gff in gffs:
         if "print" not in gff.attributes.keys():
             gos.append({"strain": gff.seq_id, "strand": gff.strand,
                         "start": gff.start, "end": gff.end,
-                        "protein_id": id_, "go": ""})
+                        "protein_id": gff.attributes.get(
+                            "protein_id", gff.attributes.get("Name", "")),
+                        "go": ""})
     print_go(gos, out)
     out.close()
-    idmapping.close()
 
 
 def plot(total_nums, strain, filename, total, out_folder):
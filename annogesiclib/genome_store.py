@@ -0,0 +1,173 @@
+import mmap
+import os
+from collections.abc import Mapping
+
+
+class GenomeSequence(object):
+    '''The lazy sequence of one replicon of the GenomeStore. It can be
+    sliced and indexed like a string; only the requested region is read
+    from the FASTA file.'''
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    def __len__(self):
+        return self.store.length(self.name)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step == 1:
+                return self.store.fetch(self.name, start + 1, stop)
+            return str(self)[key]
+        length = len(self)
+        if key < 0:
+            key += length
+        if (key < 0) or (key >= length):
+            raise IndexError("sequence index out of range")
+        return self.store.fetch(self.name, key + 1, key + 1)
+
+    def __str__(self):
+        return self.store.seq(self.name)
+
+    def __repr__(self):
+        return "GenomeSequence({0}, {1})".format(
+            repr(self.store.fasta_file), repr(self.name))
+
+
+class GenomeStore(Mapping):
+    '''Random access to the sequences of a FASTA file by a faidx-style
+    index (length, offset of the first nucleotide, nucleotides and bytes
+    per line of every sequence). The sequences are named by the whole
+    header line (without ">"). store[name] is a GenomeSequence; a region
+    is read by fetch() without loading the whole replicon. If the lines
+    of a sequence are not in the same length, the sequence is loaded to
+    memory when it is accessed at the first time.'''
+
+    def __init__(self, fasta_file, use_mmap=True):
+        self.fasta_file = fasta_file
+        self.use_mmap = use_mmap
+        self.index = {}
+        self._seqs = {}
+        self._data = None
+        self._build_index()
+
+    def _build_index(self):
+        entry = None
+        offset = 0
+        with open(self.fasta_file, "rb") as fh:
+            for line in fh:
+                content = line.strip()
+                if content.startswith(b">"):
+                    entry = self._new_entry(offset + len(line))
+                    self.index[content[1:].decode()] = entry
+                elif (entry is not None) or (len(content) != 0):
+                    if entry is None:
+                        entry = self._new_entry(offset)
+                        self.index[""] = entry
+                    self._add_line(entry, line, content)
+                    entry["end"] = offset + len(line)
+                offset += len(line)
+
+    def _new_entry(self, offset):
+        '''the sequence lines before the first header are stored as the
+        sequence without name ("")'''
+        return {"length": 0, "offset": offset, "line_bases": None,
+                "line_bytes": None, "end": offset, "regular": True,
+                "last": False}
+
+    def _add_line(self, entry, line, content):
+        '''update the line lengths of the sequence; the sequence is
+        irregular if the line can not be located by the line lengths'''
+        if len(content) == 0:
+            if entry["line_bases"] is not None:
+                entry["last"] = True
+            else:
+                entry["regular"] = False
+            return
+        entry["length"] += len(content)
+        if (not entry["regular"]) or (
+                line.rstrip(b"\r\n") != content):
+            entry["regular"] = False
+        elif entry["line_bases"] is None:
+            entry["line_bases"] = len(content)
+            entry["line_bytes"] = len(line)
+        elif (entry["last"]) or (len(content) > entry["line_bases"]) or (
+                len(line) - len(content) !=
+                entry["line_bytes"] - entry["line_bases"]):
+            entry["regular"] = False
+        elif len(content) < entry["line_bases"]:
+            entry["last"] = True
+
+    def _read(self, start, end):
+        if self._data is None:
+            if self.use_mmap and (os.path.getsize(self.fasta_file) != 0):
+                with open(self.fasta_file, "rb") as fh:
+                    self._data = mmap.mmap(fh.fileno(), 0,
+                                           access=mmap.ACCESS_READ)
+            else:
+                self._data = open(self.fasta_file, "rb")
+        if isinstance(self._data, mmap.mmap):
+            return self._data[start: end]
+        self._data.seek(start)
+        return self._data.read(end - start)
+
+    def _byte_pos(self, entry, pos):
+        '''the byte offset of the nucleotide (0-based) in the file'''
+        return entry["offset"] + (pos // entry["line_bases"]) * (
+            entry["line_bytes"]) + (pos % entry["line_bases"])
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+    def __getitem__(self, name):
+        if name not in self.index.keys():
+            raise KeyError(name)
+        return GenomeSequence(self, name)
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def length(self, name):
+        return self.index[name]["length"]
+
+    def seq(self, name):
+        '''the whole sequence of the replicon as a string'''
+        if name not in self._seqs.keys():
+            entry = self.index[name]
+            if entry["regular"]:
+                self._seqs[name] = self.fetch(name, 1, entry["length"])
+            else:
+                datas = self._read(entry["offset"], entry["end"])
+                self._seqs[name] = "".join([
+                    line.strip().decode() for line in datas.splitlines()])
+        return self._seqs[name]
+
+    def fetch(self, name, start, end):
+        '''the sequence of the region (1-based, start and end are
+        included) as seq[start - 1: end]'''
+        entry = self.index[name]
+        start = max(start, 1)
+        end = min(end, entry["length"])
+        if start > end:
+            return ""
+        if (name in self._seqs.keys()) or (not entry["regular"]):
+            return self.seq(name)[start - 1: end]
+        datas = self._read(self._byte_pos(entry, start - 1),
+                           self._byte_pos(entry, end - 1) + 1)
+        return datas.replace(b"\n", b"").replace(b"\r", b"").decode()
+
+
+def read_seq(fasta_file):
+    '''the sequence of the FASTA file. The sequences are concatenated if
+    there are more than one sequence in the file'''
+    store = GenomeStore(fasta_file)
+    if len(store) == 1:
+        return store[next(iter(store))]
+    return "".join([store.seq(name) for name in store])
@@ -1,4 +1,5 @@
 from annogesiclib.helper import Helper
+from annogesiclib.genome_store import GenomeStore
 from annogesiclib.gff3 import Gff3Parser
 
 
@@ -218,18 +219,10 @@ def detect_confliction(gc, genes, seq):
 
 
 def read_file(seq_file, tran_file, gff_file):
-    seq = {}
+    seq = GenomeStore(seq_file)
     tas = []
     genes = []
     merges = []
-    with open(seq_file, "r") as f_h:
-        for line in f_h:
-            line = line.strip()
-            if line.startswith(">"):
-                strain = line[1:]
-                seq[strain] = ""
-            else:
-                seq[strain] = seq[strain] + line
     ta_fh = open(tran_file, "r")
     for entry in Gff3Parser().entries(ta_fh):
         tas.append(entry)
@@ -243,33 +236,29 @@ def read_file(seq_file, tran_file, gff_file):
     return seq, tas, merges, genes
 
 
-def get_fasta(seq, merge, num, strand, args_term, out, out_i):
+def get_windows(merge, args_term):
+    '''split the long region to the windows'''
+    windows = []
     if (merge["end"] - merge["start"]) > args_term.window:
-        detect_out = False
         for start in range(merge["start"], merge["end"] + 1, args_term.shift):
             if (merge["end"] - (start + args_term.window)) < args_term.shift:
-                end = merge["end"]
-                detect_out = True
-            else:
-                end = start + args_term.window
-            inter_seq = Helper().extract_gene(
-                seq[merge["strain"]], start, end, strand)
-            out_i.write(">" + "|".join([
-                "inter_" + str(num), str(start),
-                str(end), merge["strain"], merge["parent_p"],
-                merge["parent_m"], merge["p_pos"], merge["m_pos"],
-                strand]) + "\n")
-            out.write(">inter_" + str(num) + "\n")
-            out.write(inter_seq + "\n")
-            num += 1
-            if detect_out:
+                windows.append((start, merge["end"]))
                 break
+            else:
+                windows.append((start, start + args_term.window))
     else:
-        inter_seq = Helper().extract_gene(
-            seq[merge["strain"]], merge["start"], merge["end"], strand)
+        windows.append((merge["start"], merge["end"]))
+    return windows
+
+
+def get_fasta(seq, merge, num, strand, args_term, out, out_i):
+    windows = get_windows(merge, args_term)
+    inter_seqs = Helper().extract_genes(seq, [
+        (merge["strain"], start, end, strand) for start, end in windows])
+    for (start, end), inter_seq in zip(windows, inter_seqs):
         out_i.write(">" + "|".join([
-            "inter_" + str(num), str(merge["start"]),
-            str(merge["end"]), merge["strain"], merge["parent_p"],
+            "inter_" + str(num), str(start),
+            str(end), merge["strain"], merge["parent_p"],
             merge["parent_m"], merge["p_pos"], merge["m_pos"],
             strand]) + "\n")
         out.write(">inter_" + str(num) + "\n")
@@ -1,6 +1,8 @@
 import math
 from annogesiclib.gff3 import Gff3Parser
+from annogesiclib.genome_store import GenomeStore
 from annogesiclib.helper import Helper
+from annogesiclib.interval_index import IntervalIndex
 
 
 def import_candidate(cands, term_features, strain, start, end, ut, name,
@@ -254,7 +256,6 @@ def parents(terms, genes, args_term):
 
 
 def read_gff(seq_file, gff_file, tran_file):
-    genome = {}
     genes = []
     trans = []
     for entry in Gff3Parser().entries(open(gff_file)):
@@ -262,55 +263,56 @@ def read_gff(seq_file, gff_file, tran_file):
             genes.append(entry)
     for entry in Gff3Parser().entries(open(tran_file)):
         trans.append(entry)
-    with open(seq_file, "r") as q_h:
-        for line in q_h:
-            line = line.strip()
-            if line.startswith(">"):
-                strain = line[1:]
-                genome[strain] = ""
-            else:
-                genome[strain] = genome[strain] + line
+    genome = GenomeStore(seq_file)
     genes = sorted(genes, key=lambda k: (k.seq_id, k.start, k.end, k.strand))
     trans = sorted(trans, key=lambda k: (k.seq_id, k.start, k.end, k.strand))
     return genes, genome, trans
 
 
-def compare_anno(gffs, cands, fuzzy_up, fuzzy_down):
+def compare_anno(gff_index, cands, fuzzy_up, fuzzy_down):
     '''compare the terminator with CDS'''
     detect = False
     new_cands = []
     for cand in cands:
+        if cand["strand"] == "+":
+            gffs = gff_index.overlap(
+                cand["strain"], cand["strand"],
+                cand["start"] - max(fuzzy_down, 0),
+                cand["end"] + max(fuzzy_up, 0))
+        else:
+            gffs = gff_index.overlap(
+                cand["strain"], cand["strand"],
+                cand["start"] - max(fuzzy_up, 0),
+                cand["end"] + max(fuzzy_down, 0))
         for gff in gffs:
-            if (gff.seq_id == cand["strain"]) and (
-                    gff.strand == cand["strand"]):
-                if cand["strand"] == "+":
-                    if (gff.start <= cand["start"]) and (
-                            gff.end >= cand["start"]) and (
-                            gff.end <= cand["end"]):
-                        detect = True
-                        break
-                    elif (math.fabs(gff.end - cand["end"]) <= fuzzy_up) and (
-                            gff.end >= cand["end"]):
-                        detect = True
-                        break
-                    elif (math.fabs(gff.end - cand["start"]) <=
-                            fuzzy_down) and (gff.end <= cand["start"]):
-                        detect = True
-                        break
-                else:
-                    if (gff.start >= cand["start"]) and (
-                            gff.start <= cand["end"]) and (
-                            gff.end >= cand["end"]):
-                        detect = True
-                        break
-                    elif (math.fabs(gff.start - cand["end"]) <=
-                            fuzzy_down) and (gff.start >= cand["end"]):
-                        detect = True
-                        break
-                    elif (math.fabs(gff.start - cand["start"]) <=
-                            fuzzy_up) and (cand["start"] >= gff.start):
-                        detect = True
-                        break
+            if cand["strand"] == "+":
+                if (gff.start <= cand["start"]) and (
+                        gff.end >= cand["start"]) and (
+                        gff.end <= cand["end"]):
+                    detect = True
+                    break
+                elif (math.fabs(gff.end - cand["end"]) <= fuzzy_up) and (
+                        gff.end >= cand["end"]):
+                    detect = True
+                    break
+                elif (math.fabs(gff.end - cand["start"]) <=
+                        fuzzy_down) and (gff.end <= cand["start"]):
+                    detect = True
+                    break
+            else:
+                if (gff.start >= cand["start"]) and (
+                        gff.start <= cand["end"]) and (
+                        gff.end >= cand["end"]):
+                    detect = True
+                    break
+                elif (math.fabs(gff.start - cand["end"]) <=
+                        fuzzy_down) and (gff.start >= cand["end"]):
+                    detect = True
+                    break
+                elif (math.fabs(gff.start - cand["start"]) <=
+                        fuzzy_up) and (cand["start"] >= gff.start):
+                    detect = True
+                    break
         if detect:
             detect = False
             new_cands.append(cand)
@@ -361,6 +363,8 @@ def poly_t(seq_file, sec_file, gff_file, tran_file, out_file, args_term):
     '''detect the sec str of terminator'''
     terms = []
     genes, genome, trans = read_gff(seq_file, gff_file, tran_file)
+    gene_index = IntervalIndex(genes)
+    ta_index = IntervalIndex(trans)
     out = open(out_file, "w")
     with open(sec_file, "r") as s_h:
         for line in s_h:
@@ -386,10 +390,10 @@ def poly_t(seq_file, sec_file, gff_file, tran_file, out_file, args_term):
                         end, parent_p, parent_m, strand, args_term,
                         p_pos, m_pos)
                 cands = sorted(cands, key=lambda x: (x["miss"], x["start"]))
-                new_cands_gene = compare_anno(genes, cands,
+                new_cands_gene = compare_anno(gene_index, cands,
                                               args_term.fuzzy_up_gene,
                                               args_term.fuzzy_down_gene)
-                new_cands_ta = compare_anno(trans, cands,
+                new_cands_ta = compare_anno(ta_index, cands,
                                             args_term.fuzzy_up_ta,
                                             args_term.fuzzy_down_ta)
                 new_cands = merge_cands(new_cands_gene, new_cands_ta)
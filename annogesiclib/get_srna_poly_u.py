@@ -3,15 +3,11 @@ import math
 import csv
 from annogesiclib.gff3 import Gff3Parser
 from annogesiclib.helper import Helper
+from annogesiclib.genome_store import read_seq
 
 
 def read_file(seq_file, srna_table):
-    seq = ""
-    with open(seq_file) as fh:
-        for line in fh:
-            if not line.startswith(">"):
-                line = line.strip()
-                seq = seq + line
+    seq = read_seq(seq_file)
     tabs = []
     sh = open(srna_table, "r")
     for row in csv.reader(sh, delimiter='\t'):
@@ -1,4 +1,5 @@
-import csv
+from sys import intern
+from array import array
 
 
 class Gff3Parser(object):
@@ -17,13 +18,20 @@ parse file not following the standard.
     def entries(self, input_gff_fh):
         """
 """
-        for entry_dict in csv.DictReader(
-            input_gff_fh, delimiter="\t",
-            fieldnames=["seq_id", "source", "feature", "start",
-                        "end", "score", "strand", "phase", "attributes"]):
-            if entry_dict["seq_id"].startswith("#"):
+        for line in input_gff_fh:
+            line = line.rstrip("\r\n")
+            if (len(line) == 0) or (line.startswith("#")):
                 continue
-            yield self._dict_to_entry(entry_dict)
+            yield self._line_to_entry(line)
+
+    def table(self, input_gff_fh):
+        """
+Load the whole file to a columnar Gff3Table.
+"""
+        return Gff3Table(input_gff_fh)
+
+    def _line_to_entry(self, line):
+        return Gff3Entry.from_line(line)
 
     def _dict_to_entry(self, entry_dict):
         return Gff3Entry(entry_dict)
@@ -45,8 +53,16 @@ Gff3Entry({
 "score" : ".",
 "phase" : ".",
 "attributes" : "name=%s;locus_tag=%s" % (name, locus_tag)})
+
+The attribute dictionary and the info strings are only built when
+they are used. info and info_without_attributes keep the fields of
+the entry when it was created.
 """
 
+    __slots__ = ("seq_id", "source", "feature", "start", "end", "score",
+                 "strand", "phase", "attribute_string", "_attributes",
+                 "_line", "_info", "_info_without_attributes")
+
     def __init__(self, entry_dict):
         self.seq_id = entry_dict["seq_id"]
         self.source = entry_dict["source"]
@@ -59,17 +75,75 @@ Gff3Entry({
         self.score = entry_dict["score"]
         self.strand = entry_dict["strand"]
         self.phase = entry_dict["phase"]
-        self.attributes = self._attributes(entry_dict["attributes"])
         self.attribute_string = entry_dict["attributes"]
-        self.info = "\t".join([str(field) for field in [
+        self._attributes = None
+        self._line = None
+        self._info = None
+        self._info_without_attributes = None
+        self._line = self._current_info()
+
+    @classmethod
+    def from_line(cls, line):
+        """Create the entry from a tab-separated GFF line"""
+        fields = line.split("\t")
+        entry = cls.__new__(cls)
+        entry.seq_id = intern(fields[0])
+        entry.source = intern(fields[1])
+        entry.feature = intern(fields[2])
+        start, end = sorted([int(fields[3]), int(fields[4])])
+        entry.start = start
+        entry.end = end
+        entry.score = fields[5]
+        entry.strand = intern(fields[6])
+        entry.phase = intern(fields[7])
+        entry.attribute_string = fields[8]
+        entry._attributes = None
+        entry._info = None
+        entry._info_without_attributes = None
+        if (len(fields) == 9) and (fields[3] == str(start)) and (
+                fields[4] == str(end)):
+            entry._line = line
+        else:
+            entry._line = entry._current_info()
+        return entry
+
+    def _current_info(self):
+        return "\t".join([str(field) for field in [
                         self.seq_id, self.source, self.feature, self.start,
                         self.end, self.score, self.strand, self.phase,
                         self.attribute_string]])
-        self.info_without_attributes = "\t".join([str(field) for field in [
-                        self.seq_id, self.source, self.feature, self.start,
-                        self.end, self.score, self.strand, self.phase]])
 
-    def _attributes(self, attributes_string):
+    @property
+    def attributes(self):
+        if self._attributes is None:
+            self._attributes = self._attributes_dict(self.attribute_string)
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, attributes):
+        self._attributes = attributes
+
+    @property
+    def info(self):
+        if self._info is None:
+            return self._line
+        return self._info
+
+    @info.setter
+    def info(self, info):
+        self._info = info
+
+    @property
+    def info_without_attributes(self):
+        if self._info_without_attributes is None:
+            return self._line.rsplit("\t", 1)[0]
+        return self._info_without_attributes
+
+    @info_without_attributes.setter
+    def info_without_attributes(self, info_without_attributes):
+        self._info_without_attributes = info_without_attributes
+
+    def _attributes_dict(self, attributes_string):
         """Translate the attribute string to dictionary"""
         attributes = {}
         if len(attributes_string) > 0:
@@ -95,3 +169,109 @@ Gff3Entry({
                         self.seq_id, self.source, self.feature, self.start,
                         self.end, self.score, self.strand, self.phase,
                         self.attribute_string]])
+
+
+class Gff3Table(object):
+
+    """
+Columnar storage of a GFF file. The lines are split to columns
+directly, no Gff3Entry is created. seq_id, source, feature, strand and
+phase are stored as integer codes (the names are in seq_ids, sources,
+features, strands and phases), start and end as int64 arrays, score and
+the attribute strings as lists. It is useful for the steps which only
+need to compare the positions of a large number of entries. The line of
+an entry is formatted by line(index) (as Gff3Entry.info) and the full
+Gff3Entry can be recreated by entry(index).
+"""
+
+    def __init__(self, input_gff_fh):
+        import numpy as np
+        columns = {"seq_id": [], "source": [], "feature": [],
+                   "strand": [], "phase": []}
+        codes = dict([(column, {}) for column in columns.keys()])
+        starts = array("q")
+        ends = array("q")
+        self.scores = []
+        self.attributes = []
+        for line in input_gff_fh:
+            line = line.rstrip("\r\n")
+            if (len(line) == 0) or (line.startswith("#")):
+                continue
+            fields = line.split("\t")
+            for column, field in (
+                    ("seq_id", fields[0]), ("source", fields[1]),
+                    ("feature", fields[2]), ("strand", fields[6]),
+                    ("phase", fields[7])):
+                if field not in codes[column].keys():
+                    codes[column][field] = len(codes[column])
+                columns[column].append(codes[column][field])
+            start, end = int(fields[3]), int(fields[4])
+            starts.append(min(start, end))
+            ends.append(max(start, end))
+            self.scores.append(fields[5])
+            self.attributes.append(fields[8])
+        self.seq_ids, self.sources, self.features, self.strands, \
+            self.phases = [list(codes[column].keys()) for column in (
+                "seq_id", "source", "feature", "strand", "phase")]
+        self.seq_id = np.array(columns["seq_id"], dtype=np.int32)
+        self.source = np.array(columns["source"], dtype=np.int32)
+        self.feature = np.array(columns["feature"], dtype=np.int32)
+        self.strand = np.array(columns["strand"], dtype=np.int8)
+        self.phase = np.array(columns["phase"], dtype=np.int8)
+        self.start = np.frombuffer(starts, dtype=np.int64)
+        self.end = np.frombuffer(ends, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.attributes)
+
+    def mask(self, seq_id=None, feature=None, strand=None):
+        """Get the boolean mask of the entries which match the values"""
+        import numpy as np
+        mask = np.ones(len(self), dtype=bool)
+        for names, column, value in (
+                (self.seq_ids, self.seq_id, seq_id),
+                (self.features, self.feature, feature),
+                (self.strands, self.strand, strand)):
+            if value is not None:
+                if value in names:
+                    mask &= (column == names.index(value))
+                else:
+                    mask[:] = False
+        return mask
+
+    def _ranks(self, names, column):
+        '''the codes of the column are replaced by the ranks of the
+        names, so the column can be sorted as the names'''
+        import numpy as np
+        ranks = np.zeros(len(names), dtype=np.int32)
+        ranks[sorted(range(len(names)), key=lambda x: names[x])] = range(
+            len(names))
+        return ranks[column]
+
+    def order(self):
+        """Get the indices of the entries which are sorted by seq_id,
+        start, end and strand"""
+        import numpy as np
+        return np.lexsort((self._ranks(self.strands, self.strand), self.end,
+                           self.start, self._ranks(self.seq_ids,
+                                                   self.seq_id)))
+
+    def line(self, index):
+        return "\t".join([
+            self.seq_ids[self.seq_id[index]], self.sources[self.source[index]],
+            self.features[self.feature[index]], str(self.start[index]),
+            str(self.end[index]), self.scores[index],
+            self.strands[self.strand[index]], self.phases[self.phase[index]],
+            self.attributes[index]])
+
+    def entry(self, index):
+        return Gff3Entry.from_line(self.line(index))
+
+    def entries(self, mask=None):
+        if mask is None:
+            indices = range(len(self))
+        else:
+            import numpy as np
+            indices = np.flatnonzero(mask)
+        for index in indices:
+            yield self.entry(index)
@@ -4,6 +4,7 @@ import shutil
 from annogesiclib.helper import Helper
 from annogesiclib.multiparser import Multiparser
 from annogesiclib.gene_ontology import retrieve_uniprot, map2goslim
+from annogesiclib.uniprot_index import UniprotIndex
 
 
 class GoTermFinding(object):
@@ -26,8 +27,27 @@ class GoTermFinding(object):
         self.stat_express_path = os.path.join(self.out_express,
                                               "statistics")
         self.all_strain = "all_genomes_uniprot.csv"
+        self.uni_index = UniprotIndex(args_go.uniprot, self._index_file(
+            args_go.uniprot, args_go.out_folder))
 
-    def _retrieve_go(self, uniprot, out_path, type_, log):
+    def _index_file(self, uniprot, out_folder):
+        '''the index is stored next to the idmapping file, so it can be
+        reused by the other projects. If the folder is not writable, it
+        is stored in the output folder'''
+        folder = os.path.dirname(os.path.abspath(uniprot))
+        if not os.access(folder, os.W_OK):
+            folder = out_folder
+        return os.path.join(folder, os.path.basename(uniprot) + ".sqlite")
+
+    def _build_index(self, log):
+        if not self.uni_index.is_valid():
+            print("Indexing " + self.uni_index.database_file)
+            log.write("Indexing the UniProt idmapping file. It only needs "
+                      "to be done once.\n")
+            self.uni_index.build()
+            log.write("\t" + self.uni_index.index_file + " is generated.\n")
+
+    def _retrieve_go(self, out_path, type_, log):
         prefixs = []
         log.write("Running gene_ontology.py to retrieve GO terms.\n")
         for gff in os.listdir(self.gff_path):
@@ -42,7 +62,8 @@ class GoTermFinding(object):
                                          "_".join([prefix, "transcript.gff"]))
             else:
                 tran_file = None
-            retrieve_uniprot(uniprot, os.path.join(self.gff_path, gff),
+            retrieve_uniprot(self.uni_index,
+                             os.path.join(self.gff_path, gff),
                              out_file, tran_file, type_)
             log.write("\t" + out_file + " is generated.\n")
 
@@ -132,17 +153,17 @@ class GoTermFinding(object):
         self.multiparser.parser_gff(args_go.gffs, None)
         if args_go.trans is not None:
             self.multiparser.parser_gff(args_go.trans, "transcript")
+        self._build_index(log)
         print("Computing all CDSs")
         log.write("Retrieving GO terms for all CDSs.\n")
-        self._retrieve_go(args_go.uniprot, self.result_all_path, "all", log)
+        self._retrieve_go(self.result_all_path, "all", log)
         self._merge_files(args_go.gffs, self.result_all_path, self.out_all, log)
         self._stat(self.result_all_path, self.stat_all_path, args_go.go,
                    args_go.goslim, self.out_all, log)
         if args_go.trans is not None:
             log.write("Retrieving GO terms only for expressed CDSs.\n")
             print("Computing express CDSs")
-            self._retrieve_go(args_go.uniprot, self.result_express_path,
-                              "express", log)
+            self._retrieve_go(self.result_express_path, "express", log)
             self._merge_files(args_go.gffs, self.result_express_path,
                               self.out_express, log)
             self._stat(self.result_express_path, self.stat_express_path,
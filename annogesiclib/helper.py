@@ -2,11 +2,13 @@ import os
 import sys
 import copy
 import shutil
-import csv
 import re
-from Bio.Seq import Seq
-from Bio.Alphabet import generic_dna
 from annogesiclib.gff3 import Gff3Parser
+from annogesiclib.genome_store import read_seq
+
+_COMPLEMENT = bytes.maketrans(b"ACGTacgt", b"TGCATGCA")
+_NON_NUCLEOTIDES = bytes([byte for byte in range(256)
+                          if byte not in b"ACGTacgt"])
 
 
 class Helper(object):
@@ -42,44 +44,32 @@ class Helper(object):
             name = "r"
         return name
 
-    def _fix_break_line(self, tar, prefix):
-        '''fix the break line at the end of file'''
-        tmp_out = open("tmp_file", "w")
-        first = True
-        with open(tar) as fh:
-            for line in fh:
-                line = line.strip()
-                if (prefix == ">"):
-                    if (prefix in line) and (first):
-                        first = False
-                    elif (prefix in line) and (not first) and (
-                          not line.startswith(prefix)):
-                        line = line.replace(prefix, "\n" + prefix)
-                else:
-                    row = line.split("\t")
-                    if (len(row) > 9):
-                        for strain in prefix:
-                            if strain in line:
-                                line = line.replace(strain, "\n" + strain)
-                                break
-                tmp_out.write(line + "\n")
-        tmp_out.close()
-        os.remove(tar)
-        shutil.move("tmp_file", tar)
+    def merge_files(self, refs, tar, append=True, buffer_size=1048576):
+        '''merge the files of refs to tar in one pass. If a file does not
+        end with the break line, it is added before the next data, so the
+        target does not need to be read and rewritten after merging. The
+        missing files of refs are skipped like "cat" does'''
+        refs = [ref for ref in refs if os.path.isfile(ref)]
+        end_break = True
+        if append and os.path.exists(tar) and (os.path.getsize(tar) > 0):
+            with open(tar, "rb") as th:
+                th.seek(-1, os.SEEK_END)
+                end_break = (th.read(1) == b"\n")
+        out = open(tar, "ab" if append else "wb")
+        for ref in refs:
+            with open(ref, "rb") as rh:
+                datas = rh.read(buffer_size)
+                if datas and (not end_break):
+                    out.write(b"\n")
+                while datas:
+                    out.write(datas)
+                    end_break = datas.endswith(b"\n")
+                    datas = rh.read(buffer_size)
+        out.close()
 
     def merge_file(self, ref, tar):
         '''merge two files'''
-        os.system(" ".join(["cat", ref, ">>", tar]))
-        if tar.endswith(".fa"):
-            self._fix_break_line(tar, ">")
-        elif tar.endswith(".gff"):
-            strains = []
-            fh = open(ref, "r")
-            for row in csv.reader(fh, delimiter='\t'):
-                if row[0] not in strains:
-                    strains.append(row[0])
-            fh.close()
-            self._fix_break_line(tar, strains)
+        self.merge_files([ref], tar)
 
     def merge_blast_out(self, ref, tar):
         tmp_out = tar + "_tmp"
@@ -241,19 +231,33 @@ class Helper(object):
             fasta = self._reverse_seq(rev_seq)
             return fasta
 
+    def extract_genes(self, seqs, regions):
+        '''extract the sequences of many regions at once. seqs is the
+        dict of the sequence ID and the sequence; regions is the list of
+        (sequence ID, start, end, strand). The reverse complements of the
+        regions on the reverse strand are generated by one translation'''
+        fastas = []
+        revs = []
+        for seq_id, start, end, strand in regions:
+            if strand != "+":
+                revs.append(len(fastas))
+            fastas.append(seqs[seq_id][(int(start)-1):int(end)])
+        rev_seq = "\n".join([fastas[index] for index in revs])
+        if rev_seq.count("\n") == len(revs) - 1:
+            rev_fastas = rev_seq[::-1].encode().translate(
+                _COMPLEMENT, _NON_NUCLEOTIDES.replace(b"\n", b"")).decode()
+            for index, fasta in zip(reversed(revs), rev_fastas.split("\n")):
+                fastas[index] = fasta
+        else:
+            for index in revs:
+                fastas[index] = self._reverse_seq(fastas[index])
+        return fastas
+
     def _reverse_seq(self, rev_seq):
-        '''deal with the reverse strand'''
-        fasta = ""
-        for base in rev_seq[::-1]:
-            if base.upper() == 'A':
-                fasta = fasta + 'T'
-            elif base.upper() == 'T':
-                fasta = fasta + 'A'
-            elif base.upper() == 'C':
-                fasta = fasta + 'G'
-            elif base.upper() == 'G':
-                fasta = fasta + 'C'
-        return fasta
+        '''deal with the reverse strand. The nucleotides which are not
+        A, C, G or T are removed'''
+        return rev_seq[::-1].encode().translate(
+            _COMPLEMENT, _NON_NUCLEOTIDES).decode()
 
     def _add_element(self, list_, type_, gff):
         if type_ in gff.attributes.keys():
@@ -313,23 +317,19 @@ class Helper(object):
         fh.close()
 
     def _read_fasta(self, fasta_file):
-        seq = ""
-        with open(fasta_file, "r") as seq_f:
-            for line in seq_f:
-                line = line.strip()
-                if line.startswith(">"):
-                    continue
-                else:
-                    seq = seq + line
-        return seq
+        return read_seq(fasta_file)
 
     def get_seq(self, gff_file, fasta_file, out_file):
         gff_f = open(gff_file, "r")
         out = open(out_file, "w")
         seq = self._read_fasta(fasta_file)
+        entries = list(self.gff3parser.entries(gff_f))
+        genes = self.extract_genes(
+            {entry.seq_id: seq for entry in entries},
+            [(entry.seq_id, entry.start, entry.end, entry.strand)
+             for entry in entries])
         num = 0
-        for entry in self.gff3parser.entries(gff_f):
-            gene = self.extract_gene(seq, entry.start, entry.end, entry.strand)
+        for entry, gene in zip(entries, genes):
             if "ID" in entry.attributes.keys():
                 id_ = entry.attributes["ID"]
             else:
@@ -350,8 +350,11 @@ class Helper(object):
             if entry.feature == "CDS":
                 cdss.append(entry)
         cdss = sorted(cdss, key=lambda k: (k.seq_id, k.start, k.end, k.strand))
-        for entry in cdss:
-            cds = self.extract_gene(seq, entry.start, entry.end, entry.strand)
+        cds_seqs = self.extract_genes(
+            {entry.seq_id: seq for entry in cdss},
+            [(entry.seq_id, entry.start, entry.end, entry.strand)
+             for entry in cdss])
+        for entry, cds in zip(cdss, cds_seqs):
             if "protein_id" in entry.attributes.keys():
                 protein_id = entry.attributes["protein_id"]
             elif "locus_tag" in entry.attributes.keys():
@@ -366,6 +369,8 @@ class Helper(object):
 
     def translation(self, dna_file, protein_file):
         '''translate the DNA to residues'''
+        from Bio.Seq import Seq
+        from Bio.Alphabet import generic_dna
         out = open(protein_file, "w")
         with open(dna_file) as d_h:
             for seq in d_h:
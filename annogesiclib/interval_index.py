@@ -0,0 +1,138 @@
+from bisect import bisect_right
+
+
+class IntervalIndex(object):
+    '''The index of GFF entries (or other objects with seq_id, strand,
+    start and end) for searching the overlap, containment and the
+    nearby entries. The entries are grouped by seq_id and strand and
+    every group is stored as an implicit augmented interval tree
+    (sorted array in which every node keeps the maximum end of its
+    subtree). All queries are 1-based and closed like GFF, the
+    results are returned in the original order of the entries.'''
+
+    def __init__(self, entries):
+        groups = {}
+        for order, entry in enumerate(entries):
+            key = (entry.seq_id, entry.strand)
+            if key not in groups.keys():
+                groups[key] = []
+            groups[key].append((entry.start, entry.end, order, entry))
+        self.trees = {}
+        for key, datas in groups.items():
+            datas.sort(key=lambda x: (x[0], x[2]))
+            self.trees[key] = self._build_tree(datas)
+
+    def _build_tree(self, datas):
+        '''compute the maximum end of each node of the implicit tree.
+        The node i at level k has the children i - 2^(k-1) and
+        i + 2^(k-1), the leafs are the even indices'''
+        num = len(datas)
+        starts = [data[0] for data in datas]
+        ends = [data[1] for data in datas]
+        maxs = list(ends)
+        if num == 0:
+            return {"starts": starts, "ends": ends, "maxs": maxs,
+                    "datas": datas, "level": -1}
+        last_i = 0
+        last = 0
+        for index in range(0, num, 2):
+            last_i = index
+            last = maxs[index]
+        level = 1
+        while (1 << level) <= num:
+            half = 1 << (level - 1)
+            index = (half << 1) - 1
+            while index < num:
+                left = maxs[index - half]
+                if index + half < num:
+                    right = maxs[index + half]
+                else:
+                    right = last
+                maxs[index] = max(ends[index], left, right)
+                index += half << 2
+            if (last_i >> level) & 1:
+                last_i = last_i - half
+            else:
+                last_i = last_i + half
+            if (last_i < num) and (maxs[last_i] > last):
+                last = maxs[last_i]
+            level += 1
+        return {"starts": starts, "ends": ends, "maxs": maxs,
+                "datas": datas, "level": level - 1}
+
+    def _search_tree(self, tree, start, end):
+        '''get the indices of the nodes which overlap start-end'''
+        founds = []
+        num = len(tree["datas"])
+        if num == 0:
+            return founds
+        starts = tree["starts"]
+        ends = tree["ends"]
+        maxs = tree["maxs"]
+        level = tree["level"]
+        stack = [(level, (1 << level) - 1, False)]
+        while stack:
+            level, index, visit = stack.pop()
+            if level <= 3:
+                first = index >> level << level
+                last = min(first + (1 << (level + 1)) - 1, num)
+                for node in range(first, last):
+                    if starts[node] > end:
+                        break
+                    if ends[node] >= start:
+                        founds.append(node)
+            elif not visit:
+                child = index - (1 << (level - 1))
+                stack.append((level, index, True))
+                if (child >= num) or (maxs[child] >= start):
+                    stack.append((level - 1, child, False))
+            elif (index < num) and (starts[index] <= end):
+                if ends[index] >= start:
+                    founds.append(index)
+                stack.append((level - 1, index + (1 << (level - 1)), False))
+        return founds
+
+    def _get_trees(self, seq_id, strand):
+        if strand is None:
+            return [tree for key, tree in self.trees.items()
+                    if key[0] == seq_id]
+        elif (seq_id, strand) in self.trees.keys():
+            return [self.trees[(seq_id, strand)]]
+        return []
+
+    def _query(self, seq_id, strand, start, end):
+        datas = []
+        for tree in self._get_trees(seq_id, strand):
+            for node in self._search_tree(tree, start, end):
+                datas.append(tree["datas"][node])
+        datas.sort(key=lambda x: x[2])
+        return datas
+
+    def overlap(self, seq_id, strand, start, end):
+        '''the entries which overlap start-end. If strand is None,
+        both strands are searched'''
+        return [data[3] for data in self._query(seq_id, strand, start, end)]
+
+    def nearby(self, seq_id, strand, start, end, fuzzy):
+        '''the entries which overlap or are located within fuzzy nt'''
+        return self.overlap(seq_id, strand, start - fuzzy, end + fuzzy)
+
+    def contain(self, seq_id, strand, start, end):
+        '''the entries which cover the whole start-end'''
+        return [data[3] for data in self._query(seq_id, strand, start, end)
+                if (data[0] <= start) and (data[1] >= end)]
+
+    def within(self, seq_id, strand, start, end):
+        '''the entries which are located inside start-end'''
+        return [data[3] for data in self._query(seq_id, strand, start, end)
+                if (data[0] >= start) and (data[1] <= end)]
+
+    def start_within(self, seq_id, strand, start, end):
+        '''the entries whose start is located inside start-end'''
+        datas = []
+        for tree in self._get_trees(seq_id, strand):
+            first = bisect_right(tree["starts"], start - 1)
+            last = bisect_right(tree["starts"], end)
+            datas.extend(tree["datas"][first:last])
+        datas.sort(key=lambda x: x[2])
+        return [data[3] for data in datas]
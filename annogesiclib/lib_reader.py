@@ -1,7 +1,6 @@
 import sys
 import os, gc
-import numpy as np
-from annogesiclib.parser_wig import WigParser
+from annogesiclib.coverage_store import load_coverage
 
 
 def read_libs(input_libs, wig_folder):
@@ -48,28 +47,18 @@ def read_libs(input_libs, wig_folder):
 
 
 def read_wig(filename, strand, libs):
-    wig_parser = WigParser()
     wigs = {}
     if filename is not False:
-        wig_fh = open(filename)
-        for entry in wig_parser.parser(wig_fh, strand):
-            if entry.strain not in wigs.keys():
-                wigs[entry.strain] = {}
-                for lib in libs:
-                    if lib["cond"] not in wigs[entry.strain]:
-                        wigs[entry.strain][lib["cond"]] = {}
+        covers = load_coverage(filename, strand)
+        for strain, tracks in covers.items():
+            wigs[strain] = {}
             for lib in libs:
-                if (lib["name"] == entry.track) and (
-                        lib["strand"] == entry.strand):
-                    lib_name = "|".join([
-                        entry.track, entry.strand, lib["type"]])
-                    if lib_name not in wigs[entry.strain][lib["cond"]].keys():
-                        wigs[entry.strain][lib["cond"]][lib_name] = []
-                    wigs[entry.strain][lib["cond"]][lib_name].append(entry.coverage)
-        wig_fh.close()
-        for strain, conds in wigs.items():
-            for cond, lib_names in conds.items():
-                for lib_name, cover_list in lib_names.items():
-                    wigs[strain][cond][lib_name] = np.array(
-                            wigs[strain][cond][lib_name])
+                if lib["cond"] not in wigs[strain]:
+                    wigs[strain][lib["cond"]] = {}
+            for track, cover in tracks.items():
+                for lib in libs:
+                    if (lib["name"] == track) and (
+                            lib["strand"] == strand):
+                        lib_name = "|".join([track, strand, lib["type"]])
+                        wigs[strain][lib["cond"]][lib_name] = cover
     return wigs
@@ -1,4 +1,6 @@
 from annogesiclib.gff3 import Gff3Parser
+from annogesiclib.interval_index import IntervalIndex
+from annogesiclib.genome_store import GenomeStore
 
 
 def detect_energy(line, srna):
@@ -80,7 +82,8 @@ def mod_srna_tar_pos(gff, pos, type_, pre_target, suf_target, length):
         g_end = "NA"
     return g_start, g_end
 
-def print_rank_one(srnas, out, feature, gffs, srna_gffs, args_tar, length):
+def print_rank_one(srnas, out, feature, tar_index, srna_names, args_tar,
+                   length):
     out.write("\t".join(["sRNA", "Genome", "sRNA_position",
                          "sRNA_interacted_position_" + feature,
                          "sRNA_strand", "Target_gene_ID", "Target_ID",
@@ -98,10 +101,10 @@ def print_rank_one(srnas, out, feature, gffs, srna_gffs, args_tar, length):
                         rank += 1
                         target["rank"] = rank
                         if (rank <= args_tar.top) and (method == feature):
-                            srna_infos = get_srna_name(srna_gffs, srna_id)
+                            srna_infos = get_srna_name(srna_names, srna_id)
                             name = srna_infos[0]
                             srna_info = srna_infos[1]
-                            target_info = get_target_info(gffs, target)
+                            target_info = get_target_info(tar_index, target)
                             s_start, s_end = mod_srna_tar_pos(
                                     srna_info, target["srna_pos"], "srna",
                                     args_tar.tar_start, args_tar.tar_end,
@@ -134,7 +137,7 @@ def extract_pos(line, srnas, method):
         srnas["tar_pos"] = tar_pos
         srnas["srna_pos"] = srna_pos
 
-def read_rnaplex(rnaplex, genes, genomes, features, srnas):
+def read_rnaplex(rnaplex, tar_index, srnas):
     start = False
     count_seq = 0
     with open(rnaplex, "r") as p_h:
@@ -148,8 +151,7 @@ def read_rnaplex(rnaplex, genes, genomes, features, srnas):
                     target_locus = "_".join(tags[:-3])
                     target_id = tags[-3]
                     detail = "_".join(tags[-2:])
-                    gene_id = get_gene_id(detail, target_id,
-                                          genes, genomes, features)
+                    gene_id = get_gene_id(detail, target_id, tar_index)
                 elif count_seq == 2:
                     srna = line[1:]
                     if srna not in srnas["RNAplex"].keys():
@@ -164,7 +166,7 @@ def read_rnaplex(rnaplex, genes, genomes, features, srnas):
                     detect_energy(line, srnas["RNAplex"][srna][-1])
                     extract_pos(line, srnas["RNAplex"][srna][-1], "RNAplex")
 
-def read_rnaup(rnaup, srna_names, srnas, genes, genomes, features):
+def read_rnaup(rnaup, srna_names, srnas, tar_index):
     with open(rnaup, "r") as u_h:
         for line in u_h:
             line = line.strip()
@@ -176,8 +178,7 @@ def read_rnaup(rnaup, srna_names, srnas, genes, genomes, features):
                     target_locus = "_".join(tags[:-3])
                     target_id = tags[-3]
                     detail = "_".join(tags[-2:])
-                    gene_id = get_gene_id(detail, target_id, genes, genomes,
-                                          features)
+                    gene_id = get_gene_id(detail, target_id, tar_index)
                     if srna in srnas["RNAup"].keys():
                         srnas["RNAup"][srna].append({
                             "target_id": target_id, "target_locus": target_locus,
@@ -193,7 +194,7 @@ def read_rnaup(rnaup, srna_names, srnas, genes, genomes, features):
                 detect_energy(line, srnas["RNAup"][srna][-1])
                 extract_pos(line, srnas["RNAup"][srna][-1], "RNAplex")
 
-def read_intarna(intarna, srnas, genes, genomes, features):
+def read_intarna(intarna, srnas, tar_index):
     with open(intarna, "r") as i_h:
         for line in i_h:
             inter = line.strip().split(";")
@@ -205,8 +206,7 @@ def read_intarna(intarna, srnas, genes, genomes, features):
                     target_id = tags[-3]
                     detail = "_".join(tags[-2:])
                     if (len(tags[0])) != 0:
-                        gene_id = get_gene_id(detail, target_id, genes,
-                                              genomes, features)
+                        gene_id = get_gene_id(detail, target_id, tar_index)
                         if srna not in srnas["IntaRNA"].keys():
                             srnas["IntaRNA"][srna] = []
                         srnas["IntaRNA"][srna].append({
@@ -216,71 +216,99 @@ def read_intarna(intarna, srnas, genes, genomes, features):
                             "tar_pos": ",".join(inter[1:3]),
                             "srna_pos": ",".join(inter[4:6])})
 
-def read_table(gffs, rnaplex, rnaup, intarna, genes, genomes, features):
+def read_table(gffs, rnaplex, rnaup, intarna, tar_index):
     srnas = {"RNAup": {}, "RNAplex": {}, "IntaRNA": {}}
     srna_names = set()
     for gff in gffs:
         if gff.attributes["ID"] not in srna_names:
             srna_names.add(gff.attributes["ID"])
     if rnaplex is not None:
-        read_rnaplex(rnaplex, genes, genomes, features, srnas)
+        read_rnaplex(rnaplex, tar_index, srnas)
     if rnaup is not None:
-        read_rnaup(rnaup, srna_names, srnas, genes, genomes, features)
+        read_rnaup(rnaup, srna_names, srnas, tar_index)
     if intarna is not None:
-        read_intarna(intarna, srnas, genes, genomes, features)
+        read_intarna(intarna, srnas, tar_index)
     return srnas
 
 
-def get_gene_id(detail, tar_id, genes, gffs, features):
-    for gff in gffs:
-        if gff.feature in features:
-            if tar_id != "NA":
-                if "ID" in gff.attributes.keys():
-                    if gff.attributes["ID"] == tar_id:
-                        tar = gff
-                        break
+class TargetIndex(object):
+    '''The lookup tables of the annotation for the target predictions.
+    The targets are indexed by ID and by position, the genes by ID,
+    position and interval. It is built once and shared by the readers of
+    RNAplex, RNAup and IntaRNA and the ranking and merging steps. The
+    results are the same as searching the sorted gff entries in order'''
+
+    def __init__(self, gffs, genes, features):
+        self.ids = {}
+        self.positions = {}
+        self.details = {}
+        for gff in gffs:
+            if gff.feature in features:
+                if ("ID" in gff.attributes.keys()) and (
+                        gff.attributes["ID"] not in self.ids.keys()):
+                    self.ids[gff.attributes["ID"]] = gff
+                position = (gff.start, gff.end, gff.strand)
+                if position not in self.positions.keys():
+                    self.positions[position] = gff
+            detail = str(gff.start) + "-" + str(gff.end) + "_" + gff.strand
+            if detail not in self.details.keys():
+                self.details[detail] = {"gene": None, "other": None}
+            if gff.feature == "gene":
+                if self.details[detail]["gene"] is None:
+                    self.details[detail]["gene"] = gff
             else:
-                start = int(detail.split("-")[0])
-                end = int(detail.split("-")[-1].split("_")[0])
-                strand = detail.split("_")[-1]
-                if (gff.start == start) and (gff.end == end) and (
-                        gff.strand == strand):
-                    tar = gff
-                    break
-    gene_id = "NA"
-    for gene in genes:
+                self.details[detail]["other"] = gff
+        self.genes = [gene for gene in genes if "ID" in gene.attributes.keys()]
+        self.gene_orders = {}
+        self.gene_positions = {}
+        for order, gene in enumerate(self.genes):
+            if gene.attributes["ID"] not in self.gene_orders.keys():
+                self.gene_orders[gene.attributes["ID"]] = order
+            position = (gene.seq_id, gene.strand, gene.start, gene.end)
+            if position not in self.gene_positions.keys():
+                self.gene_positions[position] = order
+        self.gene_tree = IntervalIndex(self.genes)
+        self.gene_ids = {}
+
+    def target(self, detail, tar_id):
+        '''the entry of the target, None if it is not annotated'''
+        if tar_id != "NA":
+            return self.ids.get(tar_id)
+        start = int(detail.split("-")[0])
+        end = int(detail.split("-")[-1].split("_")[0])
+        strand = detail.split("_")[-1]
+        return self.positions.get((start, end, strand))
+
+    def _search_gene(self, tar):
+        '''the parent gene or the gene with the same position, otherwise
+        the first gene which overlaps the target'''
+        if tar is None:
+            return "NA"
+        orders = []
         if "Parent" in tar.attributes.keys():
-            if "ID" in gene.attributes.keys():
-                if (gene.attributes["ID"] in
-                        tar.attributes["Parent"].split(",")):
-                    gene_id = gene.attributes["ID"]
-                    return gene_id
-        if gene_id == "NA":
-            if (gene.seq_id == tar.seq_id) and (
-                    gene.strand == tar.strand) and (
-                    (tar.start == gene.start) and (
-                    tar.end == gene.end)):
-                if "ID" in gene.attributes.keys():
-                    gene_id = gene.attributes["ID"]
-                    return gene_id
-    if gene_id == "NA":
-        for gene in genes:
-            if (gene.seq_id == tar.seq_id) and (
-                    gene.strand == tar.strand):
-                if ((tar.start <= gene.start) and (
-                        tar.end >= gene.end)) or (
-                        (tar.start >= gene.start) and (
-                        tar.end <= gene.end)) or (
-                        (tar.start <= gene.start) and (
-                        tar.end <= gene.end) and (
-                        tar.end >= gene.start)) or (
-                        (tar.start >= gene.start) and (
-                        tar.start <= gene.end) and (
-                        tar.end >= gene.end)):
-                    if "ID" in gene.attributes.keys():
-                        gene_id = gene.attributes["ID"]
-                        return gene_id
-    return gene_id
+            for parent in tar.attributes["Parent"].split(","):
+                if parent in self.gene_orders.keys():
+                    orders.append(self.gene_orders[parent])
+        position = (tar.seq_id, tar.strand, tar.start, tar.end)
+        if position in self.gene_positions.keys():
+            orders.append(self.gene_positions[position])
+        if len(orders) != 0:
+            return self.genes[min(orders)].attributes["ID"]
+        overlaps = self.gene_tree.overlap(tar.seq_id, tar.strand,
+                                          tar.start, tar.end)
+        if len(overlaps) != 0:
+            return overlaps[0].attributes["ID"]
+        return "NA"
+
+    def gene_id(self, detail, tar_id):
+        key = (detail, tar_id)
+        if key not in self.gene_ids.keys():
+            self.gene_ids[key] = self._search_gene(self.target(detail, tar_id))
+        return self.gene_ids[key]
+
+
+def get_gene_id(detail, tar_id, tar_index):
+    return tar_index.gene_id(detail, tar_id)
 
 
 def append_merge_three_methods(name, srna_info, ps_pos, pt_pos, u_data, i_data,
@@ -352,46 +380,40 @@ def import_merge(merges, name, srna_info, srna_m1, srna_m2, srna_m3,
                                        i_data, srna_m1, target_info, merges)
 
 
-def get_srna_name(gffs, srna):
-    detect_name = False
-    srna_info = None
+def index_srna_name(gffs):
+    '''the name and the entry of every sRNA ID'''
+    srna_names = {}
     for gff in gffs:
-        if (gff.attributes["ID"] == srna) and \
-           ("Name" in gff.attributes.keys()):
-            name = gff.attributes["Name"]
-            detect_name = True
-            srna_info = gff
-            break
-        elif (gff.attributes["ID"] == srna):
-            srna_info = gff
-            break
-    if not detect_name:
-        name = srna
-    return (name, srna_info)
-
-
-def get_target_info(gffs, target):
-    tmp_gff = None
-    for gff in gffs:
-        if (str(gff.start) + "-" +
-            str(gff.end) + "_" + gff.strand) == target["detail"]:
-            if gff.feature == "gene":
-                target_info = gff
-                if ("locus_tag" in gff.attributes.keys()) and (
-                        "gene" in gff.attributes.keys()):
-                    if (gff.attributes["gene"] not in target["target_locus"]):
-                        target["target_locus"] = "|".join([
-                            target["target_locus"], gff.attributes["gene"]])
-                elif ("locus_tag" in gff.attributes.keys()) and (
-                        "Name" in gff.attributes.keys()):
-                    if (gff.attributes["Name"] not in target["target_locus"]):
-                        target["target_locus"] = "|".join([
-                            target["target_locus"], gff.attributes["Name"]])
-                return target_info
+        if gff.attributes["ID"] not in srna_names.keys():
+            if "Name" in gff.attributes.keys():
+                srna_names[gff.attributes["ID"]] = (gff.attributes["Name"], gff)
             else:
-                tmp_gff = gff
-    if tmp_gff is not None:
-        return tmp_gff
+                srna_names[gff.attributes["ID"]] = (gff.attributes["ID"], gff)
+    return srna_names
+
+
+def get_srna_name(srna_names, srna):
+    return srna_names.get(srna, (srna, None))
+
+
+def get_target_info(tar_index, target):
+    datas = tar_index.details.get(target["detail"])
+    if datas is None:
+        return None
+    if datas["gene"] is not None:
+        gff = datas["gene"]
+        if ("locus_tag" in gff.attributes.keys()) and (
+                "gene" in gff.attributes.keys()):
+            if (gff.attributes["gene"] not in target["target_locus"]):
+                target["target_locus"] = "|".join([
+                    target["target_locus"], gff.attributes["gene"]])
+        elif ("locus_tag" in gff.attributes.keys()) and (
+                "Name" in gff.attributes.keys()):
+            if (gff.attributes["Name"] not in target["target_locus"]):
+                target["target_locus"] = "|".join([
+                    target["target_locus"], gff.attributes["Name"]])
+        return gff
+    return datas["other"]
 
 
 def remove_no_rank(merges, index):
@@ -492,7 +514,7 @@ def check_method3(srna_m3, srna_m1, method3, srna, srnas):
                     return srna_m3
 
 
-def check_non_overlap(detect, methods, srna_m1, srna_m2, srna_m3, gffs,
+def check_non_overlap(detect, methods, srna_m1, srna_m2, srna_m3, tar_index,
                       merges, name, srna_info, args_tar, length,
                       method3, srna, srnas):
     if (not detect["2"] and len(methods) == 2) or (
@@ -503,7 +525,7 @@ def check_non_overlap(detect, methods, srna_m1, srna_m2, srna_m3, gffs,
             srna_m2["energy"] = 1000
         srna_m3 = check_method3(srna_m3, srna_m1, method3, srna, srnas)
         target_info = get_target_info(
-            gffs, srna_m1)
+            tar_index, srna_m1)
         import_merge(
             merges, name, srna_info, srna_m1,
             srna_m2, srna_m3, target_info,
@@ -511,7 +533,8 @@ def check_non_overlap(detect, methods, srna_m1, srna_m2, srna_m3, gffs,
             args_tar.tar_end, length, len(methods))
         srna_m1["print"] = True
 
-def merge_result(srnas, srna_gffs, args_tar, gffs, merges, length, methods):
+def merge_result(srnas, srna_names, args_tar, tar_index, merges, length,
+                 methods):
     '''merge the results based on the ranking of RNAplex'''
     overlaps = []
     method1 = methods[0]
@@ -520,7 +543,7 @@ def merge_result(srnas, srna_gffs, args_tar, gffs, merges, length, methods):
     if len(methods) == 3:
         method3 = methods[2]
     for srna, srna_m1s in srnas[method1].items():
-        srna_datas = get_srna_name(srna_gffs, srna)
+        srna_datas = get_srna_name(srna_names, srna)
         name = srna_datas[0]
         srna_info = srna_datas[1]
         for srna_m1 in srna_m1s:
@@ -543,7 +566,7 @@ def merge_result(srnas, srna_gffs, args_tar, gffs, merges, length, methods):
                                     if (len(methods) == 2) or (
                                             (len(methods) == 3) and detect["3"]):
                                         target_info = get_target_info(
-                                            gffs, srna_m1)
+                                            tar_index, srna_m1)
                                         import_merge(
                                             overlaps, name, srna_info, srna_m1,
                                             srna_m2, srna_m3, target_info,
@@ -560,7 +583,7 @@ def merge_result(srnas, srna_gffs, args_tar, gffs, merges, length, methods):
                                             len(methods))
                             break
                     check_non_overlap(detect, methods, srna_m1, srna_m2,
-                                      srna_m3, gffs, merges, name, srna_info,
+                                      srna_m3, tar_index, merges, name, srna_info,
                                       args_tar, length, method3, srna, srnas)
     return overlaps
 
@@ -577,11 +600,11 @@ def compare_rest(srnas, rest, srna_last, srna):
     return srna_m3
 
 
-def merge_last(srnas, srna_gffs, args_tar, gffs, merges, length,
+def merge_last(srnas, srna_names, args_tar, tar_index, merges, length,
                method, ref, num_method, rest, switch):
     '''merge the results based on the ranking of RNAup'''
     for srna, srnas_last in srnas[method].items():
-        srna_datas = get_srna_name(srna_gffs, srna)
+        srna_datas = get_srna_name(srna_names, srna)
         name = srna_datas[0]
         srna_info = srna_datas[1]
         for srna_last in srnas_last:
@@ -599,7 +622,7 @@ def merge_last(srnas, srna_gffs, args_tar, gffs, merges, length,
                                     srna_ref["energy"] = 1000
                                 else:
                                     target_info = get_target_info(
-                                        gffs, srna_last)
+                                        tar_index, srna_last)
                                     if num_method == 2:
                                         import_merge(
                                             merges, name, srna_info, srna_ref,
@@ -630,13 +653,8 @@ def merge_last(srnas, srna_gffs, args_tar, gffs, merges, length,
 
 
 def read_fasta(seq_file):
-    length = 0
-    with open(seq_file) as fh:
-        for line in fh:
-            line = line.strip()
-            if not line.startswith(">"):
-                length = length + len(line)
-    return length
+    store = GenomeStore(seq_file)
+    return sum([store.length(name) for name in store])
 
 
 def merge_srna_target(rnaplex, rnaup, intarna, args_tar, out_rnaplex,
@@ -648,41 +666,42 @@ def merge_srna_target(rnaplex, rnaup, intarna, args_tar, out_rnaplex,
     methods = []
     srna_gffs, NA = read_gff(srna_gff_file)
     gffs, genes = read_gff(annotation_gff)
-    srnas = read_table(srna_gffs, rnaplex, rnaup, intarna, genes, gffs,
-                       args_tar.features)
+    tar_index = TargetIndex(gffs, genes, args_tar.features)
+    srnas = read_table(srna_gffs, rnaplex, rnaup, intarna, tar_index)
+    srna_names = index_srna_name(srna_gffs)
     if out_rnaplex is not None:
         print("Ranking for RNAplex")
         methods.append("RNAplex")
         out_p = open(out_rnaplex, "w")
-        print_rank_one(srnas, out_p, "RNAplex", gffs, srna_gffs, args_tar,
-                       length)
+        print_rank_one(srnas, out_p, "RNAplex", tar_index, srna_names,
+                       args_tar, length)
     if out_rnaup is not None:
         print("Ranking for RNAup")
         methods.append("RNAup")
         out_u = open(out_rnaup, "w")
-        print_rank_one(srnas, out_u, "RNAup", gffs, srna_gffs, args_tar,
-                       length)
+        print_rank_one(srnas, out_u, "RNAup", tar_index, srna_names,
+                       args_tar, length)
     if out_intarna is not None:
         print("Ranking for IntaRNA")
         methods.append("IntaRNA")
         out_i = open(out_intarna, "w")
-        print_rank_one(srnas, out_i, "IntaRNA", gffs, srna_gffs, args_tar,
-                       length)
+        print_rank_one(srnas, out_i, "IntaRNA", tar_index, srna_names,
+                       args_tar, length)
     if (len(args_tar.program) >= 2):
         out_m = open(output, "w")
         out_o = open(out_overlap, "w")
         print_title(out_m, methods)
         print_title(out_o, methods)
         print("Merging now...")
-        overlaps = merge_result(srnas, srna_gffs, args_tar, gffs,
+        overlaps = merge_result(srnas, srna_names, args_tar, tar_index,
                                 merges, length, methods)
         if len(methods) == 2:
-            merge_last(srnas, srna_gffs, args_tar, gffs, merges, length,
+            merge_last(srnas, srna_names, args_tar, tar_index, merges, length,
                        methods[1], methods[0], 2, None, False)
         elif len(methods) == 3:
-            merge_last(srnas, srna_gffs, args_tar, gffs, merges, length,
+            merge_last(srnas, srna_names, args_tar, tar_index, merges, length,
                        methods[1], methods[0], 3, methods[2], False)
-            merge_last(srnas, srna_gffs, args_tar, gffs, merges, length,
+            merge_last(srnas, srna_names, args_tar, tar_index, merges, length,
                        methods[2], methods[0], 3, methods[1], True)
         print_file(merges, out_m, len(methods))
         print_file(overlaps, out_o, len(methods))
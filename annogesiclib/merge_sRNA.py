@@ -5,9 +5,9 @@ import copy
 import numpy as np
 from annogesiclib.gff3 import Gff3Parser
 from annogesiclib.helper import Helper
-from annogesiclib.coverage_detection import coverage_comparison
 from annogesiclib.coverage_detection import replicate_comparison
 from annogesiclib.lib_reader import read_wig, read_libs
+from annogesiclib.coverage_stats import get_stats, feature_range, high_low
 
 
 def modify_attributes(pre_srna, srna, srna_type, input_type):
@@ -335,7 +335,8 @@ def get_cutoff(srna, tsss, type_, tables, args_srna):
     if type_ == "inter":
         tss_type = None
         inter_cuts = {"frag": {}, "tex": {}, "notex": {}}
-        fh = open(os.path.join(args_srna.out_folder, "tmp_cutoff_inter"), "r")
+        fh = open(os.path.join(args_srna.out_folder, "_".join([
+            "tmp_cutoff_inter", args_srna.prefix])), "r")
         for row in csv.reader(fh, delimiter='\t'):
             inter_cuts[row[0]][row[1]] = float(row[2])
         if tsss is not None:
@@ -361,7 +362,8 @@ def get_cutoff(srna, tsss, type_, tables, args_srna):
             cut[key] = check_real_cut(types, tss_type, cut[key])
     elif type_ == "utr":
         cut = {}
-        fh = open(os.path.join(args_srna.out_folder, "tmp_median"), "r")
+        fh = open(os.path.join(args_srna.out_folder, "_".join([
+            "tmp_median", args_srna.prefix])), "r")
         for row in csv.reader(fh, delimiter='\t'):
             if (row[0] == srna.seq_id) and (
                     row[1] == srna.attributes["sRNA_type"]):
@@ -458,21 +460,9 @@ def compare_table(srna, tables, type_, wigs_f, wigs_r, texs,
                       srna.attributes["overlap_percent"].replace(",", ";")))
 
 
-def check_start_and_end(start, end, covers):
-    if (start - 2) < 0:
-        c_start = 0
-    else:
-        c_start = start - 2
-    if (end + 2) > len(covers):
-        c_end = len(covers)
-    else:
-        c_end = end + 2
-    return c_start, c_end
-
-
 def get_coverage(wigs, srna):
     cover_sets = {"high": -1, "low": -1, "total": 0, "diff": 0}
-    poss = {"high": 0, "low": 0, "pos": 0}
+    poss = {"pos": 0}
     srna_covers = {}
     for wig_strain, conds in wigs.items():
         if wig_strain == srna.seq_id:
@@ -484,36 +474,16 @@ def get_coverage(wigs, srna):
                     lib_type = lib_name.split("|")[-1]
                     cover_sets["total"] = 0
                     cover_sets["diff"] = 0
-                    first = True
-                    c_start, c_end = check_start_and_end(
-                            srna.start, srna.end, covers)
-                    covers = covers[c_start: c_end]
-                    if srna.strand == "-":
-                        covers = covers[::-1]
-                    pos = 0
-                    for cover in covers:
-                        if (lib_strand == srna.strand):
-                            if srna.strand == "+":
-                                cover_pos = c_start + pos
-                            else:
-                                cover_pos = c_end - pos
-                            if (srna.start <= cover_pos) and (
-                                    srna.end >= cover_pos):
-                                cover_sets["total"] = (cover_sets["total"] +
-                                                       cover)
-                                first = coverage_comparison(
-                                        cover, cover_sets, poss,
-                                        first, srna.strand, cover_pos)
-                            else:
-                                if (srna.strand == "+") and (
-                                        cover_pos > srna.end):
-                                    cover_sets_pos = cover_pos
-                                    break
-                                elif (srna.strand == "-") and (
-                                        cover_pos < srna.start):
-                                    cover_sets["pos"] = cover_pos
-                                    break
-                        pos += 1
+                    if lib_strand == srna.strand:
+                        c_start, c_end = feature_range(
+                            srna.start, srna.end, srna.strand, len(covers))
+                        cover_sets["total"] = get_stats(covers).query(
+                            c_start, c_end)[0]
+                        high, _, low, _ = high_low(
+                            covers, c_start, c_end, srna.strand)
+                        if high is not None:
+                            cover_sets["high"] = high
+                            cover_sets["low"] = low
                     avg = cover_sets["total"] / float(
                             srna.end - srna.start + 1)
                     srna_covers[cond].append({"track": track,
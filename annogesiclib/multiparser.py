@@ -19,7 +19,6 @@ class Multiparser(object):
     def combine_fasta(self, ref_folder, tar_folder, ref_feature):
         '''combine multiple fasta files'''
         tar_merge = os.path.join(tar_folder, "merge_tmp")
-        change = False
         if ref_feature is None:
             ref_feature = ""
         else:
@@ -27,6 +26,7 @@ class Multiparser(object):
         self.helper.check_make_folder(tar_merge)
         for folder in os.listdir(ref_folder):
             files = []
+            merges = []
             if "_folder" in folder:
                 datas = folder.split("_folder")
                 if ref_feature == "":
@@ -58,12 +58,10 @@ class Multiparser(object):
                         filename = ".".join((tar.split("."))[:-1])
                         for file_ in files:
                             if filename == file_:
-                                self.helper.merge_file(
-                                     os.path.join(tar_folder, tar),
-                                     os.path.join(tar_folder, self.tmp_fa))
-                                change = True
-                if change:
-                    change = False
+                                merges.append(os.path.join(tar_folder, tar))
+                if merges:
+                    self.helper.merge_files(
+                        merges, os.path.join(tar_folder, self.tmp_fa))
                     shutil.move(os.path.join(tar_folder, self.tmp_fa),
                                 os.path.join(tar_merge, prefix + ".fa"))
         self.helper.remove_all_content(tar_folder, ".fa", "file")
@@ -90,8 +88,6 @@ class Multiparser(object):
     def combine_wig(self, ref_folder, tar_folder, ref_feature, libs):
         '''combine multiple wig files'''
         tar_merge = os.path.join(tar_folder, "merge_tmp")
-        change_f = False
-        change_r = False
         if ref_feature is None:
             ref_feature = ""
         else:
@@ -99,6 +95,8 @@ class Multiparser(object):
         self.helper.check_make_folder(tar_merge)
         for folder in os.listdir(ref_folder):
             files = []
+            merge_f = []
+            merge_r = []
             if "_folder" in folder:
                 prefix = self.get_prefix(folder, ref_feature)
                 print("Merging wig files of " + prefix)
@@ -117,20 +115,18 @@ class Multiparser(object):
                                 file_ == filename[-1][:-4]):
                             for lib in libs:
                                 if (filename[0] in lib) and (lib[-1] == "+"):
-                                    self.helper.merge_file(
-                                        os.path.join(tar_folder, tar),
-                                        os.path.join(tar_folder,
-                                                     self.tmp_wig_forward))
-                                    change_f = True
+                                    merge_f.append(
+                                        os.path.join(tar_folder, tar))
                                 elif (filename[0] in lib) and (lib[-1] == "-"):
-                                    self.helper.merge_file(
-                                        os.path.join(tar_folder, tar),
-                                        os.path.join(tar_folder,
-                                                     self.tmp_wig_reverse))
-                                    change_r = True
-                if change_f and change_r:
-                    change_f = False
-                    change_r = False
+                                    merge_r.append(
+                                        os.path.join(tar_folder, tar))
+                if merge_f and merge_r:
+                    self.helper.merge_files(
+                        merge_f, os.path.join(tar_folder,
+                                              self.tmp_wig_forward))
+                    self.helper.merge_files(
+                        merge_r, os.path.join(tar_folder,
+                                              self.tmp_wig_reverse))
                     shutil.move(os.path.join(tar_folder, self.tmp_wig_forward),
                                 os.path.join(tar_merge,
                                              prefix + "_forward.wig"))
@@ -151,7 +147,6 @@ class Multiparser(object):
     def combine_gff(self, ref_folder, tar_folder, ref_feature, tar_feature):
         '''combine multiple gff files'''
         tar_merge = os.path.join(tar_folder, "merge_tmp")
-        change = False
         if tar_feature is None:
             tar_feature = ""
         else:
@@ -163,6 +158,7 @@ class Multiparser(object):
         self.helper.check_make_folder(tar_merge)
         for folder in os.listdir(ref_folder):
             files = []
+            merges = []
             if "_folder" in folder:
                 datas = folder.split("_folder")
                 if ref_feature == "":
@@ -191,12 +187,10 @@ class Multiparser(object):
                     for file_ in files:
                         if (".gff" in tar) and (
                                 file_ + tar_feature == tar[:-4]):
-                            self.helper.merge_file(
-                                 os.path.join(tar_folder, tar),
-                                 os.path.join(tar_folder, self.tmp_gff))
-                            change = True
-                if change:
-                    change = False
+                            merges.append(os.path.join(tar_folder, tar))
+                if merges:
+                    self.helper.merge_files(
+                        merges, os.path.join(tar_folder, self.tmp_gff))
                     shutil.move(os.path.join(tar_folder, self.tmp_gff),
                                 os.path.join(tar_folder, "merge_tmp",
                                 prefix + tar_feature + ".gff"))
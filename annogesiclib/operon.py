@@ -4,6 +4,7 @@ from annogesiclib.helper import Helper
 from annogesiclib.detect_operon import operon
 from annogesiclib.stat_operon import stat
 from annogesiclib.combine_gff import combine_gff
+from annogesiclib.parallel import run_jobs
 
 
 class OperonDetection(object):
@@ -29,33 +30,37 @@ class OperonDetection(object):
             if gff.endswith(".gff"):
                 self.helper.check_uni_attributes(os.path.join(gffs, gff))
 
+    def _detect_prefix_operon(self, prefix, args_op, log):
+        out_gff = os.path.join(args_op.output_folder, "gffs",
+                                "_".join([prefix, "operon.gff"]))
+        out_table = os.path.join(self.table_path,
+                                 "_".join([prefix, "operon.csv"]))
+        print("Detecting operons of {0}".format(prefix))
+        if self.tss_path is None:
+            tss = False
+        else:
+            tss = self.helper.get_correct_file(
+                    self.tss_path, "_TSS.gff", prefix, None, None)
+        tran = self.helper.get_correct_file(
+                self.tran_path, "_transcript.gff", prefix, None, None)
+        gff = self.helper.get_correct_file(
+                args_op.gffs, ".gff", prefix, None, None)
+        if self.term_path is None:
+            term = False
+        else:
+            term = self.helper.get_correct_file(
+                    self.term_path, "_term.gff", prefix, None, None)
+        operon(tran, tss, gff, term, args_op.tss_fuzzy,
+               args_op.term_fuzzy, args_op.length, out_table, out_gff)
+        log.write("\t" + out_table + "\n")
+        log.write("\t" + out_gff + "\n")
+
     def _detect_operon(self, prefixs, args_op, log):
         log.write("Running detect_operon.py to detect operon.\n")
         log.write("The the following files are generated:\n")
-        for prefix in prefixs:
-            out_gff = os.path.join(args_op.output_folder, "gffs",
-                                    "_".join([prefix, "operon.gff"]))
-            out_table = os.path.join(self.table_path,
-                                     "_".join([prefix, "operon.csv"]))
-            print("Detecting operons of {0}".format(prefix))
-            if self.tss_path is None:
-                tss = False
-            else:
-                tss = self.helper.get_correct_file(
-                        self.tss_path, "_TSS.gff", prefix, None, None)
-            tran = self.helper.get_correct_file(
-                    self.tran_path, "_transcript.gff", prefix, None, None)
-            gff = self.helper.get_correct_file(
-                    args_op.gffs, ".gff", prefix, None, None)
-            if self.term_path is None:
-                term = False
-            else:
-                term = self.helper.get_correct_file(
-                        self.term_path, "_term.gff", prefix, None, None)
-            operon(tran, tss, gff, term, args_op.tss_fuzzy,
-                   args_op.term_fuzzy, args_op.length, out_table, out_gff)
-            log.write("\t" + out_table + "\n")
-            log.write("\t" + out_gff + "\n")
+        run_jobs(self._detect_prefix_operon,
+                 [(prefix, args_op) for prefix in prefixs],
+                 args_op.threads, log)
 
     def _check_and_parser_gff(self, args_op):
         self._check_gff(args_op.gffs, "gff")
@@ -3,16 +3,12 @@ import sys
 from annogesiclib.helper import Helper
 from annogesiclib.multiparser import Multiparser
 from annogesiclib.optimize_TSSpredator import optimization
+from annogesiclib.genome_store import GenomeStore
 
 
 def get_length(fasta_file):
-    length = 0
-    with open(fasta_file) as fh:
-        for line in fh:
-            line = line.strip()
-            if not line.startswith(">"):
-                length = length + len(line)
-    return length 
+    store = GenomeStore(fasta_file)
+    return sum([store.length(name) for name in store])
 
 
 def optimize_tss(args_ops, log):
@@ -3,47 +3,68 @@ import shutil
 import sys
 import random
 import csv
-from subprocess import Popen
 import math
-import time
 from annogesiclib.gff3 import Gff3Parser
 from annogesiclib.converter import Converter
+from annogesiclib.interval_index import IntervalIndex
+from annogesiclib.parallel import CommandPool
+from annogesiclib.tsspredator_cache import TSSpredatorCache
 import copy
 
 
-def compute_stat(stat_value, best, best_para, cores,
-                 list_num, out_path, indexs, strain):
-    if indexs["change"]:
-        indexs["change"] = False
-        best = stat_value
-        best_para = copy.deepcopy(list_num[-1 * cores + indexs["count"]])
-        best_out = open(out_path + "/best_" + strain + ".csv", "w")
-        para_line = "_".join(["he", str(best_para["height"]),
-                              "rh", str(best_para["re_height"]),
-                              "fa", str(best_para["factor"]),
-                              "rf", str(best_para["re_factor"]),
-                              "bh", str(best_para["base_height"]),
-                              "ef", str(best_para["enrichment"]),
-                              "pf", str(best_para["processing"])])
-        best_out.write("{0}\t{1}\tTP={2}\tTP_rate={3}\tFP={4}\tFP_rate={5}\t"
-                       "FN={6}\tMissing_ratio={7}\t".format(
-                           (indexs["step"] - cores + 1 + indexs["count"]),
-                           para_line, best["tp"], best["tp_rate"], best["fp"],
-                           best["fp_rate"], best["fn"], best["missing_ratio"]))
-        best_out.close()
+class ParaList(list):
+    '''the list of the visited parameter sets. The parameter sets are
+    also kept in a hashed set, so checking a new parameter set does not
+    need to scan the whole list'''
+
+    def __init__(self, paras=()):
+        super(ParaList, self).__init__()
+        self.visited = set()
+        for para in paras:
+            self.append(para)
+
+    def _key(self, para):
+        return tuple(sorted(para.items()))
+
+    def append(self, para):
+        self.visited.add(self._key(para))
+        super(ParaList, self).append(para)
+
+    def __contains__(self, para):
+        return self._key(para) in self.visited
+
+
+def get_para_name(para):
+    '''the name of the parameter set which is used in stat.csv'''
+    return "_".join(["he", str(para["height"]),
+                     "rh", str(para["re_height"]),
+                     "fa", str(para["factor"]),
+                     "rf", str(para["re_factor"]),
+                     "bh", str(para["base_height"]),
+                     "ef", str(para["enrichment"]),
+                     "pf", str(para["processing"])])
+
+
+def write_best(out_path, strain, step, best_para, best):
+    best_out = open(out_path + "/best_" + strain + ".csv", "w")
+    best_out.write("{0}\t{1}\tTP={2}\tTP_rate={3}\tFP={4}\tFP_rate={5}\t"
+                   "FN={6}\tMissing_ratio={7}\t".format(
+                       step, get_para_name(best_para), best["tp"],
+                       best["tp_rate"], best["fp"], best["fp_rate"],
+                       best["fn"], best["missing_ratio"]))
+    best_out.close()
+
+
+def print_stat(strain, step, para, stat_value, best_para, best):
+    '''print the current and the best parameters'''
     print(", ".join(["Current genome={0}", "Current Parameters:step={1}",
                     "height={2}", "height_reduction={3}", "factor={4}",
                     "factor_reduction={5}", "base_height={6}",
                     "enrichment_factor={7}",
-                    "processing_factor={8}"]).format(strain,
-                        indexs["step"] - cores + 1 + indexs["count"],
-          list_num[-1 * cores + indexs["count"]]["height"],
-          list_num[-1 * cores + indexs["count"]]["re_height"],
-          list_num[-1 * cores + indexs["count"]]["factor"],
-          list_num[-1 * cores + indexs["count"]]["re_factor"],
-          list_num[-1 * cores + indexs["count"]]["base_height"],
-          list_num[-1 * cores + indexs["count"]]["enrichment"],
-          list_num[-1 * cores + indexs["count"]]["processing"]))
+                    "processing_factor={8}"]).format(
+          strain, step, para["height"], para["re_height"], para["factor"],
+          para["re_factor"], para["base_height"], para["enrichment"],
+          para["processing"]))
     print("Current:TP={0}\tTP_rate={1}\tFP={2}\t"
           "FP_rate={3}\tFN={4}\tMissing_ratio={5}".format(
               stat_value["tp"], stat_value["tp_rate"], stat_value["fp"],
@@ -63,6 +84,18 @@ def compute_stat(stat_value, best, best_para, cores,
           "\tFN={4}\tMissing_ratio={5}".format(
               best["tp"], best["tp_rate"], best["fp"], best["fp_rate"],
               best["fn"], best["missing_ratio"]))
+
+
+def compute_stat(stat_value, best, best_para, cores,
+                 list_num, out_path, indexs, strain):
+    step = indexs["step"] - cores + 1 + indexs["count"]
+    para = list_num[-1 * cores + indexs["count"]]
+    if indexs["change"]:
+        indexs["change"] = False
+        best = stat_value
+        best_para = copy.deepcopy(para)
+        write_best(out_path, strain, step, best_para, best)
+    print_stat(strain, step, para, stat_value, best_para, best)
     indexs["count"] += 1
     return (best_para, best)
 
@@ -120,32 +153,47 @@ def check_overlap(overlap, pre_tss, nums, length, manual, predict, pre_pos):
     return (overlap, pre_pos)
 
 
+def get_predict_cands(predict_index, orders, tss_m, cluster):
+    '''get the predicted TSSs which are close to the manual one, the
+    seq_id without version (e.g. ".1") is also compared'''
+    seq_ids = [tss_m.seq_id]
+    if (tss_m.seq_id[-2:-1] == "."):
+        seq_ids.append(tss_m.seq_id[:-2])
+    cands = []
+    for seq_id in seq_ids:
+        cands = cands + predict_index.start_within(
+            seq_id, tss_m.strand, tss_m.start - max(cluster, 0),
+            tss_m.start + max(cluster, 0))
+    return sorted(cands, key=lambda x: orders[id(x)])
+
+
 def comparison(manuals, predicts, nums, args_ops, length):
     overlap = False
     pre_pos = -1
+    if len(predicts) == 0:
+        return
+    orders = {}
+    for order, tss_p in enumerate(predicts):
+        orders[id(tss_p)] = order
+    predict_index = IntervalIndex(predicts)
     for tss_m in manuals:
         pre_tss = None
-        for tss_p in predicts:
-            if (tss_p.strand == tss_m.strand) and (
-                    (tss_p.seq_id == tss_m.seq_id) or (
-                    (tss_p.seq_id == tss_m.seq_id[:-2]) and (
-                     tss_m.seq_id[-2] == "."))):
-                if (tss_p.start == tss_m.start):
-                    tss_p.attributes["print"] = True
-                    overlap = True
-                    pre_tss = None
-                    break
-                elif (math.fabs(tss_p.start - tss_m.start) <=
-                        args_ops.cluster):
-                    overlap = True
-                    pre_tss = tss_p
-        try:
-            datas = check_overlap(overlap, pre_tss, nums, length,
-                                  tss_m, tss_p, pre_pos)
-            overlap = datas[0]
-            pre_pos = datas[1]
-        except UnboundLocalError:
-            nums = {"overlap": -1, "predict": -1, "manual": -1}
+        tss_p = None
+        for tss_p in get_predict_cands(predict_index, orders, tss_m,
+                                       args_ops.cluster):
+            if (tss_p.start == tss_m.start):
+                tss_p.attributes["print"] = True
+                overlap = True
+                pre_tss = None
+                break
+            elif (math.fabs(tss_p.start - tss_m.start) <=
+                    args_ops.cluster):
+                overlap = True
+                pre_tss = tss_p
+        datas = check_overlap(overlap, pre_tss, nums, length,
+                              tss_m, tss_p, pre_pos)
+        overlap = datas[0]
+        pre_pos = datas[1]
     for tss_p in predicts:
         if tss_p.attributes["print"] is False:
             if (tss_p.start <= int(length)):
@@ -165,92 +213,112 @@ def read_predict_manual_gff(gff_file, length):
     return num, gffs
 
 
+def compute_predict_stat(gff_file, manuals, num_manual, args_ops, length):
+    '''compare the predicted set of the gff file with the manual set'''
+    nums = {"overlap": 0, "predict": 0, "manual": 0}
+    num_predict, predicts = read_predict_manual_gff(gff_file, length)
+    comparison(manuals, predicts, nums, args_ops, length)
+    return {"tp": nums["overlap"],
+            "tp_rate": float(nums["overlap"]) / float(num_manual),
+            "fp": nums["predict"],
+            "fp_rate": float(nums["predict"]) / float(
+                int(length) - num_manual),
+            "fn": nums["manual"],
+            "missing_ratio": float(nums["manual"]) / float(num_manual)}
+
+
+def get_predict_stat(gff_file, key, cache, manuals, num_manual,
+                     args_ops, length):
+    '''get the statistics from the cache or compute it'''
+    stat = None
+    if key is not None:
+        stat = cache.get_stat(key)
+    if stat is None:
+        stat = compute_predict_stat(gff_file, manuals, num_manual,
+                                    args_ops, length)
+        if key is not None:
+            cache.put_stat(key, stat)
+    return stat
+
+
+def write_stat(out, step, para, stat):
+    '''write one line of stat.csv'''
+    out.write("{0}\t{1}\tTP={2}\tTP_rate={3}\t".format(
+              step, get_para_name(para), stat["tp"], stat["tp_rate"]))
+    out.write("FP={0}\tFP_rate={1}\tFN={2}"
+              "\tmissing_ratio={3}\n".format(
+                  stat["fp"], stat["fp_rate"], stat["fn"],
+                  stat["missing_ratio"]))
+    if stat["tp"] == -1:
+        out.write("No TSS is detected within the range\n")
+
+
 def compare_manual_predict(total_step, para_list, gff_files, out_path,
-                           out, args_ops, manuals, num_manual, length):
-    '''compare manual detected set and prediced set and print to stat.csv'''
-#    manual_fh = open(manual, "r")
+                           out, args_ops, manuals, num_manual, length,
+                           cache=None, keys=None):
+    '''compare manual detected set and prediced set and print to stat.csv.
+    If the cache is assigned, the statistics of the cached runs are
+    reused'''
     stats = []
     count = 0
     total_step = total_step - int(args_ops.cores) + 1
-#    num_manual, manuals = read_predict_manual_gff(manual, length)
     if num_manual != 0:
         for gff_file in gff_files:
-            nums = {"overlap": 0, "predict": 0, "manual": 0}
-            para = "_".join(["he", str(para_list[count]["height"]),
-                             "rh", str(para_list[count]["re_height"]),
-                             "fa", str(para_list[count]["factor"]),
-                             "rf", str(para_list[count]["re_factor"]),
-                             "bh", str(para_list[count]["base_height"]),
-                             "ef", str(para_list[count]["enrichment"]),
-                             "pf", str(para_list[count]["processing"])])
-            num_predict, predicts = read_predict_manual_gff(gff_file, length)
-            comparison(manuals, predicts, nums, args_ops, length)
-            out.write("{0}\t{1}\tTP={2}\tTP_rate={3}\t".format(
-                      total_step, para, nums["overlap"],
-                      float(nums["overlap"]) / float(num_manual)))
-            out.write("FP={0}\tFP_rate={1}\tFN={2}"
-                      "\tmissing_ratio={3}\n".format(
-                          nums["predict"], float(nums["predict"]) / float(
-                              int(length) - num_manual),
-                          nums["manual"],
-                          float(nums["manual"]) / float(num_manual)))
-            if nums["overlap"] == -1:
-                out.write("No TSS is detected within the range\n")
-            stats.append({"tp": nums["overlap"],
-                          "tp_rate": float(
-                              nums["overlap"]) / float(num_manual),
-                          "fp": nums["predict"],
-                          "fp_rate": float(nums["predict"]) / float(
-                          length - num_manual),
-                          "fn": nums["manual"],
-                          "missing_ratio": float(
-                              nums["manual"]) / float(num_manual)})
+            key = None if cache is None else keys[count]
+            stat = get_predict_stat(gff_file, key, cache, manuals,
+                                    num_manual, args_ops, length)
+            write_stat(out, total_step, para_list[count], stat)
+            stats.append(stat)
             total_step += 1
             count += 1
-#    manual_fh.close()
     return stats
 
 
-def convert2gff(out_path, gff_files, args_ops, strain):
+def convert_mastertable(out_path, core, args_ops, strain):
+    '''convert the MasterTable of the core to gff file'''
+    output_folder = os.path.join(
+            out_path, "_".join(["MasterTable", str(core)]))
+    gff_file = os.path.join(
+            output_folder, "_".join(["TSSpredator", str(core) + ".gff"]))
+    Converter().convert_mastertable2gff(
+                os.path.join(output_folder, "MasterTable.tsv"),
+                "TSSpredator", args_ops.program,
+                strain, gff_file)
+    return gff_file
+
+
+def convert2gff(out_path, gff_files, args_ops, strain, cache=None, keys=None):
+    '''convert the MasterTables to gff files. If the cache is assigned,
+    the cached gff files are used instead of the MasterTables and the
+    new gff files are stored to the cache. The key of a failed run is
+    None, it will not be cached'''
     for core in range(1, args_ops.cores+1):
-        output_folder = os.path.join(
-                out_path, "_".join(["MasterTable", str(core)]))
-        gff_file = os.path.join(
-                output_folder, "_".join(["TSSpredator", str(core) + ".gff"]))
-        Converter().convert_mastertable2gff(
-                    os.path.join(output_folder, "MasterTable.tsv"),
-                    "TSSpredator", args_ops.program,
-                    strain, gff_file)
+        key = None if cache is None else keys[core - 1]
+        if key is not None:
+            cache_gff = cache.get_gff(key)
+            if cache_gff is not None:
+                gff_files.append(cache_gff)
+                continue
+        gff_file = convert_mastertable(out_path, core, args_ops, strain)
+        if key is not None:
+            cache.put_gff(key, gff_file)
         gff_files.append(gff_file)
 
 
-def run_TSSpredator(tsspredator_path, config_file):
+def run_TSSpredator(pool, tsspredator_path, config_file):
     folders = config_file.split("/")
     out_path = "/".join(folders[:-1])
-    out = open(os.path.join(out_path, "TSSpredator_log.txt"), "w")
-    p = Popen(["java", "-jar",
-               tsspredator_path, config_file], stdout=out)
-    return p
+    return pool.submit(["java", "-jar", tsspredator_path, config_file],
+                       stdout=os.path.join(out_path, "TSSpredator_log.txt"),
+                       name=config_file)
 
 
 def run_TSSpredator_paralle(config_files, tsspredator_path, processes):
     '''it is for running TSSpredator parallel'''
+    pool = CommandPool(len(config_files))
     for config_file in config_files:
-        process = run_TSSpredator(tsspredator_path, config_file)
-        processes.append(process)
-    for p in processes:
-        p.wait()
-        if p.stdout:
-            p.stdout.close()
-        if p.stdin:
-            p.stdin.close()
-        if p.stderr:
-            p.stderr.close()
-        try:
-            p.kill()
-        except OSError:
-            pass
-    time.sleep(5)
+        run_TSSpredator(pool, tsspredator_path, config_file)
+    processes.extend(pool.join())
 
 
 def print_lib(lib_num, lib_list, out, wig_folder, prefix, rep_set):
@@ -423,8 +491,9 @@ def gen_config(para_list, out_path, core, wig, fasta, gff, args_ops, strain):
 def run_tss_and_stat(indexs, list_num, seeds, diff_h, diff_f,
                      out_path, stat_out, best_para, current_para,
                      wig, fasta, gff, best, num_manual, args_ops, strain,
-                     manuals, length, log, set_config, run_tss):
-    '''run TSS and do statistics'''
+                     manuals, length, log, set_config, run_tss, cache=None):
+    '''run TSS and do statistics. The parameter sets which are already
+    in the cache are not run again'''
     if indexs["step"] > args_ops.steps + int(args_ops.cores):
         return (True, best_para)
     elif len(list_num) == indexs["length"]:
@@ -453,20 +522,36 @@ def run_tss_and_stat(indexs, list_num, seeds, diff_h, diff_f,
                               "{0} successfully.\n".format(out_path))
             indexs["count"] = 0
             processes = []
+            keys = None
+            run_configs = config_files
+            if cache is not None:
+                keys = [cache.run_key(config_file, args_ops.program)
+                        for config_file in config_files]
+                run_configs = [config_file for config_file, key in zip(
+                    config_files, keys) if cache.get_gff(key) is None]
+                if len(run_configs) < len(config_files):
+                    log.write("{0} parameter sets are loaded from {1}.\n".format(
+                        len(config_files) - len(run_configs), cache.folder))
             if not run_tss:
                 log.write("Checking the setup of TSSpredator.\n")
                 log.write("Please make sure your version of TSSpredator "
                           "is at least 1.06.\n")
-            run_TSSpredator_paralle(config_files, args_ops.tsspredator_path,
+            run_TSSpredator_paralle(run_configs, args_ops.tsspredator_path,
                                     processes)
+            for process in processes:
+                if process["returncode"] != 0:
+                    log.write("{0} is failed (exit code {1}).\n".format(
+                              process["name"], process["returncode"]))
+                    if keys is not None:
+                        keys[config_files.index(process["name"])] = None
             if not run_tss:
                 run_tss = True
                 log.write("TSSpredator is running successfully.\n")
-            convert2gff(out_path, gff_files, args_ops, strain)
+            convert2gff(out_path, gff_files, args_ops, strain, cache, keys)
             stat_values = compare_manual_predict(
                               indexs["step"], list_num[-1 * args_ops.cores:],
                               gff_files, out_path, stat_out, args_ops, manuals,
-                              num_manual, length)
+                              num_manual, length, cache, keys)
             for stat_value in stat_values:
                 if indexs["first"]:
                     indexs["first"] = False
@@ -777,7 +862,8 @@ def run_random_part(current_para, list_num, max_num, steps, indexs):
 
 def optimization_process(indexs, current_para, list_num, max_num, best_para,
                          out_path, stat_out, best, wig, fasta, gff, num_manual,
-                         new, args_ops, strain, manuals, length, log):
+                         new, args_ops, strain, manuals, length, log,
+                         cache=None):
     '''main part of opimize TSSpredator'''
     features = {"pre_feature": "", "feature": ""}
     seeds = {"pre_seed": [], "seed": 0}
@@ -824,7 +910,7 @@ def optimization_process(indexs, current_para, list_num, max_num, best_para,
                     indexs, list_num, seeds, diff_h, diff_f, out_path,
                     stat_out, best_para, current_para, wig, fasta, gff,
                     best, num_manual, args_ops, strain, manuals, length,
-                    log, set_config, run_tss)
+                    log, set_config, run_tss, cache)
             tmp_step = 0
         else:
             indexs["step"] = indexs["step"] - 1
@@ -846,6 +932,172 @@ def optimization_process(indexs, current_para, list_num, max_num, best_para,
             break
 
 
+def propose_para(seeds, features, indexs, current_para, list_num,
+                 max_num, best_para, args_ops):
+    '''propose a new parameter set for the asynchronous optimization.
+    The random, large change and small change parts are switched as the
+    normal optimization. None is returned if no new parameter set can
+    be found'''
+    for attempt in range(24):
+        length = len(list_num)
+        features["feature"] = ["r", "l", "s"][indexs["switch"] % 3]
+        if features["feature"] != features["pre_feature"]:
+            seeds["pre_seed"] = []
+        if features["feature"] == "r":
+            run_random_part(current_para, list_num, max_num,
+                            args_ops.steps, indexs)
+        elif features["feature"] == "l":
+            run_large_change_part(seeds, features, indexs, current_para,
+                                  max_num, best_para, list_num)
+        else:
+            run_small_change_part(seeds, features, indexs, current_para,
+                                  best_para, list_num, max_num)
+        features["pre_feature"] = features["feature"]
+        if len(list_num) == length:
+            seeds["pre_seed"].append(seeds["seed"])
+            continue
+        seeds["pre_seed"] = []
+        para = list_num[-1]
+        if (para["height"] > para["re_height"]) and (
+                para["factor"] > para["re_factor"]):
+            return copy.deepcopy(para)
+    return None
+
+
+def finish_async_run(job, core, para, key, state, out_path, stat_out,
+                     num_manual, args_ops, strain, manuals, length,
+                     indexs, cache, log):
+    '''score the finished run immediately and update the best
+    parameters, the core is free for the next parameter set. A failed
+    run is counted as a step as well'''
+    state["free"].append(core)
+    if (job is not None) and (job["returncode"] != 0):
+        log.write("{0} is failed (exit code {1}).\n".format(
+                  job["name"], job["returncode"]))
+        state["failed"] += 1
+        indexs["step"] += 1
+        return
+    state["failed"] = 0
+    gff_file = None
+    if key is not None:
+        gff_file = cache.get_gff(key)
+    if gff_file is None:
+        gff_file = convert_mastertable(out_path, core, args_ops, strain)
+        if key is not None:
+            cache.put_gff(key, gff_file)
+    stat = get_predict_stat(gff_file, key, cache, manuals, num_manual,
+                            args_ops, length)
+    write_stat(stat_out, indexs["step"], para, stat)
+    stat_out.flush()
+    if indexs["first"]:
+        indexs["first"] = False
+        indexs["change"] = True
+    else:
+        scoring_function(state["best"], stat, indexs, num_manual)
+    if indexs["change"]:
+        indexs["change"] = False
+        state["best"] = stat
+        state["best_para"] = copy.deepcopy(para)
+        write_best(out_path, strain, indexs["step"], state["best_para"],
+                   state["best"])
+    print_stat(strain, indexs["step"], para, stat, state["best_para"],
+               state["best"])
+    indexs["step"] += 1
+
+
+def start_async_run(pool, core, para, state, out_path, stat_out, wig, fasta,
+                    gff, num_manual, args_ops, strain, manuals, length,
+                    indexs, cache, log):
+    '''run TSSpredator with the parameter set on the free core. If the
+    parameter set is cached, it is scored without running'''
+    config_file = gen_config(para, out_path, core, wig, fasta, gff,
+                             args_ops, strain)
+    key = None
+    if cache is not None:
+        key = cache.run_key(config_file, args_ops.program)
+        if cache.get_gff(key) is not None:
+            finish_async_run(None, core, para, key, state, out_path,
+                             stat_out, num_manual, args_ops, strain,
+                             manuals, length, indexs, cache, log)
+            return
+    master_table = os.path.join(out_path, "_".join([
+        "MasterTable", str(core)]), "MasterTable.tsv")
+    if os.path.exists(master_table):
+        os.remove(master_table)
+    pool.submit(["java", "-jar", args_ops.tsspredator_path, config_file],
+                stdout=os.path.join(os.path.dirname(master_table),
+                                    "TSSpredator_log.txt"),
+                name=config_file,
+                callback=lambda job: finish_async_run(
+                    job, core, para, key, state, out_path, stat_out,
+                    num_manual, args_ops, strain, manuals, length,
+                    indexs, cache, log))
+
+
+def optimization_async(indexs, current_para, list_num, max_num, best_para,
+                       out_path, stat_out, best, wig, fasta, gff, num_manual,
+                       new, args_ops, strain, manuals, length, log,
+                       cache=None):
+    '''the asynchronous optimization. Every parallel has its own config
+    file and MasterTable folder. When a run of TSSpredator is finished,
+    it is scored immediately and a new parameter set (proposed based on
+    the current best one) is started, so all parallels are kept busy.
+    The optimization is aborted if the number of consecutive failed runs
+    reaches the number of parallels'''
+    features = {"pre_feature": "", "feature": ""}
+    seeds = {"pre_seed": [], "seed": 0}
+    state = {"best": best, "best_para": best_para,
+             "free": list(range(1, args_ops.cores + 1)), "failed": 0}
+    if num_manual == 0:
+        log.write("No manual-detected TSS/PS is found within the range.\n")
+        return (state["best_para"], state["best"])
+    log.write("The asynchronous optimization starts.\n")
+    pool = CommandPool(args_ops.cores)
+    paras = []
+    if new:
+        start_data(current_para, list_num)
+        paras.append(copy.deepcopy(list_num[-1]))
+    num_para = 0
+    stop = False
+    while True:
+        if state["failed"] >= args_ops.cores:
+            stop = True
+        while state["free"] and (not stop) and (
+                indexs["step"] + len(pool.running) < args_ops.steps):
+            if paras:
+                para = paras.pop(0)
+            else:
+                para = propose_para(seeds, features, indexs, current_para,
+                                    list_num, max_num, state["best_para"],
+                                    args_ops)
+            if para is None:
+                stop = True
+                print("The number of steps may be enough, it "
+                      "may not be able to find more parameters\n")
+                log.write("The optimization stop because no more "
+                          "combination of parameters can be found.\n")
+                break
+            num_para += 1
+            if num_para % args_ops.cores == 0:
+                indexs["switch"] += 1
+            start_async_run(pool, state["free"].pop(0), para, state,
+                            out_path, stat_out, wig, fasta, gff, num_manual,
+                            args_ops, strain, manuals, length, indexs,
+                            cache, log)
+        if not pool.running:
+            break
+        pool.wait()
+    pool.join()
+    if state["failed"] >= args_ops.cores:
+        print("Error: The last {0} runs of TSSpredator are failed, please "
+              "check --tsspredator_path and the TSSpredator_log.txt in "
+              "{1}!".format(state["failed"], out_path))
+        log.write("The optimization is stopped because the last {0} runs "
+                  "of TSSpredator are failed.\n".format(state["failed"]))
+        sys.exit()
+    return (state["best_para"], state["best"])
+
+
 def start_data(current_para, list_num):
     '''setup the start parameter as default one'''
     current_para["height"] = 0.3
@@ -1004,17 +1256,17 @@ def optimization(wig, fasta, gff, args_ops, manual, length, strain, log):
     num_manual, manuals = read_predict_manual_gff(manual, length)
     log.write(manual + " is loaded successfully.\n")
     if len(os.listdir(out_path)) == 1:
-        list_num = []
+        list_num = ParaList()
         stat_out = open(stat_file, "w")
     else:
         if (("stat_" + strain + ".csv") in os.listdir(out_path)):
             empty_file = check_empty(stat_file)
             if empty_file:
                 os.remove(stat_file)
-                list_num = []
+                list_num = ParaList()
                 stat_out = open(stat_file, "w")
             else:
-                list_num = []
+                list_num = ParaList()
                 new = False
                 log.write("Checking the previous results.\n")
                 datas = reload_data(out_path, list_num, best, best_para, indexs,
@@ -1029,11 +1281,21 @@ def optimization(wig, fasta, gff, args_ops, manual, length, strain, log):
                 stat_out = open(stat_file, "a")
                 indexs["first"] = False
         else:
-            list_num = []
+            list_num = ParaList()
             stat_out = open(stat_file, "w")
-    optimization_process(indexs, current_para, list_num, max_num, best_para,
-                         out_path, stat_out, best, wig, fasta, gff,
-                         num_manual, new, args_ops, strain, manuals, length, log)
+    cache = TSSpredatorCache(
+        os.path.join(out_path, "TSSpredator_cache"), args_ops.tsspredator_path,
+        manual, length, args_ops.cluster)
+    if args_ops.asynchronous:
+        optimization_async(indexs, current_para, list_num, max_num, best_para,
+                           out_path, stat_out, best, wig, fasta, gff,
+                           num_manual, new, args_ops, strain, manuals,
+                           length, log, cache)
+    else:
+        optimization_process(indexs, current_para, list_num, max_num,
+                             best_para, out_path, stat_out, best, wig, fasta,
+                             gff, num_manual, new, args_ops, strain, manuals,
+                             length, log, cache)
     log.write("The optimization is done. The following files are generated:\n")
     for file_ in os.listdir(out_path):
         if not file_.startswith("Master") and not file_.startswith("config"):
@@ -0,0 +1,164 @@
+import sys
+import time
+import heapq
+import tempfile
+from io import StringIO
+from subprocess import Popen
+from multiprocessing import Pool
+
+
+def _run_job(func, job, with_log):
+    '''run one job in the worker process. The log is written to a buffer
+    and sent back to the main process'''
+    if with_log:
+        log = StringIO()
+        result = func(*(tuple(job) + (log,)))
+        return result, log.getvalue()
+    return func(*job), ""
+
+
+def run_jobs(func, jobs, threads, log=None):
+    '''Run func(*job) for every job of jobs. The independent jobs (for
+    example, one job per genome) are distributed to a pool of processes
+    if threads is more than 1. If log is assigned, it is passed to func
+    as the last argument. The log of each process is kept separately
+    and written to log in the order of jobs. The results are returned
+    in the order of jobs as well.'''
+    jobs = [tuple(job) for job in jobs]
+    if (threads is None) or (threads <= 1) or (len(jobs) <= 1):
+        if log is None:
+            return [func(*job) for job in jobs]
+        return [func(*(job + (log,))) for job in jobs]
+    sys.stdout.flush()
+    sys.stderr.flush()
+    if log is not None:
+        log.flush()
+    pool = Pool(processes=min(threads, len(jobs)))
+    try:
+        results = pool.starmap(
+            _run_job, [(func, job, log is not None) for job in jobs],
+            chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+    datas = []
+    for result, log_data in results:
+        if log is not None:
+            log.write(log_data)
+        datas.append(result)
+    return datas
+
+
+def balance_jobs(costs, num):
+    '''Split the jobs into at most num groups whose total costs are
+    similar (longest processing time first: the most expensive job is
+    assigned to the group with the lowest total cost). costs is the list
+    of the estimated costs of the jobs. The groups are returned as the
+    lists of job indices (in the original order), the most expensive
+    group first, so they can be submitted in this order.'''
+    groups = [[0, index, []] for index in range(
+        max(1, min(num, len(costs))))]
+    for index in sorted(range(len(costs)), key=lambda x: -costs[x]):
+        group = heapq.heappop(groups)
+        group[0] += costs[index]
+        group[2].append(index)
+        heapq.heappush(groups, group)
+    groups.sort(key=lambda x: (-x[0], x[1]))
+    return [sorted(group[2]) for group in groups]
+
+
+class CommandPool(object):
+    '''Run the external commands with at most "threads" of them at the
+    same time. A new command is started as soon as one of the running
+    commands finishes, so a slow job does not block the others.
+
+    stdin, stdout and stderr of a command can be assigned as file paths.
+    If stdout or stderr is not assigned, it is captured and stored in
+    the result of the job. The results are dictionaries with the keys
+    name, command, returncode, time, stdout and stderr.'''
+
+    def __init__(self, threads, log=None, interval=0.05):
+        self.threads = max(1, threads)
+        self.log = log
+        self.interval = interval
+        self.running = []
+        self.jobs = []
+
+    def _open(self, path, mode):
+        if path is None:
+            return tempfile.TemporaryFile(mode="w+")
+        return open(path, mode)
+
+    def _finish(self, job):
+        job["returncode"] = job["process"].returncode
+        job["time"] = time.time() - job["start"]
+        for key in ("stdin", "stdout", "stderr"):
+            handle = job["handles"][key]
+            if handle is None:
+                continue
+            if (key != "stdin") and (job[key] is None):
+                handle.seek(0)
+                job[key] = handle.read()
+            handle.close()
+        del job["process"]
+        del job["handles"]
+        if self.log is not None:
+            self.log.write("\t{0} is done in {1:.2f} seconds "
+                           "(exit code {2}).\n".format(
+                               job["name"], job["time"], job["returncode"]))
+        if job["callback"] is not None:
+            job["callback"](job)
+
+    def _check_running(self):
+        '''finish the jobs which are done, return True if any'''
+        done = False
+        for job in list(self.running):
+            if job["process"].poll() is not None:
+                self.running.remove(job)
+                self._finish(job)
+                done = True
+        return done
+
+    def _wait_free(self, threads):
+        while len(self.running) >= threads:
+            if not self._check_running():
+                time.sleep(self.interval)
+
+    def submit(self, command, stdin=None, stdout=None, stderr=None,
+               name=None, callback=None):
+        '''start the command, or wait until one of the running
+        commands finishes if all threads are busy. callback(job) is
+        called in the main process when the job is finished'''
+        self._wait_free(self.threads)
+        handles = {"stdin": None, "stdout": None, "stderr": None}
+        if stdin is not None:
+            handles["stdin"] = open(stdin, "r")
+        handles["stdout"] = self._open(stdout, "w")
+        handles["stderr"] = self._open(stderr, "w")
+        if name is None:
+            name = " ".join(command)
+        job = {"name": name, "command": command, "stdin": stdin,
+               "stdout": stdout, "stderr": stderr, "returncode": None,
+               "time": None, "callback": callback, "handles": handles,
+               "start": time.time()}
+        job["process"] = Popen(command, stdin=handles["stdin"],
+                               stdout=handles["stdout"],
+                               stderr=handles["stderr"])
+        self.running.append(job)
+        self.jobs.append(job)
+        return job
+
+    def wait(self):
+        '''wait until at least one of the running commands finishes'''
+        if not self.running:
+            return
+        while not self._check_running():
+            time.sleep(self.interval)
+
+    def join(self):
+        '''wait for all jobs and return the results in the order of
+        submission'''
+        self._wait_free(1)
+        jobs = self.jobs
+        self.jobs = []
+        return jobs
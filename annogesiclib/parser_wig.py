@@ -1,7 +1,76 @@
+import numpy as np
+
+
 class WigParser(object):
     '''parser the wiggle file based on 
     strain, track, position and coverage'''
 
+    def _get_step_info(self, datas):
+        infos = {}
+        for data in datas[1:]:
+            if "=" in data:
+                key, value = data.split("=", 1)
+                infos[key] = value
+        return infos
+
+    def _block_array(self, block, strand):
+        '''fill the coverage of one variableStep/fixedStep block
+        to an array which starts from the first nucleotide'''
+        if block["type"] == "variableStep":
+            values = np.array(" ".join(block["lines"]).split(),
+                              dtype=np.float64)
+            poss = values[0::2].astype(np.int64)
+            covers = values[1::2]
+        else:
+            covers = np.array(" ".join(block["lines"]).split(),
+                              dtype=np.float64)
+            poss = block["start"] + (
+                np.arange(len(covers), dtype=np.int64) * block["step"])
+        if strand != "+":
+            covers = np.abs(covers)
+        if len(poss) == 0:
+            return np.zeros(0)
+        span = block["span"]
+        wigs = np.zeros(int(poss.max()) + span - 1)
+        if span == 1:
+            wigs[poss - 1] = covers
+        else:
+            offsets = np.arange(span, dtype=np.int64)
+            wigs[(np.repeat(poss - 1, span) + np.tile(
+                offsets, len(poss)))] = np.repeat(covers, span)
+        return wigs
+
+    def parser_array(self, wig_fh, strand):
+        '''parser the wiggle file block by block. It yields the strain,
+        track and a numpy array of coverage (index 0 is position 1)
+        in which the gaps are filled by 0'''
+        track = ""
+        block = None
+        for line in wig_fh:
+            line = line.strip()
+            if len(line) == 0:
+                continue
+            if line[0].isdigit() or line[0] == "-":
+                if block is not None:
+                    block["lines"].append(line)
+                continue
+            if block is not None:
+                yield (block["strain"], track,
+                       self._block_array(block, strand))
+                block = None
+            datas = line.split(" ")
+            if datas[0] == "track":
+                track = datas[2].split("=")
+                track = track[1].replace("\"", "")
+            elif (datas[0] == "variableStep") or (datas[0] == "fixedStep"):
+                infos = self._get_step_info(datas)
+                block = {"type": datas[0], "strain": infos["chrom"],
+                         "span": int(infos.get("span", 1)),
+                         "start": int(infos.get("start", 1)),
+                         "step": int(infos.get("step", 1)), "lines": []}
+        if block is not None:
+            yield (block["strain"], track, self._block_array(block, strand))
+
     def parser(self, wig_fh, strand):
         track = ""
         strain = ""
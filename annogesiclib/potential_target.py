@@ -1,6 +1,7 @@
 import os
 from annogesiclib.helper import Helper
 from annogesiclib.gff3 import Gff3Parser
+from annogesiclib.genome_store import read_seq
 
 
 def assign_name(entry):
@@ -30,18 +31,10 @@ def print_fasta(entry, seq, out, gene):
 
 
 def read_file(seq_file, gff_file, target_folder, features):
-    fastas = []
     cdss_f = []
     cdss_r = []
     genes = []
-    with open(seq_file, "r") as seq_f:
-        for line in seq_f:
-            if line.startswith(">"):
-                continue
-            else:
-                line = line.strip()
-                fastas.append(line)
-    fasta = "".join(fastas)
+    fasta = read_seq(seq_file)
     g_h = open(gff_file)
     for entry in Gff3Parser().entries(g_h):
         if os.path.exists(os.path.join(target_folder,
@@ -0,0 +1,86 @@
+import os
+import shutil
+import hashlib
+from annogesiclib.tsspredator_cache import file_hash
+
+
+def read_fasta_records(fasta):
+    '''the names (the first word of the header) and the sequences of
+    the fasta file'''
+    records = []
+    with open(fasta) as fh:
+        for line in fh:
+            line = line.strip()
+            if line.startswith(">"):
+                records.append([line[1:].split()[0], []])
+            elif (len(line) != 0) and (len(records) != 0):
+                records[-1][1].append(line)
+    return [(name, "".join(seqs)) for name, seqs in records]
+
+
+class RNAplfoldCache(object):
+    '''The content-addressed cache of the accessibility profiles of
+    RNAplfold. The key of a sequence is computed from the sequence, the
+    window size, the span, the length of unpaired region and RNAplfold
+    itself, so the profiles of the same targets can be reused by the
+    later runs (other sRNAs or other cutoffs of energy).'''
+
+    suffixs = ["_openen", "_lunp"]
+
+    def __init__(self, folder, rnaplfold_path):
+        self.folder = folder
+        if not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
+        tool = str(rnaplfold_path)
+        if rnaplfold_path is not None:
+            tool = shutil.which(rnaplfold_path) or tool
+        if os.path.isfile(tool):
+            tool = file_hash(tool)
+        self.tool = tool
+
+    def seq_key(self, seq, win_size, span, unstr_region):
+        datas = [self.tool, str(win_size), str(span), str(unstr_region),
+                 seq.upper().replace("T", "U")]
+        return hashlib.sha1("\n".join(datas).encode("utf-8")).hexdigest()
+
+    def profile(self, key, suffix):
+        return os.path.join(self.folder, key + suffix)
+
+    def _link(self, src, dst):
+        if os.path.exists(dst):
+            os.remove(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+
+    def prepare(self, fasta, win_size, span, unstr_region, out_folder,
+                missing_fasta):
+        '''put the cached profiles of the sequences of fasta to
+        out_folder. The sequences which are not cached are written to
+        missing_fasta and returned as (name, key)'''
+        missings = []
+        out = open(missing_fasta, "w")
+        for name, seq in read_fasta_records(fasta):
+            key = self.seq_key(seq, win_size, span, unstr_region)
+            if os.path.exists(self.profile(key, "_openen")):
+                for suffix in self.suffixs:
+                    if os.path.exists(self.profile(key, suffix)):
+                        self._link(self.profile(key, suffix),
+                                   os.path.join(out_folder, name + suffix))
+            else:
+                missings.append((name, key))
+                out.write(">{0}\n{1}\n".format(name, seq))
+        out.close()
+        return missings
+
+    def store(self, missings, out_folder):
+        '''store the profiles which are computed by RNAplfold'''
+        for name, key in missings:
+            for suffix in self.suffixs:
+                filename = os.path.join(out_folder, name + suffix)
+                if os.path.exists(filename):
+                    tmp_file = "".join([self.profile(key, suffix), ".",
+                                        str(os.getpid()), ".tmp"])
+                    shutil.copyfile(filename, tmp_file)
+                    os.replace(tmp_file, self.profile(key, suffix))
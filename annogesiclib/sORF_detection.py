@@ -3,19 +3,9 @@ import numpy as np
 from annogesiclib.helper import Helper
 from annogesiclib.gff3 import Gff3Parser
 from annogesiclib.lib_reader import read_libs, read_wig
+from annogesiclib.genome_store import GenomeStore
 from annogesiclib.coverage_detection import replicate_comparison, get_repmatch
-
-
-def check_start_and_end(start, end, covers):
-    if (start - 2) < 0:
-        c_start = 0
-    else:
-        c_start = start - 2
-    if (end + 2) > len(covers):
-        c_end = len(covers)
-    else:
-        c_end = end + 2
-    return c_start, c_end
+from annogesiclib.coverage_stats import get_stats, feature_range
 
 
 def get_coverage(sorf, wigs, strand, coverages, medianlist, cutoffs, min_cutoff):
@@ -31,32 +21,14 @@ def get_coverage(sorf, wigs, strand, coverages, medianlist, cutoffs, min_cutoff)
                     lib_strand = lib_name.split("|")[-2]
                     lib_type = lib_name.split("|")[-1]
                     total_cover = 0
-                    first = True
-                    c_start, c_end = check_start_and_end(
-                            sorf["start"], sorf["end"], covers)
-                    covers = covers[c_start: c_end]
-                    if strand == "-":
-                        covers = covers[::-1]
-                    pos = 0
-                    for cover in covers:
-                        if (lib_strand == strand):
-                            if strand == "+":
-                                cover_pos = c_start + pos
-                            else:
-                                cover_pos = c_end - pos
-                            if (sorf["start"] <= cover_pos) and (
-                                    sorf["end"] >= cover_pos):
-                                total_cover = total_cover + cover
-                                if first:
-                                    first = False
-                                    high_cover = cover
-                                    low_cover = cover
-                                else:
-                                    if high_cover < cover:
-                                        high_cover = cover
-                                    if low_cover > cover:
-                                        low_cover = cover
-                        pos += 1
+                    if lib_strand == strand:
+                        c_start, c_end = feature_range(
+                            sorf["start"], sorf["end"], strand, len(covers))
+                        total_cover, high, low = get_stats(covers).query(
+                            c_start, c_end)
+                        if high is not None:
+                            high_cover = high
+                            low_cover = low
                     avg = total_cover / float(sorf["end"] - sorf["start"] + 1)
                     if medianlist is not None:
                         cutoff_cover = get_cutoff(sorf, track, coverages,
@@ -123,8 +95,10 @@ def detect_rbs_site(fasta, start, inter, args_sorf):
 def check_terminal_seq(seq, start, end, args_sorf, source, inter, sorfs, rbs):
     '''check the sequence which are located at the two ends'''
     detect = None
-    for i in [0, 1, -1, 2, -2]:
-        fasta = Helper().extract_gene(seq, start + i, end + i, inter.strand)
+    shifts = [0, 1, -1, 2, -2]
+    fastas = Helper().extract_genes({inter.seq_id: seq}, [
+        (inter.seq_id, start + i, end + i, inter.strand) for i in shifts])
+    for i, fasta in zip(shifts, fastas):
         if (fasta[:3] in args_sorf.start_codon) and (
                 fasta[-3:] in args_sorf.stop_codon):
             detect = i
@@ -142,8 +116,10 @@ def detect_start_stop(inters, seq, args_sorf):
             inter.start = 1
         if inter.end >= len(seq[inter.seq_id]):
             inter.end = len(seq[inter.seq_id])
-        fasta = Helper().extract_gene(
-                seq[inter.seq_id], inter.start, inter.end, inter.strand)
+    fastas = Helper().extract_genes(seq, [
+        (inter.seq_id, inter.start, inter.end, inter.strand)
+        for inter in inters])
+    for inter, fasta in zip(inters, fastas):
         starts = []
         stops = []
         for frame in range(0, 3):
@@ -198,7 +174,6 @@ def detect_start_stop(inters, seq, args_sorf):
 
 
 def read_data(inter_gff, tss_file, srna_gff, fasta, utr_detect):
-    seq = {}
     inters = []
     tsss = []
     srnas = []
@@ -233,14 +208,7 @@ def read_data(inter_gff, tss_file, srna_gff, fasta, utr_detect):
         fh.close()
     else:
         srnas = None
-    with open(fasta, "r") as s_f:
-        for line in s_f:
-            line = line.strip()
-            if line.startswith(">"):
-                strain = line[1:]
-                seq[strain] = ""
-            else:
-                seq[strain] = seq[strain] + line
+    seq = GenomeStore(fasta)
     return inters, tsss, srnas, seq
 
 
@@ -5,8 +5,10 @@ from annogesiclib.gff3 import Gff3Parser
 
 
 def filter_frag(srna_table, srna_gff):
-    out = open("tmp_srna.gff", "w")
-    out_ta = open("tmp_srna.csv", "w")
+    tmp_srna_gff = srna_gff + "tmp"
+    tmp_srna_table = srna_table + "tmp"
+    out = open(tmp_srna_gff, "w")
+    out_ta = open(tmp_srna_table, "w")
     out.write("##gff-version 3\n")
     gffs = []
     tables = []
@@ -53,5 +55,5 @@ def filter_frag(srna_table, srna_gff):
     fh.close()
     os.remove(srna_gff)
     os.remove(srna_table)
-    shutil.move("tmp_srna.gff", srna_gff)
-    shutil.move("tmp_srna.csv", srna_table)
+    shutil.move(tmp_srna_gff, srna_gff)
+    shutil.move(tmp_srna_table, srna_table)
@@ -5,8 +5,10 @@ from annogesiclib.gff3 import Gff3Parser
 
 
 def filter_utr(srna_gff, srna_table, min_utr):
-    out = open("tmp_utr_srna.gff", "w")
-    out_ta = open("tmp_utr_srna.csv", "w")
+    tmp_srna_gff = srna_gff + "tmp"
+    tmp_srna_table = srna_table + "tmp"
+    out = open(tmp_srna_gff, "w")
+    out_ta = open(tmp_srna_table, "w")
     out.write("##gff-version 3\n")
     gffs = []
     tables = []
@@ -31,7 +33,7 @@ def filter_utr(srna_gff, srna_table, min_utr):
     fh.close()
     os.remove(srna_gff)
     os.remove(srna_table)
-    shutil.move("tmp_utr_srna.gff", srna_gff)
-    shutil.move("tmp_utr_srna.csv", srna_table)
+    shutil.move(tmp_srna_gff, srna_gff)
+    shutil.move(tmp_srna_table, srna_table)
     out.close()
     out_ta.close()
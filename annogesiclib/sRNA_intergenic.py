@@ -6,8 +6,10 @@ from annogesiclib.gff3 import Gff3Parser
 from annogesiclib.coverage_detection import coverage_comparison
 from annogesiclib.coverage_detection import replicate_comparison, get_repmatch
 from annogesiclib.lib_reader import read_wig, read_libs
+from annogesiclib.coverage_stats import get_stats, feature_range, high_low
 from annogesiclib.gen_TSS_type import compare_tss_cds, fix_primary_type
 from annogesiclib.helper import Helper
+from annogesiclib.interval_index import IntervalIndex
 from annogesiclib.args_container import ArgsContainer
 
 
@@ -80,6 +82,48 @@ def check_start_and_end(start, end, covers):
     return c_start, c_end
 
 
+def get_range_coverage(start, end, strand, covers, cover_sets, poss):
+    '''get the total, highest and lowest coverage of the range and the
+    stop point next to the range'''
+    c_start, c_end = check_start_and_end(start, end, covers)
+    r_start, r_end = feature_range(start, end, strand, len(covers))
+    cover_sets["total"] = get_stats(covers).query(r_start, r_end)[0]
+    high, _, low, _ = high_low(covers, r_start, r_end, strand)
+    if high is not None:
+        cover_sets["high"] = high
+        cover_sets["low"] = low
+    if strand == "+":
+        if max(c_start, end + 1) < c_end:
+            poss["stop_point"] = max(c_start, end + 1)
+    else:
+        if min(c_end - 1, start - 2) >= c_start:
+            poss["stop_point"] = min(c_end - 1, start - 2) + 1
+
+
+def get_differential_coverage(start, end, strand, covers, cutoff,
+                              cover_sets, poss, args_srna):
+    '''scan the coverage of the range until the coverage is decreased'''
+    checks = {"first": True, "detect_diff": False}
+    num = 0
+    c_start, c_end = check_start_and_end(start, end, covers)
+    covers = covers[c_start: c_end]
+    if strand == "-":
+        covers = covers[::-1]
+    pos = 0
+    for cover in covers:
+        if strand == "+":
+            cover_pos = c_start + pos
+        else:
+            cover_pos = c_end - pos
+        if check_coverage_pos(start, end, cover, cutoff, cover_sets,
+                              checks, poss, strand, cover_pos):
+            break
+        if get_differential_cover(num, checks, cover_sets, poss, cover,
+                                  args_srna, cover_pos):
+            break
+        pos += 1
+
+
 def get_best(wigs, strain, strand, start, end, type_, args_srna, cutoff):
     cover_sets = {"low": -1, "high": -1, "total": 0, "diff": 0}
     poss = {"high": 0, "low": 0, "stop_point": -1}
@@ -94,33 +138,14 @@ def get_best(wigs, strain, strand, start, end, type_, args_srna, cutoff):
                     lib_type = lib_name.split("|")[-1]
                     cover_sets["total"] = 0
                     cover_sets["diff"] = 0
-                    checks = {"first": True, "detect_diff": False}
-                    num = 0
-                    c_start, c_end = check_start_and_end(start, end, covers)
-                    covers = covers[c_start: c_end]
-                    if strand == "-":
-                        covers = covers[::-1]
-                    go_out = False
-                    pos = 0
-                    for cover in covers:
-                        if strand == "+":
-                            cover_pos = c_start + pos
-                        else:
-                            cover_pos = c_end - pos
-                        if (lib_strand == strand):
-                            go_out = check_coverage_pos(
-                                    start, end, cover, cutoff,
-                                    cover_sets, checks, poss,
-                                    strand, cover_pos)
-                            if go_out:
-                                break
-                            if type_ == "differential":
-                                go_out = get_differential_cover(
-                                        num, checks, cover_sets,
-                                        poss, cover, args_srna, cover_pos)
-                                if go_out:
-                                    break
-                        pos += 1
+                    if (lib_strand == strand) and (
+                            type_ == "differential"):
+                        get_differential_coverage(
+                            start, end, strand, covers, cutoff, cover_sets,
+                            poss, args_srna)
+                    elif lib_strand == strand:
+                        get_range_coverage(start, end, strand, covers,
+                                           cover_sets, poss)
                     if strand == "+":
                         diff = poss["stop_point"] - start
                     else:
@@ -655,15 +680,13 @@ def check_overlap(cds, ta):
         return True
 
 
-def compare_ta_cds(cdss, ta, detects):
-    for cds in cdss:
-        if (cds.strand == ta.strand) and (
-                cds.seq_id == ta.seq_id):
+def compare_ta_cds(cds_index, ta, detects):
+    for cds in cds_index.overlap(ta.seq_id, None, ta.start, ta.end):
+        if (cds.strand == ta.strand):
             if check_overlap(cds, ta):
                 detects["overlap"] = True
                 ta.attributes["sRNA_type"] = "in_CDS"
-        elif (cds.strand != ta.strand) and (
-              cds.seq_id == ta.seq_id):
+        else:
             if check_overlap(cds, ta):
                 detects["anti"] = True
                 ta.attributes["sRNA_type"] = "antisense"
@@ -696,9 +719,9 @@ def check_srna_condition(ta, args_srna, cdss, wigs_f, wigs_r):
         detect_longer(ta, args_srna, cdss, wigs_f, wigs_r)
 
 
-def get_cutoff(cutoffs, out_folder, file_type):
+def get_cutoff(cutoffs, cutoff_file, file_type):
     '''set the cutoff of intergenic and antisense sRNA'''
-    out = open(os.path.join(out_folder, "tmp_cutoff_inter"), "a")
+    out = open(cutoff_file, "a")
     coverages = {}
     num_cutoff = 0
     for cutoff in cutoffs:
@@ -732,8 +755,8 @@ def get_cutoff(cutoffs, out_folder, file_type):
 
 def compute_tss_type(args_srna, cdss, genes, wigs_f, wigs_r):
     tsss, num_tss = read_tss(args_srna.tss_file)
-    if "TSS_classes" not in os.listdir(args_srna.out_folder):
-        os.mkdir(os.path.join(args_srna.out_folder, "TSS_classes"))
+    os.makedirs(os.path.join(args_srna.out_folder, "TSS_classes"),
+                exist_ok=True)
     new_tss_file = os.path.join(args_srna.out_folder, "TSS_classse",
                                 "_".join([args_srna.prefix, "TSS.gff"]))
     new_tss_fh = open(new_tss_file, "w")
@@ -759,11 +782,13 @@ def compute_tss_type(args_srna, cdss, genes, wigs_f, wigs_r):
 def get_intergenic_antisense_cutoff(args_srna):
     '''set the cutoff of intergenic and antisense sRNA
     also deal with the no tex library'''
-    cutoff_coverage = get_cutoff(args_srna.cutoffs, args_srna.out_folder,
+    cutoff_file = os.path.join(args_srna.out_folder, "_".join([
+        "tmp_cutoff_inter", args_srna.prefix]))
+    cutoff_coverage = get_cutoff(args_srna.cutoffs, cutoff_file,
                                  args_srna.file_type)
     notex = None
     if args_srna.cut_notex is not None:
-        notex = get_cutoff(args_srna.cut_notex, args_srna.out_folder, "notex")
+        notex = get_cutoff(args_srna.cut_notex, cutoff_file, "notex")
     return cutoff_coverage, notex
 
 
@@ -785,6 +810,7 @@ def intergenic_srna(args_srna, libs, texs, wigs_f, wigs_r):
         compute_tss_type(args_srna, cdss, genes, wigs_f, wigs_r)
         print("Classification of TSSs has done...")
     tsss, num_tss = read_tss(args_srna.tss_file)
+    cds_index = IntervalIndex(cdss)
     detects = {"overlap": False, "uni_with_tss": False, "anti": False}
     output = open(args_srna.output_file, "w")
     out_table = open(args_srna.output_table, "w")
@@ -792,7 +818,7 @@ def intergenic_srna(args_srna, libs, texs, wigs_f, wigs_r):
     for ta in tas:
         detects["overlap"] = False
         detects["anti"] = False
-        compare_ta_cds(cdss, ta, detects)
+        compare_ta_cds(cds_index, ta, detects)
         if (detects["overlap"]) and (not args_srna.in_cds):
             continue
         else:
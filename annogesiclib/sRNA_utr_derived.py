@@ -3,6 +3,7 @@ import math
 import numpy as np
 from annogesiclib.gff3 import Gff3Parser
 from annogesiclib.lib_reader import read_wig, read_libs
+from annogesiclib.genome_store import GenomeStore
 from annogesiclib.coverage_detection import coverage_comparison, get_repmatch
 from annogesiclib.coverage_detection import replicate_comparison
 from annogesiclib.args_container import ArgsContainer
@@ -652,7 +653,6 @@ def read_data(args_srna):
     tas = []
     tsss = []
     pros = []
-    seq = {}
     gff_parser = Gff3Parser()
     fh = open(args_srna.gff_file, "r")
     for entry in gff_parser.entries(fh):
@@ -678,14 +678,7 @@ def read_data(args_srna):
         for entry in gff_parser.entries(fh):
             pros.append(entry)
         fh.close()
-    with open(args_srna.seq_file, "r") as s_f:
-        for line in s_f:
-            line = line.strip()
-            if line.startswith(">"):
-                strain = line[1:]
-                seq[strain] = ""
-            else:
-                seq[strain] = seq[strain] + line
+    seq = GenomeStore(args_srna.seq_file)
     cdss = sorted(cdss, key=lambda k: (k.seq_id, k.start, k.end, k.strand))
     tas = sorted(tas, key=lambda k: (k.seq_id, k.start, k.end, k.strand))
     tsss = sorted(tsss, key=lambda k: (k.seq_id, k.start, k.end, k.strand))
@@ -777,9 +770,9 @@ def set_cutoff(covers, args_srna):
     return mediandict
 
 
-def print_median(out_folder, mediandict):
+def print_median(median_file, mediandict):
     '''print the cutoff based on the types of sRNA'''
-    out = open(os.path.join(out_folder, "tmp_median"), "a")
+    out = open(median_file, "a")
     for strain, utrs in mediandict.items():
         for utr, tracks in utrs.items():
             for track, value in tracks.items():
@@ -815,7 +808,8 @@ def utr_derived_srna(args_srna, libs, texs, wig_fs, wig_rs):
                 class_utr(inter, ta, args_srna, wig_fs, wig_rs)
     covers = get_utr_coverage(args_srna.utrs)
     mediandict = set_cutoff(covers, args_srna)
-    print_median(args_srna.out_folder, mediandict)
+    print_median(os.path.join(args_srna.out_folder, "_".join([
+        "tmp_median", args_srna.prefix])), mediandict)
     detect_srna(mediandict, args_srna)
     args_srna.out.close()
     args_srna.out_t.close()
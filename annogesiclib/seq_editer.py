@@ -2,10 +2,8 @@ import os
 import shutil
 import sys
 import csv
-from Bio import SeqIO
-from Bio.SeqRecord import SeqRecord
-from Bio.Seq import Seq
 from annogesiclib.seqmodifier import SeqModifier
+from annogesiclib.genome_store import read_seq
 
 
 class SeqEditer(object):
@@ -43,18 +41,14 @@ class SeqEditer(object):
         return datas
 
     def modify_seq(self, fasta_folder, mod_table_file, output_folder, out_name):
+        from Bio import SeqIO
+        from Bio.SeqRecord import SeqRecord
+        from Bio.Seq import Seq
         datas = self._import_data(mod_table_file, out_name)
         for data in datas:
-            seq = ""
             if (data["ref_id"] + ".fa") in os.listdir(fasta_folder):
                 filename = os.path.join(fasta_folder, data["ref_id"] + ".fa")
-                with open(filename, "r") as fasta:
-                    for line in fasta:
-                        line = line.strip()
-                        if len(line) != 0:
-                            if line[0] != ">":
-                                seq = seq + line
-                seq_modifier = SeqModifier(seq)
+                seq_modifier = SeqModifier(str(read_seq(filename)))
                 for change in data["datas"]:
                     if change["ref_nt"] == "-":
                         seq_modifier.insert(
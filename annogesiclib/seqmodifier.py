@@ -1,44 +1,142 @@
+from array import array
+
+
 class SeqModifier(object):
-    """Help to apply SNPs, insertion and deletions to a sequence."""
+    """Help to apply SNPs, insertion and deletions to a sequence.
+
+    An original position (1-based) is mapped to an index of the modified
+    sequence. The mapping is shifted by insert and remove, but not by a
+    replacement which changes the length (as the mapping of the previous
+    versions). The edits are stored per original position ("slots"), so
+    an edit does not copy the whole sequence. The shifts of the mapping
+    and the lengths of the slots are stored in Fenwick trees, so the
+    index of a position and the slot of an index are found in O(log n).
+    The modified sequence is generated once when seq() is called."""
 
     def __init__(self, seq):
-        self._seq = seq
-        self._init_pos_dict()
+        self._org_seq = seq
+        self._slots = {}
+        self._removed = set()
+        self._tail = ""
+        self._length = len(seq)
+        self._shifts = None
+        self._lens = None
+        self._mod_seq = None
 
     def seq(self):
-        return self._seq
+        if self._mod_seq is None:
+            chunks = []
+            point = 0
+            for pos in sorted(self._slots.keys()):
+                chunks.append(self._org_seq[point: pos - 1])
+                chunks.append(self._slots[pos])
+                point = pos
+            chunks.append(self._org_seq[point:])
+            chunks.append(self._tail)
+            self._mod_seq = "".join(chunks)
+        return self._mod_seq
+
+    def _add(self, tree, pos, diff):
+        while pos < len(tree):
+            tree[pos] += diff
+            pos += pos & (-pos)
+
+    def _shift(self, start, end, diff):
+        '''shift the mapping of the original positions from start to end'''
+        if (self._shifts is None) or (start > end):
+            return
+        self._add(self._shifts, start, diff)
+        self._add(self._shifts, end + 1, -diff)
 
-    def _init_pos_dict(self):
-        self._org_pos_to_internal_pos = dict(
-            [(pos, pos-1)
-             for pos in range(1, len(self._seq) + 1)])
+    def _index(self, pos):
+        '''the index of the original position in the modified sequence'''
+        if (pos < 1) or (pos > len(self._org_seq)) or (
+                pos in self._removed):
+            raise KeyError(pos)
+        if self._shifts is None:
+            self._shifts = array("l", [0]) * (len(self._org_seq) + 1)
+            self._lens = array("l", [0]) * (len(self._org_seq) + 1)
+        diff = 0
+        index = pos
+        while index > 0:
+            diff += self._shifts[index]
+            index -= index & (-index)
+        return pos - 1 + diff
+
+    def _locate(self, index):
+        '''the slot (original position) which contains the index of the
+        modified sequence and the offset in the slot. The slot is None if
+        the index is after the original sequence'''
+        pos = 0
+        step = 1
+        while step * 2 <= len(self._org_seq):
+            step *= 2
+        while step > 0:
+            if (pos + step <= len(self._org_seq)) and (
+                    step + self._lens[pos + step] <= index):
+                pos += step
+                index -= step + self._lens[pos]
+            step //= 2
+        if pos == len(self._org_seq):
+            return None, index
+        return pos + 1, index
+
+    def _nucl_index(self, pos):
+        '''the index of the nucleotide of the position. A negative index
+        counts from the end of the sequence (as str)'''
+        index = self._index(pos)
+        if index < 0:
+            index += self._length
+        if (index < 0) or (index >= self._length):
+            raise IndexError(index)
+        return index
+
+    def _edit(self, index, num, nucleotide):
+        '''replace num (0 or 1) nucleotides from the index with the
+        given nucleotides'''
+        slot, offset = self._locate(index)
+        if slot is None:
+            self._tail = "".join([self._tail[:offset], nucleotide,
+                                  self._tail[offset + num:]])
+        else:
+            pre = self._slots.get(slot, self._org_seq[slot - 1])
+            self._slots[slot] = "".join([pre[:offset], nucleotide,
+                                         pre[offset + num:]])
+            self._add(self._lens, slot, len(self._slots[slot]) - len(pre))
+        self._length += len(nucleotide) - num
+        self._mod_seq = None
 
     def replace(self, pos, nucleotide):
-        seq_as_list = list(self._seq)
-        seq_as_list[self._org_pos_to_internal_pos[pos]] = nucleotide
-        self._seq = "".join(seq_as_list)
+        self._edit(self._nucl_index(pos), 1, nucleotide)
 
     def remove(self, pos, num):
-        int_pos = self._org_pos_to_internal_pos[pos]
-        self._seq = self._seq[:int_pos] + self._seq[int_pos+1:]
-        del(self._org_pos_to_internal_pos[pos])
-        for pos in range(pos, len(self._seq) + 2):
-            try:
-                self._org_pos_to_internal_pos[pos] = (
-                    self._org_pos_to_internal_pos[pos] - num)
-            except KeyError:
-                pass
+        """Remove the nucleotide of the given position, the positions
+        after it are shifted by num"""
+        index = self._index(pos)
+        if index < 0:
+            index += self._length
+        if (index >= 0) and (index < self._length):
+            self._edit(index, 1, "")
+        self._removed.add(pos)
+        self._shift(pos + 1, min(self._length + 1, len(self._org_seq)),
+                    -num)
 
     def insert(self, pos, nucleotide):
-        """Insert after nucleotide of the given position"""
-        int_pos = self._org_pos_to_internal_pos[pos]
-        self._seq = self._seq[:int_pos] + nucleotide + self._seq[int_pos:]
-        for pos in range(pos + 1, len(self._seq) + 1):
-            try:
-                self._org_pos_to_internal_pos[pos] = (
-                    self._org_pos_to_internal_pos[pos] + len(nucleotide))
-            except KeyError:
-                pass
+        """Insert in front of the nucleotide of the given position"""
+        index = self._index(pos)
+        if index < 0:
+            index = max(index + self._length, 0)
+        self._edit(min(index, self._length), 0, nucleotide)
+        self._shift(pos + 1, min(self._length, len(self._org_seq)),
+                    len(nucleotide))
+
+    def current_pos(self, pos):
+        """The index (0-based) of the original position in the modified
+        sequence"""
+        return self._index(pos)
 
     def get_nucl(self, pos):
-        return self._seq[self._org_pos_to_internal_pos[pos]]
+        slot, offset = self._locate(self._nucl_index(pos))
+        if slot is None:
+            return self._tail[offset]
+        return self._slots.get(slot, self._org_seq[slot - 1])[offset]
@@ -3,11 +3,60 @@ import sys
 import csv
 import shutil
 from glob import glob
-from subprocess import call
+from subprocess import call, Popen, PIPE
 from annogesiclib.multiparser import Multiparser
 from annogesiclib.seq_editer import SeqEditer
 from annogesiclib.transcript_SNP import snp_detect
 from annogesiclib.helper import Helper
+from annogesiclib.parallel import run_jobs
+
+
+def call_region(mpileup, bcftools, log):
+    '''run samtools mpileup of one region and pipe the output to bcftools
+    call directly'''
+    log.write(" ".join(mpileup) + " | " + " ".join(bcftools) + "\n")
+    p_mpileup = Popen(mpileup, stdout=PIPE)
+    p_call = Popen(bcftools, stdin=p_mpileup.stdout)
+    p_mpileup.stdout.close()
+    p_call.wait()
+    p_mpileup.wait()
+    return p_mpileup.returncode, p_call.returncode
+
+
+def get_regions(fasta_file, region_size):
+    '''split the genomes of the fasta file to the regions
+    ($GENOME:$START-$END) whose length is at most region_size'''
+    lengths = []
+    with open(fasta_file) as fh:
+        for line in fh:
+            line = line.strip()
+            if line.startswith(">"):
+                lengths.append([line[1:].split()[0], 0])
+            elif len(lengths) != 0:
+                lengths[-1][1] += len(line)
+    regions = []
+    for name, length in lengths:
+        for start in range(1, length + 1, region_size):
+            end = min(start + region_size - 1, length)
+            regions.append("{0}:{1}-{2}".format(name, start, end))
+    return regions
+
+
+def merge_vcfs(vcfs, out_vcf):
+    '''concatenate the vcf files of the regions, the header is taken
+    from the first one'''
+    out = open(out_vcf, "w")
+    first = True
+    for vcf in vcfs:
+        with open(vcf) as vh:
+            for line in vh:
+                if line.startswith("#"):
+                    if first:
+                        out.write(line)
+                else:
+                    out.write(line)
+        first = False
+    out.close()
 
 
 class SNPCalling(object):
@@ -64,36 +113,96 @@ class SNPCalling(object):
             bcf_para = "-vmO"
         return bcf_para
 
-    def _run_tools(self, fasta_file, type_, args_snp, bam_datas, log):
+    def _mpileup_command(self, fasta_file, type_, args_snp, bam_file):
+        if type_ == "with":
+            command = [args_snp.samtools_path, "mpileup", "-t", "DP"]
+        elif type_ == "without":
+            command = [args_snp.samtools_path, "mpileup", "-t", "DP", "-B"]
+        elif type_ == "extend":
+            command = [args_snp.samtools_path, "mpileup", "-t", "DP", "-E"]
+        if args_snp.rg:
+            command = command + ["-ugf", fasta_file, bam_file]
+        else:
+            command = command + ["--ignore-RG", "-ugf", fasta_file, bam_file]
+        return command
+
+    def _call_command(self, args_snp, bcf_para, bcf_file, vcf_file):
+        if args_snp.chrom == "1":
+            return [args_snp.bcftools_path, "call", "--ploidy", args_snp.chrom,
+                    bcf_file, bcf_para, "v", "-o", vcf_file]
+        elif args_snp.chrom == "2":
+            return [args_snp.bcftools_path, "call",
+                    bcf_file, bcf_para, "v", "-o", vcf_file]
+
+    def _run_tools_by_region(self, fasta_file, type_, args_snp, bam_datas,
+                             log):
+        '''split the genomes to regions, and run mpileup piped to bcftools
+        for every region and BAM file in parallel. The vcf files of the
+        regions are concatenated afterward. If any region is failed, the
+        program stops without merging the partial output'''
         bcf_para = self._get_para(args_snp)
+        log.write(" ".join([args_snp.samtools_path, "faidx",
+                            fasta_file]) + "\n")
+        call([args_snp.samtools_path, "faidx", fasta_file])
+        regions = get_regions(fasta_file, args_snp.region_size)
+        self.helper.check_make_folder(self.outputs["tmp"] + "_regions")
+        jobs = []
         for bam in bam_datas:
             bam_file = os.path.join(args_snp.out_folder,
                                     bam["sample"] + ".bam")
-            if type_ == "with":
-                command = [args_snp.samtools_path, "mpileup", "-t", "DP"]
-            elif type_ == "without":
-                command = [args_snp.samtools_path, "mpileup", "-t", "DP", "-B"]
-            elif type_ == "extend":
-                command = [args_snp.samtools_path, "mpileup", "-t", "DP", "-E"]
-            if args_snp.rg:
-                command = command + ["-ugf", fasta_file, bam_file]
-            else:
-                command = command + ["--ignore-RG", "-ugf", fasta_file, bam_file]
-            log.write(" ".join(command) + ">" + self.outputs["tmp"] + "\n")
-            os.system(" ".join(command) + ">" + self.outputs["tmp"])
             bam["vcf"] = os.path.join(self.outputs["raw"], "_".join(
                 [self.baqs[type_], bam["sample"] + ".vcf"]))
-            if args_snp.chrom == "1":
-                log.write(" ".join([
-                      args_snp.bcftools_path, "call", "--ploidy", args_snp.chrom,
-                      self.outputs["tmp"], bcf_para, "v", "-o", bam["vcf"]]) + "\n")
-                call([args_snp.bcftools_path, "call", "--ploidy", args_snp.chrom,
-                      self.outputs["tmp"], bcf_para, "v", "-o", bam["vcf"]])
-            elif args_snp.chrom == "2":
-                log.write(" ".join([args_snp.bcftools_path, "call",
-                      self.outputs["tmp"], bcf_para, "v", "-o", bam["vcf"]]) + "\n")
-                call([args_snp.bcftools_path, "call",
-                      self.outputs["tmp"], bcf_para, "v", "-o", bam["vcf"]])
+            bam["region_vcfs"] = []
+            for index, region in enumerate(regions):
+                region_vcf = os.path.join(
+                    self.outputs["tmp"] + "_regions", "_".join([
+                        bam["sample"], str(index) + ".vcf"]))
+                bam["region_vcfs"].append(region_vcf)
+                jobs.append((self._mpileup_command(
+                    fasta_file, type_, args_snp, bam_file) + ["-r", region],
+                    self._call_command(args_snp, bcf_para, "-", region_vcf)))
+        log.write("{0} regions of {1} BAM files are computed by {2} "
+                  "processes.\n".format(len(regions), len(bam_datas),
+                                        args_snp.threads))
+        results = run_jobs(call_region, jobs, args_snp.threads, log)
+        failed = False
+        for job, result in zip(jobs, results):
+            if result != (0, 0):
+                log.write("\t" + " ".join(job[0]) + " failed.\n")
+                failed = True
+        if failed:
+            shutil.rmtree(self.outputs["tmp"] + "_regions")
+            print("Error: samtools mpileup or bcftools call is failed "
+                  "for some regions, please check the log file!")
+            log.write("The SNP calling is stopped because some regions "
+                      "are failed.\n")
+            sys.exit()
+        for bam in bam_datas:
+            merge_vcfs([vcf for vcf in bam["region_vcfs"]
+                        if os.path.exists(vcf)], bam["vcf"])
+            del bam["region_vcfs"]
+        shutil.rmtree(self.outputs["tmp"] + "_regions")
+
+    def _run_tools(self, fasta_file, type_, args_snp, bam_datas, log):
+        if args_snp.threads > 1:
+            self._run_tools_by_region(fasta_file, type_, args_snp,
+                                      bam_datas, log)
+        else:
+            bcf_para = self._get_para(args_snp)
+            for bam in bam_datas:
+                bam_file = os.path.join(args_snp.out_folder,
+                                        bam["sample"] + ".bam")
+                command = self._mpileup_command(fasta_file, type_,
+                                                args_snp, bam_file)
+                log.write(" ".join(command) + ">" + self.outputs["tmp"] + "\n")
+                os.system(" ".join(command) + ">" + self.outputs["tmp"])
+                bam["vcf"] = os.path.join(self.outputs["raw"], "_".join(
+                    [self.baqs[type_], bam["sample"] + ".vcf"]))
+                command = self._call_command(args_snp, bcf_para,
+                                             self.outputs["tmp"], bam["vcf"])
+                if command is not None:
+                    log.write(" ".join(command) + "\n")
+                    call(command)
         log.write("Done!\n")
         log.write("The following files are generated:\n")
         for file_ in os.listdir(self.outputs["raw"]):
@@ -343,7 +452,8 @@ class SNPCalling(object):
         else:
             print("Detecting mutations now")
             self._run_program(all_fasta, bam_datas, args_snp, log)
-            os.remove(self.outputs["tmp"])
+            if os.path.exists(self.outputs["tmp"]):
+                os.remove(self.outputs["tmp"])
             os.remove(all_fasta)
             os.remove(all_fasta + ".fai")
         self.helper.remove_tmp_dir(args_snp.fastas)
@@ -7,6 +7,7 @@ from annogesiclib.sORF_intergenic import get_intergenic
 from annogesiclib.sORF_detection import sorf_detection
 from annogesiclib.stat_sorf import stat
 from annogesiclib.reorganize_table import reorganize_table
+from annogesiclib.parallel import run_jobs
 
 
 class sORFDetection(object):
@@ -63,54 +64,59 @@ class sORFDetection(object):
             self.multiparser.combine_gff(args_sorf.gffs, self.srna_path,
                                          None, "sRNA")
 
+    def _detect_sorf(self, prefix, args_sorf, log):
+        '''detect the sORFs of one genome'''
+        print("Searching sORFs of {0}".format(prefix))
+        if self.srna_path is not None:
+            srna_file = os.path.join(self.srna_path,
+                                     "_".join([prefix, "sRNA.gff"]))
+        else:
+            srna_file = None
+        if self.tss_path is not None:
+            tss_file = os.path.join(self.tss_path,
+                                    "_".join([prefix, "TSS.gff"]))
+        else:
+            tss_file = None
+        sorf_detection(os.path.join(self.fasta_path, prefix + ".fa"),
+                       srna_file, os.path.join(args_sorf.out_folder,
+                       "_".join([prefix, "inter.gff"])), tss_file,
+                       os.path.join(args_sorf.wig_path,
+                       "_".join([prefix, "forward.wig"])),
+                       os.path.join(args_sorf.wig_path,
+                       "_".join([prefix, "reverse.wig"])),
+                       os.path.join(self.gff_output, self.all_cand,
+                       "_".join([prefix, "sORF"])), args_sorf)
+        if "_".join([prefix, "sORF_all.gff"]) in os.listdir(
+                     os.path.join(self.gff_output, self.all_cand)):
+            gff_all = os.path.join(self.gff_output, self.all_cand,
+                                   "_".join([prefix, "sORF.gff"]))
+            gff_best = os.path.join(self.gff_output, self.best,
+                                    "_".join([prefix, "sORF.gff"]))
+            csv_all = os.path.join(self.table_output, self.all_cand,
+                                   "_".join([prefix, "sORF.csv"]))
+            csv_best =  os.path.join(self.table_output, self.best,
+                                     "_".join([prefix, "sORF.csv"]))
+            shutil.move(os.path.join(self.gff_output, self.all_cand,
+                        "_".join([prefix, "sORF_all.gff"])), gff_all)
+            shutil.move(os.path.join(self.gff_output, self.all_cand,
+                        "_".join([prefix, "sORF_best.gff"])), gff_best)
+            shutil.move(os.path.join(self.gff_output, self.all_cand,
+                        "_".join([prefix, "sORF_all.csv"])), csv_all)
+            shutil.move(os.path.join(self.gff_output, self.all_cand,
+                        "_".join([prefix, "sORF_best.csv"])), csv_best)
+            log.write("\t" + gff_all + "\n")
+            log.write("\t" + gff_best + "\n")
+            log.write("\t" + csv_all + "\n")
+            log.write("\t" + csv_best + "\n")
+
     def _start_stop_codon(self, prefixs, args_sorf, log):
         '''detect the sORF based on start and stop codon 
         and ribosome binding site'''
         log.write("Running sORF_detection.py for detecting sORFs.\n")
         log.write("The following files are generated:\n")
-        for prefix in prefixs:
-            print("Searching sORFs of {0}".format(prefix))
-            if self.srna_path is not None:
-                srna_file = os.path.join(self.srna_path,
-                                         "_".join([prefix, "sRNA.gff"]))
-            else:
-                srna_file = None
-            if self.tss_path is not None:
-                tss_file = os.path.join(self.tss_path,
-                                        "_".join([prefix, "TSS.gff"]))
-            else:
-                tss_file = None
-            sorf_detection(os.path.join(self.fasta_path, prefix + ".fa"),
-                           srna_file, os.path.join(args_sorf.out_folder,
-                           "_".join([prefix, "inter.gff"])), tss_file,
-                           os.path.join(args_sorf.wig_path,
-                           "_".join([prefix, "forward.wig"])),
-                           os.path.join(args_sorf.wig_path,
-                           "_".join([prefix, "reverse.wig"])),
-                           os.path.join(self.gff_output, self.all_cand,
-                           "_".join([prefix, "sORF"])), args_sorf)
-            if "_".join([prefix, "sORF_all.gff"]) in os.listdir(
-                         os.path.join(self.gff_output, self.all_cand)):
-                gff_all = os.path.join(self.gff_output, self.all_cand,
-                                       "_".join([prefix, "sORF.gff"]))
-                gff_best = os.path.join(self.gff_output, self.best,
-                                        "_".join([prefix, "sORF.gff"]))
-                csv_all = os.path.join(self.table_output, self.all_cand,
-                                       "_".join([prefix, "sORF.csv"]))
-                csv_best =  os.path.join(self.table_output, self.best,
-                                         "_".join([prefix, "sORF.csv"]))
-                shutil.move(os.path.join(self.gff_output, self.all_cand,
-                            "_".join([prefix, "sORF_all.gff"])), gff_all)
-                shutil.move(os.path.join(self.gff_output, self.all_cand,
-                            "_".join([prefix, "sORF_best.gff"])), gff_best)
-                shutil.move(os.path.join(self.gff_output, self.all_cand,
-                            "_".join([prefix, "sORF_all.csv"])), csv_all)
-                shutil.move(os.path.join(self.gff_output, self.all_cand,
-                            "_".join([prefix, "sORF_best.csv"])), csv_best)
-                log.write("\t" + gff_all + "\n")
-                log.write("\t" + gff_best + "\n")
-                log.write("\t" + csv_all + "\n")
-                log.write("\t" + csv_best + "\n")
+        run_jobs(self._detect_sorf,
+                 [(prefix, args_sorf) for prefix in prefixs],
+                 args_sorf.threads, log)
 
     def _remove_tmp(self, args_sorf):
         self.helper.remove_all_content(args_sorf.out_folder, ".gff", "file")
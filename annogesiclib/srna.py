@@ -10,6 +10,8 @@ from annogesiclib.sRNA_utr_derived import utr_derived_srna
 from annogesiclib.merge_sRNA import merge_srna_gff
 from annogesiclib.merge_sRNA import merge_srna_table
 from annogesiclib.extract_sRNA_info import extract_energy, extract_blast
+from annogesiclib.extract_sRNA_info import extract_blast_table
+from annogesiclib.extract_sRNA_info import BLAST_TABLE_FORMAT
 from annogesiclib.plot_mountain import plot_mountain_plot
 from annogesiclib.sRNA_class import classify_srna
 from annogesiclib.gen_srna_output import gen_srna_table, gen_best_srna
@@ -28,6 +30,7 @@ from annogesiclib.extract_sec_info import extract_info_sec, modify_header
 from annogesiclib.get_srna_poly_u import get_srna_poly_u
 from annogesiclib.reorganize_table import reorganize_table
 from annogesiclib.check_srna_overlap import check_overlap
+from annogesiclib.parallel import run_jobs
 
 
 class sRNADetection(object):
@@ -47,6 +50,7 @@ class sRNADetection(object):
         self.tran_path = os.path.join(args_srna.trans, "tmp")
         self.term_path = self._check_folder_exist(args_srna.terms)
         self.merge_wigs = os.path.join(args_srna.out_folder, "merge_wigs")
+        self.blast_tabular = args_srna.blast_tabular
         self.prefixs = {"merge": os.path.join(
                             args_srna.out_folder, "tmp_merge"),
                         "utr": os.path.join(
@@ -164,8 +168,10 @@ class sRNADetection(object):
         '''detection of intergenic and antisense sRNA'''
         tex_datas = None
         frag_datas = None
-        if "tmp_cutoff_inter" in os.listdir(args_srna.out_folder):
-            os.remove(os.path.join(args_srna.out_folder, "tmp_cutoff_inter"))
+        cutoff_file = os.path.join(args_srna.out_folder,
+                                   "_".join(["tmp_cutoff_inter", prefix]))
+        if os.path.exists(cutoff_file):
+            os.remove(cutoff_file)
         files = {"frag_gff": None, "frag_csv": None,
                  "tex_gff": None, "tex_csv": None,
                  "merge_gff": None, "merge_csv": None}
@@ -219,8 +225,10 @@ class sRNADetection(object):
     def _run_utrsrna(self, gff, tran, prefix, tss, pro, args_srna,
                      frag_datas, tex_datas, log):
         '''detection of UTR-derived sRNA'''
-        if "tmp_median" in os.listdir(args_srna.out_folder):
-            os.remove(os.path.join(args_srna.out_folder, "tmp_median"))
+        median_file = os.path.join(args_srna.out_folder,
+                                   "_".join(["tmp_median", prefix]))
+        if os.path.exists(median_file):
+            os.remove(median_file)
         files = {"frag_gff": None, "frag_csv": None,
                  "tex_gff": None, "tex_csv": None,
                  "merge_gff": None, "merge_csv": None}
@@ -354,56 +362,62 @@ class sRNADetection(object):
             tex_datas = frag_datas
         return tex_datas
 
+    def _detect_srna(self, gff, args_srna, log):
+        '''detect the sRNAs of one genome'''
+        prefix = gff.replace(".gff", "")
+        print("Running sRNA detection of {0}".format(prefix))
+        tran = self.helper.get_correct_file(
+                self.tran_path, "_transcript.gff", prefix, None, None)
+        gffs = {"merge": "_".join([self.prefixs["merge"], prefix]),
+                "utr": "_".join([self.prefixs["utr"], prefix]),
+                "normal": "_".join([self.prefixs["normal"], prefix])}
+        csvs = {"merge": "_".join([
+                    self.prefixs["merge_table"], prefix]),
+                "utr": "_".join([self.prefixs["utr_table"], prefix]),
+                "normal": "_".join([
+                    self.prefixs["normal_table"], prefix])}
+        tss, frag_datas, tex_datas = self._run_normal(
+                prefix, gff, tran, args_srna.fuzzy_tsss["inter"],
+                args_srna, log)
+        if args_srna.utr_srna:
+            print("Running UTR derived sRNA detection of {0}".format(
+                  prefix))
+            if tss is None:
+                tss = self.helper.get_correct_file(
+                        self.tss_path, "_TSS.gff", prefix, None, None)
+            if self.pro_path is not None:
+                pro = self.helper.get_correct_file(
+                        self.pro_path, "_processing.gff",
+                        prefix, None, None)
+            else:
+                pro = None
+            if tss is not None:
+                self._run_utrsrna(gff, tran, prefix, tss, pro,
+                                  args_srna, frag_datas, tex_datas, log)
+        tex_datas = self._merge_tex_frag_datas(tex_datas, frag_datas)
+        del frag_datas
+        gc.collect()
+        self._merge_srna(args_srna, gffs, csvs, prefix,
+                         os.path.join(args_srna.gffs, gff), tss, tex_datas)
+        del tex_datas
+        filter_frag(csvs["merge"], gffs["merge"])
+        self.helper.sort_gff(gffs["merge"],
+                             "_".join([self.prefixs["basic"], prefix]))
+        log.write("\t" + "_".join([self.prefixs["basic"], prefix]) + 
+                  " is generated to temporary store sRNA candidates.\n")
+        log.write("\t" + csvs["merge"] + " is generated to temporary store "
+                  "the detail information of sRNA candidates.\n")
+        for tmp in ("tmp_median", "tmp_cutoff_inter"):
+            tmp_file = os.path.join(args_srna.out_folder,
+                                    "_".join([tmp, prefix]))
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+        return prefix
+
     def _run_program(self, args_srna, log):
-        prefixs = []
-        tss = None
-        for gff in os.listdir(args_srna.gffs):
-            if gff.endswith(".gff"):
-                prefix = gff.replace(".gff", "")
-                prefixs.append(prefix)
-                print("Running sRNA detection of {0}".format(prefix))
-                tran = self.helper.get_correct_file(
-                        self.tran_path, "_transcript.gff", prefix, None, None)
-                gffs = {"merge": "_".join([self.prefixs["merge"], prefix]),
-                        "utr": "_".join([self.prefixs["utr"], prefix]),
-                        "normal": "_".join([self.prefixs["normal"], prefix])}
-                csvs = {"merge": "_".join([
-                            self.prefixs["merge_table"], prefix]),
-                        "utr": "_".join([self.prefixs["utr_table"], prefix]),
-                        "normal": "_".join([
-                            self.prefixs["normal_table"], prefix])}
-                tss, frag_datas, tex_datas = self._run_normal(
-                        prefix, gff, tran, args_srna.fuzzy_tsss["inter"],
-                        args_srna, log)
-                if args_srna.utr_srna:
-                    print("Running UTR derived sRNA detection of {0}".format(
-                          prefix))
-                    if tss is None:
-                        tss = self.helper.get_correct_file(
-                                self.tss_path, "_TSS.gff", prefix, None, None)
-                    if self.pro_path is not None:
-                        pro = self.helper.get_correct_file(
-                                self.pro_path, "_processing.gff",
-                                prefix, None, None)
-                    else:
-                        pro = None
-                    if tss is not None:
-                        self._run_utrsrna(gff, tran, prefix, tss, pro,
-                                          args_srna, frag_datas, tex_datas, log)
-                tex_datas = self._merge_tex_frag_datas(tex_datas, frag_datas)
-                del frag_datas
-                gc.collect()
-                self._merge_srna(args_srna, gffs, csvs, prefix,
-                                 os.path.join(args_srna.gffs, gff), tss, tex_datas)
-                del tex_datas
-                filter_frag(csvs["merge"], gffs["merge"])
-                self.helper.sort_gff(gffs["merge"],
-                                     "_".join([self.prefixs["basic"], prefix]))
-                log.write("\t" + "_".join([self.prefixs["basic"], prefix]) + 
-                          " is generated to temporary store sRNA candidates.\n")
-                log.write("\t" + csvs["merge"] + " is generated to temporary store "
-                          "the detail information of sRNA candidates.\n")
-        return prefixs
+        gffs = [(gff, args_srna) for gff in os.listdir(args_srna.gffs)
+                if gff.endswith(".gff")]
+        return run_jobs(self._detect_srna, gffs, args_srna.threads, log)
 
     def _merge_srna(self, args_srna, gffs, csvs, prefix,
                     gff_file, tss, tex_datas):
@@ -569,20 +583,15 @@ class sRNADetection(object):
 
     def _run_blast(self, program, database, e, seq_file,
                    blast_file, strand, para_num, processes, log):
+        command = [program, "-db", database, "-evalue", str(e),
+                   "-strand", strand, "-query", seq_file, "-out", blast_file]
+        if self.blast_tabular:
+            command = command + ["-outfmt", BLAST_TABLE_FORMAT]
+        log.write(" ".join(command) + "\n")
         if para_num == 1:
-            log.write(" ".join([program, "-db", database,
-                  "-evalue", str(e), "-strand", strand, "-query", seq_file,
-                  "-out", blast_file]) + "\n")
-            call([program, "-db", database,
-                  "-evalue", str(e), "-strand", strand, "-query", seq_file,
-                  "-out", blast_file])
+            call(command)
         else:
-            log.write(" ".join([program, "-db", database,
-                       "-evalue", str(e), "-strand", strand, "-query", seq_file,
-                       "-out", blast_file]) + "\n")
-            p = Popen([program, "-db", database,
-                       "-evalue", str(e), "-strand", strand, "-query", seq_file,
-                       "-out", blast_file])
+            p = Popen(command)
             processes.append(p)
 
     def _run_para_blast(self, program, database, e, seq_file,
@@ -633,9 +642,10 @@ class sRNADetection(object):
                         "_".join([blast_file, strand, str(para)]), strand, paras,
                         processes, log)
             self._wait_process(processes)
-            for para in range(paras):
-                cur_blast_file = "_".join([blast_file, strand, str(para)])
-                self.helper.merge_file(cur_blast_file, blast_file)
+            blast_files = ["_".join([blast_file, strand, str(para)])
+                           for para in range(paras)]
+            self.helper.merge_files(blast_files, blast_file)
+            for cur_blast_file in blast_files:
                 os.remove(cur_blast_file)
             for file_ in seq_files:
                 os.remove(file_)
@@ -729,10 +739,16 @@ class sRNADetection(object):
                                          args_srna.para_blast, log)
                 log.write("Running extract_sRNA_info.py to extract BLAST "
                           "information.\n")
-                extract_blast(blast_file, srna_file, out_file,
-                              out_file + ".csv", database_type,
-                              args_srna.blast_score_s,
-                              args_srna.blast_score_n)
+                if self.blast_tabular:
+                    extract_blast_table(blast_file, srna_file, out_file,
+                                        out_file + ".csv", database_type,
+                                        args_srna.blast_score_s,
+                                        args_srna.blast_score_n)
+                else:
+                    extract_blast(blast_file, srna_file, out_file,
+                                  out_file + ".csv", database_type,
+                                  args_srna.blast_score_s,
+                                  args_srna.blast_score_n)
                 log.write(srna_file + " is updated.\n")
                 shutil.move(out_file, srna_file)
 
@@ -818,8 +834,6 @@ class sRNADetection(object):
             self.helper.remove_tmp_dir(args_srna.pro_folder)
         if args_srna.sorf_file is not None:
             self.helper.remove_tmp_dir(args_srna.sorf_file)
-        if "tmp_median" in os.listdir(args_srna.out_folder):
-            os.remove(os.path.join(args_srna.out_folder, "tmp_median"))
         if self.term_path is not None:
             self.helper.remove_tmp_dir(args_srna.terms)
         tmp_blast = os.path.join(args_srna.out_folder,
@@ -1,14 +1,16 @@
 import os
 import shutil
 import sys
-import time
-from subprocess import Popen, call
+from subprocess import call
 from annogesiclib.multiparser import Multiparser
 from annogesiclib.helper import Helper
 from annogesiclib.potential_target import potential_target
 from annogesiclib.format_fixer import FormatFixer
 from annogesiclib.merge_rnaplex_rnaup import merge_srna_target
 from annogesiclib.gff3 import Gff3Parser
+from annogesiclib.parallel import CommandPool, balance_jobs
+from annogesiclib.rnaplfold_cache import RNAplfoldCache
+from annogesiclib.genome_store import read_seq
 
 
 class sRNATargetPrediction(object):
@@ -29,8 +31,7 @@ class sRNATargetPrediction(object):
         self.fasta_path = os.path.join(args_tar.fastas, "tmp")
         self.gff_path = os.path.join(args_tar.gffs, "tmp")
         self.tmps = {"tmp": "tmp_srna_target", "rnaup": "tmp_rnaup",
-                     "log": "tmp_log",
-                     "all_fa": "tmp*.fa", "all_txt": "tmp*.txt"}
+                     "log": "tmp_log"}
 
     def _check_gff(self, gffs):
         for gff in os.listdir(gffs):
@@ -40,40 +41,31 @@ class sRNATargetPrediction(object):
     def _run_rnaplfold(self, rnaplfold_path, file_type, win_size, span,
                        unstr_region, seq_path, prefix, out_path, log):
         current = os.getcwd()
-        os.chdir(out_path)
-        command = " ".join([rnaplfold_path,
-                            "-W", str(win_size),
-                            "-L", str(span),
-                            "-u", str(unstr_region),
-                            "-O"])
         if file_type == "sRNA":
-            log.write("<".join([command, os.path.join(current, seq_path,
-                                "_".join([self.tmps["tmp"], prefix,
-                                          file_type + ".fa"]))]) + "\n")
-            os.system("<".join([command, os.path.join(current, seq_path,
-                                "_".join([self.tmps["tmp"], prefix,
-                                          file_type + ".fa"]))]))
+            seq_file = os.path.join(current, seq_path, "_".join([
+                self.tmps["tmp"], prefix, file_type + ".fa"]))
         else:
-            log.write("<".join([command, os.path.join(current, seq_path,
-                                "_".join([prefix, file_type + ".fa"]))]) + "\n")
-            os.system("<".join([command, os.path.join(current, seq_path,
-                                "_".join([prefix, file_type + ".fa"]))]))
-        os.chdir(current)
-
-    def _wait_process(self, processes):
-        for p in processes:
-            p.wait()
-            if p.stdout:
-                p.stdout.close()
-            if p.stdin:
-                p.stdin.close()
-            if p.stderr:
-                p.stderr.close()
-            try:
-                p.kill()
-            except OSError:
-                pass
-            time.sleep(5)
+            seq_file = os.path.join(current, seq_path, "_".join([
+                prefix, file_type + ".fa"]))
+        tmp_seq = os.path.join(current, out_path, "_".join([
+            self.tmps["tmp"], file_type + ".fa"]))
+        missings = self.plfold_cache.prepare(
+            seq_file, win_size, span, unstr_region, out_path, tmp_seq)
+        log.write("{0} sequences of {1} are not in the RNAplfold cache "
+                  "{2}.\n".format(len(missings), seq_file,
+                                   self.plfold_cache.folder))
+        if len(missings) != 0:
+            os.chdir(out_path)
+            command = " ".join([rnaplfold_path,
+                                "-W", str(win_size),
+                                "-L", str(span),
+                                "-u", str(unstr_region),
+                                "-O"])
+            log.write("<".join([command, tmp_seq]) + "\n")
+            os.system("<".join([command, tmp_seq]))
+            os.chdir(current)
+            self.plfold_cache.store(missings, out_path)
+        os.remove(tmp_seq)
 
     def _sort_srna_fasta(self, fasta, prefix, path):
         out = open(os.path.join(path,
@@ -93,15 +85,7 @@ class sRNATargetPrediction(object):
         out.close()
 
     def _read_fasta(self, fasta_file):
-        seq = ""
-        with open(fasta_file, "r") as seq_f:
-            for line in seq_f:
-                line = line.strip()
-                if line.startswith(">"):
-                    continue
-                else:
-                    seq = seq + line
-        return seq
+        return read_seq(fasta_file)
 
     def _get_specific_seq(self, srna_file, seq_file, srna_out, querys):
         for query in querys:
@@ -164,60 +148,66 @@ class sRNATargetPrediction(object):
                 potential_target(os.path.join(self.gff_path, gff),
                                  os.path.join(self.fasta_path, prefix + ".fa"),
                                  os.path.join(self.target_seq_path), args_tar)
-                file_num = 1
-                num = 0
-                sub_prefix = os.path.join(self.target_seq_path,
-                                          "_".join([prefix, "target"]))
-                sub_out = open("_".join([sub_prefix, str(file_num) + ".fa"]),
-                               "w")
-                with open((sub_prefix + ".fa"), "r") as t_f:
-                    for line in t_f:
-                        line = line.strip()
-                        if line.startswith(">"):
-#                            line = line.replace("|", "_")
-                            num += 1
-                        if (num == 100):
-                            num = 0
-                            file_num += 1
-                            sub_out.close()
-                            sub_out = open("_".join([sub_prefix,
-                                           str(file_num) + ".fa"]), "w")
-                        sub_out.write(line + "\n")
-                sub_out.close()
+                self._split_targets(os.path.join(
+                    self.target_seq_path, "_".join([prefix, "target"])),
+                    args_tar.core_plex)
+
+    def _split_targets(self, sub_prefix, core):
+        '''split the targets to the sub-files for running RNAplex in
+        parallel. The sub-files have similar total length of targets
+        (the running time of RNAplex depends on it) and they are numbered
+        from the longest one'''
+        targets = []
+        with open(sub_prefix + ".fa", "r") as t_f:
+            for line in t_f:
+                line = line.strip()
+                if line.startswith(">"):
+                    targets.append([line, []])
+                elif len(targets) != 0:
+                    targets[-1][1].append(line)
+        num = max(int((len(targets) + 99) / 100), min(core, len(targets)))
+        groups = balance_jobs([sum([len(seq) for seq in target[1]])
+                               for target in targets], num)
+        for file_num, group in enumerate(groups):
+            with open("_".join([sub_prefix, str(file_num + 1) + ".fa"]),
+                      "w") as sub_out:
+                for index in group:
+                    sub_out.write(targets[index][0] + "\n")
+                    for seq in targets[index][1]:
+                        sub_out.write(seq + "\n")
+
+    def _target_num(self, seq):
+        '''the number of the sub-file of targets, the sub-files are
+        submitted from the longest one (number 1)'''
+        num = seq.split("_target_")[-1].split(".")[0]
+        if num.isdigit():
+            return int(num)
+        return 0
 
     def _run_rnaplex(self, prefix, rnaplfold_folder, args_tar, log):
         print("Running RNAplex of {0}".format(prefix))
         num_process = 0
-        processes = []
-        for seq in os.listdir(self.target_seq_path):
-            if (prefix in seq) and ("_target_" in seq):
-                print("Running RNAplex with {0}".format(seq))
-                out_rnaplex = open(os.path.join(
-                    self.rnaplex_path, prefix, "_".join([
-                        prefix, "RNAplex", str(num_process) + ".txt"])), "w")
-                num_process += 1
-                log.write(" ".join([args_tar.rnaplex_path,
-                           "-q", os.path.join(
-                               self.srna_seq_path, "_".join([
-                                   self.tmps["tmp"], prefix, "sRNA.fa"])),
-                           "-t", os.path.join(self.target_seq_path, seq),
-                           "-l", str(args_tar.inter_length),
-                           "-e", str(args_tar.energy),
-                           "-z", str(args_tar.duplex_dist),
-                           "-a", rnaplfold_folder]) + "\n")
-                p = Popen([args_tar.rnaplex_path,
-                           "-q", os.path.join(
-                               self.srna_seq_path, "_".join([
-                                   self.tmps["tmp"], prefix, "sRNA.fa"])),
-                           "-t", os.path.join(self.target_seq_path, seq),
-                           "-l", str(args_tar.inter_length),
-                           "-e", str(args_tar.energy),
-                           "-z", str(args_tar.duplex_dist),
-                           "-a", rnaplfold_folder], stdout=out_rnaplex)
-                processes.append(p)
-                if num_process % args_tar.core_plex == 0:
-                    self._wait_process(processes)
-        self._wait_process(processes)
+        pool = CommandPool(args_tar.core_plex, log)
+        seqs = [seq for seq in os.listdir(self.target_seq_path)
+                if (prefix in seq) and ("_target_" in seq)]
+        for seq in sorted(seqs, key=self._target_num):
+            print("Running RNAplex with {0}".format(seq))
+            out_rnaplex = os.path.join(
+                self.rnaplex_path, prefix, "_".join([
+                    prefix, "RNAplex", str(num_process) + ".txt"]))
+            num_process += 1
+            command = [args_tar.rnaplex_path,
+                       "-q", os.path.join(
+                           self.srna_seq_path, "_".join([
+                               self.tmps["tmp"], prefix, "sRNA.fa"])),
+                       "-t", os.path.join(self.target_seq_path, seq),
+                       "-l", str(args_tar.inter_length),
+                       "-e", str(args_tar.energy),
+                       "-z", str(args_tar.duplex_dist),
+                       "-a", rnaplfold_folder]
+            log.write(" ".join(command) + "\n")
+            pool.submit(command, stdout=out_rnaplex, name=seq)
+        pool.join()
         log.write("The prediction for {0} is done.\n".format(prefix))
         log.write("The following temporary files for storing results of {0} are "
                   "generated:\n".format(prefix))
@@ -229,6 +219,9 @@ class sRNATargetPrediction(object):
         log.write("Using RNAplex and RNAplfold to predict sRNA targets.\n")
         log.write("Please make sure the version of Vienna RNA package is "
                   "at least 2.3.2.\n")
+        self.plfold_cache = RNAplfoldCache(
+            os.path.join(args_tar.out_folder, "RNAplfold_cache"),
+            args_tar.rnaplfold_path)
         for prefix in prefixs:
             print("Running RNAplfold of {0}".format(prefix))
             self.helper.check_make_folder(
@@ -250,12 +243,11 @@ class sRNATargetPrediction(object):
             if ("_".join([prefix, "RNAplex.txt"]) in
                     os.listdir(os.path.join(self.rnaplex_path, prefix))):
                 os.remove(rnaplex_file)
-            for index in range(0, num_process):
-                log.write("Using helper.py to merge the temporary files.\n")
-                self.helper.merge_file(os.path.join(
-                    self.rnaplex_path, prefix, "_".join([
-                        prefix, "RNAplex", str(index) + ".txt"])),
-                    rnaplex_file)
+            log.write("Using helper.py to merge the temporary files.\n")
+            self.helper.merge_files([os.path.join(
+                self.rnaplex_path, prefix, "_".join([
+                    prefix, "RNAplex", str(index) + ".txt"]))
+                for index in range(0, num_process)], rnaplex_file)
             log.write("\t" + rnaplex_file + " is generated.\n")
             self.helper.remove_all_content(os.path.join(
                  self.rnaplex_path, prefix), "_RNAplex_", "file")
@@ -263,49 +255,32 @@ class sRNATargetPrediction(object):
             shutil.move(self.tmps["tmp"], rnaplex_file)
             shutil.rmtree(rnaplfold_folder)
 
-    def _run_rnaup(self, num_up, processes, prefix, out_rnaup, out_log,
-                   args_tar, log):
-        for index in range(1, num_up + 1):
-            out_tmp_up = open(os.path.join(
-                args_tar.out_folder, "".join([self.tmps["rnaup"],
-                                              str(index), ".txt"])), "w")
-            out_err = open(os.path.join(
-                args_tar.out_folder, "".join([self.tmps["log"],
-                                              str(index), ".txt"])), "w")
-            in_up = open(os.path.join(
-                args_tar.out_folder, "".join([self.tmps["tmp"],
-                                              str(index), ".fa"])), "r")
-            log.write(" ".join([args_tar.rnaup_path,
-                       "-u", str(args_tar.unstr_region_rnaup),
-                       "-o", "--interaction_first"]) + "\n")
-            p = Popen([args_tar.rnaup_path,
-                       "-u", str(args_tar.unstr_region_rnaup),
-                       "-o", "--interaction_first"],
-                      stdin=in_up, stdout=out_tmp_up, stderr=out_err)
-            processes.append(p)
-        if len(processes) != 0:
-            time.sleep(5)
-            self._wait_process(processes)
-            log.write("The following temporary files for storing results of {0} are "
-                      "generated:\n".format(prefix))
-            for file_ in os.listdir(os.path.join(args_tar.out_folder)):
-                log.write("\t" + os.path.join(args_tar.out_folder, file_) + "\n")
-            os.system("rm " + os.path.join(args_tar.out_folder,
-                                           self.tmps["all_fa"]))
-            self._merge_txt(num_up, out_rnaup, out_log, args_tar.out_folder)
-            os.system("rm " + os.path.join(args_tar.out_folder,
-                                           self.tmps["all_txt"]))
+    def _merge_rnaup(self, job, index, out_rnaup, out_log, out_folder):
+        '''merge the result of one RNAup job as soon as it is finished
+        and remove its temporary files'''
+        tmp_up = os.path.join(out_folder, "".join([
+            self.tmps["rnaup"], str(index), ".txt"]))
+        tmp_log = os.path.join(out_folder, "".join([
+            self.tmps["log"], str(index), ".txt"]))
+        self.helper.merge_file(tmp_up, out_rnaup)
+        self.helper.merge_file(tmp_log, out_log)
+        for tmp_file in (job["stdin"], tmp_up, tmp_log):
+            os.remove(tmp_file)
 
-    def _merge_txt(self, num_up, out_rnaup, out_log, out_folder):
-        for index in range(1, num_up + 1):
-            self.helper.merge_file(
-                os.path.join(out_folder, "".join([self.tmps["rnaup"],
-                                                  str(index), ".txt"])),
-                out_rnaup)
-            self.helper.merge_file(
-                os.path.join(out_folder, "".join([self.tmps["log"],
-                                                  str(index), ".txt"])),
-                out_log)
+    def _run_rnaup(self, pool, index, out_rnaup, out_log, args_tar, log):
+        in_up = os.path.join(args_tar.out_folder, "".join([
+            self.tmps["tmp"], str(index), ".fa"]))
+        command = [args_tar.rnaup_path,
+                   "-u", str(args_tar.unstr_region_rnaup),
+                   "-o", "--interaction_first"]
+        log.write(" ".join(command) + "\n")
+        pool.submit(command, stdin=in_up, stdout=os.path.join(
+                        args_tar.out_folder, "".join([
+                            self.tmps["rnaup"], str(index), ".txt"])),
+                    stderr=os.path.join(args_tar.out_folder, "".join([
+                            self.tmps["log"], str(index), ".txt"])),
+                    callback=lambda job: self._merge_rnaup(
+                        job, index, out_rnaup, out_log, args_tar.out_folder))
 
     def _get_continue(self, out_rnaup):
         '''For RNAup, it can continue running RNAup based on previous run'''
@@ -341,7 +316,7 @@ class sRNATargetPrediction(object):
             if not os.path.exists(os.path.join(self.rnaup_path, prefix)):
                 os.mkdir(os.path.join(self.rnaup_path, prefix))
             num_up = 0
-            processes = []
+            pool = CommandPool(args_tar.core_up, log)
             out_rnaup = os.path.join(self.rnaup_path, prefix,
                                      "_".join([prefix + "_RNAup.txt"]))
             out_log = os.path.join(self.rnaup_path, prefix,
@@ -355,38 +330,34 @@ class sRNATargetPrediction(object):
                     log.write("The data from the previous run is found.\n")
                     srnas = self._get_continue(out_rnaup)
                     log.write("The previous data is loaded.\n")
+            querys = []
             with open(os.path.join(self.srna_seq_path, "_".join([
                     self.tmps["tmp"], prefix, "sRNA.fa"])), "r") as s_f:
                 for line in s_f:
                     line = line.strip()
                     if line.startswith(">"):
-                        if line[1:] in srnas:
-                            start = False
-                            continue
-                        start = True
-                        print("Running RNAup with {0}".format(line[1:]))
-                        num_up += 1
-                        out_up = open(os.path.join(args_tar.out_folder,
-                                      "".join([self.tmps["tmp"],
-                                               str(num_up), ".fa"])), "w")
-                        out_up.write(line + "\n")
-                    else:
-                        if start:
-                            out_up.write(line + "\n")
-                            out_up.close()
-                            self.helper.merge_file(os.path.join(
-                                self.target_seq_path,
-                                "_".join([prefix, "target.fa"])),
-                                os.path.join(args_tar.out_folder,
-                                             "".join([self.tmps["tmp"],
-                                                      str(num_up), ".fa"])))
-                            if num_up == args_tar.core_up:
-                                self._run_rnaup(num_up, processes, prefix,
-                                                out_rnaup, out_log, args_tar, log)
-                                processes = []
-                                num_up = 0
-            self._run_rnaup(num_up, processes, prefix, out_rnaup, out_log,
-                            args_tar, log)
+                        querys.append([line, []])
+                    elif len(querys) != 0:
+                        querys[-1][1].append(line)
+            querys = [[line, "".join(seqs)] for line, seqs in querys
+                      if line[1:] not in srnas]
+            # one RNAup job compares one sRNA with all targets, the
+            # longest sRNAs are submitted first and the short ones fill
+            # the idle cores at the end
+            for line, seq in sorted(querys, key=lambda x: -len(x[1])):
+                print("Running RNAup with {0}".format(line[1:]))
+                num_up += 1
+                in_up = os.path.join(args_tar.out_folder, "".join([
+                    self.tmps["tmp"], str(num_up), ".fa"]))
+                with open(in_up, "w") as out_up:
+                    out_up.write(line + "\n")
+                    out_up.write(seq + "\n")
+                self.helper.merge_file(os.path.join(
+                    self.target_seq_path, "_".join([prefix, "target.fa"])),
+                    in_up)
+                self._run_rnaup(pool, num_up, out_rnaup,
+                                out_log, args_tar, log)
+            pool.join()
             log.write("The prediction for {0} is done.\n".format(prefix))
             log.write("\t" + out_rnaup + " is complete generated and updated.\n")
 
@@ -2,6 +2,7 @@ import os
 import shutil
 from annogesiclib.gff3 import Gff3Parser
 from annogesiclib.helper import Helper
+from annogesiclib.interval_index import IntervalIndex
 
 
 def assign_tss(tss, tran):
@@ -220,59 +221,61 @@ def assign_parent(gff, tran, feature):
                          "-", str(gff.end), "_", strand])]))
 
 
-def compare_ta_gff(gffs, tran, check, tran_type, detect, stats, c_feature):
-    for gff in gffs:
+def compare_ta_gff(gff_index, tran, check, tran_type, detect,
+                   stats, c_feature):
+    for gff in gff_index.overlap(tran.seq_id, tran.strand,
+                                 tran.start, tran.end):
         if (gff.feature == c_feature):
-            if (gff.strand == tran.strand) and (
-                    gff.seq_id == tran.seq_id):
-                if (gff.start < tran.start) and (
-                        gff.end > tran.end):
-                    if check[0] != 1:
-                        stats[tran.seq_id]["bsae"] += 1
-                        stats["All"]["bsae"] += 1
-                    tran_type.append("within")
-                    assign_parent(gff, tran, c_feature)
-                    detect = True
-                    check[0] = 1
-                elif (gff.start >= tran.start) and (
-                        gff.end <= tran.end):
-                    if check[3] != 1:
-                        stats[tran.seq_id]["asbe"] += 1
-                        stats["All"]["asbe"] += 1
-                    tran_type.append("cover")
-                    assign_parent(gff, tran, c_feature)
-                    check[3] = 1
-                    detect = True
-                elif (gff.start >= tran.start) and (
-                        gff.end > tran.end) and (
-                        gff.start < tran.end):
-                    if check[1] != 1:
-                        stats[tran.seq_id]["asae"] += 1
-                        stats["All"]["asae"] += 1
-                    tran_type.append("left_shift")
-                    assign_parent(gff, tran, c_feature)
-                    check[1] = 1
-                    detect = True
-                elif (gff.start < tran.start) and (
-                        gff.end <= tran.end) and (
-                        gff.end > tran.start):
-                    if check[2] != 1:
-                        stats[tran.seq_id]["bsbe"] += 1
-                        stats["All"]["bsbe"] += 1
-                    tran_type.append("right_shift")
-                    assign_parent(gff, tran, c_feature)
-                    check[2] = 1
-                    detect = True
+            if (gff.start < tran.start) and (
+                    gff.end > tran.end):
+                if check[0] != 1:
+                    stats[tran.seq_id]["bsae"] += 1
+                    stats["All"]["bsae"] += 1
+                tran_type.append("within")
+                assign_parent(gff, tran, c_feature)
+                detect = True
+                check[0] = 1
+            elif (gff.start >= tran.start) and (
+                    gff.end <= tran.end):
+                if check[3] != 1:
+                    stats[tran.seq_id]["asbe"] += 1
+                    stats["All"]["asbe"] += 1
+                tran_type.append("cover")
+                assign_parent(gff, tran, c_feature)
+                check[3] = 1
+                detect = True
+            elif (gff.start >= tran.start) and (
+                    gff.end > tran.end) and (
+                    gff.start < tran.end):
+                if check[1] != 1:
+                    stats[tran.seq_id]["asae"] += 1
+                    stats["All"]["asae"] += 1
+                tran_type.append("left_shift")
+                assign_parent(gff, tran, c_feature)
+                check[1] = 1
+                detect = True
+            elif (gff.start < tran.start) and (
+                    gff.end <= tran.end) and (
+                    gff.end > tran.start):
+                if check[2] != 1:
+                    stats[tran.seq_id]["bsbe"] += 1
+                    stats["All"]["bsbe"] += 1
+                tran_type.append("right_shift")
+                assign_parent(gff, tran, c_feature)
+                check[2] = 1
+                detect = True
     return detect
 
 
 def detect_tag_region(gffs, trans, stats, out_t, out_g, c_feature, region):
     detect = False
+    gff_index = IntervalIndex([gff for gff in gffs
+                               if gff.feature == c_feature])
     for tran in trans:
         check = [0, 0, 0, 0, 0]
         tran_type = []
         tran_type_string = ""
-        detect = compare_ta_gff(gffs, tran, check, tran_type,
+        detect = compare_ta_gff(gff_index, tran, check, tran_type,
                                 detect, stats, c_feature)
         if not detect:
             stats[tran.seq_id]["other"] += 1
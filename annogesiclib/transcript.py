@@ -12,6 +12,7 @@ from annogesiclib.gen_table_tran import gen_table_transcript
 from annogesiclib.compare_tran_term import compare_term_tran
 from annogesiclib.plot_tran import plot_tran
 from annogesiclib.reorganize_table import reorganize_table
+from annogesiclib.parallel import run_jobs
 
 
 class TranscriptDetection(object):
@@ -49,13 +50,15 @@ class TranscriptDetection(object):
         for wig in os.listdir(wig_folder):
             if wig.endswith("_forward.wig"):
                 strains.append(wig.replace("_forward.wig", ""))
+        jobs = []
         for strain in strains:
             f_file = os.path.join(wig_folder, "_".join(
                 [strain, "forward.wig"]))
             r_file = os.path.join(wig_folder, "_".join(
                 [strain, "reverse.wig"]))
-            self._compute_transcript(f_file, r_file, wigs, wig_type,
-                                     strain, libs, args_tran)
+            jobs.append((f_file, r_file, wigs, wig_type,
+                         strain, libs, args_tran))
+        run_jobs(self._compute_transcript, jobs, args_tran.threads)
         return strains
 
     def _compare_tss(self, tas, args_tran, log):
@@ -1,5 +1,6 @@
 import csv
 import copy
+from itertools import islice
 import numpy as np
 import matplotlib as mpl
 mpl.use('Agg')
@@ -92,6 +93,34 @@ def change(snp, seq):
                     len(snp["ref"]) - len(snp["alt"]))
 
 
+def apply_snps(seq, snps):
+    '''build the modified sequence by applying the SNPs in one pass.
+    The SNPs are applied from the start of the genome; a SNP is skipped
+    if its reference does not match to the genome or it overlaps with
+    the SNP which is already applied'''
+    chunks = []
+    point = 0
+    for snp in sorted(snps, key=lambda x: x["pos"]):
+        start_point = snp["pos"] - 1
+        end_point = start_point + len(snp["ref"])
+        if (start_point >= point) and (
+                seq[start_point: end_point].upper() == snp["ref"].upper()):
+            chunks.append(seq[point: start_point])
+            chunks.append(snp["alt"].lower())
+            point = end_point
+    chunks.append(seq[point:])
+    return "".join(chunks)
+
+
+def write_fasta(out, name, seq, line_len=60):
+    '''write the sequence in lines of line_len nucleotides'''
+    out.write(">{0}\n".format(name))
+    out.write("\n".join([seq[index: index + line_len]
+                         for index in range(0, len(seq), line_len)]))
+    if (len(seq) != 0) and (len(seq) % line_len == 0):
+        out.write("\n")
+
+
 def get_n_a_value(para, depth_file, min_sample, type_):
     '''get the corresponding number of cutoff'''
     if (para.lower() == "none") and type_ == "b_dp":
@@ -195,94 +224,95 @@ def import_data(snp_file, args_snp, bam_number, depth_file, min_sample):
     return max_quals, snps, dess, raw_snps
 
 
-def check_overlap(new_snps, overlaps):
-    count = 0
-    element = 0
-    first_overlap = True
-    printeds = []
-    count_overlap = len(overlaps)
-    for key, value in new_snps.items():
-        if first_overlap:
-            for overlap in overlaps:
-                if "print" in overlap.keys():
-                    element += 1
-                    printeds.append(overlap)
-                else:
-                    break
-            first_overlap = False
-        if ("print" not in overlaps[element].keys()):
-            if len(printeds) == 0:
-                value.append(overlaps[element])
-                count += 1
-            else:
-                for printed in printeds:
-                    if printed not in value:
-                        value.append(overlaps[element])
-                        count += 1
-        if count_overlap != 0:
-            if count == (len(new_snps.keys()) / count_overlap):
-                overlaps[element]["print"] = True
-                element += 1
-                if element >= len(overlaps):
-                    break
-                count = 0
-
-
-def overlap_position(qual_snps):
-    '''deal with the conflict position of SNPs'''
-    first = True
-    qual_nooverlap_snps = {}
-    num_overlap = 1
-    qual_nooverlap_snps[num_overlap] = []
-    conflicts = []
-    for snp1 in qual_snps:
-        overlaps = []
-        overlaps.append(snp1)
-        for snp2 in qual_snps:
-            if (snp1 != snp2) and (snp1["strain"] == snp2["strain"]) and (
-                    (snp2["pos"] - snp1["pos"] < len(snp1["ref"]))) and (
-                    "print" not in snp2.keys()):
-                overlaps.append(snp2)
-        if len(overlaps) != 1:
-            conflicts.append(overlaps)
-            if first:
-                for overlap in overlaps:
-                    qual_nooverlap_snps[num_overlap] = []
-                    qual_nooverlap_snps[num_overlap].append(overlap)
-                    num_overlap += 1
-                    overlap["print"] = True
-                num_overlap = 1
-                first = False
+def group_conflicts(qual_snps):
+    '''group the SNPs by sweeping the sorted positions of each strain.
+    The SNPs whose references overlap with each other (directly or
+    through the other SNPs of the group) are in the same group'''
+    strains = {}
+    for snp in qual_snps:
+        strains.setdefault(snp["strain"], len(strains))
+    groups = []
+    end = -1
+    for snp in sorted(qual_snps, key=lambda x: (strains[x["strain"]],
+                                                x["pos"])):
+        if (len(groups) != 0) and (
+                groups[-1][0]["strain"] == snp["strain"]) and (
+                snp["pos"] < end):
+            groups[-1].append(snp)
+            end = max(end, snp["pos"] + len(snp["ref"]))
+        else:
+            groups.append([snp])
+            end = snp["pos"] + len(snp["ref"])
+    return groups
+
+
+def search_haplotypes(group):
+    '''generate the sets of the SNPs of the group which do not overlap
+    with each other and can not be extended by the other SNPs of the
+    group. chosen_end is the end of the last chosen SNP and pending_end is
+    the end of the skipped SNP which is not overlapped by the chosen SNPs
+    yet, so the branches which can not be completed are stopped early'''
+    stacks = [(0, None, -1, None)]
+    while len(stacks) != 0:
+        index, chosens, chosen_end, pending_end = stacks.pop()
+        if index == len(group):
+            if pending_end is None:
+                haplotype = []
+                while chosens is not None:
+                    haplotype.append(chosens[0])
+                    chosens = chosens[1]
+                yield haplotype[::-1]
+            continue
+        snp = group[index]
+        end = snp["pos"] + len(snp["ref"])
+        if (pending_end is not None) and (snp["pos"] >= pending_end):
+            continue
+        if snp["pos"] < chosen_end:
+            stacks.append((index + 1, chosens, chosen_end, pending_end))
+        else:
+            if pending_end is None:
+                stacks.append((index + 1, chosens, chosen_end, end))
             else:
-                new_snps = qual_nooverlap_snps.copy()
-                index = len(qual_nooverlap_snps.keys())
-                repeat = 0
-                for overlap in overlaps:
-                    if "print" in overlap.keys():
-                        repeat += 1
-                for times in range(1, len(overlaps) - repeat):
-                    for key, value in qual_nooverlap_snps.items():
-                        new_snps[key + index * times] = list(value)
-                check_overlap(new_snps, overlaps)
-                qual_nooverlap_snps = new_snps.copy()
+                stacks.append((index + 1, chosens, chosen_end,
+                               min(pending_end, end)))
+            stacks.append((index + 1, (snp, chosens), end, None))
+
+
+def gen_combinations(groups, max_comb=None):
+    '''generate the combinations of the haplotypes of the groups one by
+    one. The haplotypes of the first group change first. If max_comb is
+    assigned, only the first max_comb combinations are generated'''
+    choices = []
+    for group in groups:
+        choices.append(list(islice(search_haplotypes(group), max_comb)))
+    indexs = [0] * len(choices)
+    key = 1
+    while (max_comb is None) or (key <= max_comb):
+        snps = []
+        for choice, index in zip(choices, indexs):
+            snps.extend(choice[index])
+        yield key, snps
+        key += 1
+        for num in range(len(indexs)):
+            indexs[num] += 1
+            if indexs[num] < len(choices[num]):
+                break
+            indexs[num] = 0
         else:
-            if "print" not in snp1.keys():
-                if first:
-                    qual_nooverlap_snps[num_overlap].append(snp1)
-                    first = False
-                else:
-                    for key, value in qual_nooverlap_snps.items():
-                        value.append(snp1)
-                snp1["print"] = True
-        if first:
-            first = False
-    return conflicts, qual_nooverlap_snps
+            return
+
+
+def overlap_position(qual_snps, max_comb=None):
+    '''deal with the conflict position of SNPs. The conflicting groups
+    and the generator of the combinations are returned'''
+    groups = group_conflicts(qual_snps)
+    conflicts = [group for group in groups if len(group) > 1]
+    return conflicts, gen_combinations(groups, max_comb)
 
 
 def print_file(refs, out_ref, conflicts, key, values, mod_seq_init,
                mod_seqs, out_seq, strain):
     num_seq = 1
-    num_nt = 0
     paths = []
     if len(conflicts) == 0:
         paths.append("All")
@@ -304,24 +334,13 @@ def print_file(refs, out_ref, conflicts, key, values, mod_seq_init,
     if len(mod_seqs) == 0:
         out_fasta = open("_".join([out_seq, mod_seq_init["genome"],
                                   str(key), "1.fa"]), "w")
-        out_fasta.write(">{0}\n".format(mod_seq_init["genome"]))
-        for nt in mod_seq_init["seq"]:
-            num_nt += 1
-            out_fasta.write("{0}".format(nt))
-            if num_nt % 60 == 0:
-                out_fasta.write("\n")
+        write_fasta(out_fasta, mod_seq_init["genome"], mod_seq_init["seq"])
         out_fasta.close()
     else:
         for seq in mod_seqs:
-            num_nt = 0
             out_fasta = open("_".join([out_seq, seq["genome"], str(key),
                                        str(num_seq)]) + ".fa", "w")
-            out_fasta.write(">{0}\n".format(seq["genome"]))
-            for nt in seq["seq"]:
-                num_nt += 1
-                out_fasta.write("{0}".format(nt))
-                if num_nt % 60 == 0:
-                    out_fasta.write("\n")
+            write_fasta(out_fasta, seq["genome"], seq["seq"])
             num_seq += 1
             out_fasta.close()
 
@@ -371,69 +390,57 @@ def stat(max_quals, trans_snps, bam_number, stat_prefix,
 
 def read_fasta(fasta_file):
     seqs = []
-    first = True
-    num_index = 0
     seq_name = ""
     with open(fasta_file, "r") as fh:
         for line in fh:
             line = line.strip()
             if line.startswith(">"):
-                if first:
-                    seqs.append({line[1:]: ""})
-                    first = False
-                else:
-                    seqs.append({line[1:]: ""})
-                    num_index += 1
                 seq_name = line[1:]
+                seqs.append({seq_name: []})
             else:
-                seqs[num_index][seq_name] = seqs[num_index][seq_name] + line
-    return seqs
+                seqs[-1][seq_name].append(line)
+    return [{name: "".join(lines) for name, lines in seq.items()}
+            for seq in seqs]
 
 
-def gen_new_fasta(qual_nooverlap_snps, seqs, out_ref, conflicts, out_seq):
+def gen_new_fasta(combinations, seqs, out_ref, conflicts, out_seq):
+    '''generate the modified genomes. combinations is the iterable of
+    the index and SNPs of every combination of the conflicting SNPs.
+    The SNPs of each combination of the alternatives are collected
+    first, then each genome is built in one pass'''
     refs = {}
-    for key, values in qual_nooverlap_snps.items():
+    for key, values in combinations:
         for seq in seqs:
             for strain, fasta in seq.items():
                 refs[strain] = []
                 num_var = 0
-                mod_seq_init = {"genome": strain, "seq": fasta, "num_mod": 0}
-                mod_seqs = []
+                combs = [[]]
                 for snp in values:
                     if snp["strain"] == strain:
                         if "," in snp["alt"]:
                             num_var += 1
-                            tmps = []
                             tmp_snps = []
-                            alts = snp["alt"].split(",")
-                            for alt in alts:
+                            new_combs = []
+                            for alt in snp["alt"].split(","):
                                 tmp_snp = snp.copy()
                                 tmp_snp["alt"] = alt
                                 tmp_snps.append(tmp_snp)
-                                if len(mod_seqs) == 0:
-                                    num_mod_seqs = len(mod_seqs)
-                                    tmps.append(mod_seq_init.copy())
-                                else:
-                                    num_mod_seqs = len(mod_seqs)
-                                    for mod_seq in mod_seqs:
-                                        tmps.append(mod_seq.copy())
-                            mod_seqs = list(tmps)
-                            num_mod = 0
-                            num = 1
+                                for comb in combs:
+                                    new_combs.append(comb + [tmp_snp])
+                            combs = new_combs
                             refs[strain] = gen_ref(tmp_snps, snp["pos"],
                                                    refs[strain], num_var)
-                            for mod_seq in mod_seqs:
-                                change(tmp_snps[num_mod], mod_seq)
-                                if num >= num_mod_seqs:
-                                    num_mod += 1
-                                    num = 0
-                                num += 1
                         else:
-                            if len(mod_seqs) == 0:
-                                change(snp, mod_seq_init)
-                            else:
-                                for mod_seq in mod_seqs:
-                                    change(snp, mod_seq)
+                            for comb in combs:
+                                comb.append(snp)
+                mod_seq_init = {"genome": strain, "seq": fasta, "num_mod": 0}
+                mod_seqs = []
+                if num_var == 0:
+                    mod_seq_init["seq"] = apply_snps(fasta, combs[0])
+                else:
+                    for comb in combs:
+                        mod_seqs.append({"genome": strain, "num_mod": 0,
+                                         "seq": apply_snps(fasta, comb)})
                 print_file(refs[strain], out_ref, conflicts, key, values,
                            mod_seq_init, mod_seqs, out_seq, strain)
 
@@ -452,10 +459,11 @@ def snp_detect(fasta_file, snp_file, depth_file, out_snp, out_seq,
         if snp["qual"] >= args_snp.quality:
             out_best.write(snp["all_info"] + "\n")
             best_snps.append(snp)
-    conflicts, qual_nooverlap_snps = overlap_position(best_snps)
+    conflicts, combinations = overlap_position(
+        best_snps, args_snp.max_combination)
     stat(max_quals, raw_snps, bam_number, stat_prefix, out_snp, args_snp, "raw.csv")
     stat(max_quals, best_snps, bam_number, stat_prefix, out_snp, args_snp, "best.csv")
     seqs = read_fasta(fasta_file)
-    gen_new_fasta(qual_nooverlap_snps, seqs, out_ref, conflicts, out_seq)
+    gen_new_fasta(combinations, seqs, out_ref, conflicts, out_seq)
     out_best.close()
     out_ref.close()
@@ -5,114 +5,147 @@ from annogesiclib.lib_reader import read_wig, read_libs
 from annogesiclib.coverage_detection import get_repmatch
 
 
-def check_tex_conds(tracks, libs, texs, check_tex, conds, tex_notex):
-    for track in tracks:
-        for lib in libs:
-            if lib["name"] == track:
-                if "tex" in lib["type"]:
-                    type_ = "tex"
-                else:
-                    type_ = "frag"
-                index = "_".join([lib["cond"]])
-                if len(texs) != 0:
-                    for key, num in texs.items():
-                        if track in key:
-                            if (texs[key] >= tex_notex) and (
-                                    key not in check_tex):
-                                check_tex.append(key)
-                                if index not in conds.keys():
-                                    conds[index] = 1
-                                else:
-                                    conds[index] += 1
-                else:
-                    if index not in conds.keys():
-                        conds[index] = 1
-                    else:
-                        conds[index] += 1
+CHUNK_SIZE = 1000000
 
 
-def detect_hight_toler(cover, height, tmp_covers, tracks, lib_track):
-    if cover > height:
-        if tmp_covers["best"] < cover:
-            tmp_covers["best"] = cover
-        tracks.append(lib_track)
-    else:
-        if cover > tmp_covers["toler"]:
-            tmp_covers["toler"] = cover
+def get_track_infos(lib_conds, libs, texs):
+    '''get the information of every library track for the array
+    computation. The order of the tracks is the order of lib_conds'''
+    tracks = []
+    for cond, lib_tracks in lib_conds.items():
+        for lib_track, covers in lib_tracks.items():
+            real_track = lib_track.split("|")[-3]
+            claim_cond = None
+            weights = {}
+            for lib in libs:
+                if lib["name"] == real_track:
+                    if claim_cond is None:
+                        claim_cond = lib["cond"]
+                    if lib["cond"] not in weights.keys():
+                        weights[lib["cond"]] = 1
+                    else:
+                        weights[lib["cond"]] += 1
+            tracks.append({"covers": covers, "claim": claim_cond,
+                           "weights": weights,
+                           "keys": [key for key in texs.keys()
+                                    if real_track in key]})
+    return tracks
 
 
-def elongation(lib_conds, template_texs, libs, strand, trans,
-               args_tran, strain, tolers):
-    '''check coverage and replicate match to form transcript'''
-    first = True
-    pre_pos = -1
-    check_tex = []
-    tracks = []
-    conds = {}
-    pre_wig = None
-    detect = False
-    texs = template_texs.copy()
-    tmp_covers = {"best": 0, "toler": -1}
+def get_cover_length(lib_conds):
+    '''the transcript is computed along the first library'''
     for cond, lib_tracks in lib_conds.items():
-        for lib_name, covers in lib_tracks.items():
-            index_pos = 0
-            for cover in covers:
-                for cond, lib_tracks in lib_conds.items():
-                    for lib_track in lib_tracks.keys():
-                        real_track = lib_track.split("|")[-3]
-                        if index_pos < len(lib_tracks[lib_track]):
-                            compare_cover = lib_tracks[lib_track][index_pos]
-                        else:
-                            compare_cover = 0
-                        detect_hight_toler(
-                                compare_cover, args_tran.height,
-                                tmp_covers, tracks, real_track)
-                for track in tracks:
-                    if len(texs) != 0:
-                        for key, num in texs.items():
-                            if track in key:
-                                texs[key] += 1
-                check_tex_conds(tracks, libs, texs, check_tex,
-                                conds, args_tran.tex)
-                for cond, detect_num in conds.items():
-                    if ("tex" in cond):
-                        tex_rep = get_repmatch(args_tran.replicates["tex"], cond)
-                        if detect_num >= tex_rep:
-                            detect = True
-                    elif ("frag" in cond):
-                        frag_rep = get_repmatch(args_tran.replicates["frag"], cond)
-                        if detect_num >= frag_rep:
-                            detect = True
-                if detect:
-                    detect = False
-                    trans[strain].append(tmp_covers["best"])
+        for covers in lib_tracks.values():
+            return len(covers)
+        return 0
+    return 0
+
+
+def get_cover_type(tracks):
+    dtype = np.asarray(tracks[0]["covers"][:1]).dtype
+    if not np.issubdtype(dtype, np.floating):
+        dtype = np.float64
+    return dtype
+
+
+def stack_covers(tracks, start, end, dtype):
+    '''stack the coverages of all libraries to a 2-D array,
+    the short libraries are filled by 0'''
+    stacks = np.zeros((len(tracks), end - start), dtype=dtype)
+    for index, track in enumerate(tracks):
+        covers = track["covers"][start:end]
+        stacks[index, :len(covers)] = covers
+    return stacks
+
+
+def count_conds(tracks, texs, above, tex_notex):
+    '''count the libraries which pass the height for each condition.
+    If TEX+/- libraries are used, one TEX+/- pair is counted when
+    its libraries pass the height at least tex_notex times'''
+    counts = {}
+    if len(texs) != 0:
+        cond_names = []
+        for track in tracks:
+            if (track["claim"] is not None) and (
+                    track["claim"] not in cond_names):
+                cond_names.append(track["claim"])
+        for key, num in texs.items():
+            indexs = [index for index, track in enumerate(tracks)
+                      if key in track["keys"]]
+            if len(indexs) == 0:
+                continue
+            pair = (above[indexs].sum(axis=0) + num) >= tex_notex
+            claimers = np.full(above.shape[1], -1)
+            for index in reversed(indexs):
+                if tracks[index]["claim"] is not None:
+                    claimers = np.where(
+                        above[index], cond_names.index(
+                            tracks[index]["claim"]), claimers)
+            for cond_index, cond in enumerate(cond_names):
+                count = (pair & (claimers == cond_index)).astype(int)
+                if cond not in counts.keys():
+                    counts[cond] = count
                 else:
-                    trans[strain].append(-1)
-                if (tmp_covers["toler"] != -1):
-                    tolers.append(tmp_covers["toler"])
+                    counts[cond] += count
+    else:
+        for index, track in enumerate(tracks):
+            for cond, weight in track["weights"].items():
+                count = above[index].astype(int) * weight
+                if cond not in counts.keys():
+                    counts[cond] = count
                 else:
-                    tolers.append(args_tran.height + 10)
-                tmp_covers = {"best": 0, "toler": -1}
-                tracks = []
-                conds = {}
-                check_tex = []
-                texs = template_texs.copy()
-                index_pos += 1
-            break
-        break
+                    counts[cond] += count
+    return counts
+
+
+def check_replicates(counts, replicates, length):
+    '''check the replicate match of each condition'''
+    detects = np.zeros(length, dtype=bool)
+    for cond, count in counts.items():
+        if not count.any():
+            continue
+        if ("tex" in cond):
+            rep = get_repmatch(replicates["tex"], cond)
+        elif ("frag" in cond):
+            rep = get_repmatch(replicates["frag"], cond)
+        else:
+            continue
+        detects |= (count >= max(rep, 1))
+    return detects
+
+
+def elongation(lib_conds, template_texs, libs, args_tran):
+    '''check coverage and replicate match to form transcript. It returns
+    the highest coverage of each position (-1 if the position is not
+    detected) and the coverages for checking the tolerance'''
+    length = get_cover_length(lib_conds)
+    tracks = get_track_infos(lib_conds, libs, template_texs)
+    if (length == 0) or (len(tracks) == 0):
+        return np.zeros(0), np.zeros(0)
+    dtype = get_cover_type(tracks)
+    trans = np.full(length, -1, dtype=dtype)
+    tolers = np.full(length, args_tran.height + 10, dtype=np.float64)
+    for start in range(0, length, CHUNK_SIZE):
+        end = min(start + CHUNK_SIZE, length)
+        stacks = stack_covers(tracks, start, end, dtype)
+        above = stacks > args_tran.height
+        bests = np.maximum(np.where(above, stacks, 0).max(axis=0), 0)
+        tolers_chunk = np.maximum(np.where(above, -1, stacks).max(axis=0), -1)
+        counts = count_conds(tracks, template_texs, above, args_tran.tex)
+        detects = check_replicates(counts, args_tran.replicates, end - start)
+        trans[start:end] = np.where(detects, bests, -1)
+        tolers[start:end] = np.where(tolers_chunk != -1, tolers_chunk,
+                                     args_tran.height + 10)
+    return trans, tolers
 
 
 def transfer_to_tran(wigs, libs, template_texs, strand, args_tran):
     '''check coverage and replicate match to form transcript'''
     tolers = {}
     trans = {}
-    detect = False
     for strain, lib_conds in wigs.items():
-        if strain not in trans:
-            trans[strain] = []
-            tolers[strain] = []
-        elongation(lib_conds, template_texs, libs, strand, trans,
-                   args_tran, strain, tolers[strain])
+        trans[strain], tolers[strain] = elongation(
+            lib_conds, template_texs, libs, args_tran)
     return tolers, trans
 
 
@@ -136,57 +169,79 @@ def print_transcript(finals, out):
             num += 1
 
 
+def get_segments(covers):
+    '''get the run-length segments (start and end position)
+    of the detected positions'''
+    poss = np.flatnonzero(covers != -1) + 1
+    if len(poss) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(poss) != 1) + 1
+    starts = poss[np.concatenate(([0], breaks))]
+    ends = poss[np.concatenate((breaks - 1, [len(poss) - 1]))]
+    return zip(starts.tolist(), ends.tolist())
+
+
 def fill_gap_and_print(trans, strand, finals, tolers, wig_type, args_tran):
     '''compare transcript with CDS to modify transcript(merge mutliple 
     transcript based on overlap with the same CDS)'''
     for strain, covers in trans.items():
         if strain not in finals:
             finals[strain] = []
+        covers = np.asarray(covers)
+        if strain in tolers.keys():
+            toler_datas = np.asarray(tolers[strain])
+        else:
+            toler_datas = None
         first = True
         start = -1
         end = -1
-        pre_cover = None
-        cover_pos = 1
-        for cover in covers:
+        for seg_start, seg_end in get_segments(covers):
             fit = True
-            if cover != -1:
-                if first:
-                    first = False
-                    start = cover_pos
+            cover = covers[seg_start - 1]
+            if first:
+                first = False
+                start = seg_start
+                high_cover = cover
+                low_cover = cover
+            else:
+                if (seg_start - pre_pos) <= args_tran.tolerance:
+                    if (seg_start - pre_pos > 1) and (
+                            toler_datas is not None):
+                        toler_covers = toler_datas[(pre_pos - 1): seg_start]
+                        if (toler_covers < args_tran.low_cutoff).any():
+                            fit = False
+                    if fit:
+                        end = seg_start
+                        if high_cover < cover:
+                            high_cover = cover
+                        if low_cover > cover:
+                            low_cover = cover
+                if ((seg_start - pre_pos) >
+                        args_tran.tolerance) or (not fit):
+                    if (start != -1) and (end != -1) and (
+                            (end - start) >= args_tran.width):
+                        finals[strain].append({
+                            "start": start, "end": end, "strand": strand,
+                            "high": high_cover, "low": low_cover,
+                            "wig": wig_type})
+                    start = seg_start
+                    end = -1
                     high_cover = cover
                     low_cover = cover
+            if seg_end > seg_start:
+                seg_covers = covers[seg_start: seg_end]
+                if args_tran.tolerance >= 1:
+                    end = seg_end
+                    if high_cover < seg_covers.max():
+                        high_cover = seg_covers.max()
+                    if low_cover > seg_covers.min():
+                        low_cover = seg_covers.min()
                 else:
-                    if (cover_pos - pre_pos) <= args_tran.tolerance:
-                        if cover_pos - pre_pos > 1:
-                            for toler_strain, toler_datas in tolers.items():
-                                if toler_strain == strain:
-                                    toler_covers = toler_datas[
-                                            (pre_pos - 1): cover_pos]
-                                    for toler_cover in toler_covers:
-                                        if (toler_cover < args_tran.low_cutoff):
-                                            fit = False
-                                            break
-                        if fit:
-                            end = cover_pos
-                            if high_cover < cover:
-                                high_cover = cover
-                            if low_cover > cover:
-                                low_cover = cover
-                    if ((cover_pos - pre_pos) >
-                            args_tran.tolerance) or (not fit):
-                        if (start != -1) and (end != -1) and (
-                                (end - start) >= args_tran.width):
-                            finals[strain].append({
-                                "start": start, "end": end, "strand": strand,
-                                "high": high_cover, "low": low_cover,
-                                "wig": wig_type})
-                        start = cover_pos
-                        end = -1
-                        high_cover = cover
-                        low_cover = cover
-                pre_cover = cover
-                pre_pos = cover_pos
-            cover_pos += 1
+                    start = seg_end
+                    end = -1
+                    high_cover = seg_covers[-1]
+                    low_cover = seg_covers[-1]
+            pre_pos = seg_end
         if (len(covers) != 0) and (not first) and (
                 (start != -1) and (end != -1) and (
                 (end - start) >= args_tran.width)):
@@ -0,0 +1,96 @@
+import os
+import json
+import shutil
+import hashlib
+
+
+def file_hash(filename, buffer_size=1048576):
+    '''the sha1 of the content of the file'''
+    sha = hashlib.sha1()
+    with open(filename, "rb") as fh:
+        while True:
+            datas = fh.read(buffer_size)
+            if not datas:
+                break
+            sha.update(datas)
+    return sha.hexdigest()
+
+
+class TSSpredatorCache(object):
+    '''The content-addressed cache of TSSpredator runs for the
+    optimization. The key of a run is computed from the config file in
+    which the paths of the input files (wig, fasta and gff) are replaced
+    by the hashes of their contents, so the key does not depend on the
+    temporary folders. The converted gff file and the statistics
+    (compared with the manual set) of every key are stored in the
+    cache folder and can be reused by the later steps or runs.'''
+
+    def __init__(self, folder, tsspredator_path, manual, length, cluster):
+        self.folder = folder
+        if not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
+        self.hashs = {}
+        self.tool = self._path_hash(tsspredator_path)
+        self.manual_key = hashlib.sha1("\t".join([
+            self._path_hash(manual), str(length),
+            str(cluster)]).encode("utf-8")).hexdigest()
+
+    def _path_hash(self, path):
+        '''the hash of the file, it is only computed once for the same
+        size and modification time'''
+        if not os.path.isfile(path):
+            return path
+        stat = os.stat(path)
+        stamp = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+        if stamp not in self.hashs.keys():
+            self.hashs[stamp] = file_hash(path)
+        return self.hashs[stamp]
+
+    def run_key(self, config_file, program):
+        '''the key of the TSSpredator run of the config file'''
+        datas = [self.tool, program.lower()]
+        with open(config_file) as fh:
+            for line in fh:
+                line = line.strip()
+                if line.startswith("outputDirectory"):
+                    continue
+                if " = " in line:
+                    name, value = line.split(" = ", 1)
+                    line = " = ".join([name, self._path_hash(value)])
+                datas.append(line)
+        return hashlib.sha1("\n".join(datas).encode("utf-8")).hexdigest()
+
+    def gff_file(self, key):
+        return os.path.join(self.folder, key + ".gff")
+
+    def get_gff(self, key):
+        '''the cached gff of the key, None if it is not cached'''
+        if os.path.exists(self.gff_file(key)):
+            return self.gff_file(key)
+        return None
+
+    def put_gff(self, key, gff_file):
+        tmp_file = "".join([self.gff_file(key), ".", str(os.getpid()), ".tmp"])
+        shutil.copyfile(gff_file, tmp_file)
+        os.replace(tmp_file, self.gff_file(key))
+
+    def stat_file(self, key):
+        return os.path.join(self.folder, "_".join([
+            key, self.manual_key]) + ".json")
+
+    def get_stat(self, key):
+        '''the cached statistics of the key, None if it is not cached'''
+        if not os.path.exists(self.stat_file(key)):
+            return None
+        try:
+            with open(self.stat_file(key)) as fh:
+                return json.load(fh)
+        except ValueError:
+            return None
+
+    def put_stat(self, key, stat):
+        tmp_file = "".join([self.stat_file(key), ".",
+                            str(os.getpid()), ".tmp"])
+        with open(tmp_file, "w") as fh:
+            json.dump(stat, fh)
+        os.replace(tmp_file, self.stat_file(key))
@@ -0,0 +1,86 @@
+import os
+import sqlite3
+
+
+class UniprotIndex(object):
+    '''The on-disk index of the idmapping file of UniProt
+    (idmapping_selected.tab). The IDs of the fourth column are mapped to
+    the GO terms of the seventh column. The index is built once and
+    reused by the later runs; it is rebuilt only if the size or the
+    modification time of the idmapping file is changed.'''
+
+    batch = 500
+
+    def __init__(self, database_file, index_file):
+        self.database_file = database_file
+        self.index_file = index_file
+
+    def _stamp(self):
+        stat = os.stat(self.database_file)
+        return "\t".join([os.path.abspath(self.database_file),
+                          str(stat.st_size), str(stat.st_mtime_ns)])
+
+    def is_valid(self):
+        if not os.path.exists(self.index_file):
+            return False
+        try:
+            conn = sqlite3.connect(self.index_file)
+            try:
+                row = conn.execute(
+                    "SELECT value FROM info WHERE key = 'stamp'").fetchone()
+            finally:
+                conn.close()
+        except sqlite3.DatabaseError:
+            return False
+        return (row is not None) and (row[0] == self._stamp())
+
+    def _read_idmapping(self):
+        with open(self.database_file, "r") as fh:
+            for line in fh:
+                datas = line.rstrip("\n").split("\t")
+                if len(datas) >= 7:
+                    for id_ in datas[3].split(";"):
+                        id_ = id_.strip()
+                        if len(id_) != 0:
+                            yield (id_, datas[6])
+
+    def build(self):
+        '''build the index if it does not exist or is out of date.
+        Return True if the index is built'''
+        if self.is_valid():
+            return False
+        tmp_file = "".join([self.index_file, ".", str(os.getpid()), ".tmp"])
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        conn = sqlite3.connect(tmp_file)
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("CREATE TABLE info (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("CREATE TABLE mapping (id TEXT, go TEXT)")
+        conn.executemany("INSERT INTO mapping (id, go) VALUES (?, ?)",
+                         self._read_idmapping())
+        conn.execute("CREATE INDEX mapping_id ON mapping (id)")
+        conn.execute("INSERT INTO info VALUES ('stamp', ?)", (self._stamp(),))
+        conn.commit()
+        conn.close()
+        os.replace(tmp_file, self.index_file)
+        return True
+
+    def lookup(self, ids):
+        '''return the (ID, GO terms) of the IDs in the order of the
+        idmapping file'''
+        self.build()
+        ids = sorted(set(ids))
+        rows = []
+        conn = sqlite3.connect(self.index_file)
+        try:
+            for start in range(0, len(ids), self.batch):
+                sub_ids = ids[start: start + self.batch]
+                rows.extend(conn.execute(
+                    "SELECT rowid, id, go FROM mapping WHERE id IN "
+                    "({0})".format(", ".join(["?"] * len(sub_ids))),
+                    sub_ids).fetchall())
+        finally:
+            conn.close()
+        rows.sort()
+        return [(row[1], row[2]) for row in rows]
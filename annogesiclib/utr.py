@@ -3,6 +3,7 @@ import sys
 from annogesiclib.helper import Helper
 from annogesiclib.detect_utr import detect_3utr, detect_5utr
 from annogesiclib.multiparser import Multiparser
+from annogesiclib.parallel import run_jobs
 
 
 class UTRDetection(object):
@@ -28,33 +29,37 @@ class UTRDetection(object):
             if gff.endswith(".gff"):
                 self.helper.check_uni_attributes(os.path.join(folder, gff))
 
+    def _detect_utr(self, gff, args_utr):
+        '''detecting the 5'UTRs and 3'UTRs of one genome'''
+        prefix = gff[:-4]
+        tss = self.helper.get_correct_file(
+                self.tss_path, "_TSS.gff", prefix, None, None)
+        tran = self.helper.get_correct_file(
+                self.tran_path, "_transcript.gff", prefix, None, None)
+        if args_utr.terms:
+            term = self.helper.get_correct_file(
+                        os.path.join(args_utr.terms, "tmp"),
+                        "_term.gff", prefix, None, None)
+        else:
+            term = None
+        print("Computing 5'UTRs of {0}".format(prefix))
+        detect_5utr(tss, os.path.join(args_utr.gffs, gff),
+                    tran, os.path.join(self.utr5_path, "gffs",
+                    "_".join([prefix, "5UTR.gff"])), args_utr)
+        print("Computing 3'UTRs of {0}".format(prefix))
+        detect_3utr(tran, os.path.join(args_utr.gffs, gff),
+                    term, os.path.join(self.utr3_path, "gffs",
+                    "_".join([prefix, "3UTR.gff"])), args_utr)
+
     def _compute_utr(self, args_utr, log):
         log.write("Running detect_utr.py to detect UTRs.\n")
-        for gff in os.listdir(args_utr.gffs):
-            if gff.endswith(".gff"):
-                prefix = gff[:-4]
-                tss = self.helper.get_correct_file(
-                        self.tss_path, "_TSS.gff", prefix, None, None)
-                tran = self.helper.get_correct_file(
-                        self.tran_path, "_transcript.gff", prefix, None, None)
-                if args_utr.terms:
-                    term = self.helper.get_correct_file(
-                                os.path.join(args_utr.terms, "tmp"),
-                                "_term.gff", prefix, None, None)
-                else:
-                    term = None
-                print("Computing 5'UTRs of {0}".format(prefix))
-                detect_5utr(tss, os.path.join(args_utr.gffs, gff),
-                            tran, os.path.join(self.utr5_path, "gffs",
-                            "_".join([prefix, "5UTR.gff"])), args_utr)
-                print("Computing 3'UTRs of {0}".format(prefix))
-                detect_3utr(tran, os.path.join(args_utr.gffs, gff),
-                            term, os.path.join(self.utr3_path, "gffs",
-                            "_".join([prefix, "3UTR.gff"])), args_utr)
-                self.helper.move_all_content(
-                    os.getcwd(), self.utr5_stat_path, ["_5utr_length.png"])
-                self.helper.move_all_content(
-                    os.getcwd(), self.utr3_stat_path, ["_3utr_length.png"])
+        gffs = [(gff, args_utr) for gff in os.listdir(args_utr.gffs)
+                if gff.endswith(".gff")]
+        run_jobs(self._detect_utr, gffs, args_utr.threads)
+        self.helper.move_all_content(
+            os.getcwd(), self.utr5_stat_path, ["_5utr_length.png"])
+        self.helper.move_all_content(
+            os.getcwd(), self.utr3_stat_path, ["_3utr_length.png"])
         log.write("The following files are generated:\n")
         for folder in (os.path.join(self.utr5_path, "gffs"),
                        os.path.join(self.utr3_path, "gffs"),
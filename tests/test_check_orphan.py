@@ -7,30 +7,10 @@ sys.path.append(".")
 from mock_gff3 import Create_generator
 import annogesiclib.check_orphan as co
 
-class Mock_Parser_wig(object):
-
-    def __init__(self):
-        self.wigs = [{"pos": 1, "coverage": 300,
-                      "strand": "+", "strain": "aaa", "track": "track_1"},
-                     {"pos": 2, "coverage": 200,
-                      "strand": "+", "strain": "aaa", "track": "track_1"},
-                     {"pos": 1, "coverage": 500,
-                      "strand": "+", "strain": "bbb", "track": "track_1"}]
-
-    def parser(self, filename, strand):
-        for wig in self.wigs:
-            self.pos = wig["pos"]
-            self.coverage = wig["coverage"]
-            self.track = wig["track"]
-            self.strand = wig["strand"]
-            self.strain = wig["strain"]
-            yield self
-
 class TestCheckOrphan(unittest.TestCase):
 
     def setUp(self):
         self.example = Example()
-        co.WigParser = Mock_Parser_wig
         self.test_folder = "test_folder"
         if (not os.path.exists(self.test_folder)):
             os.mkdir(self.test_folder)
@@ -160,14 +140,12 @@ class TestCheckOrphan(unittest.TestCase):
 
     def test_read_wig(self):
         wig_file = os.path.join(self.test_folder, "test.wig")
-        wig_fh = open(wig_file, "w")
-        wig_fh.close()
+        with open(wig_file, "w") as wig_fh:
+            wig_fh.write(self.example.wig)
         wigs = co.read_wig(wig_file, "+")
-        self.assertDictEqual(wigs, {
-            'aaa': {'track_1': [
-                {'pos': 1, 'coverage': 300, 'strand': '+'},
-                {'pos': 2, 'coverage': 200, 'strand': '+'}]},
-            'bbb': {'track_1': [{'pos': 1, 'coverage': 500, 'strand': '+'}]}})
+        self.assertListEqual(list(wigs["aaa"]["track_1"]), [300, 200])
+        self.assertListEqual(list(wigs["bbb"]["track_1"]), [500])
+        self.assertDictEqual(co.read_wig(False, "+"), {})
 
     def test_compare_cds_check_orphan(self):
         tss_dict = [{"start": 517, "end": 517, "phase": ".",
@@ -229,23 +207,17 @@ class Example(object):
                   "UTR_length": "Primary_100&Primary_120",
                   "associated_gene": "AAA_00001&AAA_00003"}
 
-    wigs_f = {"aaa": {"texnotex": [{"pos": 1, "coverage": 300,
-                                    "strand": "+", "type": "tex"},
-                                   {"pos": 2, "coverage": 400,
-                                    "strand": "+", "type": "tex"},
-                                   {"pos": 3, "coverage": 450,
-                                    "strand": "+", "type": "tex"},
-                                   {"pos": 4, "coverage": 470,
-                                    "strand": "+", "type": "tex"}]}}
-
-    wigs_r = {"aaa": {"texnotex": [{"pos": 1, "coverage": 300,
-                                    "strand": "-", "type": "tex"},
-                                   {"pos": 2, "coverage": 300,
-                                    "strand": "-", "type": "tex"},
-                                   {"pos": 3, "coverage": 330,
-                                    "strand": "-", "type": "tex"},
-                                   {"pos": 4, "coverage": 350,
-                                    "strand": "-", "type": "tex"}]}}
+    wig = """track type=wiggle_0 name="track_1"
+variableStep chrom=aaa span=1
+1 300
+2 200
+variableStep chrom=bbb span=1
+1 500
+"""
+
+    wigs_f = {"aaa": {"texnotex": [300, 400, 450, 470]}}
+
+    wigs_r = {"aaa": {"texnotex": [300, 300, 330, 350]}}
 if __name__ == "__main__":
     unittest.main()
 
@@ -15,15 +15,12 @@ class Mock_segemehl(object):
                          index, fasta, log):
         pass
 
-    def mock_align(self, args,
+    def mock_align(self, pool, args,
                    index, fasta, read,
                    sam_file, log_file,
                    fasta_prefix, log):
         return "test"
 
-    def mock_wait_processes(self, processes):
-        pass
-
 class Mock_samtools(object):
 
     def mock_covert_bam(self, samtools_path, out_bam, pre_sam, log):
@@ -97,7 +94,6 @@ class TestCircRNADetection(unittest.TestCase):
     def test_align(self):
         self.circ._run_segemehl_fasta_index = self.segemehl.mock_fasta_index
         self.circ._run_segemehl_align = self.segemehl.mock_align
-        self.circ._wait_process = self.segemehl.mock_wait_processes
         fasta1 = os.path.join(os.path.join(self.fasta_folder, "tmp/test1.fa"))
         fasta2 = os.path.join(os.path.join(self.fasta_folder, "tmp/test2.fa"))
         read1 = os.path.join(self.read_folder, "read1.fa")
@@ -0,0 +1,96 @@
+import gc
+import sys
+import unittest
+import numpy as np
+sys.path.append(".")
+import annogesiclib.coverage_stats as coverage_stats
+from annogesiclib.coverage_stats import CoverageStats, get_stats, \
+    feature_range, high_low, coverage_matrix
+
+
+class TestCoverageStats(unittest.TestCase):
+
+    def setUp(self):
+        self.covers = np.array([3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5, 8, 9, 7,
+                                9, 3, 2, 3, 8, 4, 6, 2, 6, 4, 3],
+                               dtype=np.float32)
+
+    def test_query(self):
+        stats = CoverageStats(self.covers, block_size=4)
+        for start in range(-1, len(self.covers) + 2):
+            for end in range(start, len(self.covers) + 2):
+                total, high, low = stats.query(start, end)
+                covers = self.covers[max(start, 0): max(end, 0)]
+                if len(covers) == 0:
+                    self.assertEqual(total, 0)
+                    self.assertIsNone(high)
+                    self.assertIsNone(low)
+                else:
+                    self.assertEqual(total, covers.sum())
+                    self.assertEqual(high, covers.max())
+                    self.assertEqual(low, covers.min())
+
+    def test_batch(self):
+        stats = CoverageStats(self.covers, block_size=4)
+        starts = [0, 2, 5, 3, 10, 24, 0]
+        ends = [25, 3, 21, 3, 18, 30, 8]
+        totals, highs, lows = stats.batch(starts, ends)
+        for index, (start, end) in enumerate(zip(starts, ends)):
+            total, high, low = stats.query(start, end)
+            self.assertEqual(totals[index], total)
+            if high is None:
+                self.assertTrue(np.isnan(highs[index]))
+                self.assertTrue(np.isnan(lows[index]))
+            else:
+                self.assertEqual(highs[index], high)
+                self.assertEqual(lows[index], low)
+
+    def test_get_stats(self):
+        stats = get_stats(self.covers)
+        self.assertIs(get_stats(self.covers).highs, stats.highs)
+        covers = self.covers.copy()
+        self.assertIsNot(get_stats(covers).highs, stats.highs)
+        key = id(covers)
+        self.assertIn(key, coverage_stats._TABLES.keys())
+        del covers
+        gc.collect()
+        self.assertNotIn(key, coverage_stats._TABLES.keys())
+        self.assertEqual(get_stats([1, 2, 3]).query(0, 3), (6, 3, 1))
+
+    def test_tables(self):
+        covers = np.arange(5000, dtype=np.float32)
+        stats = CoverageStats(covers)
+        self.assertEqual(stats.highs[0].dtype, np.float32)
+        self.assertLess(sum([high.nbytes for high in stats.highs]) * 2 +
+                        stats.sums.nbytes, covers.nbytes / 10)
+        self.assertEqual(stats.query(100, 4000)[1], 3999)
+        self.assertEqual(CoverageStats([1, 2]).highs, [])
+
+    def test_feature_range(self):
+        self.assertEqual(feature_range(3, 5, "+", 25), (3, 6))
+        self.assertEqual(feature_range(3, 5, "-", 25), (2, 5))
+        self.assertEqual(feature_range(20, 30, "+", 25), (20, 25))
+        self.assertEqual(feature_range(1, 30, "-", 25), (0, 25))
+
+    def test_high_low(self):
+        self.assertEqual(high_low(self.covers, 2, 10, "+"), (9, 5, 2, 6))
+        self.assertEqual(high_low(self.covers, 2, 10, "-"), (9, 5, 1, 3))
+        self.assertEqual(high_low(self.covers, 11, 16, "+"), (9, 12, 3, 15))
+        self.assertEqual(high_low(self.covers, 11, 16, "-"), (9, 14, 7, 13))
+        self.assertEqual(high_low(self.covers, 5, 5, "+"),
+                         (None, None, None, None))
+
+    def test_coverage_matrix(self):
+        libs = [self.covers, self.covers[::-1].copy()]
+        matrix = coverage_matrix(libs, [0, 4], [4, 8], "total")
+        self.assertListEqual(matrix.tolist(), [[9, 15], [22, 21]])
+        matrix = coverage_matrix(libs, [0, 4], [4, 8], "average")
+        self.assertListEqual(matrix.tolist(), [[2.25, 3.75], [5.5, 5.25]])
+        matrix = coverage_matrix(libs, [0, 4], [4, 8], "high")
+        self.assertListEqual(matrix.tolist(), [[4, 6], [9, 8]])
+        matrix = coverage_matrix(libs, [0, 4], [4, 8], "low")
+        self.assertListEqual(matrix.tolist(), [[1, 2], [2, 3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import sys
+import os
+import unittest
+import shutil
+import subprocess
+sys.path.append(".")
+import annogesiclib.coverage_store as cs
+
+
+class TestCoverageStore(unittest.TestCase):
+
+    def setUp(self):
+        self.example = Example()
+        self.test_folder = "test_folder"
+        if (not os.path.exists(self.test_folder)):
+            os.mkdir(self.test_folder)
+        self.store_folder = os.path.join(self.test_folder, "store")
+        os.environ["ANNOGESIC_COVERAGE_STORE"] = self.store_folder
+        self.wig_file = os.path.join(self.test_folder, "test_reverse.wig")
+        with open(self.wig_file, "w") as wh:
+            wh.write(self.example.wig)
+
+    def tearDown(self):
+        del os.environ["ANNOGESIC_COVERAGE_STORE"]
+        if os.path.exists(self.test_folder):
+            shutil.rmtree(self.test_folder)
+
+    def test_store_name(self):
+        forward = cs.store_name(self.wig_file, "+")
+        reverse = cs.store_name(self.wig_file, "-")
+        self.assertNotEqual(forward, reverse)
+        self.assertTrue(forward.startswith(self.store_folder))
+        self.assertFalse(".wig" in os.path.basename(forward))
+
+    def test_store_folder(self):
+        self.assertEqual(cs.store_folder(), self.store_folder)
+        env = dict(os.environ)
+        del env["ANNOGESIC_COVERAGE_STORE"]
+        proc = subprocess.run(
+            [sys.executable, "-c", "import annogesiclib.coverage_store as "
+             "cs; print(cs.store_folder()); print(cs.store_folder())"],
+            env=env, stdout=subprocess.PIPE, universal_newlines=True)
+        folders = proc.stdout.split()
+        self.assertEqual(proc.returncode, 0)
+        self.assertEqual(folders[0], folders[1])
+        self.assertFalse(os.path.exists(folders[0]))
+
+    def test_convert_wig(self):
+        store_file = cs.convert_wig(self.wig_file, "-")
+        self.assertTrue(os.path.exists(store_file))
+        wigs = cs.open_store(store_file)
+        self.assertListEqual(list(wigs["aaa"]["track_1"]),
+                             [0, 0, 1.5, 20, 30])
+        self.assertListEqual(list(wigs["aaa"]["track_2"]), [0, 4])
+        self.assertListEqual(list(wigs["bbb"]["track_2"]), [7])
+
+    def test_load_coverage(self):
+        wigs = cs.load_coverage(self.wig_file, "-")
+        self.assertListEqual(list(wigs["aaa"]["track_1"]),
+                             [0, 0, 1.5, 20, 30])
+        store_file = cs.store_name(self.wig_file, "-")
+        self.assertTrue(cs._is_fresh(self.wig_file, "-", store_file))
+        wigs = cs.load_coverage(self.wig_file, "-")
+        wigs["aaa"]["track_1"][0] = 100
+        wigs = cs.load_coverage(self.wig_file, "-")
+        self.assertEqual(wigs["aaa"]["track_1"][0], 0)
+        with open(self.wig_file, "a") as wh:
+            wh.write("2 -8\n")
+        self.assertFalse(cs._is_fresh(self.wig_file, "-", store_file))
+        wigs = cs.load_coverage(self.wig_file, "-")
+        self.assertListEqual(list(wigs["bbb"]["track_2"]), [7, 8])
+
+
+class Example(object):
+
+    wig = """track type=wiggle_0 name="track_1"
+variableStep chrom=aaa span=1
+3 -1.5
+4 -20
+5 -30
+track type=wiggle_0 name="track_2"
+variableStep chrom=aaa span=1
+2 -4
+variableStep chrom=bbb span=1
+1 -7
+"""
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ sys.path.append(".")
 from mock_gff3 import Create_generator
 from mock_helper import import_data
 import annogesiclib.detect_operon as op
+from annogesiclib.interval_index import IntervalIndex
 
 class Mock_func(object):
 
@@ -77,7 +78,7 @@ class TestDetectOperon(unittest.TestCase):
         datas = []
         for ta in self.example.tas:
             datas.append(op.detect_features(
-                ta, self.example.gffs, "gene", 5, 3))
+                ta, IntervalIndex(self.example.gffs), "gene", 5, 3))
         features = []
         detects = []
         for data in datas:
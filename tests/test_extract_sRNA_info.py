@@ -73,6 +73,38 @@ class TestExtractsRNAInfo(unittest.TestCase):
         out_t.close()
         blast_f.close()
 
+    def test_index_blast(self):
+        srna_blast = os.path.join(self.test_folder, "srna_table")
+        gen_file(srna_blast, self.example.blast_srna_all + "\n" +
+                 "Query= srna2|Staphylococcus_aureus\n_HG003|1|2|+\n")
+        index = esi.index_blast(srna_blast)
+        self.assertListEqual(sorted(index.keys()), [
+            "srna0|Staphylococcus_aureus_HG003|313|417|+",
+            "srna1|Staphylococcus_aureus_HG003|4045|4159|-",
+            "srna2|Staphylococcus_aureus_HG003|1|2|+"])
+        with open(srna_blast, "rb") as fh:
+            lines = list(esi.read_query_blocks(fh, index[
+                "srna1|Staphylococcus_aureus_HG003|4045|4159|-"]))
+        self.assertEqual(lines[0].strip(),
+                         "Query= srna1|Staphylococcus_aureus_HG003|4045|4159|-")
+        self.assertFalse("Query= srna0" in "".join(lines))
+        self.assertEqual(len(index["srna2|Staphylococcus_aureus_HG003|1|2|+"]),
+                         1)
+
+    def test_load_blast_index(self):
+        srna_blast = os.path.join(self.test_folder, "srna_table")
+        index_file = os.path.join(self.test_folder, "srna_table.index")
+        gen_file(srna_blast, self.example.blast_srna_all)
+        index = esi.load_blast_index(srna_blast, index_file)
+        self.assertTrue(os.path.exists(index_file))
+        self.assertDictEqual(esi.load_blast_index(srna_blast, index_file),
+                             index)
+        gen_file(srna_blast, self.example.blast_srna_all.split(
+            "Query= srna1")[0])
+        self.assertListEqual(list(esi.load_blast_index(
+            srna_blast, index_file).keys()),
+            ["srna0|Staphylococcus_aureus_HG003|313|417|+"])
+
     def test_extract_blast(self):
         esi.read_gff = Mock_func().mock_read_gff
         nr_blast = os.path.join(self.test_folder, "nr_table")
@@ -101,6 +133,50 @@ class TestExtractsRNAInfo(unittest.TestCase):
         self.assertEqual(set(datas),
                          set(self.example.out_srna_csv.split("\n")))
 
+    def test_read_blast_table(self):
+        nr_blast = os.path.join(self.test_folder, "nr_table")
+        gen_file(nr_blast, self.example.blast_nr_table)
+        hits = esi.read_blast_table(nr_blast)
+        self.assertListEqual(list(hits.keys()), [
+            "srna1|Staphylococcus_aureus_HG003|4045|4159|-"])
+        hits = hits["srna1|Staphylococcus_aureus_HG003|4045|4159|-"]
+        self.assertListEqual([hit["e"] for hit in hits],
+                             ["4e-18", "1e-17", "2e-10"])
+        self.assertEqual(esi.get_protein_info(hits[0]),
+                         ("DNA replication and repair protein RecF domain "
+                          "protein", "EHS30036.1"))
+
+    def test_extract_blast_table(self):
+        esi.read_gff = Mock_func().mock_read_gff
+        nr_blast = os.path.join(self.test_folder, "nr_table")
+        gen_file(nr_blast, self.example.blast_nr_table)
+        srna_blast = os.path.join(self.test_folder, "srna_table")
+        gen_file(srna_blast, self.example.blast_srna_table)
+        output_file = os.path.join(self.test_folder, "out.gff")
+        output_table = os.path.join(self.test_folder, "out.csv")
+        esi.extract_blast_table(nr_blast, "test.srna", output_file,
+                                output_table, "nr", None, None)
+        datas, attributes = extract_info(output_file, "file")
+        refs, ref_attributes = extract_info(self.example.out_nr_gff, "string")
+        self.assertEqual(set(datas), set(refs[1:]))
+        datas = import_data(output_table)
+        self.assertListEqual(datas, self.example.out_nr_table.split("\n"))
+        esi.extract_blast_table(nr_blast, "test.srna", output_file,
+                                output_table, "nr", None, 80.7)
+        datas = import_data(output_table)
+        self.assertListEqual(datas, [
+            self.example.out_nr_table.split("\n")[0],
+            self.example.out_nr_table.split("\n")[2]])
+        esi.extract_blast_table(srna_blast, "test.srna", output_file,
+                                output_table, "sRNA", None, None)
+        datas, attributes = extract_info(output_file, "file")
+        refs, ref_attributes = extract_info(
+            self.example.out_srna_gff, "string")
+        self.assertEqual(set(datas), set(refs[1:]))
+        datas = import_data(output_table)
+        self.assertEqual(set(datas),
+                         set(self.example.out_srna_csv.split("\n")))
+
 class Example(object):
 
     srna_dict = [{"start": 313, "end": 417, "phase": ".",
@@ -313,6 +389,26 @@ Staphylococcus_aureus_HG003	Refseq	sRNA	4045	4159	.	-	.	ID=srna1;Name=sRNA_candi
     out_nr_csv = """Staphylococcus_aureus_HG003	srna0	+	313	417	NA
 Staphylococcus_aureus_HG003	srna1	-	4045	4159	DNA replication and repair protein RecF domain protein	EHS30036.1,EHS80331.1,EID88948.1	4e-18
 Staphylococcus_aureus_HG003	srna1	-	4045	4159	AAA domain protein	KDP53072.1	1e-17"""
+    blast_nr_table = "\n".join([
+        "srna1|Staphylococcus_aureus_HG003|4045|4159|-\tgi|375036980|gb|"
+        "EHS30036.1|\t4e-18\t80.5\tDNA replication and repair protein RecF "
+        "domain protein [Staphylococcus aureus subsp. aureus IS-111]",
+        "srna1|Staphylococcus_aureus_HG003|4045|4159|-\tgi|375036980|gb|"
+        "EHS30036.1|\t3.0\t20.1\tDNA replication and repair protein RecF "
+        "domain protein [Staphylococcus aureus subsp. aureus IS-111]",
+        "srna1|Staphylococcus_aureus_HG003|4045|4159|-\tgi|515566342|ref|"
+        "WP_016999177.1|\t2e-10\t60.2\thypothetical protein "
+        "[Staphylococcus lentus]",
+        "srna1|Staphylococcus_aureus_HG003|4045|4159|-\tgi|645287686|gb|"
+        "KDP53072.1|\t1e-17\t80.9\tAAA domain protein [Staphylococcus "
+        "aureus subsp. aureus CO-86]"]) + "\n"
+    blast_srna_table = (
+        "srna1|Staphylococcus_aureus_HG003|4045|4159|-\tssau217.1|"
+        "Staphylococcus\t4e-89\t318\tssau217.1|Staphylococcus aureus subsp. "
+        "aureus N315|RsaK\n")
+    out_nr_table = """Staphylococcus_aureus_HG003	srna0	+	313	417	NA
+Staphylococcus_aureus_HG003	srna1	-	4045	4159	DNA replication and repair protein RecF domain protein	EHS30036.1	4e-18	80.5
+Staphylococcus_aureus_HG003	srna1	-	4045	4159	AAA domain protein	KDP53072.1	1e-17	80.9"""
     out_srna_gff = """##gff-version 3
 Staphylococcus_aureus_HG003	Refseq	sRNA	313	417	.	+	.	Name=sRNA_candidate_0000;ID=srna0;sRNA_hit=NA
 Staphylococcus_aureus_HG003	Refseq	sRNA	4045	4159	.	-	.	Name=sRNA_candidate_0001;ID=srna1;sRNA_hit=1"""
@@ -7,6 +7,8 @@ import shutil
 sys.path.append(".")
 from io import StringIO
 from mock_gff3 import Create_generator
+from mock_helper import gen_file, import_data
+from annogesiclib.gff3 import Gff3Parser
 import annogesiclib.filter_TSS_pro as ftp
 
 
@@ -29,6 +31,29 @@ class TestFilterTSSPro(unittest.TestCase):
         self.assertEqual("\t".join(out.getvalue().split("\t")[0:-1]), 
                          "aaa\tRefseq\tTSS\t24\t24\t.\t+\t.")
 
+    def test_compare_tss_pro_table(self):
+        out = StringIO()
+        tars = Gff3Parser().table(StringIO("\n".join(
+            [tar.info for tar in self.example.tars])))
+        refs = Gff3Parser().table(StringIO("\n".join(
+            [ref.info for ref in self.example.refs])))
+        ftp.compare_tss_pro_table(tars, refs, out, 3)
+        self.assertEqual("\t".join(out.getvalue().split("\t")[0:-1]),
+                         "aaa\tRefseq\tTSS\t24\t24\t.\t+\t.")
+
+    def test_filter_tss_pro(self):
+        tss_file = os.path.join(self.test_folder, "test_TSS.gff")
+        pro_file = os.path.join(self.test_folder, "test_processing.gff")
+        gen_file(tss_file, "\n".join(
+            [tar.info for tar in reversed(self.example.tars)]) + "\n")
+        gen_file(pro_file, "\n".join(
+            [ref.info for ref in self.example.refs]) + "\n")
+        ftp.filter_tss_pro(tss_file, pro_file, "processing", 3)
+        datas = import_data(tss_file)
+        self.assertEqual(len(datas), 2)
+        self.assertTrue(datas[1].startswith(
+            "aaa\tRefseq\tTSS\t24\t24\t.\t+\t."))
+
 
 class Example(object):
     tar_dict = [
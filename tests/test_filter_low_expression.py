@@ -29,18 +29,8 @@ class TestLowExpress(unittest.TestCase):
                     "score": "."}
         attributes_tar = {"type": "Primary", "ID": "tss1", "Name": "TSS:3_+"}
         tar = Create_generator(tar_dist, attributes_tar, "gff")
-        wigs = {"aaa": {"frag_1": {"track_1": [
-            {"pos": 1, "coverage": 100, "type": "frag"},
-            {"pos": 2, "coverage": 30, "type": "frag"},
-            {"pos": 3, "coverage": 23, "type": "frag"},
-            {"pos": 4, "coverage": 21, "type": "frag"},
-            {"pos": 5, "coverage": 21, "type": "frag"}]},
-                        "frag_2": {"track_2": [
-            {"pos": 1, "coverage": 100, "type": "frag"},
-            {"pos": 2, "coverage": 30, "type": "frag"},
-            {"pos": 3, "coverage": 40, "type": "frag"},
-            {"pos": 4, "coverage": 21, "type": "frag"},
-            {"pos": 5, "coverage": 21, "type": "frag"}]}}}
+        wigs = {"aaa": {"frag_1": {"track_1": [100, 30, 23, 21, 21]},
+                        "frag_2": {"track_2": [100, 30, 40, 21, 21]}}}
         coverage = fle.get_coverage(tar, wigs)
         self.assertEqual(coverage, 40)
 
@@ -79,23 +79,11 @@ class TestGenScreenshots(unittest.TestCase):
         self.assertEqual(out.getvalue(), self.example.out_print_wig)
 
 class Example(object):
-    cover_low = [{"coverage": 1.342}, {"coverage": 2.341},
-                 {"coverage": 2.3544}, {"coverage": 5.342},
-                 {"coverage": 10.2341}, {"coverage": 6.231},
-                 {"coverage": 1.432}, {"coverage": 1.342},
-                 {"coverage": 1.342}]
-    covers_low = []
-    for cover in cover_low:
-        covers_low.append(Create_generator(cover, {}, "wig"))
+    covers_low = [1.342, 2.341, 2.3544, 5.342, 10.2341,
+                  6.231, 1.432, 1.342, 1.342]
     wigs_low = {"test.wig": {"aaa": covers_low, "bbb": covers_low}}
-    cover_high = [{"coverage": 100.342}, {"coverage": 20.341},
-                  {"coverage": 20.3544}, {"coverage": 500.342},
-                  {"coverage": 10.2341}, {"coverage": 60.231},
-                  {"coverage": 100.432}, {"coverage": 100.342},
-                  {"coverage": 10.342}]
-    covers_high = []
-    for cover in cover_high:
-        covers_high.append(Create_generator(cover, {}, "wig"))
+    covers_high = [100.342, 20.341, 20.3544, 500.342, 10.2341,
+                   60.231, 100.432, 100.342, 10.342]
     wigs_high = {"test.wig": {"aaa": covers_high, "bbb": covers_high}}
     out = """new
 genome /home/silas/ANNOgesic/fasta
@@ -59,8 +59,8 @@ class TestGensRNAOutput(unittest.TestCase):
         args = self.mock_args.mock()
         args.min_len = 30
         args.max_len = 500
-        new_final = gso.compare_srna_table(self.example.srna_tables,
-                                           srna, final, args)
+        tables = gso.index_by_position(self.example.srna_tables)
+        new_final = gso.compare_srna_table(tables, srna, final, args)
         self.assertDictEqual(new_final, {
             'end_pro': 'NA', 'strand': '+', 'strain': 'aaa',
             'avg': 100, 'type': 'TEX+/-;Fragmented',
@@ -68,6 +68,20 @@ class TestGensRNAOutput(unittest.TestCase):
             'tss_pro': 'TSS:300_+', 'start': 300, 'utr': '3UTR',
             'energy': -23, 'end': 367})
 
+    def test_compare_blast(self):
+        srna_dict = {"seq_id": "aaa", "source": "Refseq",
+                     "feature": "sRNA", "start": 300,
+                     "end": 367, "phase": ".", "strand": "+", "score": "."}
+        srna = Create_generator(srna_dict, {"ID": "srna0"}, "gff")
+        blasts = gso.index_by_position(gso.merge_info(
+            self.example.nr_blasts))
+        self.assertEqual(len(blasts.keys()), 3)
+        final = gso.compare_blast(blasts, srna, {}, "nr_hit")
+        self.assertDictEqual(final, {"nr_hit": "111;222"})
+        srna.strand = "-"
+        self.assertDictEqual(gso.compare_blast(blasts, srna, {}, "nr_hit"),
+                             {})
+
     def test_compare(self):
         args = self.mock_args.mock()
         args.min_len = 30
@@ -4,6 +4,7 @@ import unittest
 import os
 import sys
 import shutil
+import numpy as np
 sys.path.append(".")
 from io import StringIO
 from mock_gff3 import Create_generator
@@ -140,24 +141,11 @@ class TestGeneExpress(unittest.TestCase):
         self.assertDictEqual(dicts, refs)
 
 class Example(object):
-    wig_frags = {"aaa": {"frag": {"track_1": [{"coverage": 100, "pos": 1},
-                                              {"coverage": 100, "pos": 2},
-                                              {"coverage": 200, "pos": 3},
-                                              {"coverage": 0, "pos": 4},
-                                              {"coverage": 230, "pos": 5},
-                                              {"coverage": 230, "pos": 6}]}}}
-    wig_texs = {"aaa": {"tex": {"tex1": [{"coverage": 100, "pos": 1},
-                                         {"coverage": 100, "pos": 2},
-                                         {"coverage": 0, "pos": 3},
-                                         {"coverage": 0, "pos": 4},
-                                         {"coverage": 230, "pos": 5},
-                                         {"coverage": 230, "pos": 6}],
-                                "tex2": [{"coverage": 100, "pos": 1},
-                                         {"coverage": 100, "pos": 2},
-                                         {"coverage": 100, "pos": 3},
-                                         {"coverage": 0, "pos": 4},
-                                         {"coverage": 230, "pos": 5},
-                                         {"coverage": 230, "pos": 6}]}}}
+    wig_frags = {"aaa": {"frag": {"track_1": np.array(
+        [100, 100, 200, 0, 230, 230])}}}
+    wig_texs = {"aaa": {"tex": {"tex1": np.array([100, 100, 0, 0, 230, 230]),
+                                "tex2": np.array(
+                                    [100, 100, 100, 0, 230, 230])}}}
     out_stat = """aaa:
 total input:	1
 expression at all conditions:	1 (1.0)
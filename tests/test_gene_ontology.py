@@ -7,6 +7,7 @@ sys.path.append(".")
 from mock_gff3 import Create_generator
 from mock_helper import import_data, gen_file
 import annogesiclib.gene_ontology as go
+from annogesiclib.uniprot_index import UniprotIndex
 
 
 class Mock_gff_parser(object):
@@ -43,17 +44,27 @@ class TestGeneOntology(unittest.TestCase):
         go.Gff3Parser = Mock_gff_parser
         database_file = os.path.join(self.test_folder, "database")
         gen_file(database_file, self.example.idmapping)
+        uni_index = UniprotIndex(database_file, database_file + ".sqlite")
         gff_file = os.path.join(self.test_folder, "test.gff")
         gen_file(gff_file, "test")
         out_file = os.path.join(self.test_folder, "out.gff")
         tran_file = os.path.join(self.test_folder, "test_transcript.gff")
         gen_file(tran_file, "test")
-        go.retrieve_uniprot(database_file, gff_file,
+        go.retrieve_uniprot(uni_index, gff_file,
                             out_file, tran_file, "express")
         datas = import_data(out_file)
         self.assertEqual(set(datas),
                          set(self.example.out_retrieve.split("\n")))
 
+    def test_index_cds(self):
+        cds_index = go.index_cds(self.example.gffs)
+        self.assertListEqual(sorted(cds_index.keys()), [
+            "CDS_1", "YP_031579.1", "YP_031580.1", "YP_654574.1"])
+        self.assertListEqual([gff.start for gff in cds_index["YP_031579.1"]],
+                             [150, 100])
+        self.assertListEqual([gff.start for gff in cds_index["CDS_1"]],
+                             [1230])
+
     def test_compare_cds_tran(self):
         gffs = self.example.gffs
         trans = self.example.trans
@@ -0,0 +1,97 @@
+import os
+import sys
+import shutil
+import unittest
+sys.path.append(".")
+from mock_helper import gen_file
+from annogesiclib.genome_store import GenomeStore, read_seq
+
+
+class TestGenomeStore(unittest.TestCase):
+
+    def setUp(self):
+        self.example = Example()
+        self.test_folder = "test_folder"
+        if (not os.path.exists(self.test_folder)):
+            os.mkdir(self.test_folder)
+        self.fasta = os.path.join(self.test_folder, "test.fa")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_folder)
+
+    def test_index(self):
+        gen_file(self.fasta, self.example.fasta)
+        store = GenomeStore(self.fasta)
+        self.assertListEqual(list(store.keys()), ["aaa", "bbb", "ccc"])
+        self.assertEqual(store.length("aaa"), 25)
+        self.assertEqual(store.length("bbb"), 12)
+        self.assertEqual(store.index["aaa"]["line_bases"], 10)
+        self.assertEqual(store.index["aaa"]["line_bytes"], 11)
+        self.assertTrue(store.index["aaa"]["regular"])
+        self.assertFalse(store.index["ccc"]["regular"])
+
+    def test_fetch(self):
+        gen_file(self.fasta, self.example.fasta)
+        for use_mmap in (True, False):
+            store = GenomeStore(self.fasta, use_mmap=use_mmap)
+            for name, seq in self.example.seqs.items():
+                for start in range(0, len(seq) + 2):
+                    for end in range(start, len(seq) + 2):
+                        self.assertEqual(store.fetch(name, start, end),
+                                         seq[max(start - 1, 0): end])
+                self.assertEqual(store.seq(name), seq)
+            store.close()
+
+    def test_sequence(self):
+        gen_file(self.fasta, self.example.fasta)
+        store = GenomeStore(self.fasta)
+        seq = store["aaa"]
+        ref = self.example.seqs["aaa"]
+        self.assertEqual(len(seq), 25)
+        self.assertEqual(seq[3:14], ref[3:14])
+        self.assertEqual(seq[-5:], ref[-5:])
+        self.assertEqual(seq[::-1], ref[::-1])
+        self.assertEqual(seq[12], ref[12])
+        self.assertEqual(seq[-1], ref[-1])
+        self.assertEqual(str(seq), ref)
+        self.assertRaises(IndexError, lambda: seq[25])
+        self.assertRaises(KeyError, lambda: store["ddd"])
+
+    def test_crlf(self):
+        gen_file(self.fasta, self.example.fasta.replace("\n", "\r\n"))
+        store = GenomeStore(self.fasta)
+        for name, seq in self.example.seqs.items():
+            self.assertEqual(store.fetch(name, 8, 23), seq[7:23])
+
+    def test_read_seq(self):
+        gen_file(self.fasta, ">aaa\nACGTA\nCG")
+        self.assertEqual(str(read_seq(self.fasta)), "ACGTACG")
+        gen_file(self.fasta, self.example.fasta)
+        self.assertEqual(read_seq(self.fasta), "".join(
+            self.example.seqs.values()))
+        gen_file(self.fasta, "\nACGT\nAA\n")
+        self.assertEqual(str(read_seq(self.fasta)), "ACGTAA")
+
+
+class Example(object):
+
+    fasta = """>aaa
+ACGTACGTAC
+GGGTTTAAAC
+CCATG
+>bbb
+TTTTTGGGGG
+AA
+
+>ccc
+ACGTA
+ACGTACG
+AC
+"""
+    seqs = {"aaa": "ACGTACGTACGGGTTTAAACCCATG",
+            "bbb": "TTTTTGGGGGAA",
+            "ccc": "ACGTAACGTACGAC"}
+
+
+if __name__ == "__main__":
+    unittest.main()
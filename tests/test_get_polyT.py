@@ -7,6 +7,7 @@ sys.path.append(".")
 from mock_gff3 import Create_generator
 from mock_args_container import MockClass
 import annogesiclib.get_polyT as gpt
+from annogesiclib.interval_index import IntervalIndex
 
 
 class TestGetPolyT(unittest.TestCase):
@@ -115,7 +116,9 @@ class TestGetPolyT(unittest.TestCase):
         terms = [{"strain": "aaa", "start": 11, "end": 14, "strand": "+"},
                  {"strain": "aaa", "start": 9, "end": 18, "strand": "-"},
                  {"strain": "aaa", "start": 209, "end": 218, "strand": "-"}]
-        cands = gpt.compare_anno(self.example.cdss, terms, 3, 3)
+        cands = gpt.compare_anno(IntervalIndex(self.example.cdss),
+                                 terms, 3, 3)
+        self.assertListEqual(cands, terms[:2])
         self.assertDictEqual(terms[0], {
             'strand': '+', 'start': 11, 'strain': 'aaa', 'end': 14})
         self.assertDictEqual(terms[1], {
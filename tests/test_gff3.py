@@ -7,7 +7,7 @@ import shutil
 import unittest
 from io import StringIO
 sys.path.append(".")
-from annogesiclib.gff3 import Gff3Parser
+from annogesiclib.gff3 import Gff3Parser, Gff3Entry
 
 
 class TestGff3Parser(unittest.TestCase):
@@ -48,6 +48,65 @@ class TestGff3Parser(unittest.TestCase):
         self.assertListEqual(IDs, ["gene0", "cds0", "gene1",
                                    "cds1", "gene2", "rna0"])
 
+    def test_entry_info(self):
+        fh = StringIO(self.example.gff_file)
+        entries = list(self.gff_parser.entries(fh))
+        lines = self.example.gff_file.split("\n")[1:]
+        self.assertEqual(entries[0].info, lines[0])
+        self.assertEqual(entries[0].info_without_attributes,
+                         "\t".join(lines[0].split("\t")[:8]))
+        entries[0].start = 1
+        entries[0].strand = "-"
+        self.assertEqual(entries[0].info, lines[0])
+        self.assertEqual(str(entries[0]).split("\t")[3], "1")
+        entries[0].info_without_attributes = "test"
+        self.assertEqual(entries[0].info_without_attributes, "test")
+        entries[0].attributes = {"ID": "test"}
+        self.assertDictEqual(entries[0].attributes, {"ID": "test"})
+        entries[1].add_attribute("Parent", "gene1")
+        self.assertTrue("Parent=gene1" in entries[1].attribute_string)
+        self.assertFalse(hasattr(entries[2], "__dict__"))
+        with self.assertRaises(AttributeError):
+            entries[2].tag = "test"
+
+    def test_swap_position(self):
+        fh = StringIO("aaa\tRefseq\tgene\t10\t3\t.\t+\t.\tID=gene0\n\n")
+        entries = list(self.gff_parser.entries(fh))
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].start, 3)
+        self.assertEqual(entries[0].end, 10)
+        self.assertEqual(entries[0].info,
+                         "aaa\tRefseq\tgene\t3\t10\t.\t+\t.\tID=gene0")
+        entry = Gff3Entry({"seq_id": "aaa", "source": "Refseq",
+                           "feature": "gene", "start": "10", "end": 3,
+                           "score": ".", "strand": "+", "phase": ".",
+                           "attributes": "ID=gene0"})
+        self.assertEqual(entry.info, entries[0].info)
+        self.assertDictEqual(entry.attributes, {"ID": "gene0"})
+
+    def test_table(self):
+        fh = StringIO(self.example.gff_file)
+        table = self.gff_parser.table(fh)
+        self.assertEqual(len(table), 6)
+        self.assertListEqual(table.seq_ids, ["aaa", "bbb"])
+        self.assertListEqual(list(table.start),
+                             [517, 517, 2156, 2156, 4444, 4444])
+        mask = table.mask(seq_id="aaa", strand="-")
+        self.assertListEqual(list(mask), [False, False, True,
+                                          True, False, False])
+        self.assertListEqual([entry.attributes["ID"]
+                              for entry in table.entries(mask)],
+                             ["gene1", "cds1"])
+        self.assertFalse(table.mask(feature="sRNA").any())
+        self.assertEqual(table.entry(5).feature, "tRNA")
+        fh = StringIO(self.example.gff_file)
+        entries = list(self.gff_parser.entries(fh))
+        for index, entry in enumerate(entries):
+            self.assertEqual(table.line(index), entry.info)
+        self.assertListEqual(list(table.order()), [
+            entries.index(entry) for entry in sorted(
+                entries, key=lambda k: (k.seq_id, k.start, k.end, k.strand))])
+
 class Example(object):
 
     gff_file = """#gff3
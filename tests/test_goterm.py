@@ -29,6 +29,7 @@ class TestGetPolyT(unittest.TestCase):
         args.out_folder = self.test_folder
         args.gffs = self.gffs
         args.trans = self.trans
+        args.uniprot = os.path.join(self.test_folder, "idmapping.tab")
         self.go = GoTermFinding(args)
 
     def tearDown(self):
@@ -44,6 +44,25 @@ class TestHelper(unittest.TestCase):
         self.assertFalse(os.path.exists(tmp2))
         self.assertTrue(os.path.exists(self.gff_file))
 
+    def test_merge_files(self):
+        refs = []
+        for index, data in enumerate(["aaa\nbbb", "", "ccc\n", "ddd"]):
+            refs.append(os.path.join(self.test_folder, str(index) + ".txt"))
+            with open(refs[-1], "w") as fh:
+                fh.write(data)
+        tar = os.path.join(self.test_folder, "tar.txt")
+        with open(tar, "w") as fh:
+            fh.write("000")
+        self.helper.merge_files(refs, tar, buffer_size=2)
+        with open(tar) as fh:
+            self.assertEqual(fh.read(), "000\naaa\nbbb\nccc\nddd")
+        self.helper.merge_files(refs[2:], tar, append=False)
+        with open(tar) as fh:
+            self.assertEqual(fh.read(), "ccc\nddd")
+        self.helper.merge_file(refs[0], tar)
+        with open(tar) as fh:
+            self.assertEqual(fh.read(), "ccc\nddd\naaa\nbbb")
+
     def test_remove_tmp(self):
         tmp1 = os.path.join(self.test_folder, "tmp")
         tmp2 = os.path.join(self.test_folder, "test.gff_folder")
@@ -81,6 +100,21 @@ class TestHelper(unittest.TestCase):
         new_seq = self.helper.extract_gene(seq, 1, 140, "-")
         self.assertEqual(new_seq, self.rev_seq)
 
+    def test_extract_genes(self):
+        seq = self.example.seq.replace("\n", "")
+        seqs = {"aaa": seq, "bbb": "AACGTNNacgt"}
+        new_seqs = self.helper.extract_genes(seqs, [
+            ("aaa", 1, 70, "+"), ("bbb", 2, 11, "-"), ("aaa", 1, 140, "-"),
+            ("bbb", 1, 4, "+")])
+        self.assertListEqual(new_seqs, [
+            "CGCAGGTTGAGTTCCTGTTCCCGATAGATCCGATAAACCCGCTTATGATTCCAGAGCTGTCCCTGCACAT",
+            "ACGTACGT", self.rev_seq, "AACG"])
+        self.assertListEqual(self.helper.extract_genes(seqs, []), [])
+
+    def test_reverse_seq(self):
+        self.assertEqual(self.helper._reverse_seq("AAcgTN-t"), "AACGTT")
+        self.assertEqual(self.helper._reverse_seq(""), "")
+
     def test_get_seq(self):
         gff_file = os.path.join(self.test_folder, "test.gff")
         out_file = os.path.join(self.test_folder, "test.cds")
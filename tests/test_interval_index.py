@@ -0,0 +1,76 @@
+import sys
+import unittest
+sys.path.append(".")
+from mock_gff3 import Create_generator
+from annogesiclib.interval_index import IntervalIndex
+
+
+class TestIntervalIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.example = Example()
+        self.index = IntervalIndex(self.example.gffs)
+
+    def get_ids(self, gffs):
+        return [gff.attributes["ID"] for gff in gffs]
+
+    def test_overlap(self):
+        self.assertListEqual(self.get_ids(self.index.overlap(
+            "aaa", "+", 10, 60)), ["cds0", "cds1", "cds4"])
+        self.assertListEqual(self.get_ids(self.index.overlap(
+            "aaa", None, 10, 60)), ["cds0", "cds1", "cds2", "cds4"])
+        self.assertListEqual(self.get_ids(self.index.overlap(
+            "aaa", "+", 301, 400)), [])
+        self.assertListEqual(self.get_ids(self.index.overlap(
+            "bbb", "+", 1, 1000)), ["cds3"])
+        self.assertListEqual(self.get_ids(self.index.overlap(
+            "ccc", "+", 1, 1000)), [])
+
+    def test_nearby(self):
+        self.assertListEqual(self.get_ids(self.index.nearby(
+            "aaa", "+", 180, 190, 9)), ["cds4"])
+        self.assertListEqual(self.get_ids(self.index.nearby(
+            "aaa", "+", 180, 190, 10)), ["cds1", "cds4"])
+
+    def test_contain_within(self):
+        self.assertListEqual(self.get_ids(self.index.contain(
+            "aaa", "+", 50, 60)), ["cds1", "cds4"])
+        self.assertListEqual(self.get_ids(self.index.within(
+            "aaa", "+", 1, 170)), ["cds0", "cds1"])
+
+    def test_start_within(self):
+        self.assertListEqual(self.get_ids(self.index.start_within(
+            "aaa", "+", 3, 40)), ["cds0", "cds1"])
+
+    def test_large_index(self):
+        gffs = []
+        for index in range(500):
+            gffs.append(Create_generator(
+                {"seq_id": "aaa", "source": "Refseq", "feature": "CDS",
+                 "start": index * 10 + 1, "end": index * 10 + 25,
+                 "phase": ".", "strand": "+", "score": "."},
+                {"ID": "cds" + str(index)}, "gff"))
+        index = IntervalIndex(gffs)
+        self.assertListEqual(self.get_ids(index.overlap(
+            "aaa", "+", 2500, 2505)), ["cds248", "cds249", "cds250"])
+
+
+class Example(object):
+    gff_dict = [
+        {"seq_id": "aaa", "source": "Refseq", "feature": "CDS", "start": 3,
+         "end": 15, "phase": ".", "strand": "+", "score": "."},
+        {"seq_id": "aaa", "source": "Refseq", "feature": "CDS", "start": 30,
+         "end": 170, "phase": ".", "strand": "+", "score": "."},
+        {"seq_id": "aaa", "source": "Refseq", "feature": "CDS", "start": 50,
+         "end": 100, "phase": ".", "strand": "-", "score": "."},
+        {"seq_id": "bbb", "source": "Refseq", "feature": "CDS", "start": 30,
+         "end": 170, "phase": ".", "strand": "+", "score": "."},
+        {"seq_id": "aaa", "source": "Refseq", "feature": "CDS", "start": 45,
+         "end": 300, "phase": ".", "strand": "+", "score": "."}]
+    gffs = []
+    for index in range(0, 5):
+        gffs.append(Create_generator(gff_dict[index],
+                                     {"ID": "cds" + str(index)}, "gff"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,11 +27,7 @@ class TestGensRNAOutput(unittest.TestCase):
                                       "locus": "AAA_00004"})
 
     def test_detect_coverage(self):
-        wigs = {"aaa": {"track_1": [{"pos": 1, "coverage": 200},
-                                    {"pos": 2, "coverage": 300},
-                                    {"pos": 3, "coverage": 400},
-                                    {"pos": 4, "coverage": 600},
-                                    {"pos": 5, "coverage": 650}]}}
+        wigs = {"aaa": {"track_1": [200, 300, 400, 600, 650]}}
         tss_dict = {"seq_id": "aaa", "source": "Refseq",
                     "feature": "TSS", "start": 3,
                     "end": 3, "phase": ".", "strand": "+", "score": "."}
@@ -86,12 +82,7 @@ class TestGensRNAOutput(unittest.TestCase):
         self.assertEqual(tsss[1].attributes["type"], "Antisense,Primary")
 
     def test_fix_primary_type(self):
-        wigs = {"aaa": {"track_1": [{"pos": 1, "coverage": 200},
-                                    {"pos": 2, "coverage": 300},
-                                    {"pos": 3, "coverage": 400},
-                                    {"pos": 4, "coverage": 600},
-                                    {"pos": 5, "coverage": 650},
-                                    {"pos": 6, "coverage": 655}]}}
+        wigs = {"aaa": {"track_1": [200, 300, 400, 600, 650, 655]}}
         tss_dict = [{"seq_id": "aaa", "source": "Refseq",
                      "feature": "TSS", "start": 3,
                      "end": 3, "phase": ".", "strand": "+", "score": "."},
@@ -21,6 +21,9 @@ class TestMergeRNAplexRNAup(unittest.TestCase):
         os.mkdir(self.test_folder)
         self.example = Example()
         self.mock_args = MockClass()
+        self.tar_index = mrr.TargetIndex(self.example.gffs,
+                                         self.example.genes, ["CDS"])
+        self.srna_names = mrr.index_srna_name(self.example.srna_gffs)
 
     def tearDown(self):
         if os.path.exists(self.test_folder):
@@ -41,8 +44,7 @@ class TestMergeRNAplexRNAup(unittest.TestCase):
         args_tar.tar_start = 20
         args_tar.tar_end = 15
         mrr.print_rank_one(self.example.srnas, out, "RNAplex",
-                           self.example.gffs, self.example.srna_gffs,
-                           args_tar, 50)
+                           self.tar_index, self.srna_names, args_tar, 50)
         datas = convert_dict(out.getvalue().split("\n"))
         news = {}
         for key, value in datas.items():
@@ -57,7 +59,7 @@ class TestMergeRNAplexRNAup(unittest.TestCase):
         gen_file(rnaplex, self.example.rnaplex)
         gen_file(rnaup, self.example.rnaup)
         srnas = mrr.read_table(self.example.srna_gffs, rnaplex, rnaup, None,
-                               self.example.genes, self.example.gffs, ["CDS"])
+                               self.tar_index)
         self.assertDictEqual(srnas, {'IntaRNA': {}, 'RNAup': {'srna0': [
             {'srna_pos': '20,25', 'energy': -4.87, 'tar_pos': '571,576',
              'gene_id': 'gene0', 'target_id': 'cds0', 'target_locus': 'AAA_00001',
@@ -74,15 +76,35 @@ class TestMergeRNAplexRNAup(unittest.TestCase):
              'gene_id': 'gene0', 'target_id': 'cds0', 'target_locus': 'AAA_00001',
              'detail': '100-150_+'}]}})
 
+    def test_get_gene_id(self):
+        self.assertEqual(mrr.get_gene_id("100-150_+", "cds0",
+                                         self.tar_index), "gene0")
+        self.assertEqual(mrr.get_gene_id("100-150_+", "NA",
+                                         self.tar_index), "gene0")
+        self.assertEqual(mrr.get_gene_id("2348-2934_+", "cds1",
+                                         self.tar_index), "NA")
+        self.assertEqual(mrr.get_gene_id("100-150_+", "cds5",
+                                         self.tar_index), "NA")
+        gff_dict = {"start": 120, "end": 300, "phase": ".", "strand": "+",
+                    "seq_id": "aaa", "score": ".", "source": "Refseq",
+                    "feature": "CDS"}
+        gffs = self.example.gffs + [Create_generator(
+            gff_dict, {"ID": "cds2", "Parent": "gene1"}, "gff")]
+        tar_index = mrr.TargetIndex(gffs, self.example.genes, ["CDS"])
+        self.assertEqual(tar_index.gene_id("120-300_+", "NA"), "gene1")
+        gffs[-1].attributes = {"ID": "cds2"}
+        tar_index = mrr.TargetIndex(gffs, self.example.genes, ["CDS"])
+        self.assertEqual(tar_index.gene_id("120-300_+", "cds2"), "gene0")
+
     def test_get_srna_name(self):
-        output = mrr.get_srna_name(self.example.srna_gffs, "srna0")
+        output = mrr.get_srna_name(self.srna_names, "srna0")
         self.assertEqual(output[0], 'sRNA_0')
         self.assertEqual(output[1].start, 6)
 
     def test_get_target_info(self):
         target = {"gene_id": "gene0","detail": "100-150_+","target_id": "cds0",
                   "target_locus": "AAA_00001", "energy": -6.5}
-        output = mrr.get_target_info(self.example.gffs, target)
+        output = mrr.get_target_info(self.tar_index, target)
         self.assertEqual(output.start, 100)
 
     def test_merge_result(self):
@@ -93,8 +115,8 @@ class TestMergeRNAplexRNAup(unittest.TestCase):
         merges = []
         methods = ["RNAup", "RNAplex"]
         overlap = mrr.merge_result(
-            self.example.srnas, self.example.srna_gffs, args_tar,
-            self.example.gffs, merges, 50, methods)
+            self.example.srnas, self.srna_names, args_tar,
+            self.tar_index, merges, 50, methods)
         output = [['sRNA_0', 'aaa', '6-15', '7-15', '7-15', '+', 'gene0',
                    'cds0', 'AAA_00001', '100-150', '89-50',
                    '89-50', '+', '-6.5', '1', '-6.5', '1'],
@@ -150,8 +172,8 @@ class TestMergeRNAplexRNAup(unittest.TestCase):
              "target_locus": "AAA_00001", "energy": -23.5, "rank": 1,
              "srna_pos": "2,10", "tar_pos": "10,15"}]}}
         merges = []
-        mrr.merge_last(srnas, self.example.srna_gffs,
-                       args_tar, self.example.gffs, merges, 50, "RNAplex",
+        mrr.merge_last(srnas, self.srna_names,
+                       args_tar, self.tar_index, merges, 50, "RNAplex",
                        "RNAup", 2, None, False)
         output = [['sRNA_1', 'aaa', '1258-2234', '1259-1267', '1259-1267',
                    '+', 'gene2', 'cds2', 'AAA_00003', '2348-2934', '2337-50',
@@ -183,8 +183,9 @@ class TestMergesRNA(unittest.TestCase):
         cutoff_tex = [0, 0, 0, 50, 20]
         cutoff_notex = [0, 0, 0, 30, 10]
         cutoff_frag = [400, 200, 0, 50, 30]
-        gen_file("tmp_median", "aaa\t3utr\ttrack_1\t10")
+        gen_file("tmp_median_aaa", "aaa\t3utr\ttrack_1\t10")
         args = self.mock_args.mock()
+        args.prefix = "aaa"
         args.replicates = replicates = {"tex": 1, "frag": 1}
         args.texs = texs = {"track_tex_track_notex": 0}
         args.out_folder = os.getcwd()
@@ -194,7 +195,7 @@ class TestMergesRNA(unittest.TestCase):
                          out, [tss], args)
         self.assertEqual(out.getvalue(),
                          "aaa\tsrna_0\t3\t4\t+\tfrag_1\t1\tTSS_1;cleavage3\tcleavage10\t22.0\ttrack_1(22.0)\tCDS1\t0.01415\n")
-        os.remove("tmp_median")
+        os.remove("tmp_median_aaa")
 
     def test_get_coverage(self):
         wigs = {"aaa": {"frag_1": {"track_1|+|frag": [100, 30, 23, 21, 21]}}}
@@ -72,6 +72,7 @@ class TestOperonDetection(unittest.TestCase):
                               "test_transcript.gff"), "test")
         gen_file(os.path.join(self.gffs, "test.gff"), "test")
         args = self.mock_args.mock()
+        args.threads = 1
         args.gffs = self.out_gff
         args.term_fuzzy = 3
         args.tss_fuzzy = 3
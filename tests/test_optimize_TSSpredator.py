@@ -20,12 +20,37 @@ class Mock_func(object):
             self, config_files, tsspredator_path, processes):
         pass
 
-    def mock_convert2gff(self, out_path, gff_files, args, test):
+    def mock_convert2gff(self, out_path, gff_files, args, test,
+                         cache=None, keys=None):
         if not os.path.exists("test_folder/gffs"):
             os.mkdir("test_folder/gffs")
         gen_file("test_folder/gffs/aaa.gff", self.example.gff_file)
         gff_files.append("test_folder/gffs/aaa.gff")
 
+    def mock_convert_mastertable(self, out_path, core, args, strain):
+        gff_file = os.path.join(out_path, "_".join([
+            "TSSpredator", str(core) + ".gff"]))
+        gen_file(gff_file, "aaa\tRefseq\tTSS\t140\t140\t.\t+\t.\tID=tss0")
+        return gff_file
+
+    def mock_start_async_run(self, pool, core, para, state, out_path,
+                             stat_out, wig, fasta, gff, num_manual, args,
+                             strain, manuals, length, indexs, cache, log):
+        ot.finish_async_run(None, core, para, None, state, out_path,
+                            stat_out, num_manual, args, strain, manuals,
+                            length, indexs, cache, log)
+
+    def mock_failed_start_async_run(self, pool, core, para, state, out_path,
+                                    stat_out, wig, fasta, gff, num_manual,
+                                    args, strain, manuals, length, indexs,
+                                    cache, log):
+        pool.submit([sys.executable, "-c", "import sys; sys.exit(1)"],
+                    name="config_" + str(core) + ".ini",
+                    callback=lambda job: ot.finish_async_run(
+                        job, core, para, None, state, out_path, stat_out,
+                        num_manual, args, strain, manuals, length, indexs,
+                        cache, log))
+
 class TestOptimizeTSSpredator(unittest.TestCase):
 
     def setUp(self):
@@ -211,6 +236,41 @@ class TestOptimizeTSSpredator(unittest.TestCase):
             out.getvalue(),
             "1000\the_0.3_rh_0.2_fa_0.7_rf_0.3_bh_0.0_ef_2.5_pf_3.3\tTP=0\tTP_rate=0.0\tFP=2\tFP_rate=0.00100150225338007\tFN=2\tmissing_ratio=0.6666666666666666\n")
 
+    def test_para_list(self):
+        list_num = ot.ParaList([self.example.best_para])
+        self.assertTrue(copy.deepcopy(self.example.best_para) in list_num)
+        new_para = copy.deepcopy(self.example.best_para)
+        new_para["height"] = 0.4
+        self.assertFalse(new_para in list_num)
+        list_num.append(copy.deepcopy(new_para))
+        self.assertTrue(new_para in list_num)
+        self.assertEqual(len(list_num), 2)
+        self.assertDictEqual(list_num[-1], new_para)
+
+    def test_compare_manual_predict_cache(self):
+        out = StringIO()
+        manual = os.path.join(self.test_folder, "manual.gff")
+        predict = os.path.join(self.test_folder, "predict.gff")
+        gen_file(manual, self.example.manual_file)
+        gen_file(predict, self.example.gff_file)
+        para_list = [copy.deepcopy(self.example.best_para)]
+        args = self.mock_args.mock()
+        args.cores = 1
+        args.cluster = 3
+        cache = ot.TSSpredatorCache(os.path.join(self.test_folder, "cache"),
+                                    "test", manual, 2000, 3)
+        stats = ot.compare_manual_predict(
+            1000, para_list, [predict], self.test_folder, out, args,
+            self.example.mans, 3, 2000, cache, ["aaa"])
+        self.assertDictEqual(cache.get_stat("aaa"), stats[0])
+        os.remove(predict)
+        cache_out = StringIO()
+        cache_stats = ot.compare_manual_predict(
+            1000, para_list, [predict], self.test_folder, cache_out, args,
+            self.example.mans, 3, 2000, cache, ["aaa"])
+        self.assertListEqual(stats, cache_stats)
+        self.assertEqual(out.getvalue(), cache_out.getvalue())
+
     def test_compute_stat(self):
         list_num = [self.example.best_para]
         best_para = {'re_factor': 0.3, 'processing': 3.3, 'enrichment': 2.5,
@@ -441,6 +501,7 @@ class TestOptimizeTSSpredator(unittest.TestCase):
         args.length = None
         args.replicate_name = "test"
         args.tsspredator_path = "test"
+        args.asynchronous = False
         args.manual = os.path.join(self.test_folder, "manual.gff")
         gen_file(args.manual, self.example.manual_file)
         log = open(os.path.join(self.test_folder, "test.log"), "w")
@@ -450,6 +511,79 @@ class TestOptimizeTSSpredator(unittest.TestCase):
         self.assertTrue(os.path.exists(os.path.join(
             self.test_folder, "optimized_TSSpredator", "stat_aaa.csv")))
 
+    def test_propose_para(self):
+        list_num = ot.ParaList([copy.deepcopy(self.example.best_para)])
+        indexs = copy.deepcopy(self.example.indexs)
+        seeds = {"seed": 0, "pre_seed": []}
+        features = {"feature": "", "pre_feature": ""}
+        current_para = copy.deepcopy(self.example.ref_para)
+        args = self.mock_args.mock()
+        args.steps = 100
+        for switch in range(3):
+            indexs["switch"] = switch
+            para = ot.propose_para(
+                seeds, features, indexs, current_para, list_num,
+                self.example.max_nums, self.example.best_para, args)
+            self.assertTrue(para in list_num)
+            self.assertTrue(para["height"] > para["re_height"])
+            self.assertTrue(para["factor"] > para["re_factor"])
+        self.assertTrue(len(list_num) >= 4)
+
+    def test_optimization_async(self):
+        ot.convert_mastertable = Mock_func().mock_convert_mastertable
+        ot.start_async_run = Mock_func().mock_start_async_run
+        indexs = {'step': 0, 'change': False, 'num': 0, 'first': True,
+                  'length': 0, 'exist': False, 'switch': 0, 'extend': False,
+                  'count': 0}
+        list_num = ot.ParaList()
+        current_para = copy.deepcopy(self.example.ref_para)
+        best_para = copy.deepcopy(self.example.best_para)
+        stat_out = StringIO()
+        args = self.mock_args.mock()
+        args.cores = 2
+        args.steps = 5
+        args.cluster = 3
+        args.program = "TSS"
+        log = open(os.path.join(self.test_folder, "test.log"), "w")
+        best_para, best = ot.optimization_async(
+            indexs, current_para, list_num, self.example.max_nums,
+            best_para, self.test_folder, stat_out, {}, "wigs", "aaa.fa",
+            "aaa.gff", 2, True, args, "aaa", self.example.mans, 2000, log)
+        lines = stat_out.getvalue().split("\n")[:-1]
+        self.assertListEqual([line.split("\t")[0] for line in lines],
+                             ["0", "1", "2", "3", "4"])
+        self.assertTrue(lines[0].startswith(
+            "0\the_0.3_rh_0.2_fa_2.0_rf_0.5_bh_0.0_ef_2.0_pf_1.5\tTP=1"))
+        self.assertEqual(indexs["step"], 5)
+        self.assertEqual(len(list_num), 5)
+        self.assertDictEqual(best_para, list_num[0])
+        self.assertEqual(best["tp"], 1)
+        self.assertTrue(os.path.exists(os.path.join(
+            self.test_folder, "best_aaa.csv")))
+
+    def test_optimization_async_failed(self):
+        ot.start_async_run = Mock_func().mock_failed_start_async_run
+        indexs = copy.deepcopy(self.example.indexs)
+        stat_out = StringIO()
+        args = self.mock_args.mock()
+        args.cores = 2
+        args.steps = 1000
+        args.cluster = 3
+        args.program = "TSS"
+        log = open(os.path.join(self.test_folder, "test.log"), "w")
+        with self.assertRaises(SystemExit):
+            ot.optimization_async(
+                indexs, copy.deepcopy(self.example.ref_para), ot.ParaList(),
+                self.example.max_nums, copy.deepcopy(self.example.best_para),
+                self.test_folder, stat_out, {}, "wigs", "aaa.fa", "aaa.gff",
+                2, True, args, "aaa", self.example.mans, 2000, log)
+        log.close()
+        self.assertEqual(stat_out.getvalue(), "")
+        self.assertTrue(2 <= indexs["step"] <= 4)
+        with open(os.path.join(self.test_folder, "test.log")) as fh:
+            self.assertIn("runs of TSSpredator are failed", fh.read())
+
+
 class Example(object):
 
     libs = ["GSM1649587_Hp26695_ML_B1_HS1_-TEX_forward.wig:notex:1:a:+",
@@ -0,0 +1,105 @@
+import sys
+import os
+import unittest
+import shutil
+from io import StringIO
+sys.path.append(".")
+from annogesiclib.parallel import run_jobs, CommandPool, balance_jobs
+
+
+def add_num(num1, num2):
+    return num1 + num2
+
+
+def add_num_log(num1, num2, log):
+    log.write("\t".join([str(num1), str(os.getpid())]) + "\n")
+    return num1 + num2
+
+
+class TestParallel(unittest.TestCase):
+
+    def test_run_jobs(self):
+        jobs = [(num, 1) for num in range(5)]
+        self.assertListEqual(run_jobs(add_num, jobs, 1), [1, 2, 3, 4, 5])
+        self.assertListEqual(run_jobs(add_num, jobs, 3), [1, 2, 3, 4, 5])
+        self.assertListEqual(run_jobs(add_num, [], 3), [])
+
+    def test_run_jobs_log(self):
+        jobs = [(num, 1) for num in range(5)]
+        log = StringIO()
+        self.assertListEqual(run_jobs(add_num_log, jobs, 1, log),
+                             [1, 2, 3, 4, 5])
+        datas = [line.split("\t") for line in log.getvalue().split("\n")[:-1]]
+        self.assertListEqual([data[0] for data in datas],
+                             ["0", "1", "2", "3", "4"])
+        self.assertEqual(set([data[1] for data in datas]),
+                         set([str(os.getpid())]))
+        log = StringIO()
+        self.assertListEqual(run_jobs(add_num_log, jobs, 3, log),
+                             [1, 2, 3, 4, 5])
+        datas = [line.split("\t") for line in log.getvalue().split("\n")[:-1]]
+        self.assertListEqual([data[0] for data in datas],
+                             ["0", "1", "2", "3", "4"])
+        self.assertFalse(str(os.getpid()) in [data[1] for data in datas])
+
+    def test_balance_jobs(self):
+        groups = balance_jobs([5, 1, 1, 1, 1, 1, 10, 3], 3)
+        self.assertListEqual(groups, [[6], [0, 3, 5], [1, 2, 4, 7]])
+        self.assertListEqual(balance_jobs([2, 2], 5), [[0], [1]])
+        self.assertListEqual(balance_jobs([], 3), [[]])
+
+    def test_command_pool(self):
+        log = StringIO()
+        dones = []
+        pool = CommandPool(2, log)
+        pool.submit(["sh", "-c", "sleep 0.2; echo slow"], name="slow")
+        pool.submit(["echo", "fast"], name="fast",
+                    callback=lambda job: dones.append(job["name"]))
+        pool.submit(["sh", "-c", "echo err >&2; exit 3"], name="fail",
+                    callback=lambda job: dones.append(job["name"]))
+        jobs = pool.join()
+        self.assertListEqual([job["name"] for job in jobs],
+                             ["slow", "fast", "fail"])
+        self.assertListEqual([job["returncode"] for job in jobs], [0, 0, 3])
+        self.assertEqual(jobs[0]["stdout"], "slow\n")
+        self.assertEqual(jobs[1]["stdout"], "fast\n")
+        self.assertEqual(jobs[2]["stderr"], "err\n")
+        self.assertListEqual(dones, ["fast", "fail"])
+        self.assertTrue(jobs[0]["time"] >= 0.2)
+        self.assertEqual(len(log.getvalue().split("\n")[:-1]), 3)
+        self.assertListEqual(pool.join(), [])
+
+    def test_command_pool_wait(self):
+        dones = []
+        pool = CommandPool(2)
+        pool.wait()
+        pool.submit(["sh", "-c", "sleep 0.3"], name="slow",
+                    callback=lambda job: dones.append(job["name"]))
+        pool.submit(["true"], name="fast",
+                    callback=lambda job: dones.append(job["name"]))
+        pool.wait()
+        self.assertListEqual(dones, ["fast"])
+        self.assertEqual(len(pool.running), 1)
+        pool.join()
+        self.assertListEqual(dones, ["fast", "slow"])
+
+    def test_command_pool_file(self):
+        test_folder = "test_folder"
+        if not os.path.exists(test_folder):
+            os.mkdir(test_folder)
+        in_file = os.path.join(test_folder, "in.txt")
+        out_file = os.path.join(test_folder, "out.txt")
+        with open(in_file, "w") as fh:
+            fh.write("aaa\n")
+        pool = CommandPool(1)
+        pool.submit(["cat"], stdin=in_file, stdout=out_file)
+        jobs = pool.join()
+        with open(out_file) as fh:
+            self.assertEqual(fh.read(), "aaa\n")
+        self.assertEqual(jobs[0]["stdout"], out_file)
+        self.assertEqual(jobs[0]["name"], "cat")
+        shutil.rmtree(test_folder)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -40,7 +40,27 @@ class TestParserWig(unittest.TestCase):
             wigs.append(entry)
         self.assertEqual(wigs[2].pos, 3)
         self.assertEqual(wigs[2].coverage, 1.4041251228308191)
- 
+
+    def test_parser_array(self):
+        wig_f_fh = StringIO(self.example.wig_forward_file)
+        wigs = list(self.wig_parser.parser_array(wig_f_fh, "+"))
+        self.assertEqual(len(wigs), 1)
+        self.assertEqual(wigs[0][0], "aaa")
+        self.assertEqual(wigs[0][1], "TSB_t0_TEX_forward")
+        self.assertListEqual(list(wigs[0][2]), [
+            0, 0, 1.4041251228308191, 56.867067474648174,
+            56.867067474648174])
+        wig_r_fh = StringIO(self.example.wig_reverse_file)
+        wigs = list(self.wig_parser.parser_array(wig_r_fh, "-"))
+        self.assertEqual(wigs[0][2][2], 1.4041251228308191)
+        wig_fix_fh = StringIO(self.example.wig_fixed_file)
+        wigs = list(self.wig_parser.parser_array(wig_fix_fh, "+"))
+        self.assertEqual(len(wigs), 2)
+        self.assertListEqual(list(wigs[0][2]), [0, 2, 2, 0, 3, 3])
+        self.assertEqual(wigs[1][0], "bbb")
+        self.assertListEqual(list(wigs[1][2]), [5, 6])
+
+
 class Example(object):
     wig_forward_file = """track type=wiggle_0 name="TSB_t0_TEX_forward"
 variableStep chrom=aaa span=1
@@ -53,5 +73,14 @@ variableStep chrom=aaa span=1
 3 -1.4041251228308191
 4 -56.867067474648174
 5 -56.867067474648174"""
+
+    wig_fixed_file = """track type=wiggle_0 name="TSB_t0_TEX_forward"
+fixedStep chrom=aaa start=2 step=3 span=2
+2
+3
+fixedStep chrom=bbb start=1 step=1
+5
+6"""
+
 if __name__ == "__main__":
     unittest.main()
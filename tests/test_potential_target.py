@@ -31,7 +31,7 @@ class TestPotentialTarget(unittest.TestCase):
         fasta, cdss_f, cdss_r, genes = pt.read_file(
             seq_file, gff_file, "test", ["CDS"])
         self.assertEqual(
-            fasta,
+            str(fasta),
             "AGGATAGTCCGATACGTATACTGATAAAGACCGAAAATATTAGCGCGTAGC")
         self.assertEqual(cdss_f[0].start, 1)
         self.assertEqual(cdss_f[0].feature, "CDS")
@@ -0,0 +1,67 @@
+import sys
+import os
+import unittest
+import shutil
+sys.path.append(".")
+from mock_helper import gen_file, import_data
+from annogesiclib.rnaplfold_cache import RNAplfoldCache, read_fasta_records
+
+
+class TestRNAplfoldCache(unittest.TestCase):
+
+    def setUp(self):
+        self.test_folder = "test_folder"
+        if (not os.path.exists(self.test_folder)):
+            os.mkdir(self.test_folder)
+        self.cache_folder = os.path.join(self.test_folder, "cache")
+        self.out_folder = os.path.join(self.test_folder, "out")
+        os.mkdir(self.out_folder)
+        self.fasta = os.path.join(self.test_folder, "target.fa")
+        gen_file(self.fasta, ">cds0_10-20_+ test\nAAATTT\nCCC\n"
+                             ">cds1_30-40_-\nGGGAAA\n")
+        self.cache = RNAplfoldCache(self.cache_folder, None)
+
+    def tearDown(self):
+        if os.path.exists(self.test_folder):
+            shutil.rmtree(self.test_folder)
+
+    def test_read_fasta_records(self):
+        self.assertListEqual(read_fasta_records(self.fasta), [
+            ("cds0_10-20_+", "AAATTTCCC"), ("cds1_30-40_-", "GGGAAA")])
+
+    def test_seq_key(self):
+        key = self.cache.seq_key("AAATTT", 200, 150, 30)
+        self.assertEqual(key, self.cache.seq_key("aaauuu", 200, 150, 30))
+        self.assertNotEqual(key, self.cache.seq_key("AAATTT", 100, 150, 30))
+        self.assertNotEqual(key, self.cache.seq_key("AAATTA", 200, 150, 30))
+
+    def test_prepare_and_store(self):
+        missing = os.path.join(self.test_folder, "missing.fa")
+        missings = self.cache.prepare(self.fasta, 200, 150, 30,
+                                      self.out_folder, missing)
+        self.assertListEqual([data[0] for data in missings],
+                             ["cds0_10-20_+", "cds1_30-40_-"])
+        self.assertEqual(len(import_data(missing)), 4)
+        gen_file(os.path.join(self.out_folder, "cds0_10-20_+_openen"),
+                 "openen0")
+        gen_file(os.path.join(self.out_folder, "cds0_10-20_+_lunp"), "lunp0")
+        self.cache.store(missings, self.out_folder)
+        shutil.rmtree(self.out_folder)
+        os.mkdir(self.out_folder)
+        missings = self.cache.prepare(self.fasta, 200, 150, 30,
+                                      self.out_folder, missing)
+        self.assertListEqual([data[0] for data in missings],
+                             ["cds1_30-40_-"])
+        self.assertListEqual(import_data(missing),
+                             [">cds1_30-40_-", "GGGAAA"])
+        self.assertListEqual(import_data(os.path.join(
+            self.out_folder, "cds0_10-20_+_openen")), ["openen0"])
+        self.assertListEqual(import_data(os.path.join(
+            self.out_folder, "cds0_10-20_+_lunp")), ["lunp0"])
+        missings = self.cache.prepare(self.fasta, 100, 150, 30,
+                                      self.out_folder, missing)
+        self.assertEqual(len(missings), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -114,7 +114,8 @@ class TestsORFDetection(unittest.TestCase):
         gen_file(fasta, ">aaa\nATATACCGATC")
         inters, tsss, srnas, seq = sd.read_data(inter, None, None, fasta, True)
         self.assertEqual(inters[0].start, 2)
-        self.assertDictEqual(seq, {'aaa': 'ATATACCGATC'})
+        self.assertDictEqual({strain: str(fasta) for strain, fasta in
+                              seq.items()}, {'aaa': 'ATATACCGATC'})
 
     def test_check_tss(self):
         sorf = {"strain": "aaa", "strand": "+", "start": 2, "end": 6,
@@ -8,6 +8,7 @@ sys.path.append(".")
 from mock_gff3 import Create_generator
 from mock_helper import import_data, gen_file, extract_info
 import annogesiclib.sRNA_intergenic as si
+from annogesiclib.interval_index import IntervalIndex
 from mock_args_container import MockClass
 
 
@@ -91,7 +92,7 @@ class TestsRNAIntergenic(unittest.TestCase):
         detects = {"overlap": False}
         gffs = copy.deepcopy(self.example.gffs)
         tas = copy.deepcopy(self.example.tas)
-        si.compare_ta_cds(gffs, tas[0], detects)
+        si.compare_ta_cds(IntervalIndex(gffs), tas[0], detects)
         self.assertDictEqual(detects, {'overlap': True})
 
     def test_compare_ta_tss(self):
@@ -238,7 +239,7 @@ class TestsRNAIntergenic(unittest.TestCase):
         datas = si.get_best(self.example.wigs, "aaa", "+", 2, 20,
                             "normal", args, 10)
         self.assertDictEqual(datas, {'frag_1': [
-            {'low': -1, 'high': -1, 'avg': 30.7, 'pos': 21,
+            {'low': 2, 'high': 100, 'avg': 30.7, 'pos': 21,
              'type': 'frag', 'track': 'track_1'}]})
 
     def test_get_attribute_string(self):
@@ -464,6 +465,7 @@ class TestsRNAIntergenic(unittest.TestCase):
         args.cutoffs = coverage
         args.out_folder = self.test_folder
         args.file_type = "frag"
+        args.prefix = "aaa"
         args.cut_notex = coverage
         args.input_libs = "input_libs"
         args.wig_folder = self.wig_folder
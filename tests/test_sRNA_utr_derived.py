@@ -97,7 +97,7 @@ class TestsRNAUTR(unittest.TestCase):
         self.assertEqual(tsss[0].start, 4)
         self.assertEqual(pros[0].start, 4)
         self.assertDictEqual(
-            seq,
+            {strain: str(fasta) for strain, fasta in seq.items()},
             {'aaa': 'ATATGACGATACGTAAACCGACCGAATATATCTTTTCACAACCAGATTACGATCGTCAT'})
 
     def test_get_terminal(self):
@@ -20,24 +20,36 @@ class TestSeqModifier(unittest.TestCase):
         if os.path.exists(self.test_folder):
             shutil.rmtree(self.test_folder)
 
-    def test_init_pos_dict(self):
-        self.seq._init_pos_dict()
-        self.assertDictEqual(self.seq._org_pos_to_internal_pos,
-                             {1: 0, 2: 1, 3: 2, 4: 3, 5: 4, 6: 5, 7: 6,
-                              8: 7, 9: 8, 10: 9, 11: 10, 12: 11, 13: 12,
-                              14: 13, 15: 14, 16: 15, 17: 16, 18: 17})
-
     def test_replace(self):
         self.seq.replace(2, "G")
-        self.assertEqual(self.seq._seq, "AGTTATATAGGAAGGCCC")
+        self.assertEqual(self.seq.seq(), "AGTTATATAGGAAGGCCC")
 
     def test_remove(self):
         self.seq.remove(8, 1)
-        self.assertEqual(self.seq._seq, "AATTATAAGGAAGGCCC")
+        self.assertEqual(self.seq.seq(), "AATTATAAGGAAGGCCC")
 
     def test_insert(self):
         self.seq.insert(5, "C")
-        self.assertEqual(self.seq._seq, "AATTCATATAGGAAGGCCC")
+        self.assertEqual(self.seq.seq(), "AATTCATATAGGAAGGCCC")
+
+    def test_edits(self):
+        self.seq.insert(5, "C")
+        self.seq.remove(8, 2)
+        self.seq.replace(2, "GG")
+        self.seq.insert(5, "TT")
+        self.seq.replace(12, "C")
+        self.assertEqual(self.seq.seq(), "AGGTTTTCATAACGAAGGCCC")
+        self.assertEqual(self.seq.get_nucl(2), "G")
+        self.assertEqual(self.seq.get_nucl(5), "T")
+        self.assertEqual(self.seq.get_nucl(12), "C")
+        self.assertRaises(KeyError, self.seq.get_nucl, 8)
+        for pos in (1, 2, 5, 7, 10, 12, 18):
+            self.assertEqual(self.seq.seq()[self.seq.current_pos(pos)],
+                             self.seq.get_nucl(pos))
+        self.assertEqual(self.seq.current_pos(7), 9)
+        self.seq.remove(1, 1)
+        self.assertEqual(self.seq.current_pos(5), 3)
+        self.assertEqual(self.seq.seq(), "GGTTTTCATAACGAAGGCCC")
 
 if __name__ == "__main__":
     unittest.main()
@@ -94,6 +94,7 @@ class TestSNPCalling(unittest.TestCase):
         args.imf = 0.5
         args.filters = ["VDB_s0.1"]
         args.min_sample = 2
+        args.max_combination = 100
         os.mkdir(os.path.join(
             self.test_folder,
             "compare_related_and_reference_genomes/seqs/with_BAQ/test"))
@@ -118,6 +119,72 @@ class TestSNPCalling(unittest.TestCase):
         os.remove("test_NC_007795.1_NC_007795.1_SNP_QUAL_best.png")
         os.remove("test_NC_007795.1_NC_007795.1_SNP_QUAL_raw.png")
 
+    def test_get_regions(self):
+        fasta = os.path.join(self.test_folder, "all.fa")
+        gen_file(fasta, ">aaa\nAAAAA\nCCCCC\n>bbb test\nGGG\n")
+        self.assertListEqual(sn.get_regions(fasta, 4), [
+            "aaa:1-4", "aaa:5-8", "aaa:9-10", "bbb:1-3"])
+        self.assertListEqual(sn.get_regions(fasta, 100), [
+            "aaa:1-10", "bbb:1-3"])
+
+    def test_merge_vcfs(self):
+        vcf1 = os.path.join(self.test_folder, "1.vcf")
+        vcf2 = os.path.join(self.test_folder, "2.vcf")
+        out_vcf = os.path.join(self.test_folder, "out.vcf")
+        gen_file(vcf1, "##head\n#CHROM\naaa\t2\n")
+        gen_file(vcf2, "##head\n#CHROM\naaa\t12\naaa\t15\n")
+        sn.merge_vcfs([vcf1, vcf2], out_vcf)
+        self.assertListEqual(import_data(out_vcf), [
+            "##head", "#CHROM", "aaa\t2", "aaa\t12", "aaa\t15"])
+
+    def test_run_tools_by_region(self):
+        bcftools = os.path.join(self.test_folder, "bcftools")
+        gen_file(bcftools, "#!/bin/sh\nfor out; do :; done\ncat > $out\n")
+        os.chmod(bcftools, 0o755)
+        fasta = os.path.join(self.test_folder, "all.fa")
+        gen_file(fasta, ">aaa\nAAAAACCCCC\n")
+        args = self.mock_args.mock()
+        args.samtools_path = "echo"
+        args.bcftools_path = bcftools
+        args.caller = "m"
+        args.chrom = "1"
+        args.rg = True
+        args.threads = 2
+        args.region_size = 4
+        bam_datas = [{"sample": "test", "bam_number": 1, "rep": 1}]
+        log = StringIO()
+        self.snp._run_tools(fasta, "with", args, bam_datas, log)
+        datas = import_data(bam_datas[0]["vcf"])
+        self.assertEqual(len(datas), 3)
+        self.assertTrue(datas[0].endswith("-r aaa:1-4"))
+        self.assertTrue(datas[2].endswith("-r aaa:9-10"))
+        self.assertFalse(os.path.exists(os.path.join(
+            self.test_folder, "tmp_bcf_regions")))
+
+    def test_run_tools_by_region_failed(self):
+        bcftools = os.path.join(self.test_folder, "bcftools")
+        gen_file(bcftools, "#!/bin/sh\nfor out; do :; done\ncat > $out\n"
+                 "grep -q aaa:5-8 $out && exit 1\nexit 0\n")
+        os.chmod(bcftools, 0o755)
+        fasta = os.path.join(self.test_folder, "all.fa")
+        gen_file(fasta, ">aaa\nAAAAACCCCC\n")
+        args = self.mock_args.mock()
+        args.samtools_path = "echo"
+        args.bcftools_path = bcftools
+        args.caller = "m"
+        args.chrom = "1"
+        args.rg = True
+        args.threads = 2
+        args.region_size = 4
+        bam_datas = [{"sample": "test", "bam_number": 1, "rep": 1}]
+        log = StringIO()
+        with self.assertRaises(SystemExit):
+            self.snp._run_tools(fasta, "with", args, bam_datas, log)
+        self.assertFalse(os.path.exists(bam_datas[0]["vcf"]))
+        self.assertIn("-r aaa:5-8 failed", log.getvalue())
+        self.assertFalse(os.path.exists(os.path.join(
+            self.test_folder, "tmp_bcf_regions")))
+
     def test_run_program(self):
         self.snp._run_sub = self.mock.mock_run_sub
         args = self.mock_args.mock()
@@ -105,6 +105,7 @@ class TestsORFDetection(unittest.TestCase):
                  "test")
         so.sorf_detection = self.mock.mock_sorf_detection
         args = self.mock_args.mock()
+        args.threads = 1
         args.libs = "libs"
         args.tex_notex = "tex_notex"
         args.replicates = "replicates"
@@ -156,6 +157,7 @@ class TestsORFDetection(unittest.TestCase):
         self.sorf._check_necessary_files = self.mock.mock_check_necessary_files
         self.sorf.multiparser = Mock_Multiparser()
         args = self.mock_args.mock()
+        args.threads = 1
         args.trans = self.trans
         args.gffs = self.gffs
         args.tsss = self.tsss
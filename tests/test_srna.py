@@ -144,6 +144,7 @@ class TestsRNADetection(unittest.TestCase):
             os.mkdir(self.tsss)
             os.mkdir(os.path.join(self.tsss, "tmp"))
             os.mkdir(self.out)
+            os.mkdir(os.path.join(self.out, "blast_results_and_misc"))
             os.mkdir(self.trans)
             os.mkdir(os.path.join(self.trans, "tmp"))
             os.mkdir(self.fastas)
@@ -163,6 +164,7 @@ class TestsRNADetection(unittest.TestCase):
         args.fastas = self.fastas
         args.trans = self.trans
         args.terms = self.terms
+        args.blast_tabular = False
         self.srna = sRNADetection(args)
 
     def tearDown(self):
@@ -232,6 +234,7 @@ class TestsRNADetection(unittest.TestCase):
                  self.example.sorf_file)
         fuzzy_tsss = {"inter": 3}
         args = self.mock_args.mock()
+        args.threads = 1
         args.import_info = ["tss", "blast_nr", "blast_srna", "sec_str", "sorf"]
         args.trans = self.trans
         args.tsss = self.tsss
@@ -23,8 +23,8 @@ class Mock_func(object):
                            prefix, rnaplfold_path, log):
         pass
 
-    def mock_run_rnaup(self, num_up, unstr_region_rnaup,
-                       out_folder, out_rnaup, out_log, log, ttt):
+    def mock_run_rnaup(self, pool, num_up, out_rnaup, out_log,
+                       args_tar, log):
         pass
 
     def mock_merge_srna_target(self, rnaplex_file, rnaup_file, top,
@@ -82,7 +82,7 @@ class TestsRNATargetPrediction(unittest.TestCase):
         fasta = os.path.join(self.fastas, "test.fa")
         gen_file(fasta, ">aaa\nAAAAAAAA")        
         seq = self.star._read_fasta(fasta)
-        self.assertEqual(seq, "AAAAAAAA")
+        self.assertEqual(str(seq), "AAAAAAAA")
 
     def test_get_specific_seq(self):
         srna_file = os.path.join(self.test_folder, "aaa_sRNA.gff")
@@ -113,6 +113,7 @@ class TestsRNATargetPrediction(unittest.TestCase):
         args.features = ["CDS"]
         args.tar_start = 3
         args.tar_end = 5
+        args.core_plex = 1
         self.star._gen_seq(["aaa"], args)
         datas = import_data(os.path.join(srna_seq, "aaa_sRNA.fa"))
         self.assertEqual("\n".join(datas), '>srna0|aaa|5|8|+\nTAAT')
@@ -120,6 +121,22 @@ class TestsRNATargetPrediction(unittest.TestCase):
         self.assertEqual("\n".join(datas),
                          '>AAA_000001_cds0_12-16_+\nTAAATTCC')
 
+    def test_split_targets(self):
+        sub_prefix = os.path.join(self.test_folder, "aaa_target")
+        gen_file(sub_prefix + ".fa", "\n".join([
+            ">t1", "AAAAAAAAAA", ">t2", "CC", ">t3", "GGGG", "GGGG",
+            ">t4", "TTT"]))
+        self.star._split_targets(sub_prefix, 2)
+        self.assertListEqual(import_data(sub_prefix + "_1.fa"),
+                             [">t1", "AAAAAAAAAA", ">t2", "CC"])
+        self.assertListEqual(import_data(sub_prefix + "_2.fa"),
+                             [">t3", "GGGG", "GGGG", ">t4", "TTT"])
+        self.assertFalse(os.path.exists(sub_prefix + "_3.fa"))
+        self.assertListEqual(sorted(
+            ["aaa_target_10.fa", "aaa_target_2.fa", "aaa_target_1.fa"],
+            key=self.star._target_num),
+            ["aaa_target_1.fa", "aaa_target_2.fa", "aaa_target_10.fa"])
+
     def test_rna_plex(self):
         self.star._run_rnaplex = self.mock.mock_run_rnaplex
         self.star._run_rnaplfold = self.mock.mock_run_rnaplfold
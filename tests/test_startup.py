@@ -0,0 +1,63 @@
+import os
+import re
+import sys
+import subprocess
+import importlib
+import unittest
+sys.path.append(".")
+
+
+HEAVY_MODULES = ["matplotlib", "networkx", "Bio", "numpy", "scipy"]
+MAX_IMPORT_TIME = 0.5
+
+
+def import_times(command, args=[]):
+    '''run the command with "python -X importtime" and return the
+    cumulative import time (second) of every imported module'''
+    env = dict(os.environ)
+    paths = [os.getcwd()]
+    if "PYTHONPATH" in env.keys():
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + command +
+                          args, env=env, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, universal_newlines=True)
+    times = {}
+    for line in proc.stderr.split("\n"):
+        datas = re.match(r"import time:\s+\d+ \|\s+(\d+) \| \s*(\S+)", line)
+        if datas is not None:
+            times[datas.group(2)] = int(datas.group(1)) / 1000000
+    return proc.returncode, times
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_controller_import(self):
+        returncode, times = import_times(
+            ["-c", "import annogesiclib.controller"])
+        self.assertEqual(returncode, 0)
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, times.keys())
+        print("\nimport time of annogesiclib.controller: {0:.3f}s".format(
+            times["annogesiclib.controller"]))
+        self.assertLess(times["annogesiclib.controller"], MAX_IMPORT_TIME)
+
+    def test_help(self):
+        returncode, times = import_times(
+            [os.path.join("bin", "annogesic")], ["--help"])
+        self.assertEqual(returncode, 0)
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, times.keys())
+
+    def test_subcommand_imports(self):
+        with open(os.path.join("annogesiclib", "controller.py")) as fh:
+            source = fh.read()
+        imports = re.findall(
+            r"^ +from (annogesiclib\.\w+) import (\w+)$", source, re.M)
+        self.assertGreater(len(imports), 0)
+        for module, name in imports:
+            self.assertTrue(hasattr(importlib.import_module(module), name))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,7 @@ sys.path.append(".")
 from mock_gff3 import Create_generator
 from mock_helper import import_data, gen_file, extract_info
 import annogesiclib.stat_TA_comparison as stc
+from annogesiclib.interval_index import IntervalIndex
 
 
 class TestStatTaComparison(unittest.TestCase):
@@ -149,7 +150,7 @@ class TestStatTaComparison(unittest.TestCase):
                          'bsbe': 0, 'gene': 1, 'bsae': 0}}
         gffs = copy.deepcopy(self.example.gffs)
         trans = copy.deepcopy(self.example.tas)
-        stc.compare_ta_gff(gffs, trans[0], check, tran_type,
+        stc.compare_ta_gff(IntervalIndex(gffs), trans[0], check, tran_type,
                            False, stats, "gene")
         self.assertListEqual(check, [0, 0, 0, 1, 0])
         self.assertDictEqual(stats, {
@@ -203,6 +203,7 @@ class TestTerminator(unittest.TestCase):
         term_outfolder = os.path.join(self.out, "gffs")
         csv_outfolder = os.path.join(self.out, "tables")
         args = self.mock_args.mock()
+        args.threads = 1
         args.trans = self.trans
         args.fastas = self.fastas
         args.tex_notex = "tex_notex"
@@ -269,6 +270,7 @@ class TestTerminator(unittest.TestCase):
         gen_file(os.path.join(frag_wigs, "frag.wig"), "text")
         gen_file(os.path.join(tex_wigs, "tex.wig"), "text")
         args = self.mock_args.mock()
+        args.threads = 1
         args.out_folder = self.out
         args.fastas = self.fastas
         args.gffs = self.gffs
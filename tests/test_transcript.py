@@ -104,6 +104,7 @@ class TestsTranscriptAssembly(unittest.TestCase):
         gen_file(os.path.join(
             self.frag, "tmp/test_forward.wig"), "test")
         args = self.mock_args.mock()
+        args.threads = 1
         args.replicates = "rep"
         args.out_foler = self.out
         strains = self.tran._compute("frag", self.frag, "libs", args)
@@ -118,6 +119,7 @@ class TestsTranscriptAssembly(unittest.TestCase):
         gen_file(os.path.join(self.out, "test_frag"), self.example.tran_file)
         args = self.mock_args.mock()
         args.replicates = "rep"
+        args.threads = 1
         args.libs = "libs"
         args.gffs = self.gffs
         args.out_folder = self.out
@@ -249,6 +251,7 @@ class TestsTranscriptAssembly(unittest.TestCase):
         gen_file(os.path.join(gff_out, "tmp_overlap"), self.example.tran_file)
         gen_file(os.path.join(gff_out, "final_test"), self.example.tran_file)
         args = self.mock_args.mock()
+        args.threads = 1
         args.out_folder = self.out
         args.frag_wigs = self.frag
         args.tex_wigs = None
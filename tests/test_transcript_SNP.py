@@ -62,12 +62,42 @@ class TestTranscripSNP(unittest.TestCase):
              'alt': 'AA', 'ref': 'A', 'frac': 0.536585, 'depth': 41,
              'dp4_sum': 40}])
 
-    def test_check_overlap(self):
-        snps = {"test": []}
-        overlaps = [{"test": []}]
-        ts.check_overlap(snps, overlaps)
-        self.assertListEqual(overlaps, [{'test': [], 'print': True}])
-        self.assertDictEqual(snps, {'test': [{'test': [], 'print': True}]})
+    def test_group_conflicts(self):
+        snps = [{'strain': 'aaa', 'pos': 10, 'ref': 'C'},
+                {'strain': 'bbb', 'pos': 2, 'ref': 'CAG'},
+                {'strain': 'aaa', 'pos': 2, 'ref': 'CA'},
+                {'strain': 'aaa', 'pos': 3, 'ref': 'AG'},
+                {'strain': 'aaa', 'pos': 4, 'ref': 'G'},
+                {'strain': 'bbb', 'pos': 4, 'ref': 'G'}]
+        groups = ts.group_conflicts(snps)
+        self.assertListEqual([[(snp['strain'], snp['pos']) for snp in group]
+                              for group in groups], [
+            [('aaa', 2), ('aaa', 3), ('aaa', 4)], [('aaa', 10)],
+            [('bbb', 2), ('bbb', 4)]])
+
+    def test_search_haplotypes(self):
+        group = [{'pos': 2, 'ref': 'CA'}, {'pos': 3, 'ref': 'AG'},
+                 {'pos': 4, 'ref': 'G'}]
+        haplotypes = list(ts.search_haplotypes(group))
+        self.assertListEqual([[snp['pos'] for snp in haplotype]
+                              for haplotype in haplotypes], [[2, 4], [3]])
+        group = [{'pos': 2, 'ref': 'CAGT'}, {'pos': 3, 'ref': 'A'},
+                 {'pos': 4, 'ref': 'G'}]
+        haplotypes = list(ts.search_haplotypes(group))
+        self.assertListEqual([[snp['pos'] for snp in haplotype]
+                              for haplotype in haplotypes], [[2], [3, 4]])
+
+    def test_gen_combinations(self):
+        groups = [[{'pos': 1, 'ref': 'CA'}, {'pos': 2, 'ref': 'A'}],
+                  [{'pos': 10, 'ref': 'A'}],
+                  [{'pos': 20, 'ref': 'AA'}, {'pos': 21, 'ref': 'A'}]]
+        combs = [(key, [snp['pos'] for snp in snps])
+                 for key, snps in ts.gen_combinations(groups)]
+        self.assertListEqual(combs, [(1, [1, 10, 20]), (2, [2, 10, 20]),
+                                     (3, [1, 10, 21]), (4, [2, 10, 21])])
+        combs = [key for key, snps in ts.gen_combinations(groups, 3)]
+        self.assertListEqual(combs, [1, 2, 3])
+        self.assertListEqual(list(ts.gen_combinations([])), [(1, [])])
 
     def test_overlap_position(self):
         qual_snps = [{'filter': '.', 'pos': 22181, 'alt': 'A',
@@ -95,29 +125,29 @@ class TestTranscripSNP(unittest.TestCase):
         self.assertListEqual(conflicts, [[
             {'strain': 'NC_007795.1', 'info': 'MQ=20',
              'indel': -1, 'qual': 98.0, 'ref': 'CA', 'frac': -1,
-             'alt': 'A', 'depth': 89, 'print': True, 'pos': 22181,
+             'alt': 'A', 'depth': 89, 'pos': 22181,
              'filter': '.', 'id': '.',
              'all_info': ("NC_007795.1\t22181\t.\tC\tA\t98\t.\tDP=89;"
                           "VDB=8.46526e-15;SGB=-0.693147\tGT:PL:DP\t"
                           "1/1:125,184,0:87")},
             {'strain': 'NC_007795.1', 'info': 'MQ=20', 'indel': -1,
              'qual': 98.0, 'ref': 'A', 'frac': -1, 'alt': 'C',
-             'depth': 89, 'print': True, 'pos': 22182, 'filter': '.',
+             'depth': 89, 'pos': 22182, 'filter': '.',
              'id': '.',
              'all_info': ("NC_007795.1\t22182\t.\tC\tA\t98\t.\tDP=89;"
                           "VDB=8.46526e-15;SGB=-0.693147\tGT:PL:DP\t"
                           "1/1:125,184,0:87")}]])
-        self.assertDictEqual(nooverlap, {1: [
+        self.assertDictEqual(dict(nooverlap), {1: [
             {'strain': 'NC_007795.1', 'info': 'MQ=20', 'indel': -1,
              'qual': 98.0, 'ref': 'CA', 'frac': -1, 'alt': 'A',
-             'depth': 89, 'print': True, 'pos': 22181, 'filter': '.',
+             'depth': 89, 'pos': 22181, 'filter': '.',
              'id': '.',
              'all_info': ("NC_007795.1\t22181\t.\tC\tA\t98\t.\tDP=89;"
                           "VDB=8.46526e-15;SGB=-0.693147\tGT:PL:DP\t"
                           "1/1:125,184,0:87")},
             {'strain': 'NC_007795.1', 'info': 'MQ=20', 'indel': -1,
              'qual': 98.0, 'ref': 'C', 'frac': -1, 'alt': 'A',
-             'depth': 89, 'print': True, 'pos': 30000, 'filter': '.',
+             'depth': 89, 'pos': 30000, 'filter': '.',
              'id': '.',
              'all_info': ("NC_007795.1\t30000\t.\tC\tA\t98\t.\tDP=89;"
                           "VDB=8.46526e-15;SGB=-0.693147\tGT:PL:DP\t"
@@ -125,14 +155,14 @@ class TestTranscripSNP(unittest.TestCase):
                                          2: [
             {'strain': 'NC_007795.1', 'info': 'MQ=20', 'indel': -1,
              'qual': 98.0, 'ref': 'A', 'frac': -1, 'alt': 'C',
-             'depth': 89, 'print': True,
+             'depth': 89,
              'pos': 22182, 'filter': '.', 'id': '.',
              'all_info': ("NC_007795.1\t22182\t.\tC\tA\t98\t.\tDP=89;"
                           "VDB=8.46526e-15;SGB=-0.693147\tGT:PL:DP\t"
                           "1/1:125,184,0:87")},
             {'strain': 'NC_007795.1', 'info': 'MQ=20', 'indel': -1,
              'qual': 98.0, 'ref': 'C', 'frac': -1, 'alt': 'A',
-             'depth': 89, 'print': True, 'pos': 30000, 'filter': '.',
+             'depth': 89, 'pos': 30000, 'filter': '.',
              'id': '.',
              'all_info': ("NC_007795.1\t30000\t.\tC\tA\t98\t.\tDP=89;"
                           "VDB=8.46526e-15;SGB=-0.693147\tGT:PL:DP\t"
@@ -214,6 +244,25 @@ class TestTranscripSNP(unittest.TestCase):
         self.assertDictEqual(seq, {
             'num_mod': 3, 'seq': 'CCCaATATCAGCACCGTAGACGATAGAGTAGTAC'})
 
+    def test_apply_snps(self):
+        snps = [{'pos': 7, 'ref': 'C', 'alt': 'A'},
+                {'pos': 1, 'ref': 'CA', 'alt': 'GTT'},
+                {'pos': 2, 'ref': 'A', 'alt': 'AA'},
+                {'pos': 9, 'ref': 'T', 'alt': 'G'},
+                {'pos': 10, 'ref': 'ca', 'alt': 'C'},
+                {'pos': 13, 'ref': 'T', 'alt': 'G'}]
+        seq = ts.apply_snps("CAGTACCCTCAGCACCG", snps)
+        self.assertEqual(seq, "gttGTACaCgcGCACCG")
+        self.assertEqual(ts.apply_snps("CAGT", []), "CAGT")
+
+    def test_write_fasta(self):
+        out = StringIO()
+        ts.write_fasta(out, "aaa", "ACGTACG", 3)
+        self.assertEqual(out.getvalue(), ">aaa\nACG\nTAC\nG")
+        out = StringIO()
+        ts.write_fasta(out, "aaa", "ACGTAC", 3)
+        self.assertEqual(out.getvalue(), ">aaa\nACG\nTAC\n")
+
     def test_print_file(self):
         refs = {'NC_007795.1': ['1:A', '1:GT']}
         conflicts = [[{'all_info': ("NC_007795.1\t1\t.\tCA\tA,GT\t98\t.\tDP=89;"
@@ -310,7 +359,8 @@ class TestTranscripSNP(unittest.TestCase):
                                     "INDEL;IDV=22;IMF=0.536585;DP=41;"
                                     "VDB=9.36323e-14 GT:PL:DP\t0/1:60,0,"
                                     "55:40")}]]
-        ts.gen_new_fasta(nooverlap, seqs, out_ref, conflicts, out_seq)
+        ts.gen_new_fasta(nooverlap.items(), seqs, out_ref, conflicts,
+                         out_seq)
         self.assertEqual(out_ref.getvalue(),
                          ("1\t1\t1\t1:A\tNC_007795.1\n"
                           "1\t1\t2\t1:GT\tNC_007795.1\n"
@@ -344,6 +394,7 @@ class TestTranscripSNP(unittest.TestCase):
         args.imf = 0.5
         args.filters = ["VDB_s0.1"]
         args.min_sample = 2
+        args.max_combination = 100
         ts.snp_detect(fasta_file, snp_file, depth_file, out_snp, out_seq,
                       2, stat_file, args, 2)
         self.assertTrue(os.path.exists(os.path.join(
@@ -37,26 +37,27 @@ class TestTranscriptAssembly(unittest.TestCase):
                 wigs["aaa"]['frag_1']["test1|+|frag"][i],
                 self.example.wigs_nf["aaa"]['frag_1']["test1|+|frag"][i])
 
-    def test_detect_hight_toler(self):
-        cover = 100
-        height = 5
-        tmp_covers = {"best": 10, "toler": 2}
-        tracks = []
-        ta.detect_hight_toler(cover, height, tmp_covers,
-                              tracks, "test_1|+|frag")
-        self.assertDictEqual(tmp_covers, {'best': 100, 'toler': 2})
-
-    def test_check_tex_conds(self):
-        check_tex = []
-        tracks = ["test1", "test2"]
-        libs = [{"name": "test1", "type": "frag",
-                 "cond": "1", "strand": "+", "rep": "a"},
-                {"name": "test2", "type": "tex",
-                 "cond": "2", "strand": "+", "rep": "a"}]
-        texs = {"test1": 2, "test2": 2}
-        conds = {}
-        ta.check_tex_conds(tracks, libs, texs, check_tex, conds, 1)
-        self.assertDictEqual(conds, {'1': 1, '2': 1})
+    def test_count_conds(self):
+        tracks = [{"claim": "1", "weights": {"1": 1},
+                   "keys": ["test1@AND@test2"]},
+                  {"claim": "1", "weights": {"1": 1},
+                   "keys": ["test1@AND@test2"]},
+                  {"claim": "2", "weights": {"2": 2}, "keys": []}]
+        above = np.array([[True, True, False],
+                          [False, True, False],
+                          [True, False, True]])
+        counts = ta.count_conds(
+            tracks, {"test1@AND@test2": 0}, above, 2)
+        self.assertListEqual(list(counts["1"]), [0, 1, 0])
+        self.assertListEqual(list(counts["2"]), [0, 0, 0])
+        counts = ta.count_conds(tracks, {}, above, 2)
+        self.assertListEqual(list(counts["1"]), [1, 2, 0])
+        self.assertListEqual(list(counts["2"]), [2, 0, 2])
+
+    def test_get_segments(self):
+        covers = np.array([-1, 3, 4, -1, -1, 5, -1, 6, 7, 8])
+        self.assertListEqual(list(ta.get_segments(covers)),
+                             [(2, 3), (6, 6), (8, 10)])
 
     def test_elongation(self):
         covers = {"texnotex_1": {
@@ -68,15 +69,15 @@ class TestTranscriptAssembly(unittest.TestCase):
                  "cond": "texnotex_1", "strand": "+", "rep": "a"}]
         reps = {"tex": ["all_1"], "frag": ["all_1"]}
         tmp_texs = {"test1_test2": 2}
-        tolers = []
-        trans = {"aaa": []}
         args = self.mock_args.mock()
         args.replicates = reps
         args.height = 5
         args.tex = 2
-        ta.elongation(covers, tmp_texs, libs, "+", trans, args, "aaa", [])
-        self.assertDictEqual(trans, {
-            'aaa': [-1, -1, -1, -1, -1, -1, -1, -1, -1, 10, 100]})
+        trans, tolers = ta.elongation(covers, tmp_texs, libs, args)
+        self.assertListEqual(list(trans),
+                             [-1, -1, -1, -1, -1, -1, -1, -1, -1, 10, 100])
+        self.assertListEqual(list(tolers),
+                             [0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 15])
 
     def test_transfer_to_tran(self):
         reps = {"tex": ["all_1"], "frag": ["all_1"]}
@@ -89,10 +90,10 @@ class TestTranscriptAssembly(unittest.TestCase):
         args.replicates = reps
         tolers, trans = ta.transfer_to_tran(
             self.example.wigs_f, libs, tmp_texs, "+", args)
-        self.assertDictEqual(tolers, {
-            'aaa': [0.0, 2.0, 20, 20, 4.0, 20, 7.0, 20]})
-        self.assertDictEqual(trans, {
-            'aaa': [-1, -1, 41.0, 47.0, -1, 47.0, -1, 47.0]})
+        self.assertListEqual(list(tolers['aaa']),
+                             [0.0, 2.0, 20, 20, 4.0, 20, 7.0, 20])
+        self.assertListEqual(list(trans['aaa']),
+                             [-1, -1, 41.0, 47.0, -1, 47.0, -1, 47.0])
 
     def test_fill_gap_and_print(self):
         trans = {'aaa': [-1, -1, 41.0, 47.0, -1, 47.0, -1, 47.0]}
@@ -251,9 +251,9 @@ class TestsTSSpredator(unittest.TestCase):
                 "test1_TEX_reverse.wig:tex:1:a:-"]
         self.tss._merge_wigs(self.wigs, "test", libs)
         datas = import_data(os.path.join("tmp", "merge_forward.wig"))
-        self.assertEqual("\n".join(datas), "test_ftest_f")
+        self.assertEqual("\n".join(datas), "test_f\ntest_f")
         datas = import_data(os.path.join("tmp", "merge_reverse.wig"))
-        self.assertEqual("\n".join(datas), "test_rtest_r")
+        self.assertEqual("\n".join(datas), "test_r\ntest_r")
         shutil.rmtree("tmp")
 
     def test_check_orphan(self):
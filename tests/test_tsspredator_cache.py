@@ -0,0 +1,76 @@
+import sys
+import os
+import unittest
+import shutil
+import hashlib
+sys.path.append(".")
+from mock_helper import gen_file
+from annogesiclib.tsspredator_cache import TSSpredatorCache, file_hash
+
+
+class TestTSSpredatorCache(unittest.TestCase):
+
+    def setUp(self):
+        self.test_folder = "test_folder"
+        if (not os.path.exists(self.test_folder)):
+            os.mkdir(self.test_folder)
+        self.cache_folder = os.path.join(self.test_folder, "cache")
+        self.manual = os.path.join(self.test_folder, "manual.gff")
+        gen_file(self.manual, "manual")
+        self.wig1 = os.path.join(self.test_folder, "wig1", "aaa.wig")
+        self.wig2 = os.path.join(self.test_folder, "wig2", "aaa.wig")
+        os.mkdir(os.path.dirname(self.wig1))
+        os.mkdir(os.path.dirname(self.wig2))
+        gen_file(self.wig1, "wig")
+        gen_file(self.wig2, "wig")
+        self.cache = TSSpredatorCache(self.cache_folder, "test.jar",
+                                      self.manual, 2000, 3)
+
+    def tearDown(self):
+        if os.path.exists(self.test_folder):
+            shutil.rmtree(self.test_folder)
+
+    def gen_config(self, filename, wig, height):
+        gen_file(filename, "\n".join([
+            "fivePrimePlus_1a = " + wig, "minCliffHeight = " + height,
+            "outputDirectory = " + os.path.dirname(filename)]) + "\n")
+
+    def test_file_hash(self):
+        self.assertEqual(file_hash(self.wig1), file_hash(self.wig2))
+        self.assertEqual(file_hash(self.wig1, buffer_size=1),
+                         hashlib.sha1(b"wig").hexdigest())
+
+    def test_run_key(self):
+        config1 = os.path.join(self.test_folder, "wig1", "config.ini")
+        config2 = os.path.join(self.test_folder, "wig2", "config.ini")
+        self.gen_config(config1, self.wig1, "0.3")
+        self.gen_config(config2, self.wig2, "0.3")
+        key = self.cache.run_key(config1, "TSS")
+        self.assertEqual(key, self.cache.run_key(config2, "TSS"))
+        self.assertNotEqual(key, self.cache.run_key(config1, "PS"))
+        self.gen_config(config2, self.wig2, "0.4")
+        self.assertNotEqual(key, self.cache.run_key(config2, "TSS"))
+        gen_file(self.wig2, "wig2")
+        self.gen_config(config2, self.wig2, "0.3")
+        self.assertNotEqual(key, self.cache.run_key(config2, "TSS"))
+
+    def test_gff_and_stat(self):
+        gff = os.path.join(self.test_folder, "test.gff")
+        gen_file(gff, "gff")
+        self.assertIsNone(self.cache.get_gff("aaa"))
+        self.assertIsNone(self.cache.get_stat("aaa"))
+        self.cache.put_gff("aaa", gff)
+        with open(self.cache.get_gff("aaa")) as fh:
+            self.assertEqual(fh.read(), "gff")
+        stat = {"tp": 2, "tp_rate": 0.5, "fp": 1, "fp_rate": 0.001,
+                "fn": 2, "missing_ratio": 0.5}
+        self.cache.put_stat("aaa", stat)
+        self.assertDictEqual(self.cache.get_stat("aaa"), stat)
+        cache = TSSpredatorCache(self.cache_folder, "test.jar",
+                                 self.manual, 1000, 3)
+        self.assertIsNotNone(cache.get_gff("aaa"))
+        self.assertIsNone(cache.get_stat("aaa"))
+
+
+if __name__ == "__main__":
+    unittest.main()
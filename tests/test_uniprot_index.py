@@ -0,0 +1,54 @@
+import sys
+import os
+import unittest
+import shutil
+sys.path.append(".")
+from mock_helper import gen_file
+from annogesiclib.uniprot_index import UniprotIndex
+
+
+class TestUniprotIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.example = Example()
+        self.test_folder = "test_folder"
+        if (not os.path.exists(self.test_folder)):
+            os.mkdir(self.test_folder)
+        self.database = os.path.join(self.test_folder, "idmapping.tab")
+        gen_file(self.database, self.example.idmapping)
+        self.index = UniprotIndex(self.database, self.database + ".sqlite")
+
+    def tearDown(self):
+        if os.path.exists(self.test_folder):
+            shutil.rmtree(self.test_folder)
+
+    def test_build(self):
+        self.assertFalse(self.index.is_valid())
+        self.assertTrue(self.index.build())
+        self.assertTrue(self.index.is_valid())
+        self.assertFalse(self.index.build())
+        gen_file(self.database, self.example.idmapping + "\n")
+        self.assertFalse(self.index.is_valid())
+        self.assertTrue(self.index.build())
+
+    def test_lookup(self):
+        self.index.batch = 1
+        self.assertListEqual(
+            self.index.lookup(["YP_3", "YP_1", "YP_2", "YP_4", "YP_5"]),
+            [("YP_1", "GO:0006355; GO:0046782"), ("YP_2", "GO:0016021"),
+             ("YP_3", "GO:0016021"), ("YP_4", "")])
+        self.assertListEqual(self.index.lookup([]), [])
+        self.assertListEqual(
+            UniprotIndex(self.database, self.database + ".sqlite").lookup(
+                ["YP_2"]), [("YP_2", "GO:0016021")])
+
+
+class Example(object):
+    idmapping = """Q1	A_1	1	YP_1	1; 2		GO:0006355; GO:0046782	UniRef100_Q1
+Q2	A_2	2	YP_2; YP_3	3		GO:0016021	UniRef100_Q2
+Q3	A_3	3	YP_4	4			UniRef100_Q3
+Q4	A_4"""
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -101,6 +101,7 @@ class TestsTSSpredator(unittest.TestCase):
         gen_file(os.path.join(term_path, "test_term.gff"),
                  self.example.term_file)
         args = self.mock_args.mock()
+        args.threads = 1
         args.gffs = self.gffs
         args.tsss = self.tsss
         args.trans = self.trans
@@ -136,6 +137,7 @@ class TestsTSSpredator(unittest.TestCase):
         gen_file(os.path.join(self.terms, "test_term.gff"),
                  self.example.term_file)
         args = self.mock_args.mock()
+        args.threads = 1
         args.tsss = self.tsss
         args.gffs = self.gffs
         args.trans = self.trans